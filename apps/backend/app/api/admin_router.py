@@ -0,0 +1,172 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from typing import Any, Dict, List, Optional
+
+from ..services.admin_auth import ADMIN_CONFIG, admin_authorized
+from ..services.profiler import get_profile_store
+from ..services.memory_diagnostics import (
+    MEMORY_CONFIG, cache_sizes, get_memory_profiler, object_census, register_cache
+)
+from ..services.match_service import get_match_store
+from ..services.scrape_cache import get_scrape_cache
+from ..services.team_stats_cache import get_team_stats_cache
+from ..services.html_extractor import get_html_extractor
+from ..services.odds_store import get_odds_store
+from ..services.web_scraper import get_crawl_frontier
+from ..services.loop_watchdog import get_loop_watchdog
+from ..services.prediction_cache import get_prediction_cache
+from ..services.admission import get_admission_controller
+from ..services.prediction_jobs import get_prediction_job_queue
+
+
+def require_admin(token: Optional[str] = Header(None, alias=ADMIN_CONFIG["HEADER"])) -> None:
+    """Dependency rejecting callers without the admin token, when one is configured."""
+    if not admin_authorized(token):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+register_cache("match_list", get_match_store)
+register_cache("scraped_data", get_scrape_cache)
+register_cache("team_stats", get_team_stats_cache)
+register_cache("html_parse", get_html_extractor)
+register_cache("odds", get_odds_store)
+register_cache("crawl_frontier", get_crawl_frontier)
+register_cache("predictions", get_prediction_cache)
+register_cache("prediction_jobs", get_prediction_job_queue)
+
+
+@router.get("/profiles")
+async def list_profiles() -> List[Dict[str, Any]]:
+    """
+    List stored request profiles, newest first.
+
+    Returns:
+        Profile metadata: id, method, path, status, trigger, duration and
+        sample count
+    """
+    return get_profile_store().list()
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str) -> str:
+    """
+    Download a stored profile as collapsed stacks.
+
+    The output feeds straight into flamegraph.pl or speedscope.
+
+    Raises:
+        HTTPException: 404 if the profile does not exist
+    """
+    collapsed = get_profile_store().load(profile_id)
+    if collapsed is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return collapsed
+
+
+@router.get("/memory")
+async def get_memory_status() -> Dict[str, Any]:
+    """
+    Report tracemalloc state and the snapshots held for diffing.
+    """
+    return get_memory_profiler().status()
+
+
+@router.post("/memory/tracemalloc/start")
+async def start_tracemalloc(frames: int = Query(MEMORY_CONFIG["TRACE_FRAMES"], ge=1, le=50)) -> Dict[str, Any]:
+    """
+    Start tracing allocations, keeping `frames` frames per allocation.
+
+    Tracing slows allocation-heavy code down, so stop it when done.
+    """
+    return get_memory_profiler().start(frames)
+
+
+@router.post("/memory/tracemalloc/stop")
+async def stop_tracemalloc() -> Dict[str, Any]:
+    """Stop tracing allocations; stored snapshots are kept."""
+    return get_memory_profiler().stop()
+
+
+@router.post("/memory/snapshots")
+async def take_memory_snapshot(limit: int = Query(MEMORY_CONFIG["TOP_LIMIT"], ge=1, le=500)) -> Dict[str, Any]:
+    """
+    Snapshot traced allocations.
+
+    Returns:
+        Snapshot id, total traced bytes and the top allocation sites
+
+    Raises:
+        HTTPException: 409 if tracemalloc is not tracing
+    """
+    try:
+        return get_memory_profiler().take_snapshot(limit)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/memory/snapshots/{older_id}/diff/{newer_id}")
+async def diff_memory_snapshots(
+    older_id: int,
+    newer_id: int,
+    limit: int = Query(MEMORY_CONFIG["TOP_LIMIT"], ge=1, le=500)
+) -> Dict[str, Any]:
+    """
+    Compare two snapshots to find the allocation sites that grew.
+
+    Raises:
+        HTTPException: 404 if either snapshot is unknown
+    """
+    try:
+        return get_memory_profiler().diff(older_id, newer_id, limit)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Snapshot {older_id} or {newer_id} not found")
+
+
+@router.get("/memory/objects")
+def get_object_census(limit: int = Query(MEMORY_CONFIG["TOP_LIMIT"], ge=1, le=500)) -> List[Dict[str, Any]]:
+    """
+    Count live objects by type, largest total size first.
+
+    A plain def: the heap walk runs in the threadpool, not on the event loop.
+    """
+    return object_census(limit)
+
+
+@router.get("/memory/caches")
+def get_cache_sizes() -> Dict[str, Dict[str, Any]]:
+    """
+    Report the entry count and retained size of each app-level cache.
+
+    A plain def: the object graph walks run in the threadpool, not on the
+    event loop.
+
+    Returns:
+        Per cache: entries, retained bytes and objects walked
+    """
+    return cache_sizes()
+
+
+@router.get("/loop")
+async def get_loop_health() -> Dict[str, Any]:
+    """
+    Report event loop lag percentiles and recent stalls.
+
+    Returns:
+        Lag percentiles, stall count and the stack captured for each recent
+        stall (None when the stall ended before it could be sampled)
+    """
+    return get_loop_watchdog().report()
+
+
+@router.get("/admission")
+async def get_admission_state() -> Dict[str, Any]:
+    """
+    Report prediction admission control.
+
+    Returns:
+        Slot limit and usage, queue depth, admitted, cache-exempt and shed
+        counts, and the service time estimate behind Retry-After
+    """
+    return get_admission_controller().stats()
@@ -0,0 +1,142 @@
+from contextvars import ContextVar
+
+from fastapi import APIRouter, Response
+from typing import Any, Dict
+
+from ..services.metrics import METRICS_CONFIG, REGISTRY
+from ..services.scrape_cache import get_scrape_cache
+from ..services.team_stats_cache import get_team_stats_cache
+from ..services.html_extractor import get_html_extractor
+from ..services.hedging import get_request_hedger
+from ..services.web_scraper import get_crawl_frontier
+from ..services.loop_watchdog import get_loop_watchdog
+from ..services.warmup import get_warmup_state
+from ..services.prediction_cache import get_prediction_cache
+from ..services.shared_cache import get_shared_cache
+from ..services.admission import get_admission_controller
+from ..services.prediction_jobs import get_prediction_job_queue
+from ..services.update_hub import get_update_hub
+
+router = APIRouter(tags=["metrics"])
+
+
+async def _cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit and miss counts and entry totals of every cache, keyed by cache name."""
+    caches = {
+        f"scrape:{section}": stats
+        for section, stats in get_scrape_cache().stats().items()
+    }
+    caches["team_stats"] = get_team_stats_cache().stats()
+    caches["html_parse"] = get_html_extractor().stats()
+    # Shared entry counts are SQLite queries; they run on the database thread
+    prediction_cache = get_prediction_cache()
+    if prediction_cache.shared is not None:
+        caches["predictions"] = await prediction_cache.shared.run(prediction_cache.stats)
+    else:
+        caches["predictions"] = prediction_cache.stats()
+    shared = get_shared_cache()
+    if shared is not None:
+        caches["shared"] = await shared.run(shared.stats)
+    return caches
+
+
+# Collected once per /metrics render and read by every cache metric
+_rendered_cache_stats: ContextVar[Dict[str, Dict[str, Any]]] = ContextVar("rendered_cache_stats", default={})
+
+
+def _cache_lookups() -> Dict[tuple, int]:
+    lookups = {}
+    for cache, stats in _rendered_cache_stats.get().items():
+        lookups[(cache, "hit")] = stats.get("hits", 0)
+        lookups[(cache, "miss")] = stats.get("misses", 0)
+    return lookups
+
+
+def _cache_hit_ratio() -> Dict[str, float]:
+    ratios = {}
+    for cache, stats in _rendered_cache_stats.get().items():
+        lookups = stats.get("hits", 0) + stats.get("misses", 0)
+        ratios[cache] = stats.get("hits", 0) / lookups if lookups else 0.0
+    return ratios
+
+
+def _cache_entries() -> Dict[str, int]:
+    return {cache: stats["entries"] for cache, stats in _rendered_cache_stats.get().items() if "entries" in stats}
+
+
+def _frontier_stats() -> Dict[str, int]:
+    stats = get_crawl_frontier().stats()
+    return {key: stats[key] for key in ("workers", "in_flight", "pending")}
+
+
+def _hedge_totals() -> Dict[str, int]:
+    hedger = get_request_hedger()
+    if hedger is None:
+        return {}
+    stats = hedger.stats()
+    return {outcome: stats[outcome] for outcome in ("hedged", "hedge_wins", "budget_denied")}
+
+
+def _admission_state() -> Dict[str, int]:
+    stats = get_admission_controller().stats()
+    return {state: stats[state] for state in ("active", "queued", "max_concurrent", "max_queue")}
+
+
+def _prediction_jobs() -> Dict[str, int]:
+    return get_prediction_job_queue().stats()["jobs"]
+
+
+def _update_hub_state() -> Dict[str, int]:
+    stats = get_update_hub().stats()
+    return {state: stats[state] for state in ("connections", "topics", "subscriptions")}
+
+
+def _update_hub_messages() -> Dict[str, int]:
+    stats = get_update_hub().stats()
+    return {outcome: stats[outcome] for outcome in ("published", "delivered", "dropped")}
+
+
+def _startup_phases() -> Dict[str, float]:
+    warmup = get_warmup_state()
+    phases = {name: phase["seconds"] for name, phase in warmup.phases.items() if phase["seconds"] is not None}
+    if warmup.import_seconds is not None:
+        phases["import"] = warmup.import_seconds
+    return phases
+
+
+def _loop_lag_quantiles() -> Dict[str, float]:
+    percentiles = get_loop_watchdog().lag_percentiles()
+    quantiles = {"p50": "0.5", "p95": "0.95", "p99": "0.99", "max": "1"}
+    return {quantiles[name]: value for name, value in percentiles.items()}
+
+
+# Collected from the services' own counters when /metrics is scraped
+REGISTRY.callback("cache_lookups_total", "Cache lookups by cache and result", _cache_lookups, ("cache", "result"), "counter")
+REGISTRY.callback("cache_hit_ratio", "Cache hits over lookups since start", _cache_hit_ratio, ("cache",))
+REGISTRY.callback("cache_entries", "Entries currently held per cache", _cache_entries, ("cache",))
+REGISTRY.callback("crawl_frontier_pool", "Crawl frontier workers, fetches in flight and queued URLs", _frontier_stats, ("state",))
+REGISTRY.callback("scraper_hedges_total", "Hedged scraper requests by outcome", _hedge_totals, ("outcome",), "counter")
+REGISTRY.callback("prediction_admission", "Prediction slots in use, requests queued and their limits", _admission_state, ("state",))
+REGISTRY.callback("prediction_jobs", "Prediction jobs retained, by status", _prediction_jobs, ("status",))
+REGISTRY.callback("update_hub", "Push connections, followed topics and subscriptions", _update_hub_state, ("state",))
+REGISTRY.callback("update_hub_messages_total", "Pushed updates published, queued per subscriber and dropped", _update_hub_messages, ("outcome",), "counter")
+REGISTRY.callback("startup_phase_seconds", "Duration of app import and each warm-up phase", _startup_phases, ("phase",))
+REGISTRY.callback("event_loop_lag_quantile_seconds", "Event loop lag percentiles over the last minute", _loop_lag_quantiles, ("quantile",))
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    """
+    Expose service metrics in the Prometheus text format.
+
+    Returns:
+        Latency histograms per stage, scrape source and upstream host,
+        request and upstream status counts, in-flight gauges, cache hit
+        ratios and crawl pool usage
+    """
+    token = _rendered_cache_stats.set(await _cache_stats())
+    try:
+        body = REGISTRY.render()
+    finally:
+        _rendered_cache_stats.reset(token)
+    return Response(body, media_type=METRICS_CONFIG["CONTENT_TYPE"])
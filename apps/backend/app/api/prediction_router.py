@@ -1,11 +1,24 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response
+from typing import List, Dict, Any, Optional
+import asyncio
 import logging
 
-from ..services.match_service import MatchService
+from ..services.match_service import MatchService, get_match_store
+from ..services.deadline import DEADLINE_CONFIG, Deadline, deadline_scope
 from ..services.prediction_service import PredictionService
-from ..services.web_scraper import WebScraperService
-from ..models.match import Match, PredictionRequest, PredictionResult
+from ..services.web_scraper import WebScraperService, get_crawl_frontier
+from ..services.scrape_cache import get_scrape_cache
+from ..services.hedging import get_request_hedger
+from ..services.metrics import ServerTiming
+from ..services.admission import ADMISSION_CONFIG, AdmissionController, AdmissionRejected, get_admission_controller
+from ..services.prediction_cache import PredictionCache, get_prediction_cache
+from ..services.shared_cache import get_shared_cache
+from ..services.prediction_jobs import JobQueueFull, PredictionJobQueue, get_prediction_job_queue
+from ..services.team_stats_cache import get_team_stats_cache
+from ..services.update_hub import get_update_hub
+from ..services.odds_store import get_odds_store, ODDS_MARKETS
+from ..services.value_bet_service import ValueBetService, VALUE_BET_CONFIG
+from ..models.match import Match, MatchChanges, PredictionJob, PredictionRequest, PredictionResult, ValueBet
 
 logger = logging.getLogger(__name__)
 
@@ -14,26 +27,39 @@ router = APIRouter(prefix="/prediction", tags=["prediction"])
 
 def get_match_service() -> MatchService:
     """Dependency injection for MatchService"""
-    return MatchService()
+    return MatchService(store=get_match_store(), shared=get_shared_cache(), updates=get_update_hub())
 
 
 def get_prediction_service() -> PredictionService:
     """Dependency injection for PredictionService"""
-    return PredictionService()
+    return PredictionService(team_stats=get_team_stats_cache())
 
 
 def get_web_scraper_service() -> WebScraperService:
     """Dependency injection for WebScraperService"""
-    return WebScraperService()
+    return WebScraperService(
+        cache=get_scrape_cache(),
+        team_stats_cache=get_team_stats_cache(),
+        frontier=get_crawl_frontier(),
+        odds_store=get_odds_store(),
+        hedger=get_request_hedger(),
+        updates=get_update_hub()
+    )
+
+
+def get_value_bet_service() -> ValueBetService:
+    """Dependency injection for ValueBetService"""
+    return ValueBetService()
 
 
 @router.get("/matches", response_model=List[Match])
-async def get_matches(match_service: MatchService = Depends(get_match_service)) -> List[Match]:
+async def get_matches(response: Response, match_service: MatchService = Depends(get_match_service)) -> List[Match]:
     """
     Get upcoming soccer matches for betting prediction analysis.
     
     Returns:
-        List of Match objects with id, homeTeam, awayTeam, and startTime (ISO 8601)
+        List of Match objects with id, homeTeam, awayTeam, and startTime (ISO 8601);
+        the X-Matches-Version header gives the version to pass to /matches/changes
         
     Raises:
         HTTPException: 500 if external API is unavailable or rate limited
@@ -43,6 +69,10 @@ async def get_matches(match_service: MatchService = Depends(get_match_service))
         logger.info("Fetching upcoming matches for prediction")
         matches = await match_service.get_upcoming_matches()
         
+        version = get_match_store().version
+        if version:
+            response.headers["X-Matches-Version"] = str(version)
+        
         if not matches:
             logger.warning("No upcoming matches available")
             return []
@@ -52,84 +82,367 @@ async def get_matches(match_service: MatchService = Depends(get_match_service))
         
     except Exception as e:
         logger.error(f"Error fetching matches: {e}")
+        raise _match_fetch_error(e)
+
+
+@router.get("/matches/changes", response_model=MatchChanges)
+async def get_match_changes(
+    since: int = Query(0, ge=0),
+    match_service: MatchService = Depends(get_match_service)
+) -> MatchChanges:
+    """
+    Matches added, changed and removed since a match list version.
+    
+    Args:
+        since: Version from X-Matches-Version or a previous call; 0 for a full list
         
-        # Handle specific error types
-        error_message = str(e)
-        if "rate limit" in error_message.lower():
-            raise HTTPException(
-                status_code=429, 
-                detail="Sports data service rate limit exceeded. Please try again in a few minutes."
-            )
-        elif "timeout" in error_message.lower():
-            raise HTTPException(
-                status_code=503, 
-                detail="Sports data service is temporarily slow. Please try again."
-            )
-        elif "unavailable" in error_message.lower():
-            raise HTTPException(
-                status_code=503, 
-                detail="Sports data service is temporarily unavailable. Please try again later."
-            )
-        else:
-            raise HTTPException(
-                status_code=500, 
-                detail="Unable to fetch match data. Please try again later."
+    Returns:
+        MatchChanges with the current version. When since is unknown or older
+        than the change log reaches, resync is set and matches holds the full list
+        
+    Raises:
+        HTTPException: 500/503 as for /matches when match data cannot be fetched
+    """
+    try:
+        matches = await match_service.get_upcoming_matches()
+    except Exception as e:
+        logger.error(f"Error fetching match changes: {e}")
+        raise _match_fetch_error(e)
+    
+    store = get_match_store()
+    changes = store.changes_since(since) if since else None
+    if changes is None:
+        return MatchChanges(version=store.version, resync=True, matches=matches)
+    return MatchChanges(**changes)
+
+
+def _match_fetch_error(e: Exception) -> HTTPException:
+    """Map a sports API failure to the HTTP error clients get."""
+    error_message = str(e)
+    if "rate limit" in error_message.lower():
+        return HTTPException(
+            status_code=429, 
+            detail="Sports data service rate limit exceeded. Please try again in a few minutes."
+        )
+    elif "timeout" in error_message.lower():
+        return HTTPException(
+            status_code=503, 
+            detail="Sports data service is temporarily slow. Please try again."
+        )
+    elif "unavailable" in error_message.lower():
+        return HTTPException(
+            status_code=503, 
+            detail="Sports data service is temporarily unavailable. Please try again later."
+        )
+    else:
+        return HTTPException(
+            status_code=500, 
+            detail="Unable to fetch match data. Please try again later."
+        )
+
+
+@router.get("/value-bets", response_model=List[ValueBet])
+async def get_value_bets(
+    limit: int = Query(VALUE_BET_CONFIG["DEFAULT_LIMIT"], ge=1, le=VALUE_BET_CONFIG["MAX_LIMIT"]),
+    match_service: MatchService = Depends(get_match_service),
+    prediction_service: PredictionService = Depends(get_prediction_service),
+    web_scraper: WebScraperService = Depends(get_web_scraper_service),
+    value_bet_service: ValueBetService = Depends(get_value_bet_service)
+) -> List[ValueBet]:
+    """
+    Rank the best value bets across every market of every upcoming match.
+    
+    Odds come from the odds store's current consensus; a match is only
+    scraped when no bookmaker price for it is recent enough.
+    
+    Args:
+        limit: Maximum number of bets to return, ordered by expected value
+        
+    Returns:
+        List of ValueBet with model and de-margined bookmaker probabilities,
+        expected value and a fractional Kelly stake
+        
+    Raises:
+        HTTPException: 500 if match data or odds cannot be retrieved
+    """
+    try:
+        matches = await match_service.get_upcoming_matches()
+        if not matches:
+            return []
+        
+        # Price from the odds already recorded; only matches without current odds are scraped
+        odds_store = get_odds_store()
+        odds_by_match = [odds_store.consensus(match.id) for match in matches]
+        missing = [index for index, odds in enumerate(odds_by_match) if not odds]
+        if missing:
+            # Warm team statistics for the whole slate once while scraping
+            teams = [team for match in matches for team in (match.homeTeam, match.awayTeam)]
+            scraped, _ = await asyncio.gather(
+                asyncio.gather(*(web_scraper.scrape_betting_odds(matches[index]) for index in missing)),
+                web_scraper.prefetch_teams(teams)
             )
+            for index, odds in zip(missing, scraped):
+                odds_by_match[index] = odds
+        
+        probabilities_by_match = await asyncio.gather(
+            *(prediction_service.estimate_market_probabilities(match) for match in matches)
+        )
+        
+        value_bets = value_bet_service.rank_value_bets(matches, odds_by_match, probabilities_by_match, limit)
+        logger.info(f"Ranked {len(value_bets)} value bets across {len(matches)} matches")
+        return value_bets
+        
+    except Exception as e:
+        logger.error(f"Error ranking value bets: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Unable to compute value bets. Please try again later."
+        )
+
+
+@router.get("/matches/{match_id}/odds")
+async def get_match_odds(match_id: str) -> Dict[str, Any]:
+    """
+    Aggregated bookmaker odds for a match.
+    
+    Args:
+        match_id: Match identifier
+        
+    Returns:
+        Best price and bookmaker per market, consensus price per market and
+        the consensus line movement of every market
+        
+    Raises:
+        HTTPException: 404 if no odds have been recorded for the match
+    """
+    odds_store = get_odds_store()
+    if not odds_store.snapshot_count(match_id):
+        raise HTTPException(status_code=404, detail=f"No odds recorded for match {match_id}")
+    
+    return {
+        "matchId": match_id,
+        "snapshots": odds_store.snapshot_count(match_id),
+        "bestPrice": odds_store.best_price(match_id),
+        "consensus": odds_store.consensus(match_id),
+        "lineMovement": {market: odds_store.line_movement(match_id, market) for market in ODDS_MARKETS}
+    }
+
+
+@router.get("/scrape-cache")
+async def get_scrape_cache_stats() -> Dict[str, Any]:
+    """
+    Report scraped-data cache effectiveness.
+    
+    Returns:
+        Per-section TTL, entry count, hit rate and data age
+    """
+    cache = get_scrape_cache()
+    return {"entries": len(cache), "sections": cache.stats()}
+
+
+async def _run_prediction(
+    request: PredictionRequest,
+    match_service: MatchService,
+    web_scraper: WebScraperService,
+    prediction_service: PredictionService,
+    timing: ServerTiming,
+    deadline: Deadline
+) -> PredictionResult:
+    """
+    Look up the match, scrape its data and build the prediction, timing each stage.
+    
+    Raises:
+        HTTPException: 400 if the match is not found
+    """
+    logger.info(f"Generating prediction for match {request.matchId} with risk level {request.riskLevel}")
+    
+    # Validate match exists
+    with timing.stage("match_fetch"):
+        matches = await match_service.get_upcoming_matches()
+    match = next((m for m in matches if m.id == request.matchId), None)
+    
+    if not match:
+        logger.warning(f"Match {request.matchId} not found")
+        raise HTTPException(
+            status_code=400,
+            detail=f"Match with ID {request.matchId} not found"
+        )
+    
+    # Scrape additional match data for AI analysis
+    with timing.stage("scrape"):
+        scraped_data = await web_scraper.scrape_match_data(match)
+    
+    # Generate AI prediction using all available data
+    with timing.stage("analysis"):
+        result = await prediction_service.generate_prediction(
+            match=match,
+            risk_level=request.riskLevel,
+            scraped_data=scraped_data
+        )
+    
+    if deadline.degraded_reasons:
+        result = result.model_copy(
+            update={"degraded": True, "degradedReasons": list(deadline.degraded_reasons)}
+        )
+    return result
 
 
 @router.post("/predict", response_model=PredictionResult)
 async def predict_match(
     request: PredictionRequest,
+    response: Response,
     match_service: MatchService = Depends(get_match_service),
     prediction_service: PredictionService = Depends(get_prediction_service),
-    web_scraper: WebScraperService = Depends(get_web_scraper_service)
+    web_scraper: WebScraperService = Depends(get_web_scraper_service),
+    admission: AdmissionController = Depends(get_admission_controller),
+    prediction_cache: PredictionCache = Depends(get_prediction_cache),
+    timeout_ms: Optional[int] = Header(None, alias=DEADLINE_CONFIG["HEADER"], ge=1)
 ) -> PredictionResult:
     """
     Generate AI betting prediction for a specific match and risk level.
     
+    The whole request runs under one deadline, from the X-Request-Timeout-Ms
+    header or the default budget. Each stage only gets the time that is
+    left; when it runs out the prediction is built from cached or partial
+    data and flagged as degraded instead of timing out. Stage durations
+    are reported in the Server-Timing header.
+    
+    Predictions needing upstream work go through admission control: a
+    bounded number run at once and a bounded queue waits for a slot. When
+    both are full, or the wait outlasts the queue timeout, the request is
+    shed with 503 and Retry-After. Recently cached predictions are served
+    without a slot.
+    
     Args:
         request: PredictionRequest containing matchId and riskLevel
+        timeout_ms: Optional latency budget in milliseconds
         
     Returns:
-        PredictionResult with betSuggestion, rationale, and riskLevel
+        PredictionResult with betSuggestion, rationale, riskLevel and
+        degradation flags
         
     Raises:
         HTTPException: 400 if matchId is invalid or not found
         HTTPException: 422 if riskLevel is invalid  
         HTTPException: 500 if prediction service fails
+        HTTPException: 503 if the service is saturated
     """
-    try:
-        logger.info(f"Generating prediction for match {request.matchId} with risk level {request.riskLevel}")
+    timing = ServerTiming()
+    with deadline_scope(Deadline.from_header(timeout_ms)) as deadline:
+        cached = await prediction_cache.get(request.matchId, request.riskLevel)
+        if cached is not None:
+            admission.note_exempt()
+            response.headers["Server-Timing"] = timing.header()
+            logger.info(f"Serving cached prediction for match {request.matchId} ({request.riskLevel})")
+            return cached
         
-        # Validate match exists
-        matches = await match_service.get_upcoming_matches()
-        match = next((m for m in matches if m.id == request.matchId), None)
-        
-        if not match:
-            logger.warning(f"Match {request.matchId} not found")
+        try:
+            async with admission.admit(timeout=deadline.remaining()) as waited:
+                timing.record("queue", waited)
+                result = await _run_prediction(
+                    request, match_service, web_scraper, prediction_service, timing, deadline
+                )
+            await prediction_cache.put(request.matchId, request.riskLevel, result)
+            
+            response.headers["Server-Timing"] = timing.header()
+            logger.info(f"Successfully generated prediction: {result.betSuggestion} ({deadline.elapsed():.2f}s)")
+            return result
+            
+        except AdmissionRejected as e:
+            raise HTTPException(
+                status_code=503,
+                detail="Prediction service is at capacity. Please try again shortly.",
+                headers={"Retry-After": str(e.retry_after)}
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error generating prediction: {e}")
             raise HTTPException(
-                status_code=400,
-                detail=f"Match with ID {request.matchId} not found"
+                status_code=500,
+                detail="Unable to generate prediction. Please try again later."
             )
+
+
+@router.post("/jobs", response_model=PredictionJob, status_code=202)
+async def submit_prediction_job(
+    request: PredictionRequest,
+    response: Response,
+    match_service: MatchService = Depends(get_match_service),
+    prediction_service: PredictionService = Depends(get_prediction_service),
+    web_scraper: WebScraperService = Depends(get_web_scraper_service),
+    prediction_cache: PredictionCache = Depends(get_prediction_cache),
+    job_queue: PredictionJobQueue = Depends(get_prediction_job_queue)
+) -> PredictionJob:
+    """
+    Queue a prediction and return its job id without waiting for it.
+    
+    Jobs run on an in-process worker pool under the longest deadline
+    budget, so slow scrapes finish instead of degrading. A job for a match
+    and risk level already queued or running is merged into it, and a
+    cached prediction completes the job immediately. Poll the URL in the
+    Location header for the result.
+    
+    Args:
+        request: PredictionRequest containing matchId and riskLevel
         
-        # Scrape additional match data for AI analysis
-        scraped_data = await web_scraper.scrape_match_data(match)
+    Returns:
+        PredictionJob with jobId and status
         
-        # Generate AI prediction using all available data
-        result = await prediction_service.generate_prediction(
-            match=match,
-            risk_level=request.riskLevel,
-            scraped_data=scraped_data
-        )
+    Raises:
+        HTTPException: 422 if riskLevel is invalid
+        HTTPException: 503 if too many jobs are pending
+    """
+    cached = await prediction_cache.get(request.matchId, request.riskLevel)
+    if cached is not None:
+        job = job_queue.complete(request.matchId, request.riskLevel, cached)
+    else:
+        async def work() -> PredictionResult:
+            with deadline_scope(Deadline(DEADLINE_CONFIG["MAX_BUDGET"])) as deadline:
+                try:
+                    result = await _run_prediction(
+                        request, match_service, web_scraper, prediction_service, ServerTiming(), deadline
+                    )
+                except HTTPException as e:
+                    raise RuntimeError(e.detail) from e
+                except Exception as e:
+                    logger.error(f"Error generating prediction: {e}")
+                    raise RuntimeError("Unable to generate prediction. Please try again later.") from e
+            await prediction_cache.put(request.matchId, request.riskLevel, result)
+            return result
         
-        logger.info(f"Successfully generated prediction: {result.betSuggestion}")
-        return result
+        try:
+            job = job_queue.submit(request.matchId, request.riskLevel, work)
+        except JobQueueFull as e:
+            logger.warning(f"Refusing prediction job: {e}")
+            raise HTTPException(
+                status_code=503,
+                detail="Too many prediction jobs pending. Please try again shortly.",
+                headers={"Retry-After": str(ADMISSION_CONFIG["MAX_RETRY_AFTER"])}
+            )
+    
+    response.headers["Location"] = f"{router.prefix}/jobs/{job.id}"
+    return job.view()
+
+
+@router.get("/jobs/{job_id}", response_model=PredictionJob)
+async def get_prediction_job(
+    job_id: str,
+    job_queue: PredictionJobQueue = Depends(get_prediction_job_queue)
+) -> PredictionJob:
+    """
+    Status of a prediction job, with its result once finished.
+    
+    Args:
+        job_id: Id returned by POST /prediction/jobs
         
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error generating prediction: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail="Unable to generate prediction. Please try again later."
-        )
\ No newline at end of file
+    Returns:
+        PredictionJob; result is set when succeeded, error when failed
+        
+    Raises:
+        HTTPException: 404 if the job is unknown or its result has expired
+    """
+    job = await job_queue.lookup(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Prediction job {job_id} not found or expired")
+    return job
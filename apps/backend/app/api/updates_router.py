@@ -0,0 +1,86 @@
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from typing import Any, Dict, List
+import asyncio
+import json
+import logging
+
+from ..services.update_hub import UPDATE_HUB_CONFIG, Subscriber, UpdateHub, get_update_hub, league_topic, match_topic
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["updates"])
+
+
+@router.websocket("/ws/updates")
+async def updates(websocket: WebSocket) -> None:
+    """
+    Push fixture and odds updates for the leagues and matches a client follows.
+
+    Clients send {"action": "subscribe" | "unsubscribe", "leagues": [...],
+    "matches": [...]}. League subscribers get match additions, changes and
+    removals; match subscribers also get that match's odds. When a slow
+    client's queue overflows it receives {"type": "dropped", "count": n}
+    and should catch up through /prediction/matches/changes.
+    """
+    hub = get_update_hub()
+    await websocket.accept()
+    subscriber = hub.connect()
+    writer = asyncio.create_task(_write_updates(websocket, subscriber))
+    reader = asyncio.create_task(_read_commands(websocket, hub, subscriber))
+    try:
+        await asyncio.wait({reader, writer}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in (reader, writer):
+            task.cancel()
+        await asyncio.gather(reader, writer, return_exceptions=True)
+        hub.disconnect(subscriber)
+
+
+async def _write_updates(websocket: WebSocket, subscriber: Subscriber) -> None:
+    """Send queued messages; a client that stops reading is disconnected."""
+    while True:
+        for message in await subscriber.drain():
+            try:
+                await asyncio.wait_for(websocket.send_text(message), UPDATE_HUB_CONFIG["SEND_TIMEOUT"])
+            except asyncio.TimeoutError:
+                logger.warning("Closing update connection blocked on a slow client")
+                await websocket.close(code=1008)
+                return
+
+
+async def _read_commands(websocket: WebSocket, hub: UpdateHub, subscriber: Subscriber) -> None:
+    """Apply subscribe and unsubscribe commands until the client disconnects."""
+    try:
+        while True:
+            try:
+                command = json.loads(await websocket.receive_text())
+                if not isinstance(command, dict):
+                    raise ValueError("command must be a JSON object")
+                topics = _command_topics(command)
+                action = command["action"]
+                if action not in ("subscribe", "unsubscribe"):
+                    raise ValueError(f"Unknown action {action}")
+            except (ValueError, KeyError, TypeError) as e:
+                subscriber.offer(json.dumps({"type": "error", "detail": f"Invalid command: {e}"}))
+                continue
+
+            if action == "subscribe":
+                requested = {topic for topic in topics if topic not in subscriber.topics}
+                if len(hub.subscribe(subscriber, topics)) < len(requested):
+                    subscriber.offer(json.dumps({
+                        "type": "error",
+                        "detail": f"Subscription limit of {hub.max_subscriptions} topics reached"
+                    }))
+            else:
+                hub.unsubscribe(subscriber, topics)
+            subscriber.offer(json.dumps({"type": "subscriptions", "topics": sorted(subscriber.topics)}))
+    except WebSocketDisconnect:
+        pass
+
+
+def _command_topics(command: Dict[str, Any]) -> List[str]:
+    leagues = command.get("leagues", [])
+    matches = command.get("matches", [])
+    if not isinstance(leagues, list) or not isinstance(matches, list):
+        raise TypeError("leagues and matches must be lists")
+    return [league_topic(str(league)) for league in leagues] + [match_topic(str(match)) for match in matches]
@@ -1,12 +1,143 @@
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+
+from .api.prediction_router import router as prediction_router, get_match_service, get_web_scraper_service
+from .api.metrics_router import router as metrics_router
+from .api.admin_router import router as admin_router
+from .api.updates_router import router as updates_router
+from .services.metrics import RequestMetricsMiddleware
+from .services.profiler import ProfilingMiddleware
+from .services.loop_watchdog import get_loop_watchdog, watchdog_enabled
+from .services.prediction_jobs import get_prediction_job_queue
+from .services.prediction_cache import get_prediction_cache
+from .services.deadline import Deadline, deadline_scope
+from .services.scrape_cache import get_scrape_cache
+from .services.team_stats_cache import get_team_stats_cache
+from .services.odds_store import get_odds_store
+from .services.match_service import MATCH_SERVICE_CONFIG, get_match_store
+from .services.html_extractor import get_html_extractor
+from .services.shared_cache import get_shared_cache
+from .services.update_hub import get_update_hub
+from .services.warmup import WARMUP_CONFIG, get_warmup_state, warmup_enabled
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_match_data():
+    """Load the upcoming match list, from the shared cache or upstream"""
+    with deadline_scope(Deadline(WARMUP_CONFIG["PHASE_TIMEOUT"])):
+        await get_match_service().get_upcoming_matches()
+
+async def warm_team_stats():
+    """Fetch statistics for every team of the upcoming slate"""
+    with deadline_scope(Deadline(WARMUP_CONFIG["PHASE_TIMEOUT"])):
+        matches = await get_match_service().get_upcoming_matches()
+        teams = [team for match in matches for team in (match.homeTeam, match.awayTeam)]
+        await get_web_scraper_service().prefetch_teams(teams)
+
+async def warm_caches():
+    """Restore on-disk caches and open the shared cache connection"""
+    for warm in (get_scrape_cache, get_team_stats_cache, get_odds_store, get_html_extractor, get_prediction_cache):
+        warm()
+    shared = get_shared_cache()
+    if shared is not None:
+        await shared.run(len, shared)
 
-from .api.prediction_router import router as prediction_router
+async def warm_schemas():
+    """Build the OpenAPI schema once instead of on the first /docs request"""
+    app.openapi()
+
+async def refresh_match_data(interval=MATCH_SERVICE_CONFIG["REFRESH_INTERVAL"]):
+    """Refresh the match list in the background, so subscribers hear of changes without any request"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            with deadline_scope(Deadline(MATCH_SERVICE_CONFIG["REQUEST_TIMEOUT"])):
+                await get_match_service().get_upcoming_matches()
+        except Exception as e:
+            logger.warning(f"Background match refresh failed: {e}")
+
+WARMUP_PHASES = [
+    ("caches", warm_caches),
+    ("match_data", warm_match_data),
+    ("team_stats", warm_team_stats),
+    ("schemas", warm_schemas)
+]
+
+_eviction_tasks = set()
+
+async def evict_started_predictions(match_ids):
+    prediction_cache = get_prediction_cache()
+    for match_id in match_ids:
+        await prediction_cache.evict_match(match_id)
+
+def evict_started_matches(match_ids, previous_version):
+    """Free what is held for matches that kicked off and tell their subscribers they are gone"""
+    scrape_cache, odds_store = get_scrape_cache(), get_odds_store()
+    for match_id in match_ids:
+        scrape_cache.evict_match(match_id)
+        odds_store.evict_match(match_id)
+    get_match_service().publish_changes(previous_version)
+    # Predictions may live in the shared cache, whose writes run off the event loop
+    try:
+        task = asyncio.get_running_loop().create_task(evict_started_predictions(match_ids))
+    except RuntimeError:
+        asyncio.run(evict_started_predictions(match_ids))
+        return
+    _eviction_tasks.add(task)
+    task.add_done_callback(_eviction_tasks.discard)
+
+get_match_store().on_expire(evict_started_matches)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background services, warm up without blocking liveness, then stop them on shutdown"""
+    # Watch this worker's event loop for blocking code
+    if watchdog_enabled():
+        get_loop_watchdog().start()
+    # One timer for the next kickoff drops started matches and their cached data
+    get_match_store().start_expiry()
+    # Pushed updates reach this worker's subscribers from whichever worker saw the change
+    get_update_hub().start_relay()
+    refresh_task = asyncio.create_task(refresh_match_data())
+    
+    warmup = get_warmup_state()
+    warmup_task = None
+    if warmup.ready:
+        # Warmed by the preforking parent; the data came with the fork
+        pass
+    elif warmup_enabled():
+        warmup_task = asyncio.create_task(warmup.run(WARMUP_PHASES))
+    else:
+        warmup.mark_ready()
+    
+    yield
+    
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+        await asyncio.gather(warmup_task, return_exceptions=True)
+    refresh_task.cancel()
+    await asyncio.gather(refresh_task, return_exceptions=True)
+    await get_update_hub().stop_relay()
+    # Unfinished prediction jobs are marked failed
+    await get_prediction_job_queue().stop()
+    get_match_store().stop_expiry()
+    get_loop_watchdog().stop()
 
 app = FastAPI(
     title="AI Soccer Betting Advisor API",
     description="Backend API for AI Soccer Betting Advisor MVP",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -16,10 +147,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Profile-Id"],
 )
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
 
 # Include routers
 app.include_router(prediction_router)
+app.include_router(metrics_router)
+app.include_router(admin_router)
+app.include_router(updates_router)
 
 @app.get("/")
 async def read_root():
@@ -28,5 +165,13 @@ async def read_root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "service": "AI Soccer Betting Advisor API"}
\ No newline at end of file
+    """Liveness check endpoint; use /ready to decide whether to route traffic"""
+    return {"status": "healthy", "service": "AI Soccer Betting Advisor API"}
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness check endpoint: 503 until warm-up has finished, with per-phase startup timings"""
+    warmup = get_warmup_state()
+    return JSONResponse(warmup.report(), status_code=200 if warmup.ready else 503)
+
+get_warmup_state().record_import(time.perf_counter() - _import_started)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 
 
 class Match(BaseModel):
@@ -23,6 +23,38 @@ class Match(BaseModel):
     startTime: str  # ISO 8601 format
 
 
+class MatchChanges(BaseModel):
+    """
+    Response model for incremental match list sync.
+    """
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "version": 1755600000000,
+                "resync": False,
+                "added": [
+                    {
+                        "id": "2274672",
+                        "homeTeam": "Arsenal",
+                        "awayTeam": "Chelsea",
+                        "startTime": "2025-08-20T15:00:00+00:00"
+                    }
+                ],
+                "changed": [],
+                "removed": ["2274650"],
+                "matches": None
+            }
+        }
+    )
+    
+    version: int  # Pass as since on the next call
+    resync: bool = False  # The since version is unknown or too old; matches holds the full list
+    added: List[Match] = []
+    changed: List[Match] = []
+    removed: List[str] = []  # Ids of matches no longer upcoming
+    matches: Optional[List[Match]] = None
+
+
 class PredictionRequest(BaseModel):
     """
     Request model for prediction endpoint.
@@ -49,11 +81,76 @@ class PredictionResult(BaseModel):
             "example": {
                 "betSuggestion": "Liverpool to win",
                 "rationale": "Liverpool has a strong home record and Manchester City is missing key players.",
-                "riskLevel": "Medium"
+                "riskLevel": "Medium",
+                "degraded": True,
+                "degradedReasons": ["betting_odds:late", "betting_odds:stale"]
             }
         }
     )
     
     betSuggestion: str
     rationale: str
-    riskLevel: Literal["Low", "Medium", "High"]
\ No newline at end of file
+    riskLevel: Literal["Low", "Medium", "High"]
+    # Set when the request deadline forced cached, stale or partial input data
+    degraded: bool = False
+    degradedReasons: List[str] = []
+
+
+class PredictionJob(BaseModel):
+    """
+    Response model for an asynchronous prediction job.
+    """
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "jobId": "5f0c8d6e4b8a4f2f9d1c3e7a2b6d9f10",
+                "status": "succeeded",
+                "matchId": "2274671",
+                "riskLevel": "Medium",
+                "result": {
+                    "betSuggestion": "Liverpool to win",
+                    "rationale": "Liverpool has a strong home record and Manchester City is missing key players.",
+                    "riskLevel": "Medium"
+                },
+                "error": None
+            }
+        }
+    )
+    
+    jobId: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    matchId: str
+    riskLevel: Literal["Low", "Medium", "High"]
+    result: Optional[PredictionResult] = None  # Set once the job has succeeded
+    error: Optional[str] = None  # Set once the job has failed
+
+
+class ValueBet(BaseModel):
+    """
+    Response model for a single ranked value bet.
+    """
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "matchId": "2274671",
+                "homeTeam": "Liverpool",
+                "awayTeam": "Manchester City",
+                "market": "home_win",
+                "odds": 2.4,
+                "modelProbability": 0.48,
+                "impliedProbability": 0.4,
+                "expectedValue": 0.152,
+                "kellyStake": 0.027
+            }
+        }
+    )
+    
+    matchId: str
+    homeTeam: str
+    awayTeam: str
+    market: str
+    odds: float
+    modelProbability: float
+    impliedProbability: float  # Bookmaker probability with the overround removed
+    expectedValue: float  # Expected profit per unit staked
+    kellyStake: float  # Fraction of bankroll to stake
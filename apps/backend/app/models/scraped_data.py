@@ -0,0 +1,439 @@
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Form results stored as small int codes instead of "W"/"D"/"L" strings
+RESULT_CODES = {"W": 0, "D": 1, "L": 2}
+RESULT_LABELS = ("W", "D", "L")
+
+# Scraped odds keys mapped onto BettingOdds fields
+ODDS_FIELD_ALIASES = {
+    "over_2_5_goals": "over_2_5",
+    "under_2_5_goals": "under_2_5",
+    "both_teams_score_yes": "btts_yes",
+    "both_teams_score_no": "btts_no"
+}
+
+
+def intern_name(name: Optional[str]) -> Optional[str]:
+    """
+    Intern a team, player or other repeated name.
+
+    The same team appears across every match, form table and head-to-head
+    list, so all of them share one string object.
+    """
+    return sys.intern(name.strip()) if name is not None else None
+
+
+def parse_score(score: str) -> Tuple[int, int]:
+    """Parse a "2-1" style score into (first, second) goals."""
+    first, _, second = score.partition("-")
+    return int(first), int(second)
+
+
+class CompactRecord:
+    """
+    Base for slotted scraped-data records.
+
+    Subclasses list their fields in __slots__; equality and repr follow the
+    slots. Records are converted to plain dicts only at the API and
+    persistence boundaries via to_dict().
+    """
+
+    __slots__ = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: _plain(getattr(self, name)) for name in self.__slots__}
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, CompactRecord):
+        return value.to_dict()
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+
+class FormResult(CompactRecord):
+    """One recent match of a team: opponent, result code and score."""
+
+    __slots__ = ("opponent", "result", "goals_for", "goals_against")
+
+    def __init__(self, opponent: str, result: int, goals_for: int, goals_against: int):
+        self.opponent = intern_name(opponent)
+        self.result = result
+        self.goals_for = goals_for
+        self.goals_against = goals_against
+
+    @property
+    def result_label(self) -> str:
+        return RESULT_LABELS[self.result]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FormResult":
+        goals_for, goals_against = parse_score(data["score"])
+        return cls(data["opponent"], RESULT_CODES[data["result"]], goals_for, goals_against)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "opponent": self.opponent,
+            "result": self.result_label,
+            "score": f"{self.goals_for}-{self.goals_against}"
+        }
+
+
+class MatchStatistics(CompactRecord):
+    """Recent form of both teams and their goal totals over the last five games."""
+
+    __slots__ = (
+        "home_recent_form", "away_recent_form",
+        "home_goals_scored_last_5", "home_goals_conceded_last_5",
+        "away_goals_scored_last_5", "away_goals_conceded_last_5"
+    )
+
+    def __init__(
+        self,
+        home_recent_form: Iterable[FormResult] = (),
+        away_recent_form: Iterable[FormResult] = (),
+        home_goals_scored_last_5: Optional[int] = None,
+        home_goals_conceded_last_5: Optional[int] = None,
+        away_goals_scored_last_5: Optional[int] = None,
+        away_goals_conceded_last_5: Optional[int] = None
+    ):
+        self.home_recent_form = tuple(home_recent_form)
+        self.away_recent_form = tuple(away_recent_form)
+        self.home_goals_scored_last_5 = home_goals_scored_last_5
+        self.home_goals_conceded_last_5 = home_goals_conceded_last_5
+        self.away_goals_scored_last_5 = away_goals_scored_last_5
+        self.away_goals_conceded_last_5 = away_goals_conceded_last_5
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MatchStatistics":
+        return cls(
+            home_recent_form=[FormResult.from_dict(game) for game in data.get("home_recent_form", [])],
+            away_recent_form=[FormResult.from_dict(game) for game in data.get("away_recent_form", [])],
+            home_goals_scored_last_5=data.get("home_goals_scored_last_5"),
+            home_goals_conceded_last_5=data.get("home_goals_conceded_last_5"),
+            away_goals_scored_last_5=data.get("away_goals_scored_last_5"),
+            away_goals_conceded_last_5=data.get("away_goals_conceded_last_5")
+        )
+
+
+class Injury(CompactRecord):
+    """Availability report for one player."""
+
+    __slots__ = ("player", "status", "injury")
+
+    def __init__(self, player: str, status: str, injury: str):
+        self.player = intern_name(player)
+        self.status = intern_name(status)
+        self.injury = intern_name(injury)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Injury":
+        return cls(data["player"], data["status"], data["injury"])
+
+
+class TeamNews(CompactRecord):
+    """Injuries and suspensions of both teams."""
+
+    __slots__ = ("home_injuries", "away_injuries", "home_suspensions", "away_suspensions")
+
+    def __init__(
+        self,
+        home_injuries: Iterable[Injury] = (),
+        away_injuries: Iterable[Injury] = (),
+        home_suspensions: Iterable[str] = (),
+        away_suspensions: Iterable[str] = ()
+    ):
+        self.home_injuries = tuple(home_injuries)
+        self.away_injuries = tuple(away_injuries)
+        self.home_suspensions = tuple(intern_name(player) for player in home_suspensions)
+        self.away_suspensions = tuple(intern_name(player) for player in away_suspensions)
+
+    def injury_reports(self) -> List[Injury]:
+        return list(self.home_injuries + self.away_injuries)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TeamNews":
+        return cls(
+            home_injuries=[Injury.from_dict(injury) for injury in data.get("home_injuries", [])],
+            away_injuries=[Injury.from_dict(injury) for injury in data.get("away_injuries", [])],
+            home_suspensions=data.get("home_suspensions", []),
+            away_suspensions=data.get("away_suspensions", [])
+        )
+
+
+class Meeting(CompactRecord):
+    """One past meeting of the two teams."""
+
+    __slots__ = ("date", "home", "away", "home_goals", "away_goals")
+
+    def __init__(self, date: str, home: str, away: str, home_goals: int, away_goals: int):
+        self.date = date
+        self.home = intern_name(home)
+        self.away = intern_name(away)
+        self.home_goals = home_goals
+        self.away_goals = away_goals
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Meeting":
+        home_goals, away_goals = parse_score(data["score"])
+        return cls(data["date"], data["home"], data["away"], home_goals, away_goals)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "date": self.date,
+            "home": self.home,
+            "away": self.away,
+            "score": f"{self.home_goals}-{self.away_goals}"
+        }
+
+
+class HeadToHead(CompactRecord):
+    """Recent meetings and the overall head-to-head record."""
+
+    __slots__ = ("last_5_h2h", "home_wins", "away_wins", "draws")
+
+    def __init__(
+        self,
+        last_5_h2h: Iterable[Meeting] = (),
+        home_wins: Optional[int] = None,
+        away_wins: Optional[int] = None,
+        draws: Optional[int] = None
+    ):
+        self.last_5_h2h = tuple(last_5_h2h)
+        self.home_wins = home_wins
+        self.away_wins = away_wins
+        self.draws = draws
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HeadToHead":
+        return cls(
+            last_5_h2h=[Meeting.from_dict(meeting) for meeting in data.get("last_5_h2h", [])],
+            home_wins=data.get("home_wins"),
+            away_wins=data.get("away_wins"),
+            draws=data.get("draws")
+        )
+
+
+class BettingOdds(CompactRecord):
+    """Decimal odds per market; markets without a price are None."""
+
+    __slots__ = ("home_win", "draw", "away_win", "over_2_5", "under_2_5", "btts_yes", "btts_no")
+
+    def __init__(self, **odds: Optional[float]):
+        for name in self.__slots__:
+            setattr(self, name, odds.pop(name, None))
+        if odds:
+            raise TypeError(f"Unknown betting markets: {', '.join(odds)}")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BettingOdds":
+        odds = {}
+        for key, price in data.items():
+            field = ODDS_FIELD_ALIASES.get(key, key)
+            if field in cls.__slots__:
+                odds[field] = price
+        return cls(**odds)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {name: getattr(self, name) for name in self.__slots__ if getattr(self, name) is not None}
+
+
+class WeatherConditions(CompactRecord):
+    """Forecast at the stadium."""
+
+    __slots__ = ("temperature", "condition", "precipitation_chance", "wind_speed")
+
+    def __init__(
+        self,
+        temperature: Optional[int] = None,
+        condition: Optional[str] = None,
+        precipitation_chance: Optional[int] = None,
+        wind_speed: Optional[int] = None
+    ):
+        self.temperature = temperature
+        self.condition = intern_name(condition)
+        self.precipitation_chance = precipitation_chance
+        self.wind_speed = wind_speed
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WeatherConditions":
+        return cls(**{name: data.get(name) for name in cls.__slots__})
+
+
+class ExpertPrediction(CompactRecord):
+    """A published tip and its stated confidence."""
+
+    __slots__ = ("source", "prediction", "confidence")
+
+    def __init__(self, source: str, prediction: str, confidence: int):
+        self.source = intern_name(source)
+        self.prediction = prediction
+        self.confidence = confidence
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExpertPrediction":
+        return cls(data["source"], data["prediction"], data["confidence"])
+
+
+class StadiumInfo(CompactRecord):
+    """Venue details and the home side's record there this season."""
+
+    __slots__ = ("name", "capacity", "surface", "home_wins", "home_draws", "home_losses")
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        capacity: Optional[int] = None,
+        surface: Optional[str] = None,
+        home_wins: Optional[int] = None,
+        home_draws: Optional[int] = None,
+        home_losses: Optional[int] = None
+    ):
+        self.name = intern_name(name)
+        self.capacity = capacity
+        self.surface = intern_name(surface)
+        self.home_wins = home_wins
+        self.home_draws = home_draws
+        self.home_losses = home_losses
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StadiumInfo":
+        record = data.get("home_record_this_season", {})
+        return cls(
+            name=data.get("name"),
+            capacity=data.get("capacity"),
+            surface=data.get("surface"),
+            home_wins=record.get("wins"),
+            home_draws=record.get("draws"),
+            home_losses=record.get("losses")
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "capacity": self.capacity,
+            "surface": self.surface,
+            "home_record_this_season": {
+                "wins": self.home_wins,
+                "draws": self.home_draws,
+                "losses": self.home_losses
+            }
+        }
+
+
+# Record type of each scraped section; expert predictions are a tuple of records
+SECTION_TYPES = {
+    "match_statistics": MatchStatistics,
+    "team_news": TeamNews,
+    "head_to_head": HeadToHead,
+    "betting_odds": BettingOdds,
+    "weather_conditions": WeatherConditions,
+    "expert_predictions": ExpertPrediction,
+    "stadium_info": StadiumInfo
+}
+
+
+def section_from_dict(section: str, value: Any) -> Any:
+    """
+    Build the typed record of a scraped section from its plain form.
+
+    Values that are already typed, and sections without a record type
+    (team statistics), are returned unchanged.
+    """
+    record_type = SECTION_TYPES.get(section)
+    if record_type is None or isinstance(value, (CompactRecord, tuple)):
+        return value
+    if section == "expert_predictions":
+        return tuple(record_type.from_dict(item) for item in value)
+    return record_type.from_dict(value) if value else None
+
+
+class ScrapedMatchData(CompactRecord):
+    """
+    Scraped data for one match.
+
+    Sections that could not be scraped are None (expert predictions: an
+    empty tuple). team_statistics holds the shared per-team statistics
+    dicts from the team cache, keyed "home" and "away".
+    """
+
+    __slots__ = (
+        "match_statistics", "team_news", "head_to_head", "betting_odds",
+        "weather_conditions", "expert_predictions", "stadium_info",
+        "team_statistics", "scraping_status", "source_status", "cached_sections", "stale_sections"
+    )
+
+    def __init__(
+        self,
+        match_statistics: Optional[MatchStatistics] = None,
+        team_news: Optional[TeamNews] = None,
+        head_to_head: Optional[HeadToHead] = None,
+        betting_odds: Optional[BettingOdds] = None,
+        weather_conditions: Optional[WeatherConditions] = None,
+        expert_predictions: Iterable[ExpertPrediction] = (),
+        stadium_info: Optional[StadiumInfo] = None,
+        team_statistics: Optional[Dict[str, Dict[str, Any]]] = None,
+        scraping_status: str = "failed",
+        source_status: Optional[Dict[str, str]] = None,
+        cached_sections: Iterable[str] = (),
+        stale_sections: Iterable[str] = ()
+    ):
+        self.match_statistics = match_statistics
+        self.team_news = team_news
+        self.head_to_head = head_to_head
+        self.betting_odds = betting_odds
+        self.weather_conditions = weather_conditions
+        self.expert_predictions = tuple(expert_predictions)
+        self.stadium_info = stadium_info
+        self.team_statistics = team_statistics or {"home": {}, "away": {}}
+        self.scraping_status = scraping_status
+        self.source_status = source_status or {}
+        self.cached_sections = list(cached_sections)
+        # Sections served past their TTL because their source did not deliver in time
+        self.stale_sections = list(stale_sections)
+
+    def set_section(self, section: str, value: Any) -> None:
+        """Set a scraped section from its typed or plain form."""
+        if section not in SECTION_TYPES and section != "team_statistics":
+            raise KeyError(section)
+        value = section_from_dict(section, value)
+        if section == "expert_predictions":
+            value = value or ()
+        setattr(self, section, value)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScrapedMatchData":
+        scraped = cls(
+            team_statistics=data.get("team_statistics"),
+            scraping_status=data.get("scraping_status", "complete"),
+            source_status=data.get("source_status"),
+            cached_sections=data.get("cached_sections", ()),
+            stale_sections=data.get("stale_sections", ())
+        )
+        for section in SECTION_TYPES:
+            if data.get(section):
+                scraped.set_section(section, data[section])
+        return scraped
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {}
+        for section in SECTION_TYPES:
+            value = getattr(self, section)
+            data[section] = _plain(value) if value is not None else {}
+        data["team_statistics"] = self.team_statistics
+        data["scraping_status"] = self.scraping_status
+        data["source_status"] = dict(self.source_status)
+        data["cached_sections"] = list(self.cached_sections)
+        data["stale_sections"] = list(self.stale_sections)
+        return data
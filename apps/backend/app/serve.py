@@ -0,0 +1,307 @@
+"""
+Production server: a preforking supervisor around uvicorn workers.
+
+The parent imports the app and warms shared data once, binds the
+listening socket, then forks the workers, so the code and warmed caches
+sit in copy-on-write pages shared by every worker. uvloop and httptools
+are used when installed.
+
+Run from apps/backend:
+
+    python -m app.serve
+    python -m app.serve --workers 8 --port 8080
+
+Signals to the parent:
+    SIGTERM, SIGINT  graceful shutdown: workers finish in-flight requests
+    SIGHUP           rolling restart, one worker at a time (recycles workers;
+                     code changes need a full restart, as the app is preloaded)
+    SIGTTIN, SIGTTOU add or remove a worker
+"""
+import argparse
+import asyncio
+import gc
+import importlib.util
+import logging
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+
+logger = logging.getLogger("app.serve")
+
+# Configuration constants
+SERVE_CONFIG = {
+    "WORKERS_ENV": "WEB_CONCURRENCY",  # Defaults to one worker per core
+    "HOST_ENV": "HOST",
+    "DEFAULT_HOST": "0.0.0.0",
+    "PORT_ENV": "PORT",
+    "DEFAULT_PORT": 8000,
+    "BACKLOG": 2048,  # Pending connections the kernel queues while workers are busy
+    # Longer than a load balancer's idle timeout (typically 60s), so the proxy closes idle connections first
+    "KEEP_ALIVE": 65,
+    "GRACEFUL_TIMEOUT": 30,  # Seconds a stopping worker gets to finish in-flight requests
+    "MAX_REQUESTS": 0,  # Recycle a worker after this many requests; 0 never recycles
+    "MAX_REQUESTS_JITTER": 0.1,  # Spread recycling so workers don't restart together
+    "RESPAWN_BACKOFF_MAX": 10.0  # Longest delay before replacing a worker that keeps crashing
+}
+
+
+SUPERVISOR_SIGNALS = (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGTTIN, signal.SIGTTOU, signal.SIGCHLD)
+
+
+def select_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def select_http() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def preload_app() -> Any:
+    """
+    Import the app and warm process-wide state before forking.
+
+    Everything built here is shared copy-on-write by the workers: imported
+    modules, pydantic validators, the OpenAPI schema, caches restored from
+    disk and, unless warm-up is disabled, the match list and team
+    statistics. Workers inherit the finished warm-up and are ready at once
+    instead of each repeating the upstream fetches.
+    """
+    from .main import WARMUP_PHASES, app
+    from .services.match_service import get_match_store
+    from .services.shared_cache import get_shared_cache
+    from .services.warmup import get_warmup_state, warmup_enabled
+
+    started = time.perf_counter()
+    get_match_store()
+    if warmup_enabled():
+        asyncio.run(get_warmup_state().run(WARMUP_PHASES))
+    else:
+        app.openapi()
+    # SQLite connections and threads must not cross the fork; each worker opens its own
+    shared = get_shared_cache()
+    if shared is not None:
+        shared.close()
+    logger.info(f"Preloaded app in {time.perf_counter() - started:.2f}s")
+    return app
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Supervisor:
+    """
+    Forks uvicorn workers sharing one listening socket and keeps them running.
+
+    Workers that exit unexpectedly are replaced, with a growing delay when
+    they keep crashing. Stopping a worker sends SIGTERM so uvicorn drains
+    its connections, then SIGKILL once the graceful timeout has passed.
+    """
+
+    def __init__(self, app: Any, sock: socket.socket, workers: int, options: Dict[str, Any]):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.options = options
+        self.children: Dict[int, float] = {}  # pid -> started at
+        self._signals: List[int] = []
+        self._stopping = False
+        self._crashes = 0
+        self._respawn_after = 0.0  # Monotonic time before which crashed workers are not replaced
+
+    def spawn(self) -> int:
+        pid = os.fork()
+        if pid:
+            self.children[pid] = time.monotonic()
+            return pid
+
+        # Worker process: drop the supervisor's handlers, so uvicorn installs its own
+        for sig in SUPERVISOR_SIGNALS:
+            signal.signal(sig, signal.SIG_DFL)
+        exit_code = 0
+        try:
+            self._serve()
+        except BaseException:
+            logger.exception("Worker crashed")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _serve(self) -> None:
+        max_requests = self.options["max_requests"]
+        if max_requests:
+            jitter = int(max_requests * SERVE_CONFIG["MAX_REQUESTS_JITTER"])
+            max_requests += random.randint(0, jitter)
+        config = uvicorn.Config(
+            self.app,
+            loop=self.options["loop"],
+            http=self.options["http"],
+            backlog=self.options["backlog"],
+            timeout_keep_alive=self.options["keep_alive"],
+            timeout_graceful_shutdown=self.options["graceful_timeout"],
+            limit_max_requests=max_requests or None,
+            log_level=self.options["log_level"],
+            access_log=self.options["access_log"]
+        )
+        uvicorn.Server(config).run(sockets=[self.sock])
+
+    def stop_worker(self, pid: int, timeout: Optional[float] = None) -> None:
+        """SIGTERM a worker and wait for it, escalating to SIGKILL after the graceful timeout."""
+        timeout = self.options["graceful_timeout"] if timeout is None else timeout
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            self.children.pop(pid, None)
+            return
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if os.waitpid(pid, os.WNOHANG)[0] == pid:
+                self.children.pop(pid, None)
+                return
+            time.sleep(0.1)
+        logger.warning(f"Worker {pid} did not stop within {timeout}s, killing it")
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+        self.children.pop(pid, None)
+
+    def rolling_restart(self) -> None:
+        """Replace workers one by one; a replacement starts before the old worker stops."""
+        for pid in list(self.children):
+            self.spawn()
+            self.stop_worker(pid)
+        logger.info(f"Restarted {self.workers} workers")
+
+    def reap(self) -> None:
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.children.clear()
+                return
+            if pid == 0:
+                return
+            started = self.children.pop(pid, None)
+            if started is None or self._stopping:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if code == 0:
+                # Recycled after max requests
+                self._crashes = 0
+            else:
+                # Back off when workers die soon after starting
+                self._crashes = self._crashes + 1 if time.monotonic() - started < 5 else 1
+                delay = min(2 ** (self._crashes - 1) * 0.1, SERVE_CONFIG["RESPAWN_BACKOFF_MAX"])
+                logger.warning(f"Worker {pid} exited with {code}, replacing it in {delay:.1f}s")
+                # Checked by the supervisor loop, which keeps handling signals meanwhile
+                self._respawn_after = max(self._respawn_after, time.monotonic() + delay)
+
+    def _on_signal(self, signum, frame) -> None:
+        self._signals.append(signum)
+
+    def run(self) -> None:
+        for sig in SUPERVISOR_SIGNALS:
+            signal.signal(sig, self._on_signal)
+
+        # Keep preloaded objects out of the collector, so gc passes in the
+        # workers don't write to (and un-share) the inherited pages
+        gc.freeze()
+        for _ in range(self.workers):
+            self.spawn()
+        logger.info(
+            f"Serving on {self.sock.getsockname()} with {self.workers} workers "
+            f"(loop={self.options['loop']}, http={self.options['http']})"
+        )
+
+        while True:
+            while self._signals:
+                signum = self._signals.pop(0)
+                if signum in (signal.SIGTERM, signal.SIGINT):
+                    self.shutdown()
+                    return
+                if signum == signal.SIGHUP:
+                    self.rolling_restart()
+                elif signum == signal.SIGTTIN:
+                    self.workers += 1
+                elif signum == signal.SIGTTOU and self.workers > 1:
+                    self.workers -= 1
+            self.reap()
+            if time.monotonic() >= self._respawn_after:
+                while len(self.children) < self.workers:
+                    self.spawn()
+            while len(self.children) > self.workers:
+                self.stop_worker(max(self.children, key=self.children.get))
+            time.sleep(0.5)
+
+    def shutdown(self) -> None:
+        self._stopping = True
+        logger.info(f"Stopping {len(self.children)} workers")
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.children.pop(pid, None)
+        deadline = time.monotonic() + self.options["graceful_timeout"]
+        while self.children and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for pid in list(self.children):
+            logger.warning(f"Worker {pid} did not stop in time, killing it")
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self.children.clear()
+        self.sock.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.environ.get(SERVE_CONFIG["HOST_ENV"], SERVE_CONFIG["DEFAULT_HOST"]))
+    parser.add_argument("--port", type=int, default=int(os.environ.get(SERVE_CONFIG["PORT_ENV"], SERVE_CONFIG["DEFAULT_PORT"])))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get(SERVE_CONFIG["WORKERS_ENV"], os.cpu_count() or 1)))
+    parser.add_argument("--backlog", type=int, default=SERVE_CONFIG["BACKLOG"])
+    parser.add_argument("--keep-alive", type=int, default=SERVE_CONFIG["KEEP_ALIVE"])
+    parser.add_argument("--graceful-timeout", type=int, default=SERVE_CONFIG["GRACEFUL_TIMEOUT"])
+    parser.add_argument("--max-requests", type=int, default=SERVE_CONFIG["MAX_REQUESTS"])
+    parser.add_argument("--loop", choices=["auto", "uvloop", "asyncio"], default="auto")
+    parser.add_argument("--http", choices=["auto", "httptools", "h11"], default="auto")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--no-access-log", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s [%(process)d] %(levelname)s %(name)s: %(message)s")
+    options = {
+        "loop": select_loop() if args.loop == "auto" else args.loop,
+        "http": select_http() if args.http == "auto" else args.http,
+        "backlog": args.backlog,
+        "keep_alive": args.keep_alive,
+        "graceful_timeout": args.graceful_timeout,
+        "max_requests": args.max_requests,
+        "log_level": args.log_level,
+        "access_log": not args.no_access_log
+    }
+
+    app = preload_app()
+    from .services.shared_cache import get_shared_cache
+    if args.workers > 1 and get_shared_cache() is None:
+        logger.warning(
+            "Shared cache disabled with several workers: prediction jobs can only be polled on the worker "
+            "that accepted them, and pushed updates only reach subscribers of the worker that saw the change"
+        )
+    sock = bind_socket(args.host, args.port, args.backlog)
+    Supervisor(app, sock, max(args.workers, 1), options).run()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
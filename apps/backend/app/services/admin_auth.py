@@ -0,0 +1,28 @@
+import hmac
+import os
+from typing import Optional
+
+# Configuration constants
+ADMIN_CONFIG = {
+    "TOKEN_ENV": "ADMIN_TOKEN",  # Shared secret for admin endpoints and triggers
+    "ALLOW_UNAUTHENTICATED_ENV": "ADMIN_ALLOW_UNAUTHENTICATED",  # "1" opens admin access without a token, for local development
+    "HEADER": "X-Admin-Token"
+}
+
+
+def admin_token() -> Optional[str]:
+    """The configured admin token, None when none is set."""
+    return os.environ.get(ADMIN_CONFIG["TOKEN_ENV"]) or None
+
+
+def admin_authorized(token: Optional[str]) -> bool:
+    """
+    Check a presented admin token.
+
+    Without a configured ADMIN_TOKEN nobody is an admin, unless
+    ADMIN_ALLOW_UNAUTHENTICATED=1 opts a local development setup in.
+    """
+    expected = admin_token()
+    if expected is None:
+        return os.environ.get(ADMIN_CONFIG["ALLOW_UNAUTHENTICATED_ENV"]) == "1"
+    return token is not None and hmac.compare_digest(token, expected)
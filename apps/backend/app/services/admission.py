@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional
+
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+ADMISSION_CONFIG = {
+    "MAX_CONCURRENT_ENV": "PREDICT_MAX_CONCURRENT",
+    "DEFAULT_MAX_CONCURRENT": 16,  # Predictions doing upstream work at once
+    "MAX_QUEUE_ENV": "PREDICT_MAX_QUEUE",
+    "DEFAULT_MAX_QUEUE": 64,  # Requests allowed to wait for a slot; beyond that they are shed
+    "QUEUE_TIMEOUT": 2.0,  # Longest wait for a slot, further capped by the request deadline
+    "SERVICE_TIME_ALPHA": 0.2,  # Smoothing of the service time estimate behind Retry-After
+    "MIN_RETRY_AFTER": 1,
+    "MAX_RETRY_AFTER": 30
+}
+
+ADMISSION_SHED = REGISTRY.counter(
+    "prediction_shed_total", "Predictions rejected with 503 by admission control, by reason", ("reason",)
+)
+ADMISSION_WAIT = REGISTRY.histogram(
+    "prediction_queue_wait_seconds", "Time admitted predictions waited for a slot",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Request shed: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Concurrency limiter with a bounded FIFO wait queue.
+
+    At most `max_concurrent` holders run at once. Up to `max_queue` more
+    wait in arrival order for a slot; a request arriving to a full queue,
+    or waiting longer than its timeout, is rejected straight away so a
+    spike sheds load instead of slowing every request down.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = ADMISSION_CONFIG["DEFAULT_MAX_CONCURRENT"],
+        max_queue: int = ADMISSION_CONFIG["DEFAULT_MAX_QUEUE"],
+        queue_timeout: float = ADMISSION_CONFIG["QUEUE_TIMEOUT"],
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._clock = clock
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # Smoothed seconds a holder keeps its slot
+        self.service_time: Optional[float] = None
+        self.admitted = 0
+        self.exempt = 0
+        self.shed: Dict[str, int] = {"queue_full": 0, "queue_timeout": 0}
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    def retry_after(self) -> int:
+        """
+        Seconds a shed client should wait: the time to drain the current queue.
+        """
+        service_time = self.service_time or self.queue_timeout
+        drain = service_time * (self.queued + 1) / max(self.max_concurrent, 1)
+        return int(min(max(math.ceil(drain), ADMISSION_CONFIG["MIN_RETRY_AFTER"]), ADMISSION_CONFIG["MAX_RETRY_AFTER"]))
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        self.shed[reason] += 1
+        ADMISSION_SHED.inc(reason=reason)
+        logger.warning(f"Shedding prediction request ({reason}): {self.active} active, {self.queued} queued")
+        return AdmissionRejected(reason, self.retry_after())
+
+    async def acquire(self, timeout: Optional[float] = None) -> float:
+        """
+        Wait for a slot.
+
+        Args:
+            timeout: Longest wait, capped at the configured queue timeout
+
+        Returns:
+            Seconds spent queued
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait timed out
+        """
+        if self.active < self.max_concurrent and not self.queued:
+            self.active += 1
+            self.admitted += 1
+            ADMISSION_WAIT.observe(0.0)
+            return 0.0
+        if self.queued >= self.max_queue:
+            raise self._reject("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started = self._clock()
+        wait = self.queue_timeout if timeout is None else min(timeout, self.queue_timeout)
+        try:
+            # A slot handed over is passed through the future; active stays counted
+            await asyncio.wait_for(waiter, max(wait, 0.0))
+        except asyncio.TimeoutError:
+            raise self._reject("queue_timeout")
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                self._discard(waiter)
+        waited = self._clock() - started
+        self.admitted += 1
+        ADMISSION_WAIT.observe(waited)
+        return waited
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self, held_for: Optional[float] = None) -> None:
+        """Free a slot, handing it to the longest-waiting request if any."""
+        if held_for is not None:
+            alpha = ADMISSION_CONFIG["SERVICE_TIME_ALPHA"]
+            self.service_time = held_for if self.service_time is None else (
+                alpha * held_for + (1 - alpha) * self.service_time
+            )
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def admit(self, timeout: Optional[float] = None) -> AsyncIterator[float]:
+        """
+        Hold a slot for the duration of the block.
+
+        Yields:
+            Seconds spent queued before admission
+        """
+        waited = await self.acquire(timeout)
+        started = self._clock()
+        try:
+            yield waited
+        finally:
+            self.release(self._clock() - started)
+
+    def note_exempt(self) -> None:
+        """Count a request served without a slot because its result was cached."""
+        self.exempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "exempt": self.exempt,
+            "shed": dict(self.shed),
+            "service_time_seconds": round(self.service_time, 4) if self.service_time is not None else None
+        }
+
+
+_admission_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Return the process-wide admission controller for prediction work."""
+    global _admission_controller
+    if _admission_controller is None:
+        _admission_controller = AdmissionController(
+            max_concurrent=int(os.environ.get(
+                ADMISSION_CONFIG["MAX_CONCURRENT_ENV"], ADMISSION_CONFIG["DEFAULT_MAX_CONCURRENT"]
+            )),
+            max_queue=int(os.environ.get(ADMISSION_CONFIG["MAX_QUEUE_ENV"], ADMISSION_CONFIG["DEFAULT_MAX_QUEUE"]))
+        )
+    return _admission_controller
@@ -0,0 +1,280 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+CRAWL_CONFIG = {
+    "WORKERS": 4,
+    "DOMAIN_CONCURRENCY": 2,  # Maximum in-flight requests per domain
+    "DOMAIN_DELAYS": {},  # Per-domain politeness overrides, e.g. {"www.example.com": 2.5}
+    "STALENESS_WEIGHT": 1.0,  # Seconds of kickoff urgency traded per second of staleness
+    "MAX_STALENESS": 24 * 60 * 60  # Staleness assumed for never-fetched URLs
+}
+
+PageFetcher = Callable[[str], Awaitable[Optional[str]]]
+
+
+def url_domain(url: str) -> str:
+    """Return the lower-cased host of a URL."""
+    return (urlsplit(url).hostname or "").lower()
+
+
+class DomainPoliteness:
+    """
+    Per-domain politeness delay shared by every request path.
+
+    Each request start reserves the next free slot of its domain, so
+    concurrent callers are spaced out instead of all sleeping the same flat
+    delay and then firing together.
+    """
+
+    def __init__(
+        self,
+        default_delay: float,
+        domain_delays: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.default_delay = default_delay
+        self.domain_delays = dict(domain_delays or CRAWL_CONFIG["DOMAIN_DELAYS"])
+        self._clock = clock
+        self._next_allowed: Dict[str, float] = {}
+
+    def delay_for(self, domain: str) -> float:
+        return self.domain_delays.get(domain, self.default_delay)
+
+    def ready_in(self, domain: str) -> float:
+        """Seconds until the domain may be hit again (0 if ready now)."""
+        return max(0.0, self._next_allowed.get(domain, 0.0) - self._clock())
+
+    def reserve(self, domain: str) -> float:
+        """
+        Reserve the next request slot for a domain.
+
+        Returns:
+            Seconds the caller must wait before starting its request
+        """
+        now = self._clock()
+        start = max(now, self._next_allowed.get(domain, 0.0))
+        self._next_allowed[domain] = start + self.delay_for(domain)
+        return start - now
+
+    async def wait(self, domain: str) -> None:
+        """Wait for the domain's next politeness slot."""
+        delay = self.reserve(domain)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class _DomainQueue:
+    """Pending jobs and in-flight count for one domain."""
+
+    __slots__ = ("heap", "active")
+
+    def __init__(self):
+        self.heap: List[Tuple[float, int, str]] = []
+        self.active = 0
+
+
+class CrawlFrontier:
+    """
+    Priority crawl frontier drained by a pool of async workers.
+
+    URLs are ordered by match kickoff time and data staleness: pages for
+    matches kicking off soonest, and pages whose data is oldest, go first.
+    Duplicate submissions of a queued or in-flight URL share one fetch.
+    Workers only pick a domain that is under its concurrency limit and past
+    its politeness delay, so one slow domain never stalls the others.
+    """
+
+    def __init__(
+        self,
+        fetch: PageFetcher,
+        politeness: DomainPoliteness,
+        workers: int = CRAWL_CONFIG["WORKERS"],
+        domain_concurrency: int = CRAWL_CONFIG["DOMAIN_CONCURRENCY"],
+        clock: Callable[[], float] = time.time
+    ):
+        self.fetch = fetch
+        self.workers = workers
+        self.domain_concurrency = domain_concurrency
+        self.politeness = politeness
+        self._clock = clock
+
+        self._domains: Dict[str, _DomainQueue] = {}
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._sequence = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker_tasks: List[asyncio.Task] = []
+
+        self.submitted = 0
+        self.deduplicated = 0
+        self.completed = 0
+        self.failed = 0
+
+    def priority(self, kickoff: Optional[datetime], staleness: Optional[float]) -> float:
+        """
+        Compute the queue priority of a URL; lower values are fetched first.
+
+        Args:
+            kickoff: Kickoff time of the match the page belongs to
+            staleness: Seconds since the page data was last fetched, None if never
+        """
+        kickoff_ts = kickoff.timestamp() if kickoff else self._clock() + CRAWL_CONFIG["MAX_STALENESS"]
+        if staleness is None:
+            staleness = CRAWL_CONFIG["MAX_STALENESS"]
+        staleness = min(staleness, CRAWL_CONFIG["MAX_STALENESS"])
+        return kickoff_ts - CRAWL_CONFIG["STALENESS_WEIGHT"] * staleness
+
+    def submit(
+        self,
+        url: str,
+        kickoff: Optional[datetime] = None,
+        staleness: Optional[float] = None
+    ) -> asyncio.Future:
+        """
+        Queue a URL for crawling.
+
+        Args:
+            url: Page to fetch
+            kickoff: Kickoff time of the related match
+            staleness: Seconds since the data was last fetched, None if never
+
+        Returns:
+            Future resolving to the page text, or None if the fetch failed
+        """
+        self.submitted += 1
+        existing = self._futures.get(url)
+        if existing is not None:
+            self.deduplicated += 1
+            return existing
+
+        future = asyncio.get_running_loop().create_future()
+        self._futures[url] = future
+        domain_queue = self._domains.setdefault(url_domain(url), _DomainQueue())
+        heapq.heappush(domain_queue.heap, (self.priority(kickoff, staleness), next(self._sequence), url))
+        self._ensure_started()
+        self._notify()
+        return future
+
+    async def crawl(
+        self,
+        urls: List[str],
+        kickoff: Optional[datetime] = None,
+        staleness: Optional[float] = None
+    ) -> Dict[str, Optional[str]]:
+        """
+        Submit a batch of URLs and wait for all of them.
+
+        Returns:
+            Mapping of URL to page text (None for failed fetches)
+        """
+        futures = {url: self.submit(url, kickoff, staleness) for url in urls}
+        pages = await asyncio.gather(*(asyncio.shield(future) for future in futures.values()))
+        return dict(zip(futures, pages))
+
+    def pending(self) -> int:
+        return sum(len(queue.heap) for queue in self._domains.values())
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "pending": self.pending(),
+            "in_flight": sum(queue.active for queue in self._domains.values()),
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+            "completed": self.completed,
+            "failed": self.failed,
+            "workers": len(self._worker_tasks)
+        }
+
+    async def stop(self) -> None:
+        """Cancel all workers; queued URLs resolve to None."""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        for url, future in list(self._futures.items()):
+            if not future.done():
+                future.set_result(None)
+        self._futures.clear()
+        self._domains.clear()
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Workers are bound to the loop that started them
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._worker_tasks = []
+        self._worker_tasks = [task for task in self._worker_tasks if not task.done()]
+        while len(self._worker_tasks) < self.workers:
+            self._worker_tasks.append(asyncio.create_task(self._worker()))
+
+    def _notify(self) -> None:
+        """Wake idle workers after the queue or domain capacity changed."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _next_ready(self) -> Tuple[Optional[str], Optional[str], Optional[float]]:
+        """
+        Pick the best URL among domains with free capacity and elapsed delay.
+
+        Returns:
+            Tuple of (url, domain, None) when a job is ready, otherwise
+            (None, None, seconds until a domain becomes ready or None if idle)
+        """
+        best = None
+        wait = None
+        for domain, queue in self._domains.items():
+            if not queue.heap or queue.active >= self.domain_concurrency:
+                continue
+            ready_in = self.politeness.ready_in(domain)
+            if ready_in > 0:
+                wait = ready_in if wait is None else min(wait, ready_in)
+            elif best is None or queue.heap[0] < best[0]:
+                best = (queue.heap[0], domain)
+
+        if best is None:
+            return None, None, wait
+        _, domain = best
+        _, _, url = heapq.heappop(self._domains[domain].heap)
+        return url, domain, None
+
+    async def _worker(self) -> None:
+        while True:
+            # Selection and slot reservation run without awaiting, so they are atomic
+            url, domain, wait = self._next_ready()
+            if url is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            queue = self._domains[domain]
+            queue.active += 1
+            self.politeness.reserve(domain)
+
+            try:
+                page = await self.fetch(url)
+            except Exception as e:
+                logger.warning(f"Crawl of {url} failed: {e}")
+                page = None
+            finally:
+                queue.active -= 1
+
+            if page is None:
+                self.failed += 1
+            else:
+                self.completed += 1
+            future = self._futures.pop(url, None)
+            if future is not None and not future.done():
+                future.set_result(page)
+            self._notify()
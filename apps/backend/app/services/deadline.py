@@ -0,0 +1,104 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+DEADLINE_CONFIG = {
+    "HEADER": "X-Request-Timeout-Ms",  # Client latency budget for the whole request, in milliseconds
+    "DEFAULT_BUDGET": 8.0,
+    "MIN_BUDGET": 0.1,
+    "MAX_BUDGET": 30.0,
+    "PREDICTION_RESERVE": 0.25  # Seconds kept back from upstream stages for building the prediction
+}
+
+
+class Deadline:
+    """
+    Latency budget of one request.
+
+    Every stage sizes its timeouts from what is left instead of its own
+    fixed timeout, and records why its output is degraded when it had to
+    fall back to cached or partial data.
+    """
+
+    def __init__(self, budget: float, clock: Callable[[], float] = time.monotonic):
+        self.budget = budget
+        self._clock = clock
+        self.started_at = clock()
+        self.expires_at = self.started_at + budget
+        self.degraded_reasons: List[str] = []
+
+    @classmethod
+    def from_header(cls, timeout_ms: Optional[int]) -> "Deadline":
+        """
+        Build a deadline from the request header value, clamped to the allowed range.
+
+        Args:
+            timeout_ms: Header value in milliseconds, None for the default budget
+        """
+        if timeout_ms is None:
+            return cls(DEADLINE_CONFIG["DEFAULT_BUDGET"])
+        budget = min(max(timeout_ms / 1000.0, DEADLINE_CONFIG["MIN_BUDGET"]), DEADLINE_CONFIG["MAX_BUDGET"])
+        return cls(budget)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self._clock())
+
+    def elapsed(self) -> float:
+        return self._clock() - self.started_at
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def timeout(self, cap: Optional[float] = None, reserve: float = 0.0) -> float:
+        """
+        Timeout for a stage: what remains after the reserve, never above the stage's own cap.
+        """
+        available = max(0.0, self.remaining() - reserve)
+        return available if cap is None else min(cap, available)
+
+    def degrade(self, reason: str) -> None:
+        """Record that a stage served cached, partial or no data."""
+        if reason not in self.degraded_reasons:
+            self.degraded_reasons.append(reason)
+            logger.info(f"Request degraded: {reason} ({self.remaining():.2f}s of {self.budget:.2f}s left)")
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Deadline of the request being served, None outside a deadline scope."""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline) -> Iterator[Deadline]:
+    """
+    Make a deadline current for everything awaited inside the block.
+
+    Tasks created inside the block copy the context, so concurrent
+    sub-requests see the same deadline.
+    """
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def remaining_timeout(cap: float, reserve: float = 0.0) -> float:
+    """A stage's timeout: its cap, shortened to the current request's remaining budget."""
+    deadline = current_deadline()
+    return cap if deadline is None else deadline.timeout(cap, reserve)
+
+
+def note_degraded(reason: str) -> None:
+    """Record a degradation on the current request, if it has a deadline."""
+    deadline = current_deadline()
+    if deadline is not None:
+        deadline.degrade(reason)
@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from .crawl_frontier import url_domain
+
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+HEDGE_CONFIG = {
+    "ENABLED": True,
+    "MIRRORS": {},  # Alternate hosts serving the same paths, e.g. {"www.example.com": ["mirror.example.com"]}; only these sources are hedged
+    "HEDGE_RATIO": 0.1,  # Hedged requests allowed per primary request (10% extra load)
+    "HEDGE_BURST": 5,  # Hedges that may be sent back to back before the ratio applies
+    "LATENCY_PERCENTILE": 0.95,
+    "LATENCY_WINDOW": 200,  # Recent latency samples kept per source
+    "MIN_SAMPLES": 20,  # Samples needed before a source's percentile is trusted
+    "DEFAULT_HEDGE_DELAY": 2.0,  # Hedge delay while a source has too few samples
+    "MIN_HEDGE_DELAY": 0.05
+}
+
+PageFetch = Callable[[str], Awaitable[Optional[Any]]]
+
+
+class LatencyTracker:
+    """Sliding window of response latencies per source."""
+
+    def __init__(self, window: int = HEDGE_CONFIG["LATENCY_WINDOW"]):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, source: str, latency: float) -> None:
+        samples = self._samples.get(source)
+        if samples is None:
+            samples = self._samples[source] = deque(maxlen=self.window)
+        samples.append(latency)
+
+    def count(self, source: str) -> int:
+        return len(self._samples.get(source, ()))
+
+    def percentile(self, source: str, quantile: float) -> Optional[float]:
+        """Nearest-rank percentile of a source's recent latencies, None without samples."""
+        samples = self._samples.get(source)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, int(round(quantile * len(ordered))) - 1))
+        return ordered[index]
+
+    def sources(self) -> List[str]:
+        return list(self._samples)
+
+
+class HedgeBudget:
+    """
+    Token bucket capping hedged requests to a fraction of primary requests.
+
+    Every primary request adds `ratio` tokens (up to `burst`); a hedge
+    spends one.
+    """
+
+    def __init__(self, ratio: float = HEDGE_CONFIG["HEDGE_RATIO"], burst: float = HEDGE_CONFIG["HEDGE_BURST"]):
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = float(burst)
+
+    def on_request(self) -> None:
+        self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+
+class RequestHedger:
+    """
+    Hedged requests for slow sources.
+
+    A request that has not answered within its source's observed p95
+    latency gets a duplicate sent to a mirror; sources without a mirror are
+    never hedged. The first successful response wins and the other
+    request is cancelled. Hedges are limited by a HedgeBudget so a slow
+    source cannot double the upstream load.
+    """
+
+    def __init__(
+        self,
+        mirrors: Optional[Dict[str, List[str]]] = None,
+        budget: Optional[HedgeBudget] = None,
+        tracker: Optional[LatencyTracker] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.mirrors = {domain.lower(): list(hosts) for domain, hosts in (mirrors or HEDGE_CONFIG["MIRRORS"]).items()}
+        self.budget = budget or HedgeBudget()
+        self.tracker = tracker or LatencyTracker()
+        self._clock = clock
+        self._mirror_turn: Dict[str, int] = {}
+
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_denied = 0
+
+    def hedge_delay(self, source: str) -> float:
+        """Seconds to wait for the primary before hedging a request to this source."""
+        if self.tracker.count(source) < HEDGE_CONFIG["MIN_SAMPLES"]:
+            return HEDGE_CONFIG["DEFAULT_HEDGE_DELAY"]
+        p95 = self.tracker.percentile(source, HEDGE_CONFIG["LATENCY_PERCENTILE"])
+        return max(HEDGE_CONFIG["MIN_HEDGE_DELAY"], p95)
+
+    def alternate_url(self, url: str) -> str:
+        """Same URL on the source's next mirror, round robin; the URL itself without mirrors."""
+        parts = urlsplit(url)
+        hosts = self.mirrors.get((parts.hostname or "").lower())
+        if not hosts:
+            return url
+        turn = self._mirror_turn.get(parts.hostname, 0)
+        self._mirror_turn[parts.hostname] = turn + 1
+        netloc = hosts[turn % len(hosts)]
+        if parts.port and ":" not in netloc:
+            netloc = f"{netloc}:{parts.port}"
+        return urlunsplit((parts.scheme, netloc, parts.path, parts.query, parts.fragment))
+
+    async def run(self, url: str, fetch: PageFetch, hedge_fetch: Optional[PageFetch] = None) -> Optional[Any]:
+        """
+        Fetch a URL, hedging it if it is slower than its source's p95.
+
+        Args:
+            url: Primary URL
+            fetch: Coroutine function for the primary request; returns None on failure
+            hedge_fetch: Coroutine function for the hedge, defaults to fetch
+
+        Returns:
+            The first successful response, or None if every attempt failed
+        """
+        source = url_domain(url)
+        self.requests += 1
+        self.budget.on_request()
+
+        primary = asyncio.create_task(self._timed(source, fetch, url))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay(source))
+            if done:
+                return primary.result()
+
+            if not self.mirrors.get(source):
+                # A duplicate to the same slow host would only add to its load
+                return await primary
+
+            if not self.budget.try_acquire():
+                self.budget_denied += 1
+                return await primary
+
+            alternate = self.alternate_url(url)
+            self.hedged += 1
+            logger.info(f"Hedging slow request to {source} via {url_domain(alternate)}")
+            hedge = asyncio.create_task(self._timed(url_domain(alternate), hedge_fetch or fetch, alternate))
+            return await self._first_success(primary, hedge)
+        finally:
+            # The caller may be cancelled, e.g. by its source timeout; don't leave the fetch running
+            if not primary.done():
+                primary.cancel()
+                await asyncio.gather(primary, return_exceptions=True)
+
+    async def _first_success(self, primary: asyncio.Task, hedge: asyncio.Task) -> Optional[Any]:
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and task.result() is not None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _timed(self, source: str, fetch: PageFetch, url: str) -> Optional[Any]:
+        start = self._clock()
+        result = await fetch(url)
+        # Only successful responses describe how fast a source normally answers
+        if result is not None:
+            self.tracker.record(source, self._clock() - start)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "budget_denied": self.budget_denied,
+            "hedge_rate": round(self.hedged / self.requests, 4) if self.requests else 0.0,
+            "p95_seconds": {
+                source: round(self.tracker.percentile(source, HEDGE_CONFIG["LATENCY_PERCENTILE"]), 4)
+                for source in self.tracker.sources()
+            }
+        }
+
+
+_request_hedger: Optional[RequestHedger] = None
+
+
+def get_request_hedger() -> Optional[RequestHedger]:
+    """Return the process-wide hedger, or None when hedging is disabled."""
+    global _request_hedger
+    if not HEDGE_CONFIG["ENABLED"]:
+        return None
+    if _request_hedger is None:
+        _request_hedger = RequestHedger()
+    return _request_hedger
@@ -0,0 +1,338 @@
+import codecs
+import hashlib
+import logging
+import re
+from collections import OrderedDict
+from html.parser import HTMLParser
+from typing import AsyncIterator, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+EXTRACTOR_CONFIG = {
+    # Sections to pull out of scraped pages, as simple selectors: tag, .class, #id or tag.class#id
+    "SELECTORS": {
+        "form": "table.form-table",
+        "injuries": "ul.injury-list",
+        "odds": "tr.odds-row"
+    },
+    "MAX_ROWS_PER_SECTION": 500,
+    "MAX_CELL_CHARS": 256,
+    "PARSE_CACHE_SIZE": 256
+}
+
+# Elements that never have content or an end tag
+VOID_ELEMENTS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr"
+})
+ROW_ELEMENTS = frozenset({"tr", "li"})
+CELL_ELEMENTS = frozenset({"td", "th"})
+
+_SELECTOR_PATTERN = re.compile(r"^(?P<tag>[a-zA-Z][a-zA-Z0-9]*)?(?P<rest>(?:[.#][\w-]+)*)$")
+
+# Extracted structure: section name -> rows -> cell texts
+Extraction = Dict[str, List[List[str]]]
+
+
+class Selector:
+    """
+    A compound simple selector: optional tag, any number of classes and an optional id.
+    """
+
+    __slots__ = ("tag", "classes", "element_id")
+
+    def __init__(self, selector: str):
+        match = _SELECTOR_PATTERN.match(selector.strip())
+        if not match or not selector.strip():
+            raise ValueError(f"Unsupported selector: {selector!r}")
+        self.tag = (match.group("tag") or "").lower() or None
+        self.classes = frozenset(re.findall(r"\.([\w-]+)", match.group("rest")))
+        ids = re.findall(r"#([\w-]+)", match.group("rest"))
+        self.element_id = ids[0] if ids else None
+
+    def matches(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> bool:
+        if self.tag and tag != self.tag:
+            return False
+        if not self.classes and self.element_id is None:
+            return True
+        attributes = dict(attrs)
+        if self.element_id is not None and attributes.get("id") != self.element_id:
+            return False
+        return self.classes <= set((attributes.get("class") or "").split())
+
+
+class _SelectiveParser(HTMLParser):
+    """
+    Incremental parser that only materialises text inside selected elements.
+
+    No tree is built: outside a match each start tag is only tested against
+    the selectors, so memory is bounded by the extracted rows, not the page.
+    """
+
+    def __init__(self, selectors: Dict[str, Selector], max_rows: int, max_cell_chars: int):
+        super().__init__(convert_charrefs=True)
+        self.selectors = selectors
+        self.max_rows = max_rows
+        self.max_cell_chars = max_cell_chars
+        self.result: Extraction = {name: [] for name in selectors}
+
+        # State of the element currently being extracted
+        self._section: Optional[str] = None
+        self._root_tag: Optional[str] = None
+        self._root_depth = 0
+        self._row: Optional[List[str]] = None
+        self._cell: Optional[List[str]] = None
+        self._cell_chars = 0
+        # Text nodes can arrive split across feed() calls; joined at the next tag.
+        # Both buffers stop growing at max_cell_chars, however long the text.
+        self._text: List[str] = []
+        self._text_chars = 0
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        if self._section is None:
+            for name, selector in self.selectors.items():
+                if selector.matches(tag, attrs):
+                    self._section = name
+                    self._root_tag = tag
+                    self._root_depth = 1
+                    if tag in ROW_ELEMENTS:
+                        self._row = []
+                    return
+            return
+
+        if tag == self._root_tag:
+            self._root_depth += 1
+        if tag in ROW_ELEMENTS:
+            # Row end tags are optional in HTML; a new row closes the previous one
+            self._close_row()
+            self._row = []
+        elif tag in CELL_ELEMENTS:
+            self._close_cell()
+            if self._row is None:
+                self._row = []
+            self._cell = []
+            self._cell_chars = 0
+
+    def handle_startendtag(self, tag, attrs):
+        if tag not in VOID_ELEMENTS:
+            self.handle_starttag(tag, attrs)
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        if self._section is None:
+            return
+        if tag in CELL_ELEMENTS:
+            self._close_cell()
+        elif tag in ROW_ELEMENTS:
+            self._close_row()
+        if tag == self._root_tag:
+            self._root_depth -= 1
+            if self._root_depth == 0:
+                self._close_row()
+                self._section = None
+                self._root_tag = None
+
+    def handle_data(self, data):
+        if self._section is None or self._text_chars >= self.max_cell_chars:
+            return
+        if not self._text:
+            # Leading whitespace is stripped on flush, so it must not use up the budget
+            data = data.lstrip()
+            if not data:
+                return
+        data = data[:self.max_cell_chars - self._text_chars]
+        self._text.append(data)
+        self._text_chars += len(data)
+
+    def close_all(self) -> Extraction:
+        self.close()
+        self._flush_text()
+        self._close_row()
+        return self.result
+
+    def _flush_text(self):
+        if not self._text:
+            return
+        text = "".join(self._text).strip()
+        self._text = []
+        self._text_chars = 0
+        if not text:
+            return
+        if self._cell is not None:
+            # Count the joining space so the cell never exceeds the limit when closed
+            remaining = self.max_cell_chars - self._cell_chars
+            if remaining > 0:
+                self._cell.append(text[:remaining])
+                self._cell_chars += len(self._cell[-1]) + 1
+        elif self._row is not None:
+            # List items and rows without cells hold their text directly
+            self._row.append(text[:self.max_cell_chars])
+
+    def _close_cell(self):
+        if self._cell is not None and self._row is not None:
+            self._row.append(" ".join(self._cell)[:self.max_cell_chars])
+        self._cell = None
+
+    def _close_row(self):
+        self._close_cell()
+        if self._row and self._section is not None:
+            rows = self.result[self._section]
+            if len(rows) < self.max_rows:
+                rows.append(self._row)
+        self._row = None
+
+
+class HtmlExtractor:
+    """
+    Streaming selective HTML extraction with a parse cache.
+
+    Pages are parsed chunk by chunk and only configured selectors are kept.
+    Extracted structures are cached by a hash of the raw page bytes, so an
+    identical page seen again (another match, a retry, a replayed response)
+    is returned from the cache instead of being parsed again. Streamed pages
+    are also cached under a page key built from the URL and the response's
+    validators, which is known before the body arrives, so an unchanged
+    page is answered without reading or parsing its body.
+    """
+
+    def __init__(
+        self,
+        selectors: Optional[Dict[str, str]] = None,
+        cache_size: int = EXTRACTOR_CONFIG["PARSE_CACHE_SIZE"]
+    ):
+        raw_selectors = selectors or EXTRACTOR_CONFIG["SELECTORS"]
+        self.selectors = {name: Selector(selector) for name, selector in raw_selectors.items()}
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, Extraction]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def extract(self, content: bytes, encoding: str = "utf-8") -> Extraction:
+        """
+        Extract configured sections from a complete page.
+
+        Args:
+            content: Raw page bytes
+            encoding: Character encoding of the page
+
+        Returns:
+            Mapping of section name to rows of cell texts
+        """
+        digest = self._digest(content)
+        cached = self._cache_get(digest)
+        if cached is not None:
+            return cached
+
+        parser = self._new_parser()
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        chunk_size = 64 * 1024
+        for start in range(0, len(content), chunk_size):
+            parser.feed(decoder.decode(content[start:start + chunk_size]))
+        parser.feed(decoder.decode(b"", final=True))
+        return self._cache_put(digest, parser.close_all())
+
+    async def extract_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        encoding: str = "utf-8",
+        page_key: Optional[str] = None
+    ) -> Extraction:
+        """
+        Extract configured sections while a page is still being received.
+
+        The page is never held whole: each chunk is hashed and fed to the
+        parser, then dropped. The result is stored in the parse cache under
+        the page hash for later extract() calls on identical content, and
+        under page_key when one is given.
+
+        Args:
+            chunks: Async iterator of raw page bytes, e.g. httpx aiter_bytes()
+            encoding: Character encoding of the page
+            page_key: Key from page_key(); on a hit the body is not read at all
+
+        Returns:
+            Mapping of section name to rows of cell texts
+        """
+        key_digest = self._digest(page_key.encode()) if page_key else None
+        if key_digest is not None:
+            cached = self._cache_get(key_digest)
+            if cached is not None:
+                return cached
+
+        hasher = hashlib.blake2b(digest_size=16)
+        parser = self._new_parser()
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        async for chunk in chunks:
+            hasher.update(chunk)
+            parser.feed(decoder.decode(chunk))
+        parser.feed(decoder.decode(b"", final=True))
+
+        digest = hasher.digest()
+        cached = self._cache_get(digest)
+        if cached is None:
+            cached = self._cache_put(digest, parser.close_all())
+        if key_digest is not None:
+            self._cache_put(key_digest, cached)
+        return cached
+
+    @staticmethod
+    def page_key(url: str, headers: Mapping[str, str]) -> Optional[str]:
+        """
+        Build a cache key for a response from its URL and validators.
+
+        Args:
+            url: URL the page was fetched from
+            headers: Response headers
+
+        Returns:
+            The key, or None if the response has no ETag or Last-Modified
+            to tell a changed page from an unchanged one
+        """
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            return None
+        return "\n".join((url, etag or "", last_modified or "", headers.get("content-length") or ""))
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._cache), "hits": self.cache_hits, "misses": self.cache_misses}
+
+    def _new_parser(self) -> _SelectiveParser:
+        return _SelectiveParser(
+            self.selectors,
+            EXTRACTOR_CONFIG["MAX_ROWS_PER_SECTION"],
+            EXTRACTOR_CONFIG["MAX_CELL_CHARS"]
+        )
+
+    @staticmethod
+    def _digest(content: bytes) -> bytes:
+        return hashlib.blake2b(content, digest_size=16).digest()
+
+    def _cache_get(self, digest: bytes) -> Optional[Extraction]:
+        cached = self._cache.get(digest)
+        if cached is None:
+            self.cache_misses += 1
+            return None
+        self._cache.move_to_end(digest)
+        self.cache_hits += 1
+        return cached
+
+    def _cache_put(self, digest: bytes, extraction: Extraction) -> Extraction:
+        self._cache[digest] = extraction
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return extraction
+
+
+_html_extractor: Optional[HtmlExtractor] = None
+
+
+def get_html_extractor() -> HtmlExtractor:
+    """Return the process-wide extractor, sharing its parse cache across requests."""
+    global _html_extractor
+    if _html_extractor is None:
+        _html_extractor = HtmlExtractor()
+    return _html_extractor
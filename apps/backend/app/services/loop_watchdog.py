@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from .metrics import LOOP_LAG, LOOP_STALLS
+from .profiler import collapse_stack
+
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+LOOP_WATCHDOG_CONFIG = {
+    "ENABLED_ENV": "LOOP_WATCHDOG",  # "0" disables the watchdog
+    "INTERVAL": 0.05,  # Seconds between heartbeats scheduled on the loop
+    "STALL_THRESHOLD": 0.1,  # Lag in seconds that counts as a blocked loop
+    "LAG_WINDOW": 1200,  # Recent lag samples kept for percentiles, one minute at the default interval
+    "MAX_STALLS": 50  # Recent stalls kept with their stacks
+}
+
+
+class LoopWatchdog:
+    """
+    Measures event loop lag and catches the code blocking it.
+
+    A heartbeat callback reschedules itself every interval; how late it
+    runs is the loop lag. A watchdog thread notices when the heartbeat is
+    overdue by more than the threshold while the loop is running and
+    captures the loop thread's stack at that moment, which is the
+    synchronous code holding the loop. The stall is recorded with that
+    stack once the loop gets control back.
+    """
+
+    def __init__(
+        self,
+        threshold: float = LOOP_WATCHDOG_CONFIG["STALL_THRESHOLD"],
+        interval: float = LOOP_WATCHDOG_CONFIG["INTERVAL"],
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.threshold = threshold
+        self.interval = interval
+        self._clock = clock
+        self.lags: Deque[float] = deque(maxlen=LOOP_WATCHDOG_CONFIG["LAG_WINDOW"])
+        self.stalls: Deque[Dict[str, Any]] = deque(maxlen=LOOP_WATCHDOG_CONFIG["MAX_STALLS"])
+        self.stall_count = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._handle: Optional[asyncio.Handle] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_tick: Optional[float] = None
+        self._expected: Optional[float] = None
+        self._blocked_stack: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """
+        Start watching a loop; must be called from the loop's own thread.
+
+        Args:
+            loop: Loop to watch, defaults to the running loop
+        """
+        if self.running:
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._handle = self._loop.call_soon(self._tick)
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        if self._handle is not None:
+            self._handle.cancel()
+        self._last_tick = None
+        self._expected = None
+
+    def _tick(self) -> None:
+        now = self._clock()
+        if self._expected is not None:
+            lag = max(0.0, now - self._expected)
+            self.lags.append(lag)
+            LOOP_LAG.observe(lag)
+            if lag >= self.threshold:
+                self._record_stall(lag)
+        self._last_tick = now
+        self._expected = now + self.interval
+        self._handle = self._loop.call_later(self.interval, self._tick)
+
+    def _record_stall(self, lag: float) -> None:
+        stack, self._blocked_stack = self._blocked_stack, None
+        self.stall_count += 1
+        LOOP_STALLS.inc()
+        self.stalls.append({"at": time.time(), "lag_seconds": round(lag, 4), "stack": stack})
+        logger.warning(f"Event loop blocked for {lag * 1000:.0f}ms" + (f" in {stack.rsplit(';', 1)[-1]}" if stack else ""))
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.threshold / 2):
+            last_tick = self._last_tick
+            if last_tick is None or self._blocked_stack is not None or not self._loop.is_running():
+                continue
+            if self._clock() - last_tick > self.interval + self.threshold:
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    self._blocked_stack = collapse_stack(frame)
+
+    def lag_percentiles(self) -> Dict[str, float]:
+        """Loop lag percentiles in seconds over the recent window."""
+        if not self.lags:
+            return {}
+        ordered = sorted(self.lags)
+        last = len(ordered) - 1
+        return {
+            "p50": ordered[int(last * 0.5)],
+            "p95": ordered[int(last * 0.95)],
+            "p99": ordered[int(last * 0.99)],
+            "max": ordered[last]
+        }
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "threshold_seconds": self.threshold,
+            "lag_seconds": {name: round(value, 4) for name, value in self.lag_percentiles().items()},
+            "stall_count": self.stall_count,
+            "recent_stalls": list(self.stalls)
+        }
+
+
+def watchdog_enabled() -> bool:
+    return os.environ.get(LOOP_WATCHDOG_CONFIG["ENABLED_ENV"], "1") != "0"
+
+
+_loop_watchdog: Optional[LoopWatchdog] = None
+
+
+def get_loop_watchdog() -> LoopWatchdog:
+    """Return the process-wide event loop watchdog."""
+    global _loop_watchdog
+    if _loop_watchdog is None:
+        _loop_watchdog = LoopWatchdog()
+    return _loop_watchdog
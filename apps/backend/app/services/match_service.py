@@ -1,28 +1,357 @@
+import asyncio
+import heapq
 import httpx
 import logging
-from typing import List, Dict, Any
+import time
+from collections import deque
+from typing import List, Dict, Any, Callable, Deque, Optional, Set, Tuple
 from datetime import datetime, timezone
 
 from ..models.match import Match
+from .deadline import current_deadline, note_degraded, remaining_timeout
+from .metrics import UpstreamCall
+from .shared_cache import SharedCache
+from .update_hub import UpdateHub, league_topic, match_topic
+from .upstream_replay import get_upstream_transport
 
 logger = logging.getLogger(__name__)
 
+# Configuration constants
+MATCH_SERVICE_CONFIG = {
+    "REQUEST_TIMEOUT": 30.0,
+    "MIN_FETCH_TIME": 0.2,  # Below this much remaining budget the last-known-good list is served without fetching
+    "SHARED_KEY": "matches:upcoming:v2",  # v2 payloads carry the list version
+    "SHARED_TTL": 5 * 60,  # Fixtures rarely change; one worker refreshes the shared list this often
+    "REFRESH_INTERVAL": 60.0,  # Seconds between background refreshes that push list changes to subscribers
+    "CHANGE_LOG_SIZE": 100  # Match list versions a delta-sync client can be behind before it must resync
+}
+
+
+class MatchStore:
+    """
+    Last-known-good upcoming match list, versioned for delta sync.
+    
+    Served when the sports API fails or the request deadline leaves no
+    time to call it. Every refresh that changes the list gets a new,
+    higher version and a change log entry; the log is bounded, so clients
+    further behind than it reaches are told to resync.
+    
+    Versions are millisecond timestamps of the refresh that produced the
+    change. With the shared cache they come from the refreshing worker,
+    so every worker gives the same list the same version.
+    
+    Matches leave the list the moment they kick off. Kickoff times are
+    kept in a min-heap, so expiry only looks at the matches that started;
+    a single timer armed for the earliest kickoff wakes the store, which
+    then tells its expiry listeners which matches went.
+    """
+    
+    def __init__(self, clock: Callable[[], float] = time.time, log_size: int = MATCH_SERVICE_CONFIG["CHANGE_LOG_SIZE"]):
+        self._clock = clock
+        self._loaded = False
+        # Ordered by id; expiry deletes single entries instead of rebuilding a list
+        self._by_id: Dict[str, Match] = {}
+        self._updated_at: Optional[float] = None
+        self.version = 0
+        # (version, previous version, ids added, upserted matches, ids removed)
+        self._log: Deque[Tuple[int, int, Set[str], Dict[str, Match], Set[str]]] = deque(maxlen=log_size)
+        # (kickoff timestamp, match id); entries of rescheduled or removed matches are skipped when popped
+        self._kickoffs: List[Tuple[float, str]] = []
+        self._expiry_listeners: List[Callable[[List[str], int], None]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.expired = 0
+    
+    def update(self, matches: List[Match], version: Optional[int] = None) -> None:
+        """
+        Store a freshly fetched list, leaving out matches that already kicked off.
+        
+        Args:
+            matches: The full upcoming match list
+            version: Version assigned by the refreshing worker; derived from
+                the clock when None and the list changed
+        """
+        now = self._clock()
+        self._updated_at = now
+        by_id = {}
+        for match in matches:
+            kickoff = kickoff_timestamp(match)
+            if kickoff is None or kickoff > now:
+                by_id[match.id] = match
+        if version is None:
+            if self._loaded and by_id == self._by_id:
+                return
+            version = max(int(now * 1000), self.version + 1)
+        if version <= self.version:
+            # Same or older generation than the one already held
+            return
+        
+        added = {match_id for match_id in by_id if match_id not in self._by_id}
+        upserts = {
+            match_id: match for match_id, match in by_id.items()
+            if match_id in added or self._by_id[match_id] != match
+        }
+        removed = {match_id for match_id in self._by_id if match_id not in by_id}
+        if self._loaded:
+            self._log.append((version, self.version, added, upserts, removed))
+        self._by_id = by_id
+        self._loaded = True
+        self.version = version
+        
+        for match in upserts.values():
+            kickoff = kickoff_timestamp(match)
+            if kickoff is not None:
+                heapq.heappush(self._kickoffs, (kickoff, match.id))
+        if len(self._kickoffs) > 2 * len(self._by_id) + 16:
+            # Mostly entries of rescheduled or removed matches; rebuild from the current list
+            self._kickoffs = [
+                (kickoff, match_id) for kickoff, match_id in self._kickoffs
+                if match_id in by_id and kickoff_timestamp(by_id[match_id]) == kickoff
+            ]
+            heapq.heapify(self._kickoffs)
+        self._arm()
+    
+    def get(self) -> Optional[List[Match]]:
+        if not self._loaded:
+            return None
+        self.expire_started()
+        return list(self._by_id.values())
+    
+    def expire_started(self) -> List[str]:
+        """
+        Drop matches whose kickoff has passed.
+        
+        Only heap entries due by now are popped, so the cost follows the
+        number of matches that started, not the size of the list. The
+        change gets a version of its own, derived from the latest kickoff,
+        so every worker expiring the same matches agrees on it.
+        
+        Returns:
+            Ids of the matches removed
+        """
+        now = self._clock()
+        expired = []
+        latest = 0.0
+        while self._kickoffs and self._kickoffs[0][0] <= now:
+            kickoff, match_id = heapq.heappop(self._kickoffs)
+            match = self._by_id.get(match_id)
+            if match is not None and kickoff_timestamp(match) == kickoff:
+                del self._by_id[match_id]
+                expired.append(match_id)
+                latest = max(latest, kickoff)
+        if not expired:
+            return []
+        
+        previous = self.version
+        self.version = max(int(latest * 1000), previous + 1)
+        self._log.append((self.version, previous, set(), {}, set(expired)))
+        self.expired += len(expired)
+        logger.info(f"Expired {len(expired)} matches that kicked off")
+        for listener in self._expiry_listeners:
+            try:
+                listener(expired, previous)
+            except Exception as e:
+                logger.warning(f"Match expiry listener failed: {e}")
+        return expired
+    
+    def on_expire(self, listener: Callable[[List[str], int], None]) -> None:
+        """
+        Call listener(match_ids, previous_version) whenever matches expire.
+        """
+        self._expiry_listeners.append(listener)
+    
+    def start_expiry(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Expire matches at kickoff on this event loop, instead of on the next read."""
+        self._loop = loop or asyncio.get_running_loop()
+        self._arm()
+    
+    def stop_expiry(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = None
+        self._loop = None
+    
+    def _arm(self) -> None:
+        """(Re)arm the single expiry timer for the earliest kickoff."""
+        if self._loop is None:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._kickoffs:
+            delay = max(self._kickoffs[0][0] - self._clock(), 0.0)
+            self._timer = self._loop.call_later(delay, self._on_timer)
+    
+    def _on_timer(self) -> None:
+        self._timer = None
+        self.expire_started()
+        self._arm()
+    
+    def changes_since(self, since: int) -> Optional[Dict[str, Any]]:
+        """
+        Matches added, changed and removed after a version.
+        
+        Returns:
+            Dict with version, added, changed and removed; None when the
+            version is unknown or older than the change log, so the client
+            must resync from the full list
+        """
+        self.expire_started()
+        if since == self.version or since > self.version and self._loaded:
+            # Nothing new, or the client already saw a newer list on another worker
+            return {"version": max(since, self.version), "added": [], "changed": [], "removed": []}
+        entries = [entry for entry in self._log if entry[0] > since]
+        if not entries or entries[0][1] != since:
+            return None
+        
+        existed: Dict[str, bool] = {}
+        for _, _, added, upserts, removed in entries:
+            for match_id in list(upserts) + list(removed):
+                existed.setdefault(match_id, match_id not in added)
+        
+        result: Dict[str, Any] = {"version": self.version, "added": [], "changed": [], "removed": []}
+        for match_id, was_present in existed.items():
+            match = self._by_id.get(match_id)
+            if match is not None:
+                result["changed" if was_present else "added"].append(match)
+            elif was_present:
+                result["removed"].append(match_id)
+        return result
+    
+    def age(self) -> Optional[float]:
+        """Seconds since the list was last refreshed, None if never."""
+        return self._clock() - self._updated_at if self._updated_at is not None else None
+    
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+
+def kickoff_timestamp(match: Match) -> Optional[float]:
+    """Kickoff of a match as a Unix timestamp, None if its start time cannot be parsed."""
+    try:
+        kickoff = datetime.fromisoformat(match.startTime.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    if kickoff.tzinfo is None:
+        kickoff = kickoff.replace(tzinfo=timezone.utc)
+    return kickoff.timestamp()
+
 
 class MatchService:
-    def __init__(self):
+    def __init__(
+        self,
+        store: Optional[MatchStore] = None,
+        shared: Optional[SharedCache] = None,
+        updates: Optional[UpdateHub] = None
+    ):
         self.base_url = "https://www.thesportsdb.com/api/v1/json/3"
         self.premier_league_id = "4328"  # Premier League ID for TheSportsDB
+        self.store = store
+        self.shared = shared
+        self.updates = updates
         
     async def get_upcoming_matches(self) -> List[Match]:
+        """
+        Fetch upcoming soccer matches, falling back to the last-known-good list.
+        
+        The API call only gets the time left in the current request's
+        deadline. When that is too little, or the call fails, the stored
+        list is returned and the request is marked degraded.
+        """
+        stored = self.store.get() if self.store is not None else None
+        deadline = current_deadline()
+        if stored and deadline is not None and deadline.remaining() < MATCH_SERVICE_CONFIG["MIN_FETCH_TIME"]:
+            logger.warning("No time left to fetch matches, serving last-known-good list")
+            note_degraded("matches:stale")
+            return stored
+        
+        try:
+            matches, version = await self._load_upcoming_matches()
+        except Exception:
+            if not stored:
+                raise
+            logger.warning(f"Serving last-known-good list of {len(stored)} matches")
+            note_degraded("matches:stale")
+            return stored
+        
+        if matches and self.store is not None:
+            previous = self.store.version
+            self.store.update(matches, version)
+            if self.store.version != previous:
+                self.publish_changes(previous)
+            # The store has left out matches that already kicked off
+            return self.store.get()
+        return matches
+    
+    def publish_changes(self, since: int) -> None:
+        """
+        Push every match added, changed or removed after a version to its league and match subscribers.
+        
+        Every worker publishes the changes it sees; versions agree across
+        workers, so the version and match id make a dedupe key that keeps
+        one copy of each change in the shared update log.
+        """
+        if self.updates is None or self.store is None:
+            return
+        changes = self.store.changes_since(since)
+        if changes is None:
+            # First list of this worker; clients bootstrap over REST
+            return
+        league = league_topic(self.premier_league_id)
+        version = changes["version"]
+        for event in ("added", "changed"):
+            for match in changes[event]:
+                self.updates.publish((league, match_topic(match.id)), {
+                    "type": "match", "event": event, "version": version, "match": match.model_dump()
+                }, dedupe=f"match:{version}:{match.id}")
+        for match_id in changes["removed"]:
+            self.updates.publish((league, match_topic(match_id)), {
+                "type": "match", "event": "removed", "version": version, "matchId": match_id
+            }, dedupe=f"match:{version}:{match_id}")
+    
+    async def _load_upcoming_matches(self) -> Tuple[List[Match], Optional[int]]:
+        """
+        Read the match list from the cross-worker cache, or fetch it when there is none.
+        
+        With a shared cache, one worker on the host refreshes the list when
+        it goes stale and every other worker reads that copy. The refreshing
+        worker stamps the list with its version, keeping the previous one
+        when nothing changed, so every worker's store agrees on versions.
+        
+        Returns:
+            The matches, and their shared version or None without a shared cache
+        """
+        if self.shared is None:
+            return await self._fetch_upcoming_matches(), None
+        
+        key = MATCH_SERVICE_CONFIG["SHARED_KEY"]
+        
+        async def fetch() -> Dict[str, Any]:
+            matches = [match.model_dump() for match in await self._fetch_upcoming_matches()]
+            previous = await self.shared.run(self.shared.get, key)
+            if previous is not None and previous.value["matches"] == matches:
+                return previous.value
+            version = int(time.time() * 1000)
+            if previous is not None:
+                version = max(version, previous.value["version"] + 1)
+            return {"version": version, "matches": matches}
+        
+        payload = await self.shared.get_or_refresh(key, MATCH_SERVICE_CONFIG["SHARED_TTL"], fetch)
+        return [Match.model_validate(match) for match in payload["matches"]], payload["version"]
+    
+    async def _fetch_upcoming_matches(self) -> List[Match]:
         """
         Fetch upcoming soccer matches from TheSportsDB API.
         Returns a list of matches formatted according to our Match interface.
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            timeout = remaining_timeout(MATCH_SERVICE_CONFIG["REQUEST_TIMEOUT"])
+            async with httpx.AsyncClient(timeout=timeout, transport=get_upstream_transport()) as client:
                 url = f"{self.base_url}/eventsnextleague.php?id={self.premier_league_id}"
                 
-                response = await client.get(url)
+                with UpstreamCall(url) as call:
+                    response = await client.get(url)
+                    call.status = response.status_code
                 response.raise_for_status()
                 
                 data = response.json()
@@ -123,4 +452,15 @@ class MatchService:
             
         except Exception as e:
             logger.warning(f"Failed to parse datetime '{date_str} {time_str}': {e}")
-            return None
\ No newline at end of file
+            return None
+
+
+_match_store: Optional[MatchStore] = None
+
+
+def get_match_store() -> MatchStore:
+    """Return the process-wide last-known-good match list."""
+    global _match_store
+    if _match_store is None:
+        _match_store = MatchStore()
+    return _match_store
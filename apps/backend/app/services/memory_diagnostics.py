@@ -0,0 +1,237 @@
+import asyncio
+import gc
+import itertools
+import logging
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+MEMORY_CONFIG = {
+    "TRACE_FRAMES": 1,  # Frames kept per allocation; more frames cost more memory and time
+    "MAX_SNAPSHOTS": 5,  # Snapshots held in memory; the oldest is dropped beyond this
+    "TOP_LIMIT": 25,
+    "MAX_SIZED_OBJECTS": 2_000_000,  # Bound on objects walked when sizing one cache
+    "MAX_CENSUS_OBJECTS": 2_000_000  # Bound on objects counted by one census
+}
+
+# Objects never counted as part of a cache: code, types and runtime machinery it merely references
+SHARED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    asyncio.Future,
+    asyncio.AbstractEventLoop,
+    logging.Logger,
+    threading.Thread
+)
+
+
+def deep_sizeof(root: Any, limit: int = MEMORY_CONFIG["MAX_SIZED_OBJECTS"]) -> Dict[str, int]:
+    """
+    Retained size of an object graph: each reachable object counted once.
+
+    Follows containers, instance __dict__ and __slots__, but not code,
+    classes, futures or loggers the graph only references.
+
+    Returns:
+        Mapping with "bytes" and "objects", plus "truncated" if the walk hit the limit
+    """
+    seen = set()
+    stack = [root]
+    size = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+        if len(seen) > limit:
+            return {"bytes": size, "objects": len(seen) - 1, "truncated": 1}
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+            continue
+        else:
+            if hasattr(obj, "__dict__"):
+                stack.append(vars(obj))
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+    return {"bytes": size, "objects": len(seen)}
+
+
+def object_census(
+    limit: int = MEMORY_CONFIG["TOP_LIMIT"],
+    max_objects: int = MEMORY_CONFIG["MAX_CENSUS_OBJECTS"]
+) -> List[Dict[str, Any]]:
+    """
+    Count live gc-tracked objects and their own (shallow) size by type.
+
+    Untracked atoms such as str and int only appear inside containers'
+    retained sizes, see deep_sizeof. At most max_objects are counted, so
+    on a very large heap the census is a sample of it.
+    """
+    counts: Dict[str, List[int]] = {}
+    objects = gc.get_objects()
+    if len(objects) > max_objects:
+        logger.warning(f"Object census limited to {max_objects} of {len(objects)} objects")
+    for obj in itertools.islice(objects, max_objects):
+        cls = type(obj)
+        name = f"{cls.__module__}.{cls.__qualname__}"
+        entry = counts.get(name)
+        if entry is None:
+            entry = counts[name] = [0, 0]
+        entry[0] += 1
+        entry[1] += sys.getsizeof(obj)
+    ranked = sorted(counts.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+    return [{"type": name, "count": count, "bytes": size} for name, (count, size) in ranked]
+
+
+class MemoryProfiler:
+    """
+    tracemalloc control for a live worker: start, stop, snapshot and diff.
+
+    Snapshots are kept in memory by id so two of them can be compared
+    later to find what grew between them. tracemalloc is imported on first
+    use, keeping it out of worker startup.
+    """
+
+    def __init__(self, max_snapshots: int = MEMORY_CONFIG["MAX_SNAPSHOTS"]):
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[int, tracemalloc.Snapshot]" = OrderedDict()
+        self._taken_at: Dict[int, float] = {}
+        self._next_id = 1
+
+    def status(self) -> Dict[str, Any]:
+        import tracemalloc
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "frames": tracemalloc.get_traceback_limit(),
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "snapshots": [
+                {"id": snapshot_id, "taken_at": self._taken_at[snapshot_id]}
+                for snapshot_id in self._snapshots
+            ]
+        }
+
+    def start(self, frames: int = MEMORY_CONFIG["TRACE_FRAMES"]) -> Dict[str, Any]:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            logger.info(f"Started tracemalloc with {frames} frame(s)")
+        return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop tracing; stored snapshots are kept for diffing."""
+        import tracemalloc
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.info("Stopped tracemalloc")
+        return self.status()
+
+    def take_snapshot(self, limit: int = MEMORY_CONFIG["TOP_LIMIT"]) -> Dict[str, Any]:
+        """
+        Snapshot traced allocations.
+
+        Raises:
+            RuntimeError: If tracemalloc is not tracing
+        """
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing; start it first")
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>")
+        ))
+        snapshot_id = self._next_id
+        self._next_id += 1
+        self._snapshots[snapshot_id] = snapshot
+        self._taken_at[snapshot_id] = time.time()
+        while len(self._snapshots) > self.max_snapshots:
+            dropped, _ = self._snapshots.popitem(last=False)
+            del self._taken_at[dropped]
+
+        stats = snapshot.statistics("lineno")
+        return {
+            "id": snapshot_id,
+            "total_bytes": sum(stat.size for stat in stats),
+            "top": [
+                {"location": str(stat.traceback), "bytes": stat.size, "count": stat.count}
+                for stat in stats[:limit]
+            ]
+        }
+
+    def diff(self, older_id: int, newer_id: int, limit: int = MEMORY_CONFIG["TOP_LIMIT"]) -> Dict[str, Any]:
+        """
+        Allocation growth between two snapshots, largest first.
+
+        Raises:
+            KeyError: If either snapshot is unknown or was dropped
+        """
+        older = self._snapshots[older_id]
+        newer = self._snapshots[newer_id]
+        stats = newer.compare_to(older, "lineno")
+        return {
+            "from": older_id,
+            "to": newer_id,
+            "size_diff_bytes": sum(stat.size_diff for stat in stats),
+            "top": [
+                {
+                    "location": str(stat.traceback),
+                    "size_diff_bytes": stat.size_diff,
+                    "count_diff": stat.count_diff,
+                    "bytes": stat.size
+                }
+                for stat in stats[:limit]
+            ]
+        }
+
+
+_cache_sources: Dict[str, Callable[[], Any]] = {}
+
+
+def register_cache(name: str, getter: Callable[[], Any]) -> None:
+    """Register an app-level cache, by a getter returning it, for size reports."""
+    _cache_sources[name] = getter
+
+
+def cache_sizes() -> Dict[str, Dict[str, Any]]:
+    """Entry count and retained size of every registered cache."""
+    sizes = {}
+    for name, getter in _cache_sources.items():
+        try:
+            cache = getter()
+        except Exception as e:
+            logger.warning(f"Failed to size cache {name}: {e}")
+            continue
+        report = deep_sizeof(cache)
+        report["entries"] = len(cache) if hasattr(cache, "__len__") else None
+        sizes[name] = report
+    return sizes
+
+
+_memory_profiler: Optional[MemoryProfiler] = None
+
+
+def get_memory_profiler() -> MemoryProfiler:
+    """Return the process-wide tracemalloc controller."""
+    global _memory_profiler
+    if _memory_profiler is None:
+        _memory_profiler = MemoryProfiler()
+    return _memory_profiler
@@ -0,0 +1,363 @@
+import asyncio
+import logging
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import httpx
+
+from .crawl_frontier import url_domain
+
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+METRICS_CONFIG = {
+    "LATENCY_BUCKETS": (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    "CONTENT_TYPE": "text/plain; version=0.0.4; charset=utf-8"
+}
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, Tuple[Tuple[str, str], ...], float]
+
+
+class Metric:
+    """
+    Base of all metric types: a name, help text and a fixed set of label names.
+
+    Recording only updates plain dicts and ints. Everything runs on the
+    event loop thread, so no locks are taken on the hot path; cumulative
+    bucket counts and formatting are left to the scrape.
+    """
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _pairs(self, key: LabelValues, *extra: Tuple[str, str]) -> Tuple[Tuple[str, str], ...]:
+        return tuple(zip(self.labelnames, key)) + extra
+
+    def samples(self) -> Iterator[Sample]:
+        return iter(())
+
+
+class Counter(Metric):
+    """Monotonic total per label set."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[Sample]:
+        for key, value in self._values.items():
+            yield "", self._pairs(key), value
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down."""
+
+    type_name = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: Any) -> None:
+        self._values[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    """
+    Fixed-bucket histogram per label set.
+
+    observe() bumps a single non-cumulative bucket; the cumulative counts
+    Prometheus expects are computed when metrics are rendered.
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = METRICS_CONFIG["LATENCY_BUCKETS"]
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: Any) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def samples(self) -> Iterator[Sample]:
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield "_bucket", self._pairs(key, ("le", _format_value(bound))), cumulative
+            cumulative += counts[-1]
+            yield "_bucket", self._pairs(key, ("le", "+Inf")), cumulative
+            yield "_sum", self._pairs(key), self._sums[key]
+            yield "_count", self._pairs(key), cumulative
+
+
+class CallbackMetric(Metric):
+    """
+    Metric read from existing state when rendered, e.g. cache counters.
+
+    The callback returns a value, or a mapping of label values to values,
+    so instrumented code pays nothing between scrapes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        callback: Callable[[], Any],
+        labelnames: Iterable[str] = (),
+        type_name: str = "gauge"
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.callback = callback
+        self.type_name = type_name
+
+    def samples(self) -> Iterator[Sample]:
+        try:
+            values = self.callback()
+        except Exception as e:
+            logger.warning(f"Failed to collect metric {self.name}: {e}")
+            return
+        if not isinstance(values, dict):
+            values = {(): values}
+        for key, value in values.items():
+            key = key if isinstance(key, tuple) else (key,)
+            yield "", self._pairs(tuple(str(part) for part in key)), value
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Iterable[str] = (), **kwargs: Any) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, **kwargs))
+
+    def callback(
+        self,
+        name: str,
+        help_text: str,
+        callback: Callable[[], Any],
+        labelnames: Iterable[str] = (),
+        type_name: str = "gauge"
+    ) -> CallbackMetric:
+        """Register or replace a metric collected from a callback at render time."""
+        self._metrics.pop(name, None)
+        return self.register(CallbackMetric(name, help_text, callback, labelnames, type_name))
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for suffix, labels, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels) + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "HTTP requests served, by handler and status code", ("method", "handler", "status")
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by handler", ("handler",)
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "HTTP requests currently being served")
+STAGE_LATENCY = REGISTRY.histogram(
+    "prediction_stage_duration_seconds", "Latency of each /predict stage: queue, match_fetch, scrape, analysis", ("stage",)
+)
+SCRAPE_SOURCE_LATENCY = REGISTRY.histogram(
+    "scrape_source_duration_seconds", "Latency of each scraping source, including cut-off attempts", ("source",)
+)
+SCRAPE_SOURCE_RESULTS = REGISTRY.counter(
+    "scrape_source_results_total", "Scraping source outcomes: ok, late, failed, skipped", ("source", "status")
+)
+UPSTREAM_RESPONSES = REGISTRY.counter(
+    "upstream_responses_total", "Upstream responses by host and status code, timeout or error", ("host", "status")
+)
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    "upstream_request_duration_seconds", "Upstream request latency by host", ("host",)
+)
+UPSTREAM_IN_FLIGHT = REGISTRY.gauge(
+    "upstream_connections_in_use", "Upstream connections currently open, by host", ("host",)
+)
+LOOP_LAG = REGISTRY.histogram(
+    "event_loop_lag_seconds", "How late the event loop heartbeat ran",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+LOOP_STALLS = REGISTRY.counter("event_loop_stalls_total", "Times the event loop was blocked beyond the stall threshold")
+
+
+class UpstreamCall:
+    """
+    Records one upstream request: connection in use, latency and status.
+
+    Set `status` once the response arrives; an exception leaving the block
+    is recorded as a timeout, cancellation or error instead.
+    """
+
+    __slots__ = ("host", "status", "_start")
+
+    def __init__(self, url: str):
+        self.host = url_domain(url)
+        self.status: Optional[int] = None
+
+    def __enter__(self) -> "UpstreamCall":
+        UPSTREAM_IN_FLIGHT.inc(host=self.host)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        UPSTREAM_IN_FLIGHT.dec(host=self.host)
+        UPSTREAM_LATENCY.observe(time.perf_counter() - self._start, host=self.host)
+        if self.status is not None:
+            status = str(self.status)
+        elif exc_type is not None and issubclass(exc_type, httpx.TimeoutException):
+            status = "timeout"
+        elif exc_type is not None and issubclass(exc_type, asyncio.CancelledError):
+            status = "cancelled"
+        else:
+            status = "error"
+        UPSTREAM_RESPONSES.inc(host=self.host, status=status)
+
+
+class ServerTiming:
+    """
+    Stage durations of one response.
+
+    Each stage is observed in the stage latency histogram and reported to
+    the client in a Server-Timing header.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.entries: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, elapsed: float) -> None:
+        """Add a stage timed elsewhere."""
+        self.entries.append((name, elapsed))
+        STAGE_LATENCY.observe(elapsed, stage=name)
+
+    def header(self) -> str:
+        entries = self.entries + [("total", time.perf_counter() - self.started_at)]
+        return ", ".join(f"{name};dur={elapsed * 1000:.1f}" for name, elapsed in entries)
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware counting requests in flight, status codes and latency.
+
+    Requests are labelled by the name of the endpoint that handled them,
+    which keeps label cardinality bounded for paths with IDs in them.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            handler = getattr(scope.get("endpoint"), "__name__", "unmatched")
+            HTTP_REQUESTS.inc(method=scope["method"], handler=handler, status=status)
+            HTTP_LATENCY.observe(time.perf_counter() - start, handler=handler)
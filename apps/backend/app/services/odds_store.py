@@ -0,0 +1,281 @@
+import logging
+import math
+import time
+from array import array
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+ODDS_STORE_CONFIG = {
+    "MAX_RECENT_ROWS": 256,  # Full-resolution (per bookmaker) snapshots kept per match
+    "MAX_HISTORY_ROWS": 128,  # Downsampled consensus buckets kept per match
+    "HISTORY_BUCKET_SECONDS": 600,  # Initial width of a downsampled bucket; doubles as history fills
+    "LATEST_PRICE_MAX_AGE": 15 * 60  # Bookmaker prices older than this are ignored for best/consensus
+}
+
+ODDS_MARKETS = ("home_win", "draw", "away_win", "over_2_5", "under_2_5", "btts_yes", "btts_no")
+
+_NAN = float("nan")
+
+
+def _column(values=()) -> array:
+    return array("f", values)
+
+
+class MatchOddsSeries:
+    """
+    Columnar odds time series for one match.
+
+    Recent snapshots are kept per bookmaker in float32 columns (one per
+    market) with int32 second offsets and a uint8 bookmaker index. When the
+    recent window fills, its older half is folded into consensus buckets;
+    when those fill, adjacent buckets are merged and the bucket width
+    doubles. Memory per match therefore stays bounded however many
+    snapshots are recorded.
+    """
+
+    __slots__ = (
+        "base_time", "times", "bookmakers", "columns",
+        "history_times", "history_columns", "bucket_seconds", "snapshots"
+    )
+
+    def __init__(self, base_time: float):
+        self.base_time = int(base_time)
+        self.times = array("i")
+        self.bookmakers = array("B")
+        self.columns = {market: _column() for market in ODDS_MARKETS}
+        self.history_times = array("i")
+        self.history_columns = {market: _column() for market in ODDS_MARKETS}
+        self.bucket_seconds = ODDS_STORE_CONFIG["HISTORY_BUCKET_SECONDS"]
+        self.snapshots = 0
+
+    def append(self, timestamp: float, bookmaker_index: int, odds: Dict[str, float]) -> None:
+        self.times.append(int(timestamp) - self.base_time)
+        self.bookmakers.append(bookmaker_index)
+        for market, column in self.columns.items():
+            column.append(odds.get(market, _NAN))
+        self.snapshots += 1
+
+        if len(self.times) > ODDS_STORE_CONFIG["MAX_RECENT_ROWS"]:
+            self._downsample(len(self.times) // 2)
+
+    def latest_by_bookmaker(self, min_offset: int) -> Dict[int, int]:
+        """Row index of the newest snapshot of each bookmaker at or after min_offset."""
+        latest: Dict[int, int] = {}
+        for row in range(len(self.times) - 1, -1, -1):
+            if self.times[row] < min_offset:
+                break
+            latest.setdefault(self.bookmakers[row], row)
+        return latest
+
+    def consensus_points(self, market: str) -> List[tuple]:
+        """(offset, consensus price) points from history buckets then recent snapshots."""
+        points = [
+            (offset, price)
+            for offset, price in zip(self.history_times, self.history_columns[market])
+            if not math.isnan(price)
+        ]
+        # Recent rows sharing a timestamp are one scrape across bookmakers
+        column = self.columns[market]
+        row = 0
+        while row < len(self.times):
+            offset = self.times[row]
+            prices = []
+            while row < len(self.times) and self.times[row] == offset:
+                if not math.isnan(column[row]):
+                    prices.append(column[row])
+                row += 1
+            if prices:
+                points.append((offset, _consensus_price(prices)))
+        return points
+
+    def memory_bytes(self) -> int:
+        arrays = [self.times, self.bookmakers, self.history_times]
+        arrays += list(self.columns.values()) + list(self.history_columns.values())
+        return sum(column.buffer_info()[1] * column.itemsize for column in arrays)
+
+    def _downsample(self, rows: int) -> None:
+        """Fold the oldest recent rows into consensus buckets of history."""
+        buckets: Dict[int, Dict[str, List[float]]] = {}
+        for row in range(rows):
+            bucket = self.times[row] - self.times[row] % self.bucket_seconds
+            prices = buckets.setdefault(bucket, {market: [] for market in ODDS_MARKETS})
+            for market, column in self.columns.items():
+                if not math.isnan(column[row]):
+                    prices[market].append(column[row])
+
+        for bucket, prices in sorted(buckets.items()):
+            if self.history_times and self.history_times[-1] == bucket:
+                # Bucket continues the last history row; merge with equal weight
+                for market, column in self.history_columns.items():
+                    merged = [p for p in (column[-1],) if not math.isnan(p)] + prices[market]
+                    column[-1] = _consensus_price(merged) if merged else _NAN
+                continue
+            self.history_times.append(bucket)
+            for market, column in self.history_columns.items():
+                column.append(_consensus_price(prices[market]) if prices[market] else _NAN)
+
+        del self.times[:rows]
+        del self.bookmakers[:rows]
+        for column in self.columns.values():
+            del column[:rows]
+
+        while len(self.history_times) > ODDS_STORE_CONFIG["MAX_HISTORY_ROWS"]:
+            self._coarsen_history()
+
+    def _coarsen_history(self) -> None:
+        """Double the bucket width, merging history rows that fall in the same wider bucket."""
+        self.bucket_seconds *= 2
+        times = array("i")
+        columns = {market: _column() for market in ODDS_MARKETS}
+        for row, offset in enumerate(self.history_times):
+            bucket = offset - offset % self.bucket_seconds
+            if times and times[-1] == bucket:
+                for market, column in columns.items():
+                    pair = [p for p in (column[-1], self.history_columns[market][row]) if not math.isnan(p)]
+                    column[-1] = _consensus_price(pair) if pair else _NAN
+            else:
+                times.append(bucket)
+                for market, column in columns.items():
+                    column.append(self.history_columns[market][row])
+        self.history_times = times
+        self.history_columns = columns
+
+
+def _consensus_price(prices: List[float]) -> float:
+    """Consensus decimal odds: the price of the mean implied probability."""
+    return len(prices) / sum(1.0 / price for price in prices)
+
+
+class OddsStore:
+    """
+    In-memory odds time-series store for all matches.
+
+    Every bookmaker snapshot is recorded; queries answer best available
+    price, bookmaker consensus and line movement per market.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._series: Dict[str, MatchOddsSeries] = {}
+        self._bookmaker_names: List[str] = []
+        self._bookmaker_index: Dict[str, int] = {}
+
+    def record(self, match_id: str, bookmaker: str, odds: Dict[str, float], timestamp: Optional[float] = None) -> None:
+        """
+        Record one bookmaker's odds snapshot for a match.
+
+        Args:
+            match_id: Match identifier
+            bookmaker: Bookmaker name
+            odds: Decimal odds per market; unknown markets are ignored
+            timestamp: Snapshot time (epoch seconds), defaults to now
+        """
+        timestamp = self._clock() if timestamp is None else timestamp
+        series = self._series.get(match_id)
+        if series is None:
+            series = self._series[match_id] = MatchOddsSeries(timestamp)
+        series.append(timestamp, self._intern_bookmaker(bookmaker), odds)
+
+    def best_price(self, match_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Highest current price per market and the bookmaker offering it.
+        """
+        series = self._series.get(match_id)
+        if series is None:
+            return {}
+        best: Dict[str, Dict[str, Any]] = {}
+        for bookmaker, row in self._latest_rows(series).items():
+            for market, column in series.columns.items():
+                price = column[row]
+                if not math.isnan(price) and price > best.get(market, {}).get("odds", 0.0):
+                    best[market] = {"odds": round(price, 3), "bookmaker": self._bookmaker_names[bookmaker]}
+        return best
+
+    def consensus(self, match_id: str) -> Dict[str, float]:
+        """
+        Consensus price per market across bookmakers' current prices.
+        """
+        series = self._series.get(match_id)
+        if series is None:
+            return {}
+        latest = self._latest_rows(series)
+        consensus = {}
+        for market, column in series.columns.items():
+            prices = [column[row] for row in latest.values() if not math.isnan(column[row])]
+            if prices:
+                consensus[market] = round(_consensus_price(prices), 3)
+        return consensus
+
+    def line_movement(self, match_id: str, market: str, since: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Consensus price history of a market.
+
+        Args:
+            match_id: Match identifier
+            market: Market key, e.g. "home_win"
+            since: Only include points at or after this epoch time
+
+        Returns:
+            Opening and current consensus price, their change and the points
+        """
+        series = self._series.get(match_id)
+        if series is None or market not in series.columns:
+            return {"market": market, "points": []}
+        points = [
+            (series.base_time + offset, round(price, 3))
+            for offset, price in series.consensus_points(market)
+            if since is None or series.base_time + offset >= since
+        ]
+        if not points:
+            return {"market": market, "points": []}
+        opening, current = points[0][1], points[-1][1]
+        return {
+            "market": market,
+            "opening": opening,
+            "current": current,
+            "change": round(current - opening, 3),
+            "points": [{"timestamp": timestamp, "odds": price} for timestamp, price in points]
+        }
+
+    def snapshot_count(self, match_id: str) -> int:
+        series = self._series.get(match_id)
+        return series.snapshots if series else 0
+
+    def memory_bytes(self, match_id: Optional[str] = None) -> int:
+        """Array memory of one match's series, or of the whole store."""
+        if match_id is not None:
+            series = self._series.get(match_id)
+            return series.memory_bytes() if series else 0
+        return sum(series.memory_bytes() for series in self._series.values())
+
+    def evict_match(self, match_id: str) -> bool:
+        return self._series.pop(match_id, None) is not None
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def _latest_rows(self, series: MatchOddsSeries) -> Dict[int, int]:
+        min_offset = int(self._clock() - ODDS_STORE_CONFIG["LATEST_PRICE_MAX_AGE"]) - series.base_time
+        return series.latest_by_bookmaker(min_offset)
+
+    def _intern_bookmaker(self, bookmaker: str) -> int:
+        index = self._bookmaker_index.get(bookmaker)
+        if index is None:
+            if len(self._bookmaker_names) >= 255:
+                raise ValueError("Odds store supports at most 255 bookmakers")
+            index = self._bookmaker_index[bookmaker] = len(self._bookmaker_names)
+            self._bookmaker_names.append(bookmaker)
+        return index
+
+
+_odds_store: Optional[OddsStore] = None
+
+
+def get_odds_store() -> OddsStore:
+    """Return the process-wide odds store."""
+    global _odds_store
+    if _odds_store is None:
+        _odds_store = OddsStore()
+    return _odds_store
@@ -0,0 +1,124 @@
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..models.match import PredictionResult
+from .shared_cache import SharedCache, get_shared_cache
+
+# Configuration constants
+PREDICTION_CACHE_CONFIG = {
+    "TTL": 60,  # Predictions follow the odds, which are only fresh for a minute
+    "MAX_ENTRIES": 5000
+}
+
+
+class PredictionCache:
+    """
+    Recent predictions keyed by match id and risk level, with a TTL.
+
+    A cached prediction is served without upstream work, so these requests
+    bypass admission control. Degraded predictions are never stored.
+    
+    With a shared cache the predictions live there instead of in this
+    process, so every worker on the host serves the same prediction.
+    Lookups and writes are coroutines so the shared cache's database
+    calls run off the event loop.
+    """
+
+    def __init__(
+        self,
+        ttl: float = PREDICTION_CACHE_CONFIG["TTL"],
+        max_entries: int = PREDICTION_CACHE_CONFIG["MAX_ENTRIES"],
+        clock: Callable[[], float] = time.monotonic,
+        shared: Optional[SharedCache] = None
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self.shared = shared
+        # (match_id, risk_level) -> (stored_at, result)
+        self._entries: Dict[Tuple[str, str], Tuple[float, PredictionResult]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, match_id: str, risk_level: str) -> Optional[PredictionResult]:
+        """Fresh prediction for a match and risk level, or None."""
+        if self.shared is not None:
+            payload = await self.shared.run(self.shared.get_fresh, _shared_key(match_id, risk_level))
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return PredictionResult.model_validate(payload)
+        
+        entry = self._entries.get((match_id, risk_level))
+        if entry is not None and self._clock() - entry[0] < self.ttl:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    async def put(self, match_id: str, risk_level: str, result: PredictionResult) -> None:
+        if result.degraded:
+            return
+        if self.shared is not None:
+            await self.shared.run(self.shared.put, _shared_key(match_id, risk_level), result.model_dump(), self.ttl)
+            return
+        if len(self._entries) >= self.max_entries:
+            self.purge_expired()
+            if len(self._entries) >= self.max_entries:
+                # Dicts keep insertion order; drop the oldest entry
+                del self._entries[next(iter(self._entries))]
+        self._entries.pop((match_id, risk_level), None)
+        self._entries[(match_id, risk_level)] = (self._clock(), result)
+
+    async def evict_match(self, match_id: str) -> int:
+        """Drop every cached prediction of a match. Returns the number removed."""
+        if self.shared is not None:
+            return await self.shared.run(self.shared.delete_prefix, _shared_key(match_id, ""))
+        keys = [key for key in self._entries if key[0] == match_id]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def purge_expired(self) -> int:
+        if self.shared is not None:
+            return self.shared.purge_expired()
+        now = self._clock()
+        expired = [key for key, (stored_at, _) in self._entries.items() if now - stored_at >= self.ttl]
+        for key in expired:
+            del self._entries[key]
+        return len(expired)
+
+    def __len__(self) -> int:
+        if self.shared is not None:
+            return self.shared.count_prefix(_SHARED_PREFIX)
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report cache size and hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "ttl_seconds": self.ttl
+        }
+
+
+_SHARED_PREFIX = "prediction:"
+
+
+def _shared_key(match_id: str, risk_level: str) -> str:
+    return f"{_SHARED_PREFIX}{match_id}:{risk_level}"
+
+
+_prediction_cache: Optional[PredictionCache] = None
+
+
+def get_prediction_cache() -> PredictionCache:
+    """Return the process-wide prediction cache."""
+    global _prediction_cache
+    if _prediction_cache is None:
+        _prediction_cache = PredictionCache(shared=get_shared_cache())
+    return _prediction_cache
@@ -0,0 +1,281 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from ..models.match import PredictionJob, PredictionResult
+from .shared_cache import SharedCache, get_shared_cache
+
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+PREDICTION_JOBS_CONFIG = {
+    "WORKERS": 4,  # Jobs processed at once
+    "MAX_PENDING": 500,  # Queued jobs beyond this are refused
+    "RESULT_TTL_ENV": "PREDICTION_JOB_TTL",
+    "DEFAULT_RESULT_TTL": 10 * 60  # Seconds a finished job stays retrievable
+}
+
+JobWork = Callable[[], Awaitable[PredictionResult]]
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class Job:
+    """State of one prediction job."""
+
+    __slots__ = ("id", "match_id", "risk_level", "status", "result", "error", "created_at", "finished_at", "work")
+
+    def __init__(self, match_id: str, risk_level: str, work: Optional[JobWork], created_at: float):
+        self.id = uuid.uuid4().hex
+        self.match_id = match_id
+        self.risk_level = risk_level
+        self.status = "queued"
+        self.result: Optional[PredictionResult] = None
+        self.error: Optional[str] = None
+        self.created_at = created_at
+        self.finished_at: Optional[float] = None
+        self.work = work
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def finish(self, now: float, result: Optional[PredictionResult] = None, error: Optional[str] = None) -> None:
+        self.status = "failed" if error is not None else "succeeded"
+        self.result = result
+        self.error = error
+        self.finished_at = now
+        self.work = None
+
+    def view(self) -> PredictionJob:
+        return PredictionJob(
+            jobId=self.id,
+            status=self.status,
+            matchId=self.match_id,
+            riskLevel=self.risk_level,
+            result=self.result,
+            error=self.error
+        )
+
+
+class PredictionJobQueue:
+    """
+    In-process queue of prediction jobs served by a fixed pool of workers.
+
+    A job submitted while an identical (match, risk level) job is still
+    queued or running is merged into it and gets the same job id. Finished
+    jobs are kept for `result_ttl` seconds, then forgotten.
+
+    Workers are started on the event loop of the first submission and
+    restarted if a later submission comes from a different loop.
+
+    A job runs in the worker process that accepted it, but the poll for it
+    may land on any worker. With a shared cache every status change is
+    also written there, expiring after `result_ttl`, and lookup() falls
+    back to that copy for jobs of other workers.
+    """
+
+    def __init__(
+        self,
+        workers: int = PREDICTION_JOBS_CONFIG["WORKERS"],
+        max_pending: int = PREDICTION_JOBS_CONFIG["MAX_PENDING"],
+        result_ttl: float = PREDICTION_JOBS_CONFIG["DEFAULT_RESULT_TTL"],
+        clock: Callable[[], float] = time.monotonic,
+        shared: Optional[SharedCache] = None
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._clock = clock
+        self.shared = shared
+        self._writes: Set[asyncio.Task] = set()
+        self._jobs: Dict[str, Job] = {}
+        # (match_id, risk_level) -> job still queued or running
+        self._inflight: Dict[Tuple[str, str], Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.submitted = 0
+        self.merged = 0
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        # Jobs queued on a previous loop are handed to the new workers
+        for job in self._inflight.values():
+            job.status = "queued"
+            self._queue.put_nowait(job)
+        self._tasks = [
+            loop.create_task(self._worker(), name=f"prediction-job-worker-{index}")
+            for index in range(self.workers)
+        ]
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        while True:
+            job = await queue.get()
+            try:
+                await self._run(job)
+            finally:
+                queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        if job.finished:
+            return
+        job.status = "running"
+        self._share(job)
+        try:
+            result = await job.work()
+            job.finish(self._clock(), result=result)
+        except asyncio.CancelledError:
+            job.finish(self._clock(), error="Prediction job was cancelled")
+            raise
+        except Exception as e:
+            logger.warning(f"Prediction job {job.id} for match {job.match_id} failed: {e}")
+            job.finish(self._clock(), error=str(e))
+        finally:
+            self._inflight.pop((job.match_id, job.risk_level), None)
+            self._share(job)
+
+    def _share(self, job: Job) -> None:
+        """Write the job's current state to the shared cache, off the event loop."""
+        if self.shared is None:
+            return
+        task = asyncio.get_running_loop().create_task(self._write_shared(job.view()))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _write_shared(self, view: PredictionJob) -> None:
+        try:
+            await self.shared.run(self.shared.put, _shared_key(view.jobId), view.model_dump(), self.result_ttl)
+        except Exception as e:
+            logger.warning(f"Failed to share prediction job {view.jobId}: {e}")
+
+    def submit(self, match_id: str, risk_level: str, work: JobWork) -> Job:
+        """
+        Queue a prediction, or join the identical one already in flight.
+
+        Args:
+            match_id: Match to predict
+            risk_level: Risk level of the prediction
+            work: Coroutine function producing the prediction
+
+        Returns:
+            The new or merged job
+
+        Raises:
+            JobQueueFull: If max_pending jobs are already waiting
+        """
+        self.purge_expired()
+        key = (match_id, risk_level)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.merged += 1
+            return inflight
+        if len(self._inflight) >= self.max_pending:
+            raise JobQueueFull(f"{len(self._inflight)} prediction jobs pending")
+
+        self._ensure_workers()
+        job = Job(match_id, risk_level, work, self._clock())
+        self._jobs[job.id] = job
+        self._inflight[key] = job
+        self._share(job)
+        self._queue.put_nowait(job)
+        self.submitted += 1
+        return job
+
+    def complete(self, match_id: str, risk_level: str, result: PredictionResult) -> Job:
+        """Record a job that was answered without queueing, e.g. from a cached prediction."""
+        self.purge_expired()
+        job = Job(match_id, risk_level, None, self._clock())
+        job.finish(self._clock(), result=result)
+        self._jobs[job.id] = job
+        self._share(job)
+        self.submitted += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Job of this worker by id; None if unknown or its result has expired."""
+        self.purge_expired()
+        return self._jobs.get(job_id)
+
+    async def lookup(self, job_id: str) -> Optional[PredictionJob]:
+        """
+        State of a job submitted to any worker.
+
+        Returns:
+            The job's view, from this worker or the shared cache; None if
+            unknown or its result has expired
+        """
+        job = self.get(job_id)
+        if job is not None:
+            return job.view()
+        if self.shared is None:
+            return None
+        payload = await self.shared.run(self.shared.get_fresh, _shared_key(job_id))
+        return PredictionJob.model_validate(payload) if payload is not None else None
+
+    def purge_expired(self) -> int:
+        now = self._clock()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and now - job.finished_at >= self.result_ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        return len(expired)
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs still in flight are marked failed."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in list(self._inflight.values()):
+            job.finish(self._clock(), error="Prediction job was cancelled")
+            self._share(job)
+        self._inflight.clear()
+        await asyncio.gather(*self._writes, return_exceptions=True)
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def stats(self) -> Dict[str, Any]:
+        statuses = {"queued": 0, "running": 0, "succeeded": 0, "failed": 0}
+        for job in self._jobs.values():
+            statuses[job.status] += 1
+        return {
+            "workers": len(self._tasks),
+            "jobs": statuses,
+            "submitted": self.submitted,
+            "merged": self.merged,
+            "result_ttl_seconds": self.result_ttl
+        }
+
+
+def _shared_key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+_prediction_job_queue: Optional[PredictionJobQueue] = None
+
+
+def get_prediction_job_queue() -> PredictionJobQueue:
+    """Return the process-wide prediction job queue, sharing job state when the shared cache is enabled."""
+    global _prediction_job_queue
+    if _prediction_job_queue is None:
+        _prediction_job_queue = PredictionJobQueue(
+            result_ttl=float(os.environ.get(
+                PREDICTION_JOBS_CONFIG["RESULT_TTL_ENV"], PREDICTION_JOBS_CONFIG["DEFAULT_RESULT_TTL"]
+            )),
+            shared=get_shared_cache()
+        )
+    return _prediction_job_queue
@@ -1,9 +1,12 @@
 import logging
+import math
 import random
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 
 from ..models.match import Match, PredictionResult
+from ..models.scraped_data import ScrapedMatchData
+from .team_stats_cache import TeamStatsCache
 
 logger = logging.getLogger(__name__)
 
@@ -18,10 +21,16 @@ ANALYSIS_CONSTANTS = {
     "GOALS_PER_GAME_RANGE": (0.8, 2.5),
     "RATIONALE_MIN_LENGTH": 20,
     "EVENING_HOUR_THRESHOLD": 18,
-    "WEEKEND_DAY_THRESHOLD": 5
+    "WEEKEND_DAY_THRESHOLD": 5,
+    "STRENGTH_GOAL_FACTOR": 0.25,
+    "SEASON_GOALS_WEIGHT": 0.5,  # Blend of season goal rate vs recent form in expected goals
+    "MAX_GOALS_MODELLED": 10
 }
 
 
+ScrapedInput = Optional[Union[ScrapedMatchData, Dict[str, Any]]]
+
+
 class PredictionService:
     """
     AI Prediction Service for generating betting recommendations.
@@ -30,7 +39,8 @@ class PredictionService:
     based on risk levels and data analysis.
     """
     
-    def __init__(self):
+    def __init__(self, team_stats: Optional[TeamStatsCache] = None):
+        self.team_stats = team_stats
         self.risk_level_mappings = {
             "Low": {"multiplier": 0.5, "variance": 0.1},
             "Medium": {"multiplier": 1.0, "variance": 0.3}, 
@@ -41,7 +51,7 @@ class PredictionService:
         self, 
         match: Match, 
         risk_level: str,
-        scraped_data: Dict[str, Any] = None
+        scraped_data: ScrapedInput = None
     ) -> PredictionResult:
         """
         Generate AI betting prediction for a match based on analysis and risk level.
@@ -82,7 +92,7 @@ class PredictionService:
             logger.error(f"Error generating prediction: {e}")
             raise RuntimeError(f"Prediction generation failed: {str(e)}")
     
-    async def _analyze_match_data(self, match: Match, scraped_data: Dict[str, Any] = None) -> Dict[str, Any]:
+    async def _analyze_match_data(self, match: Match, scraped_data: ScrapedInput = None) -> Dict[str, Any]:
         """
         Analyze available match data to inform prediction logic.
         
@@ -101,6 +111,10 @@ class PredictionService:
             "match_context": self._analyze_match_context(match)
         }
         
+        season_stats = self._lookup_team_statistics(match)
+        if season_stats:
+            analysis["team_statistics"] = season_stats
+        
         # Incorporate scraped data if available
         if scraped_data:
             analysis["external_insights"] = self._process_scraped_insights(scraped_data)
@@ -235,16 +249,122 @@ class PredictionService:
             "importance": random.choice(["low", "medium", "high"])
         }
     
-    def _process_scraped_insights(self, scraped_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Process web-scraped data for additional insights."""
+    def _process_scraped_insights(self, scraped_data: Union[ScrapedMatchData, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Process web-scraped data for additional insights.
+        
+        The typed records are referenced, not copied; plain dicts from
+        external callers are converted once here.
+        """
+        if isinstance(scraped_data, dict):
+            scraped_data = ScrapedMatchData.from_dict(scraped_data)
         # MVP implementation - basic processing
+        team_news = scraped_data.team_news
         return {
-            "injury_reports": scraped_data.get("injuries", []),
-            "weather_conditions": scraped_data.get("weather", {}),
-            "betting_odds": scraped_data.get("odds", {}),
-            "expert_predictions": scraped_data.get("expert_tips", [])
+            "injury_reports": team_news.injury_reports() if team_news is not None else [],
+            "weather_conditions": scraped_data.weather_conditions,
+            "betting_odds": scraped_data.betting_odds,
+            "expert_predictions": scraped_data.expert_predictions
         }
     
+    async def estimate_market_probabilities(
+        self,
+        match: Match,
+        scraped_data: ScrapedInput = None
+    ) -> Dict[str, float]:
+        """
+        Estimate model probabilities for every priced betting market of a match.
+        
+        Expected goals for each side are derived from the match analysis and
+        fed into an independent Poisson score model.
+        
+        Args:
+            match: Match to price
+            scraped_data: Optional additional match data from web scraping
+            
+        Returns:
+            Dictionary mapping market key (e.g. "home_win", "over_2_5") to probability
+        """
+        analysis = await self._analyze_match_data(match, scraped_data)
+        home_xg, away_xg = self._expected_goals(analysis)
+        return self._poisson_market_probabilities(home_xg, away_xg)
+    
+    def _lookup_team_statistics(self, match: Match) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Read cached season statistics for both teams, if both are available."""
+        if self.team_stats is None:
+            return None
+        home = self.team_stats.get(match.homeTeam)
+        away = self.team_stats.get(match.awayTeam)
+        if home is None or away is None:
+            return None
+        return {"home": home, "away": away}
+    
+    def _expected_goals(self, analysis: Dict[str, Any]) -> tuple[float, float]:
+        """Derive expected goals for home and away sides from the analysis."""
+        form = analysis["recent_form"]
+        strength = analysis["team_strength_differential"] * ANALYSIS_CONSTANTS["STRENGTH_GOAL_FACTOR"]
+        home_rate = form["home_goals_per_game"]
+        away_rate = form["away_goals_per_game"]
+        
+        season_stats = analysis.get("team_statistics")
+        if season_stats:
+            weight = ANALYSIS_CONSTANTS["SEASON_GOALS_WEIGHT"]
+            home_rate = self._blend_goal_rate(home_rate, season_stats["home"], weight)
+            away_rate = self._blend_goal_rate(away_rate, season_stats["away"], weight)
+        
+        home_xg = home_rate * (1.0 + analysis["home_advantage"]) * math.exp(strength)
+        away_xg = away_rate * math.exp(-strength)
+        return home_xg, away_xg
+    
+    @staticmethod
+    def _blend_goal_rate(form_rate: float, stats: Dict[str, Any], weight: float) -> float:
+        """Blend a recent-form goal rate with the season goals-per-game rate."""
+        games_played = stats.get("games_played") or 0
+        if games_played <= 0 or "goals_for" not in stats:
+            return form_rate
+        return (1.0 - weight) * form_rate + weight * stats["goals_for"] / games_played
+    
+    def _poisson_market_probabilities(self, home_xg: float, away_xg: float) -> Dict[str, float]:
+        """Compute 1X2, over/under 2.5 and both-teams-to-score probabilities."""
+        max_goals = ANALYSIS_CONSTANTS["MAX_GOALS_MODELLED"]
+        home_pmf = self._poisson_pmf(home_xg, max_goals)
+        away_pmf = self._poisson_pmf(away_xg, max_goals)
+        
+        home_win = draw = away_win = under_2_5 = 0.0
+        for home_goals, p_home in enumerate(home_pmf):
+            for away_goals, p_away in enumerate(away_pmf):
+                p = p_home * p_away
+                if home_goals > away_goals:
+                    home_win += p
+                elif home_goals == away_goals:
+                    draw += p
+                else:
+                    away_win += p
+                if home_goals + away_goals <= 2:
+                    under_2_5 += p
+        
+        # Renormalise for the probability mass beyond the modelled goal cap
+        total = home_win + draw + away_win
+        btts_yes = (1.0 - home_pmf[0] / sum(home_pmf)) * (1.0 - away_pmf[0] / sum(away_pmf))
+        
+        return {
+            "home_win": home_win / total,
+            "draw": draw / total,
+            "away_win": away_win / total,
+            "over_2_5": 1.0 - under_2_5 / total,
+            "under_2_5": under_2_5 / total,
+            "btts_yes": btts_yes,
+            "btts_no": 1.0 - btts_yes
+        }
+    
+    @staticmethod
+    def _poisson_pmf(rate: float, max_goals: int) -> List[float]:
+        """Poisson probabilities for 0..max_goals goals."""
+        pmf = [math.exp(-rate)]
+        for goals in range(1, max_goals + 1):
+            pmf.append(pmf[-1] * rate / goals)
+        return pmf
+    
     def _apply_analysis_to_selection(
         self, 
         suggestions: List[str], 
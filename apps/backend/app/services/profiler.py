@@ -0,0 +1,244 @@
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+
+from .admin_auth import ADMIN_CONFIG, admin_authorized
+
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+PROFILER_CONFIG = {
+    "HEADER": "X-Profile",  # "1" profiles this request
+    "QUERY_FLAG": "profile",  # ?profile=1 does the same
+    "ID_HEADER": "X-Profile-Id",  # Response header naming the stored profile
+    "SAMPLE_EVERY_ENV": "PROFILE_SAMPLE_EVERY",  # Profile 1 in N requests; 0 disables sampling mode
+    "DIR_ENV": "PROFILE_DIR",
+    "DEFAULT_DIR": os.path.join(".cache", "profiles"),
+    "INTERVAL": 0.005,  # Seconds between stack samples
+    "MAX_DEPTH": 64,
+    "MAX_PROFILES": 50,  # Oldest stored profiles are deleted beyond this
+    "MAX_CONCURRENT": 2  # Profiled requests at once; further triggers are ignored
+}
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack from a background thread.
+
+    Stacks are counted in collapsed form ("outer;inner;leaf"), which
+    flamegraph.pl and speedscope read directly. The sampled thread runs
+    untouched, so the cost is the sampler's own work every interval.
+    """
+
+    def __init__(self, thread_id: int, interval: float = PROFILER_CONFIG["INTERVAL"]):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            self.stacks[collapse_stack(frame)] += 1
+            self.samples += 1
+
+
+def collapse_stack(frame) -> str:
+    """Render a frame and its callers root-first as a collapsed-stack line."""
+    names = []
+    while frame is not None and len(names) < PROFILER_CONFIG["MAX_DEPTH"]:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class ProfileStore:
+    """
+    Stored profiles in a local directory.
+
+    Each profile is a collapsed-stack file with a JSON metadata file next
+    to it; only the newest MAX_PROFILES are kept.
+    """
+
+    def __init__(self, directory: str, max_profiles: int = PROFILER_CONFIG["MAX_PROFILES"]):
+        self.directory = directory
+        self.max_profiles = max_profiles
+
+    def _path(self, profile_id: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.{extension}")
+
+    def save(self, meta: Dict[str, Any], stacks: Dict[str, int]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(meta["id"], "collapsed"), "w", encoding="utf-8") as f:
+            for stack, count in sorted(stacks.items(), key=lambda item: item[1], reverse=True):
+                f.write(f"{stack} {count}\n")
+        with open(self._path(meta["id"], "json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        self._prune()
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Metadata of stored profiles, newest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        profiles = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), encoding="utf-8") as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable profile {name}: {e}")
+        return sorted(profiles, key=lambda meta: meta["started_at"], reverse=True)
+
+    def load(self, profile_id: str) -> Optional[str]:
+        """Collapsed stacks of a profile, None if it does not exist."""
+        if os.path.basename(profile_id) != profile_id:
+            return None
+        try:
+            with open(self._path(profile_id, "collapsed"), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _prune(self) -> None:
+        # File times order profiles without parsing every metadata file; ids start with a timestamp
+        entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".json")]
+        entries.sort(key=lambda entry: (entry.stat().st_mtime_ns, entry.name), reverse=True)
+        for entry in entries[self.max_profiles:]:
+            profile_id = entry.name[:-len(".json")]
+            for extension in ("collapsed", "json"):
+                try:
+                    os.remove(self._path(profile_id, extension))
+                except FileNotFoundError:
+                    pass
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling requests on demand.
+
+    A request is profiled when it carries the X-Profile header or the
+    ?profile=1 flag (plus the admin token when one is configured), or when
+    it is the Nth request in sampling mode. The event loop thread is
+    sampled for as long as the request runs, so concurrent requests on the
+    same worker show up in the profile as well. Requests that are not
+    profiled only pay for the trigger check.
+    """
+
+    def __init__(self, app, store: Optional[ProfileStore] = None, sample_every: Optional[int] = None):
+        self.app = app
+        self.store = store
+        self.sample_every = sample_every
+        self._requests = itertools.count(1)
+        self._active = 0
+        self._query_flag = f"{PROFILER_CONFIG['QUERY_FLAG']}=".encode()
+
+    def _sample_every(self) -> int:
+        if self.sample_every is None:
+            self.sample_every = int(os.environ.get(PROFILER_CONFIG["SAMPLE_EVERY_ENV"], "0"))
+        return self.sample_every
+
+    def _trigger(self, scope) -> Optional[str]:
+        header = PROFILER_CONFIG["HEADER"].lower().encode()
+        token_header = ADMIN_CONFIG["HEADER"].lower().encode()
+        requested = False
+        token = None
+        for name, value in scope["headers"]:
+            if name == header:
+                requested = value == b"1"
+            elif name == token_header:
+                token = value.decode("latin-1")
+        if not requested and self._query_flag in scope["query_string"]:
+            flag = parse_qs(scope["query_string"].decode("latin-1")).get(PROFILER_CONFIG["QUERY_FLAG"])
+            requested = flag == ["1"]
+        if requested and admin_authorized(token):
+            return "requested"
+
+        sample_every = self._sample_every()
+        if sample_every > 0 and next(self._requests) % sample_every == 0:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trigger = self._trigger(scope)
+        if trigger is None or self._active >= PROFILER_CONFIG["MAX_CONCURRENT"]:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        status = 500
+
+        async def send_with_profile_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((PROFILER_CONFIG["ID_HEADER"].lower().encode(), profile_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        self._active += 1
+        started_at = time.time()
+        sampler = StackSampler(threading.get_ident()).start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            stacks = sampler.stop()
+            self._active -= 1
+            meta = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status,
+                "trigger": trigger,
+                "started_at": started_at,
+                "duration_ms": round((time.time() - started_at) * 1000, 1),
+                "samples": sampler.samples,
+                "interval_ms": sampler.interval * 1000
+            }
+            try:
+                # Writing and pruning profiles is disk I/O; keep it off the event loop
+                await asyncio.to_thread((self.store or get_profile_store()).save, meta, stacks)
+                logger.info(f"Stored profile {profile_id} for {scope['method']} {scope['path']} ({sampler.samples} samples)")
+            except OSError as e:
+                logger.error(f"Failed to store profile {profile_id}: {e}")
+
+
+_profile_store: Optional[ProfileStore] = None
+
+
+def get_profile_store() -> ProfileStore:
+    """Return the process-wide profile store in PROFILE_DIR."""
+    global _profile_store
+    if _profile_store is None:
+        directory = os.environ.get(PROFILER_CONFIG["DIR_ENV"], PROFILER_CONFIG["DEFAULT_DIR"])
+        _profile_store = ProfileStore(directory)
+    return _profile_store
@@ -0,0 +1,339 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent writers are not serialized
+    fcntl = None
+
+from ..models.scraped_data import section_from_dict
+
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+SCRAPE_CACHE_CONFIG = {
+    "PATH_ENV": "SCRAPE_CACHE_PATH",
+    "DEFAULT_PATH": os.path.join(".cache", "scrape_cache.json"),
+    "FLUSH_INTERVAL": 5.0,  # Minimum seconds between disk writes
+    # Seconds each scraped section stays fresh; sections change at very different rates
+    "SECTION_TTLS": {
+        "betting_odds": 60,
+        "weather_conditions": 60 * 60,
+        "expert_predictions": 6 * 60 * 60,
+        "match_statistics": 12 * 60 * 60,
+        "team_statistics": 12 * 60 * 60,
+        "team_news": 24 * 60 * 60,
+        "head_to_head": 7 * 24 * 60 * 60,
+        "stadium_info": 7 * 24 * 60 * 60
+    }
+}
+
+
+class ScrapeCache:
+    """
+    Scraped match data cache keyed by match id and section, with a TTL per section.
+
+    Entries are persisted to a local JSON file so fresh sections survive a
+    restart. Timestamps are wall-clock so ages remain valid after reload.
+    Typed section records are written through their to_dict() and rebuilt
+    by the optional decode callable on load. Every worker shares the file:
+    a write merges with what is already on disk under a file lock, so one
+    worker's flush does not discard another's entries.
+    """
+
+    def __init__(
+        self,
+        section_ttls: Optional[Dict[str, float]] = None,
+        path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+        decode: Optional[Callable[[str, Any], Any]] = None
+    ):
+        self.section_ttls = dict(section_ttls or SCRAPE_CACHE_CONFIG["SECTION_TTLS"])
+        self.path = path
+        self._decode = decode
+        self.flush_interval = SCRAPE_CACHE_CONFIG["FLUSH_INTERVAL"]
+        self._clock = clock
+
+        # (match_id, section) -> (fetched_at, value)
+        self._entries: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._hits: Dict[str, int] = {section: 0 for section in self.section_ttls}
+        self._misses: Dict[str, int] = {section: 0 for section in self.section_ttls}
+        self._dirty = False
+        self._last_flush = 0.0
+        # Keys dropped since the last write, so the merge does not bring them back
+        self._removed: Set[Tuple[str, str]] = set()
+        self._writing = False
+
+        if self.path:
+            self._load()
+
+    def get_fresh_sections(self, match_id: str, sections: Iterable[str]) -> Dict[str, Any]:
+        """
+        Return cached values for the requested sections that have not expired.
+
+        Args:
+            match_id: Match identifier
+            sections: Section names to look up
+
+        Returns:
+            Dictionary of section name to cached value, for fresh sections only
+        """
+        now = self._clock()
+        fresh = {}
+        for section in sections:
+            entry = self._entries.get((match_id, section))
+            if entry is not None and now - entry[0] < self.section_ttls.get(section, 0):
+                fresh[section] = entry[1]
+                self._hits[section] = self._hits.get(section, 0) + 1
+            else:
+                self._misses[section] = self._misses.get(section, 0) + 1
+        return fresh
+
+    def get_stale_sections(self, match_id: str, sections: Iterable[str]) -> Dict[str, Any]:
+        """
+        Return cached values for the requested sections whatever their age.
+
+        Used as a last resort when a request runs out of time to scrape;
+        expired entries are kept until purge_expired() drops them.
+        """
+        stale = {}
+        for section in sections:
+            entry = self._entries.get((match_id, section))
+            if entry is not None:
+                stale[section] = entry[1]
+        return stale
+
+    def put_sections(self, match_id: str, sections: Dict[str, Any]) -> None:
+        """
+        Store freshly scraped sections for a match.
+        """
+        if not sections:
+            return
+        now = self._clock()
+        for section, value in sections.items():
+            self._entries[(match_id, section)] = (now, value)
+            self._removed.discard((match_id, section))
+        self._dirty = True
+
+    def evict_match(self, match_id: str) -> int:
+        """
+        Drop every cached section of a match. Returns the number of entries removed.
+        """
+        keys = [key for key in self._entries if key[0] == match_id]
+        for key in keys:
+            del self._entries[key]
+        self._removed.update(keys)
+        if keys:
+            self._dirty = True
+        return len(keys)
+
+    def purge_expired(self) -> int:
+        """
+        Drop all expired entries. Returns the number of entries removed.
+        """
+        now = self._clock()
+        expired = [
+            key for key, (fetched_at, _) in self._entries.items()
+            if now - fetched_at >= self.section_ttls.get(key[1], 0)
+        ]
+        for key in expired:
+            del self._entries[key]
+        self._removed.update(expired)
+        if expired:
+            self._dirty = True
+        return len(expired)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Report hit rate, entry count and data age for each section.
+        """
+        now = self._clock()
+        ages: Dict[str, list] = {section: [] for section in self.section_ttls}
+        for (_, section), (fetched_at, _) in self._entries.items():
+            ages.setdefault(section, []).append(now - fetched_at)
+
+        report = {}
+        for section, section_ages in ages.items():
+            hits = self._hits.get(section, 0)
+            misses = self._misses.get(section, 0)
+            lookups = hits + misses
+            report[section] = {
+                "ttl_seconds": self.section_ttls.get(section),
+                "entries": len(section_ages),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "max_age_seconds": round(max(section_ages), 1) if section_ages else None,
+                "mean_age_seconds": round(sum(section_ages) / len(section_ages), 1) if section_ages else None
+            }
+        return report
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def flush(self, force: bool = False) -> None:
+        """
+        Persist entries to disk if anything changed since the last write.
+
+        Writes are rate limited by FLUSH_INTERVAL unless force is set, and
+        go through a temporary file so a crash never leaves a torn cache.
+        Blocks on serialization and disk I/O; on the event loop use aflush().
+        """
+        snapshot = self._snapshot(force)
+        if snapshot is not None:
+            self._finish_write(snapshot, self._write(*snapshot))
+
+    async def aflush(self, force: bool = False) -> None:
+        """
+        Like flush(), but serialize and write in a worker thread.
+
+        The entries are copied on the event loop, so sections stored while
+        the write is in progress are left dirty for the next flush.
+        """
+        snapshot = self._snapshot(force)
+        if snapshot is None:
+            return
+        try:
+            written = await asyncio.to_thread(self._write, *snapshot)
+        except asyncio.CancelledError:
+            self._finish_write(snapshot, False)
+            raise
+        self._finish_write(snapshot, written)
+
+    def _snapshot(self, force: bool) -> Optional[Tuple[List[List[Any]], Set[Tuple[str, str]]]]:
+        """Claim the pending changes for one write, or None if there is nothing to do yet."""
+        if not self.path or not self._dirty or self._writing:
+            return None
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return None
+
+        payload = [
+            [match_id, section, fetched_at, value]
+            for (match_id, section), (fetched_at, value) in self._entries.items()
+        ]
+        removed, self._removed = self._removed, set()
+        self._dirty = False
+        self._writing = True
+        self._last_flush = now
+        return payload, removed
+
+    def _finish_write(self, snapshot: Tuple[List[List[Any]], Set[Tuple[str, str]]], written: bool) -> None:
+        self._writing = False
+        if not written:
+            # Keep the changes pending so the next flush retries them
+            self._dirty = True
+            self._removed |= snapshot[1]
+
+    def _write(self, payload: List[List[Any]], removed: Set[Tuple[str, str]]) -> bool:
+        """
+        Merge entries into the file on disk and replace it atomically.
+
+        Entries other workers wrote are kept unless this worker holds a
+        newer copy, has removed them, or they have expired.
+
+        Returns:
+            True if the file was written
+        """
+        tmp_path = None
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            with open(self.path + ".lock", "a") as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                merged = self._merge_on_disk(payload, removed)
+                fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".scrape_cache.")
+                with os.fdopen(fd, "w") as handle:
+                    json.dump(merged, handle, default=_encode_record)
+                os.replace(tmp_path, self.path)
+                tmp_path = None
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to persist scrape cache to {self.path}: {e}")
+            return False
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    def _merge_on_disk(self, payload: List[List[Any]], removed: Set[Tuple[str, str]]) -> List[List[Any]]:
+        try:
+            with open(self.path) as handle:
+                on_disk = json.load(handle)
+        except (OSError, ValueError):
+            return payload
+        if not isinstance(on_disk, list):
+            return payload
+
+        now = self._clock()
+        merged = {(entry[0], entry[1]): entry for entry in payload}
+        for entry in on_disk:
+            try:
+                match_id, section, fetched_at, _ = entry
+                key = (match_id, section)
+                if key in removed or now - fetched_at >= self.section_ttls.get(section, 0):
+                    continue
+                current = merged.get(key)
+                if current is None or current[2] < fetched_at:
+                    # Kept raw: another worker's value is written back as it was read
+                    merged[key] = entry
+            except (ValueError, TypeError):
+                continue
+        return list(merged.values())
+
+    def _load(self) -> None:
+        """Load persisted entries, skipping anything expired or unreadable."""
+        try:
+            with open(self.path) as handle:
+                payload = json.load(handle)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable scrape cache {self.path}: {e}")
+            return
+
+        if not isinstance(payload, list):
+            logger.warning(f"Ignoring scrape cache {self.path} with unexpected layout")
+            return
+
+        now = self._clock()
+        skipped = 0
+        for entry in payload:
+            # Entries written by older versions or damaged on disk are dropped one by one
+            try:
+                match_id, section, fetched_at, value = entry
+                if now - fetched_at < self.section_ttls.get(section, 0):
+                    if self._decode is not None:
+                        value = self._decode(section, value)
+                    self._entries[(match_id, section)] = (fetched_at, value)
+            except (ValueError, TypeError, KeyError, AttributeError):
+                skipped += 1
+        if skipped:
+            logger.warning(f"Skipped {skipped} unreadable entries in scrape cache {self.path}")
+        logger.info(f"Loaded {len(self._entries)} scraped sections from {self.path}")
+
+
+def _encode_record(value: Any) -> Any:
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    raise TypeError(f"Cannot persist {type(value).__name__} in the scrape cache")
+
+
+_scrape_cache: Optional[ScrapeCache] = None
+
+
+def get_scrape_cache() -> ScrapeCache:
+    """Return the process-wide scrape cache, persisted to SCRAPE_CACHE_PATH."""
+    global _scrape_cache
+    if _scrape_cache is None:
+        path = os.environ.get(SCRAPE_CACHE_CONFIG["PATH_ENV"], SCRAPE_CACHE_CONFIG["DEFAULT_PATH"])
+        _scrape_cache = ScrapeCache(path=path, decode=section_from_dict)
+    return _scrape_cache
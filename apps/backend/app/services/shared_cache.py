@@ -0,0 +1,331 @@
+import asyncio
+import concurrent.futures
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Configuration constants
+SHARED_CACHE_CONFIG = {
+    "PATH_ENV": "SHARED_CACHE_PATH",  # Empty disables the shared cache
+    "DEFAULT_PATH": os.path.join(".cache", "shared_cache.sqlite3"),
+    "BUSY_TIMEOUT": 1.0,  # Seconds a write waits for another worker's lock
+    "LEASE_TTL": 30.0,  # A refresh lease outlives any upstream fetch, and expires if its worker dies
+    "REFRESH_WAIT": 2.0,  # How long a worker with nothing cached waits for the leader's refresh
+    "POLL_INTERVAL": 0.05,
+    "PURGE_EVERY": 200,  # Writes between sweeps of expired entries
+    "UPDATE_RETENTION": 60.0,  # Seconds pushed updates stay in the log for other workers to relay
+    "PAGE_CACHE_KIB": 2048  # SQLite page cache per worker
+}
+
+
+class SharedEntry(NamedTuple):
+    value: Any
+    updated_at: float
+    expires_at: float
+
+    def fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+
+class SharedCache:
+    """
+    Host-wide key/value cache shared by every worker process, backed by SQLite.
+
+    Values are stored once as JSON in a WAL-mode database, so readers in
+    any worker see the same data without holding their own copy. When an
+    entry goes stale, workers elect a refresher through a lease row: the
+    lease holder calls upstream and writes the new value, the others keep
+    serving the stale one meanwhile. Upstream calls therefore stay at one
+    per refresh however many workers run.
+
+    Each process opens its own connection on first use, so an instance
+    created before forking is safe to use in the workers.
+
+    The database methods are blocking: a write waits up to BUSY_TIMEOUT
+    for another worker's lock. Coroutines call them through run(), which
+    executes them on this process's single database thread, so lock
+    contention never stalls the event loop.
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self._clock = clock
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self.holder = f"{socket.gethostname()}:{os.getpid()}"
+        self._writes = 0
+        self._update_writes = 0
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.stale_served = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        if self._conn is not None and self._pid == pid:
+            return self._conn
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # Used from the database thread, and directly by synchronous callers
+        conn = sqlite3.connect(
+            self.path, timeout=SHARED_CACHE_CONFIG["BUSY_TIMEOUT"], isolation_level=None, check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{SHARED_CACHE_CONFIG['PAGE_CACHE_KIB']}")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, holder TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS updates (id INTEGER PRIMARY KEY AUTOINCREMENT, dedupe TEXT UNIQUE, "
+            "topics TEXT NOT NULL, message TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn = conn
+        self._pid = pid
+        self.holder = f"{socket.gethostname()}:{pid}"
+        return conn
+
+    async def run(self, method: Callable[..., T], *args: Any) -> T:
+        """Run a blocking database method on this process's database thread."""
+        pid = os.getpid()
+        if self._executor is None or self._executor_pid != pid:
+            # Threads do not survive fork; each worker starts its own
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="shared-cache")
+            self._executor_pid = pid
+        return await asyncio.get_running_loop().run_in_executor(self._executor, method, *args)
+
+    def close(self) -> None:
+        """Close this process's connection and database thread; the next use reopens them."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def get(self, key: str) -> Optional[SharedEntry]:
+        """Entry for a key whatever its age, None if never stored."""
+        row = self._connection().execute(
+            "SELECT value, updated_at, expires_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return SharedEntry(json.loads(row[0]), row[1], row[2])
+
+    def get_fresh(self, key: str) -> Optional[Any]:
+        """Value of a key if it has not expired."""
+        entry = self.get(key)
+        if entry is not None and entry.fresh(self._clock()):
+            self.hits += 1
+            return entry.value
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value: Any, ttl: float) -> None:
+        now = self._clock()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO entries (key, value, updated_at, expires_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), now, now + ttl)
+        )
+        self._writes += 1
+        if self._writes % SHARED_CACHE_CONFIG["PURGE_EVERY"] == 0:
+            self.purge_expired()
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Drop every key starting with prefix. Returns the number removed."""
+        cursor = self._connection().execute(
+            "DELETE FROM entries WHERE key LIKE ? ESCAPE '\\'", (_like_prefix(prefix),)
+        )
+        return cursor.rowcount
+
+    def count_prefix(self, prefix: str) -> int:
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM entries WHERE key LIKE ? ESCAPE '\\'", (_like_prefix(prefix),)
+        ).fetchone()[0]
+
+    def purge_expired(self) -> int:
+        cursor = self._connection().execute("DELETE FROM entries WHERE expires_at <= ?", (self._clock(),))
+        return cursor.rowcount
+
+    def append_update(self, topics: List[str], message: str, dedupe: Optional[str] = None) -> bool:
+        """
+        Add a serialized push update to the log every worker relays from.
+
+        Args:
+            topics: Topics the update belongs to
+            message: The update, already serialized
+            dedupe: Key shared by copies of the same update published by
+                several workers; only the first copy is kept
+
+        Returns:
+            False if a copy with the same dedupe key is already logged
+        """
+        now = self._clock()
+        conn = self._connection()
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO updates (dedupe, topics, message, created_at) VALUES (?, ?, ?, ?)",
+            (dedupe, json.dumps(topics), message, now)
+        )
+        self._update_writes += 1
+        if self._update_writes % SHARED_CACHE_CONFIG["PURGE_EVERY"] == 0:
+            conn.execute("DELETE FROM updates WHERE created_at <= ?", (now - SHARED_CACHE_CONFIG["UPDATE_RETENTION"],))
+        return cursor.rowcount == 1
+
+    def updates_after(self, after: int, limit: int) -> List[Tuple[int, List[str], str]]:
+        """Logged updates newer than an id, oldest first, as (id, topics, message)."""
+        rows = self._connection().execute(
+            "SELECT id, topics, message FROM updates WHERE id > ? ORDER BY id LIMIT ?", (after, limit)
+        ).fetchall()
+        return [(update_id, json.loads(topics), message) for update_id, topics, message in rows]
+
+    def last_update_id(self) -> int:
+        return self._connection().execute("SELECT COALESCE(MAX(id), 0) FROM updates").fetchone()[0]
+
+    def acquire_lease(self, name: str, ttl: float = SHARED_CACHE_CONFIG["LEASE_TTL"]) -> bool:
+        """
+        Try to become the one worker holding a named lease.
+
+        Succeeds if the lease is free, expired or already ours; the upsert
+        is a single statement, so two workers can never both win.
+        """
+        now = self._clock()
+        cursor = self._connection().execute(
+            "INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at "
+            "WHERE leases.holder = excluded.holder OR leases.expires_at <= ?",
+            (name, self.holder, now + ttl, now)
+        )
+        return cursor.rowcount == 1
+
+    def release_lease(self, name: str) -> None:
+        self._connection().execute("DELETE FROM leases WHERE name = ? AND holder = ?", (name, self.holder))
+
+    async def get_or_refresh(
+        self,
+        key: str,
+        ttl: float,
+        fetch: Callable[[], Awaitable[Any]],
+        wait: float = SHARED_CACHE_CONFIG["REFRESH_WAIT"]
+    ) -> Any:
+        """
+        Fresh value of a key, refreshed by a single elected worker when stale.
+
+        Args:
+            key: Cache key
+            ttl: Seconds a refreshed value stays fresh
+            fetch: Coroutine function producing a JSON-serializable value
+            wait: Seconds to wait for another worker's refresh when nothing
+                is cached yet
+
+        Returns:
+            The fresh value, or the stale one while another worker refreshes it
+        """
+        entry = await self.run(self.get, key)
+        now = self._clock()
+        if entry is not None and entry.fresh(now):
+            self.hits += 1
+            return entry.value
+        self.misses += 1
+
+        # The lease is per process, so coroutines of this worker share one refresh
+        refresh = self._inflight.get(key)
+        if refresh is None:
+            refresh = asyncio.ensure_future(self._refresh(key, ttl, fetch, wait, entry))
+            self._inflight[key] = refresh
+            refresh.add_done_callback(lambda task: self._refresh_done(key, task))
+        elif entry is not None:
+            self.stale_served += 1
+            return entry.value
+        # The refresh runs as its own task: a caller cancelled meanwhile does
+        # not cancel it for the others waiting on it
+        return await asyncio.shield(refresh)
+
+    def _refresh_done(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # Mark retrieved so a failed refresh nobody awaits doesn't log a warning
+            task.exception()
+
+    async def _refresh(
+        self,
+        key: str,
+        ttl: float,
+        fetch: Callable[[], Awaitable[Any]],
+        wait: float,
+        stale: Optional[SharedEntry]
+    ) -> Any:
+        """Refresh a key if this worker wins the lease, else serve stale data or wait for the leader."""
+        lease = f"refresh:{key}"
+        if await self.run(self.acquire_lease, lease):
+            try:
+                value = await fetch()
+                await self.run(self.put, key, value, ttl)
+                self.refreshes += 1
+                return value
+            finally:
+                await self.run(self.release_lease, lease)
+
+        if stale is not None:
+            self.stale_served += 1
+            return stale.value
+
+        # Cold start: wait for the leader's value rather than calling upstream too
+        waited = 0.0
+        while waited < wait:
+            await asyncio.sleep(SHARED_CACHE_CONFIG["POLL_INTERVAL"])
+            waited += SHARED_CACHE_CONFIG["POLL_INTERVAL"]
+            entry = await self.run(self.get, key)
+            if entry is not None:
+                return entry.value
+        logger.warning(f"No shared value for {key} after {wait}s, fetching it directly")
+        return await fetch()
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Report entry count, this worker's hit rate and how often it refreshed or served stale data."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "stale_served": self.stale_served,
+            "path": self.path
+        }
+
+
+def _like_prefix(prefix: str) -> str:
+    """LIKE pattern matching keys that start with prefix, wildcards escaped."""
+    return prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+_shared_cache: Optional[SharedCache] = None
+
+
+def get_shared_cache() -> Optional[SharedCache]:
+    """Return the host-wide shared cache at SHARED_CACHE_PATH, None if disabled."""
+    global _shared_cache
+    if _shared_cache is None:
+        path = os.environ.get(SHARED_CACHE_CONFIG["PATH_ENV"], SHARED_CACHE_CONFIG["DEFAULT_PATH"])
+        if not path:
+            return None
+        _shared_cache = SharedCache(path)
+    return _shared_cache
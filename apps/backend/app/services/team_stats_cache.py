@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import re
+import time
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+TEAM_STATS_CONFIG = {
+    "TTL": 6 * 60 * 60,  # Team statistics only move after a team plays
+    "PREFETCH_CONCURRENCY": 4
+}
+
+# Club-type affixes that upstream sources add or drop inconsistently
+_TEAM_NAME_AFFIXES = {"fc", "afc", "cf", "sc"}
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+TeamStatsFetcher = Callable[[str], Awaitable[Dict[str, Any]]]
+
+
+def normalize_team_name(team_name: str) -> str:
+    """
+    Normalize a team name into a cache key.
+
+    "Brighton & Hove Albion FC", "brighton  hove albion" and
+    "Brighton and Hove Albion" all map to the same key.
+    """
+    ascii_name = unicodedata.normalize("NFKD", team_name).encode("ascii", "ignore").decode()
+    words = _NON_ALNUM.sub(" ", ascii_name.lower().replace("&", " and ")).split()
+    words = [word for word in words if word != "and" and word not in _TEAM_NAME_AFFIXES]
+    return " ".join(words)
+
+
+class TeamStatsCache:
+    """
+    Team statistics cache keyed by normalized team name with a TTL.
+
+    Concurrent misses for the same team share one upstream fetch, so a team
+    appearing in many requests of a round is scraped once per TTL.
+    """
+
+    def __init__(self, ttl: float = TEAM_STATS_CONFIG["TTL"], clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        # normalized name -> (fetched_at, stats)
+        self._entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, team_name: str) -> Optional[Dict[str, Any]]:
+        """
+        O(1) lookup of fresh statistics for a team; None if missing or expired.
+        """
+        entry = self._entries.get(normalize_team_name(team_name))
+        if entry is not None and self._clock() - entry[0] < self.ttl:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, team_name: str, stats: Dict[str, Any]) -> None:
+        """Store statistics for a team."""
+        self._entries[normalize_team_name(team_name)] = (self._clock(), stats)
+
+    def is_fresh(self, team_name: str) -> bool:
+        """Check freshness without touching hit/miss counters."""
+        entry = self._entries.get(normalize_team_name(team_name))
+        return entry is not None and self._clock() - entry[0] < self.ttl
+
+    async def get_or_fetch(self, team_name: str, fetch: TeamStatsFetcher) -> Dict[str, Any]:
+        """
+        Return cached statistics, fetching them once on a miss.
+
+        Args:
+            team_name: Team to look up
+            fetch: Coroutine function scraping statistics for a team name
+
+        Returns:
+            Team statistics, or an empty dict if the fetch produced nothing
+        """
+        cached = self.get(team_name)
+        if cached is not None:
+            return cached
+
+        key = normalize_team_name(team_name)
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fetch(team_name, fetch))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda task: self._fetch_done(key, task))
+        # The fetch runs as its own task: a caller cancelled meanwhile does
+        # not cancel it for the others waiting on it
+        return await asyncio.shield(inflight)
+
+    async def _fetch(self, team_name: str, fetch: TeamStatsFetcher) -> Dict[str, Any]:
+        stats = await fetch(team_name)
+        # Empty results mean the scrape failed; don't cache them
+        if stats:
+            self.put(team_name, stats)
+        return stats
+
+    def _fetch_done(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # Mark retrieved so a failed fetch nobody awaits doesn't log a warning
+            task.exception()
+
+    async def prefetch(
+        self,
+        team_names: Iterable[str],
+        fetch: TeamStatsFetcher,
+        concurrency: int = TEAM_STATS_CONFIG["PREFETCH_CONCURRENCY"]
+    ) -> int:
+        """
+        Fetch every distinct, non-fresh team once under a concurrency limit.
+
+        Args:
+            team_names: Team names of a slate, duplicates allowed
+            fetch: Coroutine function scraping statistics for a team name
+            concurrency: Maximum number of concurrent upstream fetches
+
+        Returns:
+            Number of teams that needed fetching
+        """
+        distinct: Dict[str, str] = {}
+        for team_name in team_names:
+            distinct.setdefault(normalize_team_name(team_name), team_name)
+        stale = [name for name in distinct.values() if not self.is_fresh(name)]
+        if not stale:
+            return 0
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_one(team_name: str) -> None:
+            async with semaphore:
+                await self.get_or_fetch(team_name, fetch)
+
+        results = await asyncio.gather(*(fetch_one(name) for name in stale), return_exceptions=True)
+        for team_name, result in zip(stale, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to prefetch statistics for {team_name}: {result}")
+
+        logger.info(f"Prefetched statistics for {len(stale)} of {len(distinct)} teams")
+        return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report cache size and hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "ttl_seconds": self.ttl
+        }
+
+
+_team_stats_cache: Optional[TeamStatsCache] = None
+
+
+def get_team_stats_cache() -> TeamStatsCache:
+    """Return the process-wide team statistics cache."""
+    global _team_stats_cache
+    if _team_stats_cache is None:
+        _team_stats_cache = TeamStatsCache()
+    return _team_stats_cache
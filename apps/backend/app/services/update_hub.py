@@ -0,0 +1,247 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set
+
+from .shared_cache import SharedCache, get_shared_cache
+
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+UPDATE_HUB_CONFIG = {
+    "QUEUE_SIZE": 64,  # Messages buffered per connection; the oldest are dropped beyond this
+    "MAX_SUBSCRIPTIONS": 200,  # Topics one connection may follow
+    "SEND_TIMEOUT": 10.0,  # A connection whose write blocks this long is closed
+    "RELAY_INTERVAL": 0.5,  # Seconds between polls of the shared update log
+    "RELAY_BATCH": 500  # Logged updates relayed per poll
+}
+
+
+def league_topic(league_id: str) -> str:
+    return f"league:{league_id}"
+
+
+def match_topic(match_id: str) -> str:
+    return f"match:{match_id}"
+
+
+class Subscriber:
+    """
+    One push connection: its topics and a bounded outbox of serialized messages.
+
+    When the outbox is full the oldest message is dropped and counted, so a
+    slow reader never holds memory or delays anyone else. Its writer tells
+    the client how many were lost, and the client catches up through
+    /prediction/matches/changes.
+    """
+
+    __slots__ = ("topics", "outbox", "ready", "dropped")
+
+    def __init__(self, queue_size: int = UPDATE_HUB_CONFIG["QUEUE_SIZE"]):
+        self.topics: Set[str] = set()
+        self.outbox: Deque[str] = deque(maxlen=queue_size)
+        self.ready = asyncio.Event()
+        self.dropped = 0
+
+    def offer(self, message: str) -> bool:
+        """Queue a message. Returns False if an older one was dropped for it."""
+        full = len(self.outbox) == self.outbox.maxlen
+        if full:
+            self.dropped += 1
+        self.outbox.append(message)
+        self.ready.set()
+        return not full
+
+    async def drain(self) -> List[str]:
+        """Wait for messages, then take every queued one."""
+        await self.ready.wait()
+        self.ready.clear()
+        messages = list(self.outbox)
+        self.outbox.clear()
+        if self.dropped:
+            messages.insert(0, json.dumps({"type": "dropped", "count": self.dropped}))
+            self.dropped = 0
+        return messages
+
+
+class UpdateHub:
+    """
+    Fan-out of fixture and odds updates to WebSocket subscribers.
+
+    Publishers name the topics an update belongs to; the hub looks up the
+    subscribers of those topics, serializes the update once and queues the
+    same string on each of them. Nothing is serialized when nobody follows
+    the topics. An idle connection holds only its topic set, an empty
+    outbox and one waiting writer.
+
+    Subscribers are connected to one worker, but the update may happen in
+    another. With a shared cache, published updates therefore go to its
+    update log instead, and every worker's relay polls the log and
+    delivers them to its own subscribers. Copies of the same update
+    published by several workers carry the same dedupe key and are
+    logged once.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = UPDATE_HUB_CONFIG["QUEUE_SIZE"],
+        max_subscriptions: int = UPDATE_HUB_CONFIG["MAX_SUBSCRIPTIONS"],
+        shared: Optional[SharedCache] = None
+    ):
+        self.queue_size = queue_size
+        self.max_subscriptions = max_subscriptions
+        self.shared = shared
+        self._topics: Dict[str, Set[Subscriber]] = {}
+        self._subscribers: Set[Subscriber] = set()
+        self._appends: Set[asyncio.Task] = set()
+        self._relay: Optional[asyncio.Task] = None
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def connect(self) -> Subscriber:
+        subscriber = Subscriber(self.queue_size)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def disconnect(self, subscriber: Subscriber) -> None:
+        self.unsubscribe(subscriber, list(subscriber.topics))
+        self._subscribers.discard(subscriber)
+
+    def subscribe(self, subscriber: Subscriber, topics: Iterable[str]) -> List[str]:
+        """
+        Follow topics, up to the per-connection limit.
+
+        Returns:
+            The topics newly followed
+        """
+        added = []
+        for topic in topics:
+            if topic in subscriber.topics:
+                continue
+            if len(subscriber.topics) >= self.max_subscriptions:
+                break
+            subscriber.topics.add(topic)
+            self._topics.setdefault(topic, set()).add(subscriber)
+            added.append(topic)
+        return added
+
+    def unsubscribe(self, subscriber: Subscriber, topics: Iterable[str]) -> None:
+        for topic in topics:
+            subscriber.topics.discard(topic)
+            followers = self._topics.get(topic)
+            if followers is not None:
+                followers.discard(subscriber)
+                if not followers:
+                    del self._topics[topic]
+
+    def publish(self, topics: Iterable[str], message: Dict[str, Any], dedupe: Optional[str] = None) -> int:
+        """
+        Queue an update for every subscriber of any of its topics.
+
+        Args:
+            topics: Topics the update belongs to
+            message: JSON-serializable update
+            dedupe: Key identifying the same update published by other
+                workers, so it is relayed once
+
+        Returns:
+            Number of subscribers it was queued for; 0 when it goes through
+            the shared log, whose relay queues it on every worker
+        """
+        topics = list(topics)
+        if self.shared is not None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                task = loop.create_task(self._append(topics, json.dumps(message), dedupe))
+                self._appends.add(task)
+                task.add_done_callback(self._appends.discard)
+                return 0
+
+        if not any(self._topics.get(topic) for topic in topics):
+            return 0
+        return self._deliver(topics, json.dumps(message))
+
+    def start_relay(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Relay updates from the shared log to this worker's subscribers. No-op without a shared cache."""
+        if self.shared is None or self._relay is not None:
+            return
+        self._relay = (loop or asyncio.get_running_loop()).create_task(self._run_relay())
+
+    async def stop_relay(self) -> None:
+        relay, self._relay = self._relay, None
+        tasks = list(self._appends) + ([relay] if relay is not None else [])
+        if relay is not None:
+            relay.cancel()
+        # Updates being logged are let through, so other workers still receive them
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _append(self, topics: List[str], text: str, dedupe: Optional[str]) -> None:
+        try:
+            await self.shared.run(self.shared.append_update, topics, text, dedupe)
+        except Exception as e:
+            logger.warning(f"Failed to log update for other workers, delivering it locally: {e}")
+            self._deliver(topics, text)
+
+    async def _run_relay(self) -> None:
+        """Poll the shared log from its current end and deliver what arrives."""
+        batch = UPDATE_HUB_CONFIG["RELAY_BATCH"]
+        cursor = await self.shared.run(self.shared.last_update_id)
+        while True:
+            await asyncio.sleep(UPDATE_HUB_CONFIG["RELAY_INTERVAL"])
+            rows = [None] * batch
+            while len(rows) == batch:
+                try:
+                    rows = await self.shared.run(self.shared.updates_after, cursor, batch)
+                except Exception as e:
+                    logger.warning(f"Failed to read the shared update log: {e}")
+                    break
+                for update_id, topics, text in rows:
+                    cursor = update_id
+                    self._deliver(topics, text)
+
+    def _deliver(self, topics: Iterable[str], text: str) -> int:
+        """Queue a serialized update on every local subscriber of its topics."""
+        targets: Set[Subscriber] = set()
+        for topic in topics:
+            followers = self._topics.get(topic)
+            if followers:
+                targets.update(followers)
+        if not targets:
+            return 0
+
+        for subscriber in targets:
+            if not subscriber.offer(text):
+                self.dropped += 1
+        self.published += 1
+        self.delivered += len(targets)
+        return len(targets)
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report connections, followed topics and message totals."""
+        return {
+            "connections": len(self._subscribers),
+            "topics": len(self._topics),
+            "subscriptions": sum(len(subscriber.topics) for subscriber in self._subscribers),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped
+        }
+
+
+_update_hub: Optional[UpdateHub] = None
+
+
+def get_update_hub() -> UpdateHub:
+    """Return this worker's update hub, relaying through the shared cache when it is enabled."""
+    global _update_hub
+    if _update_hub is None:
+        _update_hub = UpdateHub(shared=get_shared_cache())
+    return _update_hub
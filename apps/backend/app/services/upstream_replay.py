@@ -0,0 +1,260 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import tempfile
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+UPSTREAM_REPLAY_CONFIG = {
+    "MODE_ENV": "UPSTREAM_MODE",  # live | record | replay
+    "CASSETTE_DIR_ENV": "UPSTREAM_CASSETTE_DIR",
+    "LATENCY_ENV": "UPSTREAM_REPLAY_LATENCY",  # e.g. fixed:20, uniform:10:50, lognormal:20:0.5 (ms)
+    "ERROR_RATE_ENV": "UPSTREAM_REPLAY_ERROR_RATE",
+    "ERROR_STATUS_ENV": "UPSTREAM_REPLAY_ERROR_STATUS",  # HTTP status, or "timeout"
+    "SEED_ENV": "UPSTREAM_REPLAY_SEED",
+    "DEFAULT_CASSETTE_DIR": os.path.join(".cache", "cassettes"),
+    "DEFAULT_LATENCY": "fixed:0",
+    "DEFAULT_ERROR_STATUS": "503",
+    "DEFAULT_SEED": "0",
+    # Response headers not worth replaying; bodies are stored decoded
+    "DROPPED_HEADERS": {"content-encoding", "content-length", "transfer-encoding", "connection", "date"}
+}
+
+MODE_LIVE = "live"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+
+class LatencyDistribution:
+    """
+    Latency distribution parsed from a spec string, in milliseconds.
+
+    Supported specs: "fixed:<ms>", "uniform:<min_ms>:<max_ms>" and
+    "lognormal:<median_ms>:<sigma>".
+    """
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        kind, *params = spec.split(":")
+        try:
+            values = [float(param) for param in params]
+        except ValueError:
+            raise ValueError(f"Invalid latency spec: {spec!r}")
+        if kind == "fixed" and len(values) == 1:
+            self._sample = lambda rng: values[0]
+        elif kind == "uniform" and len(values) == 2:
+            self._sample = lambda rng: rng.uniform(values[0], values[1])
+        elif kind == "lognormal" and len(values) == 2:
+            mu = math.log(values[0]) if values[0] > 0 else 0.0
+            self._sample = lambda rng: rng.lognormvariate(mu, values[1])
+        else:
+            raise ValueError(f"Invalid latency spec: {spec!r}")
+
+    def sample(self, rng: random.Random) -> float:
+        """Latency in seconds."""
+        return max(0.0, self._sample(rng)) / 1000.0
+
+
+def seeded_random(*parts) -> random.Random:
+    """
+    Independent generator seeded by a hash of its parts.
+
+    Hashing keeps the streams of similar keys (the same URL replayed again,
+    neighbouring match ids) uncorrelated.
+    """
+    digest = hashlib.sha256(":".join(str(part) for part in parts).encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+
+def cassette_key(method: str, url: str) -> str:
+    """Stable cassette file name for a request."""
+    return hashlib.sha1(f"{method.upper()} {url}".encode()).hexdigest()
+
+
+class CassetteStore:
+    """
+    Directory of recorded upstream responses, one JSON file per request.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path_for(self, method: str, url: str) -> str:
+        return os.path.join(self.directory, f"{cassette_key(method, url)}.json")
+
+    def save(self, request: httpx.Request, response: httpx.Response, content: bytes) -> None:
+        entry = {
+            "method": request.method,
+            "url": str(request.url),
+            "status": response.status_code,
+            "headers": [
+                [name, value] for name, value in response.headers.items()
+                if name.lower() not in UPSTREAM_REPLAY_CONFIG["DROPPED_HEADERS"]
+            ],
+            "body_b64": base64.b64encode(content).decode("ascii")
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(request.method, str(request.url))
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".cassette.")
+        with os.fdopen(fd, "w") as handle:
+            json.dump(entry, handle, indent=1)
+        os.replace(tmp_path, path)
+
+    def load(self, method: str, url: str) -> Optional[Tuple[int, list, bytes]]:
+        try:
+            with open(self.path_for(method, url)) as handle:
+                entry = json.load(handle)
+        except FileNotFoundError:
+            return None
+        return entry["status"], entry["headers"], base64.b64decode(entry["body_b64"])
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Transport that forwards to the real upstream and records every response.
+    """
+
+    def __init__(self, cassettes: CassetteStore, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.cassettes = cassettes
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self._transport.handle_async_request(request)
+        # Decoded body, so replays don't depend on the recorded content-encoding
+        content = await httpx.Response(
+            response.status_code, headers=response.headers, stream=response.stream
+        ).aread()
+        self.cassettes.save(request, response, content)
+        return httpx.Response(
+            response.status_code,
+            headers=[
+                (name, value) for name, value in response.headers.items()
+                if name.lower() not in UPSTREAM_REPLAY_CONFIG["DROPPED_HEADERS"]
+            ],
+            content=content,
+            request=request
+        )
+
+    async def aclose(self) -> None:
+        # Shared by every client in the process; the pool lives as long as the process
+        pass
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Offline stand-in for upstreams serving recorded responses.
+
+    Latency and failures are drawn from a generator seeded by the run seed,
+    the request and how many times it was replayed, so every run sees the
+    same upstream behaviour regardless of how concurrent requests
+    interleave. Requests without a cassette get a 404 so missing recordings
+    are obvious.
+    """
+
+    def __init__(
+        self,
+        cassettes: CassetteStore,
+        latency: Optional[LatencyDistribution] = None,
+        error_rate: float = 0.0,
+        error_status: str = UPSTREAM_REPLAY_CONFIG["DEFAULT_ERROR_STATUS"],
+        seed: int = 0
+    ):
+        self.cassettes = cassettes
+        self.seed = seed
+        self.latency = latency or LatencyDistribution(UPSTREAM_REPLAY_CONFIG["DEFAULT_LATENCY"])
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._replay_counts: Dict[str, int] = {}
+        self.served = 0
+        self.missing = 0
+        self.injected_errors = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        rng = self._request_rng(request)
+        delay = self.latency.sample(rng)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.error_rate and rng.random() < self.error_rate:
+            self.injected_errors += 1
+            if self.error_status == "timeout":
+                raise httpx.ReadTimeout("Injected replay timeout", request=request)
+            return httpx.Response(int(self.error_status), request=request)
+
+        recorded = self.cassettes.load(request.method, str(request.url))
+        if recorded is None:
+            self.missing += 1
+            logger.warning(f"No cassette for {request.method} {request.url}")
+            return httpx.Response(404, text="No recorded response", request=request)
+
+        self.served += 1
+        status, headers, content = recorded
+        return httpx.Response(status, headers=headers, content=content, request=request)
+
+    def _request_rng(self, request: httpx.Request) -> random.Random:
+        key = f"{request.method} {request.url}"
+        count = self._replay_counts.get(key, 0)
+        self._replay_counts[key] = count + 1
+        return seeded_random(self.seed, key, count)
+
+
+def upstream_mode() -> str:
+    mode = os.environ.get(UPSTREAM_REPLAY_CONFIG["MODE_ENV"], MODE_LIVE).lower()
+    if mode not in (MODE_LIVE, MODE_RECORD, MODE_REPLAY):
+        raise ValueError(f"Unknown upstream mode: {mode!r}")
+    return mode
+
+
+def replay_seed() -> int:
+    return int(os.environ.get(UPSTREAM_REPLAY_CONFIG["SEED_ENV"], UPSTREAM_REPLAY_CONFIG["DEFAULT_SEED"]))
+
+
+def replay_latency() -> LatencyDistribution:
+    spec = os.environ.get(UPSTREAM_REPLAY_CONFIG["LATENCY_ENV"], UPSTREAM_REPLAY_CONFIG["DEFAULT_LATENCY"])
+    return LatencyDistribution(spec)
+
+
+_transports: Dict[str, httpx.AsyncBaseTransport] = {}
+
+
+def get_upstream_transport() -> Optional[httpx.AsyncBaseTransport]:
+    """
+    Transport for upstream HTTP clients according to UPSTREAM_MODE.
+
+    Returns None in live mode so clients use their default transport.
+    """
+    mode = upstream_mode()
+    if mode == MODE_LIVE:
+        return None
+
+    cassette_dir = os.environ.get(
+        UPSTREAM_REPLAY_CONFIG["CASSETTE_DIR_ENV"], UPSTREAM_REPLAY_CONFIG["DEFAULT_CASSETTE_DIR"]
+    )
+    key = f"{mode}:{cassette_dir}"
+    transport = _transports.get(key)
+    if transport is None:
+        cassettes = CassetteStore(cassette_dir)
+        if mode == MODE_RECORD:
+            transport = RecordingTransport(cassettes)
+        else:
+            transport = ReplayTransport(
+                cassettes,
+                latency=replay_latency(),
+                error_rate=float(os.environ.get(UPSTREAM_REPLAY_CONFIG["ERROR_RATE_ENV"], "0")),
+                error_status=os.environ.get(
+                    UPSTREAM_REPLAY_CONFIG["ERROR_STATUS_ENV"], UPSTREAM_REPLAY_CONFIG["DEFAULT_ERROR_STATUS"]
+                ),
+                seed=replay_seed()
+            )
+        _transports[key] = transport
+        logger.info(f"Upstream {mode} mode using cassettes in {cassette_dir}")
+    return transport
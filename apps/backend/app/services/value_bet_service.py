@@ -0,0 +1,128 @@
+import heapq
+import logging
+from array import array
+from typing import Dict, List, Sequence
+
+from ..models.match import Match, ValueBet
+from ..models.scraped_data import ODDS_FIELD_ALIASES
+
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+VALUE_BET_CONFIG = {
+    "DEFAULT_LIMIT": 10,
+    "MAX_LIMIT": 100,
+    "MIN_EXPECTED_VALUE": 0.0,
+    "KELLY_FRACTION": 0.25,  # Fractional Kelly to damp model error
+    "MIN_VALID_ODDS": 1.01
+}
+
+# Mutually exclusive market groups; the overround is removed within each group
+MARKET_GROUPS = {
+    "match_result": ("home_win", "draw", "away_win"),
+    "total_goals_2_5": ("over_2_5", "under_2_5"),
+    "both_teams_score": ("btts_yes", "btts_no")
+}
+
+
+class ValueBetService:
+    """
+    Ranks betting markets by expected value against bookmaker odds.
+    
+    Every market of every match is flattened into parallel columns so that
+    implied probabilities, expected value and Kelly stakes are computed in a
+    single pass over the slate, followed by a heap-based top-k selection.
+    """
+    
+    def __init__(self):
+        self.kelly_fraction = VALUE_BET_CONFIG["KELLY_FRACTION"]
+        self.min_expected_value = VALUE_BET_CONFIG["MIN_EXPECTED_VALUE"]
+    
+    def rank_value_bets(
+        self,
+        matches: Sequence[Match],
+        odds_by_match: Sequence[Dict[str, float]],
+        probabilities_by_match: Sequence[Dict[str, float]],
+        limit: int = VALUE_BET_CONFIG["DEFAULT_LIMIT"]
+    ) -> List[ValueBet]:
+        """
+        Compute expected value for all markets and return the top bets.
+        
+        Args:
+            matches: Upcoming matches
+            odds_by_match: Decimal odds per market, aligned with matches
+            probabilities_by_match: Model probability per market, aligned with matches
+            limit: Maximum number of bets to return
+            
+        Returns:
+            List of ValueBet ordered by descending expected value
+        """
+        if not (len(matches) == len(odds_by_match) == len(probabilities_by_match)):
+            raise ValueError("matches, odds and probabilities must be aligned")
+        
+        # Flatten the slate into columns: one row per (match, market)
+        row_match: List[int] = []
+        row_market: List[str] = []
+        row_group: List[int] = []
+        odds = array("d")
+        model_p = array("d")
+        group_count = 0
+        
+        for match_index, (raw_odds, probabilities) in enumerate(zip(odds_by_match, probabilities_by_match)):
+            match_odds = self._normalize_odds(raw_odds)
+            for markets in MARKET_GROUPS.values():
+                # A group is only priceable when the bookmaker quotes all its outcomes
+                if not all(market in match_odds and market in probabilities for market in markets):
+                    continue
+                for market in markets:
+                    row_match.append(match_index)
+                    row_market.append(market)
+                    row_group.append(group_count)
+                    odds.append(match_odds[market])
+                    model_p.append(probabilities[market])
+                group_count += 1
+        
+        if not odds:
+            return []
+        
+        # Single pass over the columns
+        inverse = array("d", [1.0 / o for o in odds])
+        book = array("d", bytes(8 * group_count))
+        for group, inv in zip(row_group, inverse):
+            book[group] += inv
+        
+        implied = array("d", [inv / book[group] for inv, group in zip(inverse, row_group)])
+        expected_value = array("d", [p * o - 1.0 for p, o in zip(model_p, odds)])
+        kelly = array("d", [
+            max(0.0, ev / (o - 1.0)) * self.kelly_fraction
+            for ev, o in zip(expected_value, odds)
+        ])
+        
+        # Partial selection: O(n log k) instead of sorting the whole slate
+        candidates = (i for i, ev in enumerate(expected_value) if ev > self.min_expected_value)
+        top = heapq.nlargest(limit, candidates, key=expected_value.__getitem__)
+        
+        return [
+            ValueBet(
+                matchId=matches[row_match[i]].id,
+                homeTeam=matches[row_match[i]].homeTeam,
+                awayTeam=matches[row_match[i]].awayTeam,
+                market=row_market[i],
+                odds=odds[i],
+                modelProbability=round(model_p[i], 4),
+                impliedProbability=round(implied[i], 4),
+                expectedValue=round(expected_value[i], 4),
+                kellyStake=round(kelly[i], 4)
+            )
+            for i in top
+        ]
+    
+    def _normalize_odds(self, raw_odds: Dict[str, float]) -> Dict[str, float]:
+        """Map scraper odds keys to canonical markets and drop unusable prices."""
+        min_odds = VALUE_BET_CONFIG["MIN_VALID_ODDS"]
+        normalized = {}
+        for key, value in (raw_odds or {}).items():
+            market = ODDS_FIELD_ALIASES.get(key, key)
+            if isinstance(value, (int, float)) and value >= min_odds:
+                normalized[market] = float(value)
+        return normalized
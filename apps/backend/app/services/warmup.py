@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+WARMUP_CONFIG = {
+    "ENABLED_ENV": "WARMUP",  # "0" skips warm-up; the worker is ready at once
+    "PHASE_TIMEOUT": 15.0,  # A phase taking longer is abandoned and the worker serves cold
+    "IMPORT_BUDGET": 1.0,  # Seconds app.main may take to import before startup logs a warning
+    # Imported inside the functions that use them; the import-time test fails if startup pulls them in
+    "DEFERRED_MODULES": ("tracemalloc",)
+}
+
+WarmupPhase = Callable[[], Awaitable[Any]]
+
+
+class WarmupState:
+    """
+    Startup progress of this worker: import time, then each warm-up phase.
+
+    The worker reports ready once every phase has finished. A failed or
+    timed-out phase does not hold readiness back: the worker then serves
+    with that data cold, as it would after a cache miss.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self.import_seconds: Optional[float] = None
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.total_seconds: Optional[float] = None
+
+    def record_import(self, seconds: float, budget: float = WARMUP_CONFIG["IMPORT_BUDGET"]) -> None:
+        self.import_seconds = seconds
+        if seconds > budget:
+            logger.warning(f"Importing the app took {seconds:.2f}s, over the {budget:.2f}s budget")
+
+    async def run(self, phases: List[Tuple[str, WarmupPhase]], timeout: float = WARMUP_CONFIG["PHASE_TIMEOUT"]) -> None:
+        """
+        Run warm-up phases in order, timing each, then mark the worker ready.
+
+        Args:
+            phases: (name, coroutine function) pairs
+            timeout: Longest time any one phase may take
+        """
+        self.started_at = self._clock()
+        for name, phase in phases:
+            self.phases[name] = {"status": "running", "seconds": None}
+            started = self._clock()
+            try:
+                await asyncio.wait_for(phase(), timeout)
+                status, error = "ok", None
+            except asyncio.TimeoutError:
+                status, error = "timeout", f"exceeded {timeout}s"
+            except Exception as e:
+                status, error = "failed", str(e)
+            elapsed = self._clock() - started
+            self.phases[name] = {"status": status, "seconds": round(elapsed, 4)}
+            if error is not None:
+                self.phases[name]["error"] = error
+                logger.warning(f"Warm-up phase {name} {status} after {elapsed:.2f}s: {error}")
+            else:
+                logger.info(f"Warm-up phase {name} took {elapsed:.2f}s")
+        self.mark_ready()
+
+    def mark_ready(self) -> None:
+        self.ready = True
+        if self.started_at is not None:
+            self.total_seconds = round(self._clock() - self.started_at, 4)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "status": "ready" if self.ready else "warming",
+            "import_seconds": round(self.import_seconds, 4) if self.import_seconds is not None else None,
+            "warmup_seconds": self.total_seconds,
+            "phases": {name: dict(phase) for name, phase in self.phases.items()}
+        }
+
+
+def warmup_enabled() -> bool:
+    return os.environ.get(WARMUP_CONFIG["ENABLED_ENV"], "1") != "0"
+
+
+_warmup_state: Optional[WarmupState] = None
+
+
+def get_warmup_state() -> WarmupState:
+    """Return this worker's startup state."""
+    global _warmup_state
+    if _warmup_state is None:
+        _warmup_state = WarmupState()
+    return _warmup_state
@@ -6,22 +6,76 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 
 from ..models.match import Match
+from ..models.scraped_data import (
+    RESULT_CODES,
+    BettingOdds,
+    ExpertPrediction,
+    FormResult,
+    HeadToHead,
+    Injury,
+    MatchStatistics,
+    Meeting,
+    ScrapedMatchData,
+    StadiumInfo,
+    TeamNews,
+    WeatherConditions
+)
+from .scrape_cache import ScrapeCache
+from .team_stats_cache import TeamStatsCache
+from .crawl_frontier import CrawlFrontier, DomainPoliteness, url_domain
+from .hedging import RequestHedger, get_request_hedger
+from .metrics import SCRAPE_SOURCE_LATENCY, SCRAPE_SOURCE_RESULTS, UpstreamCall
+from .html_extractor import Extraction, HtmlExtractor, get_html_extractor
+from .odds_store import OddsStore
+from .update_hub import UpdateHub, match_topic
+from .deadline import DEADLINE_CONFIG, current_deadline, note_degraded, remaining_timeout
+from .upstream_replay import (
+    MODE_REPLAY, get_upstream_transport, replay_latency, replay_seed, seeded_random, upstream_mode
+)
 
 logger = logging.getLogger(__name__)
 
 # Configuration constants
 SCRAPER_CONFIG = {
     "REQUEST_TIMEOUT": 10.0,
-    "RATE_LIMIT_DELAY": 1.0,
+    "RATE_LIMIT_DELAY": 1.0,  # Default per-domain politeness delay
     "MAX_RETRIES": 3,
     "SIMULATION_DELAY_RANGE": (0.5, 2.0),
     "TEAM_STATS_DELAY_RANGE": (0.3, 1.0),
     "BETTING_ODDS_DELAY_RANGE": (0.5, 1.5),
+    "BOOKMAKERS": ("bookmaker_a", "bookmaker_b", "bookmaker_c", "bookmaker_d"),
     "MAX_INJURIES_PER_TEAM": 2,
     "EXPONENTIAL_BACKOFF_BASE": 2,
-    "RATE_LIMIT_WAIT_MULTIPLIER": 5
+    "RATE_LIMIT_WAIT_MULTIPLIER": 5,
+    "SCRAPE_BUDGET": 3.0,  # Overall deadline for one match scrape in seconds
+    "SOURCE_TIMEOUTS": {
+        "match_intel": 2.5,
+        "home_team_statistics": 1.5,
+        "away_team_statistics": 1.5,
+        "betting_odds": 2.0
+    }
 }
 
+# Per-source outcome flags reported in "source_status"
+SOURCE_OK = "ok"
+SOURCE_LATE = "late"
+SOURCE_FAILED = "failed"
+SOURCE_SKIPPED = "skipped"  # Not attempted: the request deadline had no time left
+
+# Sections produced by the match intel source
+INTEL_SECTIONS = (
+    "match_statistics",
+    "team_news",
+    "head_to_head",
+    "betting_odds",
+    "weather_conditions",
+    "expert_predictions",
+    "stadium_info"
+)
+
+# Every independently cacheable section of scraped match data
+SCRAPED_SECTIONS = INTEL_SECTIONS + ("team_statistics",)
+
 
 class WebScraperService:
     """
@@ -31,10 +85,30 @@ class WebScraperService:
     AI prediction accuracy with external information.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[ScrapeCache] = None,
+        team_stats_cache: Optional[TeamStatsCache] = None,
+        frontier: Optional[CrawlFrontier] = None,
+        politeness: Optional[DomainPoliteness] = None,
+        extractor: Optional[HtmlExtractor] = None,
+        odds_store: Optional[OddsStore] = None,
+        hedger: Optional[RequestHedger] = None,
+        updates: Optional[UpdateHub] = None
+    ):
+        self.cache = cache
+        self.team_stats_cache = team_stats_cache
+        self.frontier = frontier
+        self.politeness = politeness or get_domain_politeness()
+        self.extractor = extractor or get_html_extractor()
+        self.odds_store = odds_store
+        self.hedger = hedger
+        self.updates = updates
         self.request_timeout = SCRAPER_CONFIG["REQUEST_TIMEOUT"]
         self.rate_limit_delay = SCRAPER_CONFIG["RATE_LIMIT_DELAY"]
         self.max_retries = SCRAPER_CONFIG["MAX_RETRIES"]
+        self.scrape_budget = SCRAPER_CONFIG["SCRAPE_BUDGET"]
+        self.source_timeouts = dict(SCRAPER_CONFIG["SOURCE_TIMEOUTS"])
         
         # Headers to appear as a normal browser
         self.headers = {
@@ -46,136 +120,326 @@ class WebScraperService:
             "Upgrade-Insecure-Requests": "1",
         }
     
-    async def scrape_match_data(self, match: Match) -> Dict[str, Any]:
+    async def scrape_match_data(self, match: Match) -> ScrapedMatchData:
         """
         Scrape comprehensive match data from multiple sources.
         
+        All sources are scraped concurrently, each bounded by its own timeout
+        and all of them by the overall scrape budget. Sources that finish in
+        time are merged; the rest are reported in "source_status" as "late"
+        or "failed" instead of discarding the whole result.
+        
         Args:
             match: Match object with team and timing information
             
         Returns:
-            Dictionary containing scraped insights and statistics
+            Typed scraped insights and statistics
         """
         try:
             logger.info(f"Starting web scraping for {match.homeTeam} vs {match.awayTeam}")
             
-            # For MVP, return simulated scraping data
+            # Only sections whose TTL has expired are scraped again
+            cached = self.cache.get_fresh_sections(match.id, SCRAPED_SECTIONS) if self.cache is not None else {}
+            expired = [section for section in SCRAPED_SECTIONS if section not in cached]
+            
+            # For MVP, match intel is simulated
             # TODO: Implement actual web scraping after MVP validation
-            scraped_data = await self._simulate_scraped_data(match)
+            sources = {}
+            intel_sections = [section for section in expired if section in INTEL_SECTIONS]
+            if intel_sections:
+                sources["match_intel"] = self._simulate_scraped_data(match, intel_sections)
+            if "team_statistics" in expired:
+                sources["home_team_statistics"] = self.get_team_statistics(match.homeTeam)
+                sources["away_team_statistics"] = self.get_team_statistics(match.awayTeam)
+            if "betting_odds" in expired:
+                sources["betting_odds"] = self.scrape_betting_odds(match)
             
-            logger.info(f"Successfully scraped data for match {match.id}")
+            # The scrape only gets what the request deadline leaves after the prediction reserve
+            budget = remaining_timeout(self.scrape_budget, reserve=DEADLINE_CONFIG["PREDICTION_RESERVE"])
+            results, source_status = await self._gather_sources(sources, budget)
+            
+            fresh = self._fresh_sections(results)
+            stale = {}
+            if self.cache is not None:
+                self.cache.put_sections(match.id, fresh)
+                await self.cache.aflush()
+                missing = [section for section in expired if section not in fresh]
+                stale = self.cache.get_stale_sections(match.id, missing)
+            
+            scraped_data = self._merge_source_results(results, source_status, cached, stale)
+            self._note_degradation(scraped_data)
+            logger.info(f"Scraped data for match {match.id}: {scraped_data.scraping_status} {source_status}")
             return scraped_data
             
         except Exception as e:
             logger.error(f"Error scraping match data: {e}")
             return self._get_fallback_data()
     
-    async def _simulate_scraped_data(self, match: Match) -> Dict[str, Any]:
+    async def _gather_sources(
+        self,
+        sources: Dict[str, Any],
+        budget: float
+    ) -> tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Await all source coroutines at once under per-source timeouts and a shared budget.
+        
+        Args:
+            sources: Mapping of source name to coroutine
+            budget: Overall deadline in seconds; the critical path never exceeds it.
+                With no budget left no source is started and all are "skipped".
+            
+        Returns:
+            Tuple of (results of successful sources, status flag per source)
+        """
+        if not sources:
+            return {}, {}
+        if budget <= 0:
+            for coro in sources.values():
+                coro.close()
+            logger.warning(f"No time left to scrape, skipping sources: {', '.join(sources)}")
+            for name in sources:
+                SCRAPE_SOURCE_RESULTS.inc(source=name, status=SOURCE_SKIPPED)
+            return {}, {name: SOURCE_SKIPPED for name in sources}
+        
+        tasks = {
+            name: asyncio.create_task(
+                asyncio.wait_for(
+                    self._timed_source(name, coro),
+                    timeout=min(self.source_timeouts.get(name, budget), budget)
+                )
+            )
+            for name, coro in sources.items()
+        }
+        
+        await asyncio.wait(tasks.values(), timeout=budget)
+        
+        results: Dict[str, Any] = {}
+        source_status: Dict[str, str] = {}
+        for name, task in tasks.items():
+            if not task.done():
+                task.cancel()
+                source_status[name] = SOURCE_LATE
+            elif task.cancelled() or isinstance(task.exception(), asyncio.TimeoutError):
+                source_status[name] = SOURCE_LATE
+            elif task.exception() is not None:
+                logger.warning(f"Scraping source {name} failed: {task.exception()}")
+                source_status[name] = SOURCE_FAILED
+            elif not task.result():
+                # Source methods swallow their own errors and return empty data
+                source_status[name] = SOURCE_FAILED
+            else:
+                results[name] = task.result()
+                source_status[name] = SOURCE_OK
+        
+        for name, status in source_status.items():
+            SCRAPE_SOURCE_RESULTS.inc(source=name, status=status)
+        late = [name for name, status in source_status.items() if status == SOURCE_LATE]
+        if late:
+            logger.warning(f"Scraping sources missed their deadline: {', '.join(late)}")
+        
+        return results, source_status
+    
+    async def _timed_source(self, name: str, coro) -> Any:
+        """Await a source, observing its latency even when it is cut off."""
+        with SCRAPE_SOURCE_LATENCY.time(source=name):
+            return await coro
+    
+    def _fresh_sections(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Split successful source results into cacheable typed sections.
+        """
+        sections = dict(results.get("match_intel", {}))
+        if "betting_odds" in results:
+            sections["betting_odds"] = BettingOdds.from_dict(results["betting_odds"])
+        if "home_team_statistics" in results and "away_team_statistics" in results:
+            sections["team_statistics"] = {
+                "home": results["home_team_statistics"],
+                "away": results["away_team_statistics"]
+            }
+        return sections
+    
+    def _merge_source_results(
+        self,
+        results: Dict[str, Any],
+        source_status: Dict[str, str],
+        cached: Optional[Dict[str, Any]] = None,
+        stale: Optional[Dict[str, Any]] = None
+    ) -> ScrapedMatchData:
+        """
+        Merge cached sections and per-source results into one scraped record.
+        
+        Stale sections (past their TTL) only fill in for sources that did
+        not deliver; they are listed in "stale_sections".
+        """
+        scraped_data = ScrapedMatchData(
+            source_status=source_status,
+            cached_sections=sorted(cached or {}),
+            stale_sections=sorted(stale or {})
+        )
+        for section, value in {**(stale or {}), **(cached or {})}.items():
+            scraped_data.set_section(section, value)
+        
+        for section, value in results.get("match_intel", {}).items():
+            scraped_data.set_section(section, value)
+        if "betting_odds" in results:
+            scraped_data.set_section("betting_odds", results["betting_odds"])
+        # Copied so cached team statistics are never modified in place
+        team_statistics = dict(scraped_data.team_statistics)
+        for side in ("home", "away"):
+            if f"{side}_team_statistics" in results:
+                team_statistics[side] = results[f"{side}_team_statistics"]
+        scraped_data.team_statistics = team_statistics
+        
+        ok_count = sum(1 for status in source_status.values() if status == SOURCE_OK)
+        if ok_count == len(source_status):
+            scraped_data.scraping_status = "complete"
+        elif ok_count or cached or stale:
+            scraped_data.scraping_status = "partial"
+        else:
+            scraped_data.scraping_status = "failed"
+        
+        return scraped_data
+    
+    def _note_degradation(self, scraped_data: ScrapedMatchData) -> None:
+        """Record on the current request which sources missed out and which sections are stale."""
+        for name, status in scraped_data.source_status.items():
+            if status != SOURCE_OK:
+                note_degraded(f"{name}:{status}")
+        for section in scraped_data.stale_sections:
+            note_degraded(f"{section}:stale")
+    
+    async def _simulate_scraped_data(self, match: Match, sections: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Simulate scraped data for MVP testing purposes.
         
         In production, this would be replaced with actual web scraping logic.
+        
+        Args:
+            match: Match to simulate data for
+            sections: Optional subset of sections to return; defaults to all
+            
+        Returns:
+            Mapping of section name to its typed record
         """
         # Simulate network delay
         min_delay, max_delay = SCRAPER_CONFIG["SIMULATION_DELAY_RANGE"]
-        await asyncio.sleep(random.uniform(min_delay, max_delay))
+        rng = self._rng("intel", match.id)
+        await asyncio.sleep(self._simulated_delay(rng, min_delay, max_delay))
         
-        return {
-            "match_statistics": {
-                "home_recent_form": [
-                    {"opponent": "Team A", "result": "W", "score": "2-1"},
-                    {"opponent": "Team B", "result": "D", "score": "1-1"},
-                    {"opponent": "Team C", "result": "W", "score": "3-0"},
-                    {"opponent": "Team D", "result": "L", "score": "0-2"},
-                    {"opponent": "Team E", "result": "W", "score": "2-0"}
+        W, D, L = RESULT_CODES["W"], RESULT_CODES["D"], RESULT_CODES["L"]
+        scraped_data = {
+            "match_statistics": MatchStatistics(
+                home_recent_form=[
+                    FormResult("Team A", W, 2, 1),
+                    FormResult("Team B", D, 1, 1),
+                    FormResult("Team C", W, 3, 0),
+                    FormResult("Team D", L, 0, 2),
+                    FormResult("Team E", W, 2, 0)
                 ],
-                "away_recent_form": [
-                    {"opponent": "Team F", "result": "W", "score": "1-0"},
-                    {"opponent": "Team G", "result": "W", "score": "2-1"},
-                    {"opponent": "Team H", "result": "D", "score": "2-2"},
-                    {"opponent": "Team I", "result": "L", "score": "1-3"},
-                    {"opponent": "Team J", "result": "W", "score": "3-1"}
+                away_recent_form=[
+                    FormResult("Team F", W, 1, 0),
+                    FormResult("Team G", W, 2, 1),
+                    FormResult("Team H", D, 2, 2),
+                    FormResult("Team I", L, 1, 3),
+                    FormResult("Team J", W, 3, 1)
                 ],
-                "home_goals_scored_last_5": random.randint(6, 12),
-                "home_goals_conceded_last_5": random.randint(2, 8),
-                "away_goals_scored_last_5": random.randint(5, 11),
-                "away_goals_conceded_last_5": random.randint(3, 9)
-            },
-            "team_news": {
-                "home_injuries": self._generate_injury_list(match.homeTeam),
-                "away_injuries": self._generate_injury_list(match.awayTeam),
-                "home_suspensions": [],
-                "away_suspensions": []
-            },
-            "head_to_head": {
-                "last_5_h2h": [
-                    {"date": "2024-03-15", "home": match.homeTeam, "away": match.awayTeam, "score": "2-1"},
-                    {"date": "2023-11-20", "home": match.awayTeam, "away": match.homeTeam, "score": "0-2"},
-                    {"date": "2023-08-12", "home": match.homeTeam, "away": match.awayTeam, "score": "1-1"},
-                    {"date": "2023-03-05", "home": match.awayTeam, "away": match.homeTeam, "score": "3-1"},
-                    {"date": "2022-11-18", "home": match.homeTeam, "away": match.awayTeam, "score": "2-0"}
+                home_goals_scored_last_5=rng.randint(6, 12),
+                home_goals_conceded_last_5=rng.randint(2, 8),
+                away_goals_scored_last_5=rng.randint(5, 11),
+                away_goals_conceded_last_5=rng.randint(3, 9)
+            ),
+            "team_news": TeamNews(
+                home_injuries=self._generate_injury_list(match.homeTeam, rng),
+                away_injuries=self._generate_injury_list(match.awayTeam, rng)
+            ),
+            "head_to_head": HeadToHead(
+                last_5_h2h=[
+                    Meeting("2024-03-15", match.homeTeam, match.awayTeam, 2, 1),
+                    Meeting("2023-11-20", match.awayTeam, match.homeTeam, 0, 2),
+                    Meeting("2023-08-12", match.homeTeam, match.awayTeam, 1, 1),
+                    Meeting("2023-03-05", match.awayTeam, match.homeTeam, 3, 1),
+                    Meeting("2022-11-18", match.homeTeam, match.awayTeam, 2, 0)
                 ],
-                "home_wins": random.randint(1, 4),
-                "away_wins": random.randint(1, 4),
-                "draws": random.randint(0, 2)
-            },
-            "betting_odds": {
-                "home_win": round(random.uniform(1.5, 4.0), 2),
-                "draw": round(random.uniform(2.8, 4.5), 2),
-                "away_win": round(random.uniform(1.8, 5.0), 2),
-                "over_2_5_goals": round(random.uniform(1.6, 2.8), 2),
-                "under_2_5_goals": round(random.uniform(1.4, 2.5), 2),
-                "both_teams_score_yes": round(random.uniform(1.5, 2.2), 2),
-                "both_teams_score_no": round(random.uniform(1.6, 2.5), 2)
-            },
-            "weather_conditions": {
-                "temperature": random.randint(5, 25),
-                "condition": random.choice(["sunny", "cloudy", "rainy", "windy"]),
-                "precipitation_chance": random.randint(0, 80),
-                "wind_speed": random.randint(5, 25)
-            },
-            "expert_predictions": [
-                {
-                    "source": "Sports Analyst A",
-                    "prediction": f"{match.homeTeam} to win",
-                    "confidence": random.randint(60, 90)
-                },
-                {
-                    "source": "Betting Expert B", 
-                    "prediction": "Over 2.5 goals",
-                    "confidence": random.randint(70, 85)
-                },
-                {
-                    "source": "Football Pundit C",
-                    "prediction": "Both teams to score",
-                    "confidence": random.randint(65, 80)
-                }
-            ],
-            "stadium_info": {
-                "name": f"{match.homeTeam} Stadium",
-                "capacity": random.randint(20000, 80000),
-                "surface": "Grass",
-                "home_record_this_season": {
-                    "wins": random.randint(5, 12),
-                    "draws": random.randint(1, 6),
-                    "losses": random.randint(0, 5)
-                }
-            }
+                home_wins=rng.randint(1, 4),
+                away_wins=rng.randint(1, 4),
+                draws=rng.randint(0, 2)
+            ),
+            "betting_odds": BettingOdds(
+                home_win=round(rng.uniform(1.5, 4.0), 2),
+                draw=round(rng.uniform(2.8, 4.5), 2),
+                away_win=round(rng.uniform(1.8, 5.0), 2),
+                over_2_5=round(rng.uniform(1.6, 2.8), 2),
+                under_2_5=round(rng.uniform(1.4, 2.5), 2),
+                btts_yes=round(rng.uniform(1.5, 2.2), 2),
+                btts_no=round(rng.uniform(1.6, 2.5), 2)
+            ),
+            "weather_conditions": WeatherConditions(
+                temperature=rng.randint(5, 25),
+                condition=rng.choice(["sunny", "cloudy", "rainy", "windy"]),
+                precipitation_chance=rng.randint(0, 80),
+                wind_speed=rng.randint(5, 25)
+            ),
+            "expert_predictions": (
+                ExpertPrediction("Sports Analyst A", f"{match.homeTeam} to win", rng.randint(60, 90)),
+                ExpertPrediction("Betting Expert B", "Over 2.5 goals", rng.randint(70, 85)),
+                ExpertPrediction("Football Pundit C", "Both teams to score", rng.randint(65, 80))
+            ),
+            "stadium_info": StadiumInfo(
+                name=f"{match.homeTeam} Stadium",
+                capacity=rng.randint(20000, 80000),
+                surface="Grass",
+                home_wins=rng.randint(5, 12),
+                home_draws=rng.randint(1, 6),
+                home_losses=rng.randint(0, 5)
+            )
         }
+        
+        if sections is not None:
+            return {section: scraped_data[section] for section in sections if section in scraped_data}
+        return scraped_data
     
-    def _generate_injury_list(self, team: str) -> List[Dict[str, str]]:
+    def _generate_injury_list(self, team: str, rng: Optional[random.Random] = None) -> List[Injury]:
         """Generate realistic injury/availability data."""
         potential_injuries = [
-            {"player": "Key Striker", "status": "doubtful", "injury": "hamstring"},
-            {"player": "Main Defender", "status": "out", "injury": "knee"},
-            {"player": "Midfielder", "status": "fit", "injury": "none"},
-            {"player": "Goalkeeper", "status": "fit", "injury": "none"}
+            Injury("Key Striker", "doubtful", "hamstring"),
+            Injury("Main Defender", "out", "knee"),
+            Injury("Midfielder", "fit", "none"),
+            Injury("Goalkeeper", "fit", "none")
         ]
         
         # Return random subset of injuries
+        rng = rng or self._rng("injuries", team)
         max_injuries = SCRAPER_CONFIG["MAX_INJURIES_PER_TEAM"]
-        num_injuries = random.randint(0, max_injuries)
-        return random.sample(potential_injuries, min(num_injuries, len(potential_injuries)))
+        num_injuries = rng.randint(0, max_injuries)
+        return rng.sample(potential_injuries, min(num_injuries, len(potential_injuries)))
+    
+    async def get_team_statistics(self, team_name: str) -> Dict[str, Any]:
+        """
+        Team statistics through the team cache, scraping only on a miss.
+        
+        Args:
+            team_name: Name of the team
+            
+        Returns:
+            Dictionary containing team statistics
+        """
+        if self.team_stats_cache is None:
+            return await self.scrape_team_statistics(team_name)
+        return await self.team_stats_cache.get_or_fetch(team_name, self.scrape_team_statistics)
+    
+    async def prefetch_teams(self, team_names: List[str]) -> int:
+        """
+        Warm the team cache with every distinct team of a slate.
+        
+        Args:
+            team_names: Team names, duplicates allowed
+            
+        Returns:
+            Number of teams fetched from upstream
+        """
+        if self.team_stats_cache is None:
+            return 0
+        return await self.team_stats_cache.prefetch(team_names, self.scrape_team_statistics)
     
     async def scrape_team_statistics(self, team_name: str) -> Dict[str, Any]:
         """
@@ -192,23 +456,24 @@ class WebScraperService:
             
             # For MVP, return simulated team data
             min_delay, max_delay = SCRAPER_CONFIG["TEAM_STATS_DELAY_RANGE"]
-            await asyncio.sleep(random.uniform(min_delay, max_delay))
+            rng = self._rng("team_statistics", team_name)
+            await asyncio.sleep(self._simulated_delay(rng, min_delay, max_delay))
             
             return {
-                "league_position": random.randint(1, 20),
-                "points": random.randint(15, 85),
-                "games_played": random.randint(15, 30),
-                "wins": random.randint(5, 20),
-                "draws": random.randint(2, 8),
-                "losses": random.randint(1, 15),
-                "goals_for": random.randint(20, 70),
-                "goals_against": random.randint(15, 50),
-                "goal_difference": random.randint(-20, 40),
-                "clean_sheets": random.randint(3, 15),
-                "avg_possession": random.randint(35, 65),
-                "shots_per_game": random.uniform(8.0, 18.0),
-                "shots_on_target_percentage": random.uniform(25.0, 45.0),
-                "pass_accuracy": random.uniform(70.0, 90.0)
+                "league_position": rng.randint(1, 20),
+                "points": rng.randint(15, 85),
+                "games_played": rng.randint(15, 30),
+                "wins": rng.randint(5, 20),
+                "draws": rng.randint(2, 8),
+                "losses": rng.randint(1, 15),
+                "goals_for": rng.randint(20, 70),
+                "goals_against": rng.randint(15, 50),
+                "goal_difference": rng.randint(-20, 40),
+                "clean_sheets": rng.randint(3, 15),
+                "avg_possession": rng.randint(35, 65),
+                "shots_per_game": rng.uniform(8.0, 18.0),
+                "shots_on_target_percentage": rng.uniform(25.0, 45.0),
+                "pass_accuracy": rng.uniform(70.0, 90.0)
             }
             
         except Exception as e:
@@ -219,6 +484,10 @@ class WebScraperService:
         """
         Scrape current betting odds from multiple bookmakers.
         
+        All bookmakers are scraped concurrently and every snapshot is
+        recorded in the odds store, when one is configured. The averaged
+        odds are pushed to the match's update subscribers.
+        
         Args:
             match: Match to get odds for
             
@@ -228,82 +497,258 @@ class WebScraperService:
         try:
             logger.info(f"Scraping betting odds for {match.homeTeam} vs {match.awayTeam}")
             
-            # For MVP, return simulated odds data
-            min_delay, max_delay = SCRAPER_CONFIG["BETTING_ODDS_DELAY_RANGE"]
-            await asyncio.sleep(random.uniform(min_delay, max_delay))
+            bookmakers = SCRAPER_CONFIG["BOOKMAKERS"]
+            snapshots = await asyncio.gather(
+                *(self._scrape_bookmaker_odds(match, bookmaker) for bookmaker in bookmakers),
+                return_exceptions=True
+            )
             
-            return {
-                "home_win": round(random.uniform(1.5, 4.0), 2),
-                "draw": round(random.uniform(2.8, 4.5), 2),
-                "away_win": round(random.uniform(1.8, 5.0), 2),
-                "over_2_5": round(random.uniform(1.6, 2.8), 2),
-                "under_2_5": round(random.uniform(1.4, 2.5), 2),
-                "btts_yes": round(random.uniform(1.5, 2.2), 2),
-                "btts_no": round(random.uniform(1.6, 2.5), 2)
+            quoted = []
+            for bookmaker, odds in zip(bookmakers, snapshots):
+                if isinstance(odds, BaseException):
+                    logger.warning(f"Error scraping {bookmaker} odds: {odds}")
+                    continue
+                if self.odds_store is not None:
+                    self.odds_store.record(match.id, bookmaker, odds)
+                quoted.append(odds)
+            
+            if not quoted:
+                return {}
+            
+            markets = quoted[0].keys()
+            averaged = {
+                market: round(sum(odds[market] for odds in quoted) / len(quoted), 2)
+                for market in markets
             }
+            if self.updates is not None:
+                self.updates.publish((match_topic(match.id),), {
+                    "type": "odds", "matchId": match.id, "bookmakers": len(quoted), "odds": averaged
+                })
+            return averaged
             
         except Exception as e:
             logger.error(f"Error scraping betting odds: {e}")
             return {}
     
-    def _get_fallback_data(self) -> Dict[str, Any]:
+    async def _scrape_bookmaker_odds(self, match: Match, bookmaker: str) -> Dict[str, float]:
         """
-        Return minimal fallback data when scraping fails.
+        Scrape one bookmaker's odds for a match.
         """
+        # For MVP, return simulated odds data
+        min_delay, max_delay = SCRAPER_CONFIG["BETTING_ODDS_DELAY_RANGE"]
+        rng = self._rng("betting_odds", match.id, bookmaker)
+        await asyncio.sleep(self._simulated_delay(rng, min_delay, max_delay))
+        
         return {
-            "match_statistics": {},
-            "team_news": {"home_injuries": [], "away_injuries": []},
-            "head_to_head": {},
-            "betting_odds": {},
-            "weather_conditions": {},
-            "expert_predictions": [],
-            "stadium_info": {},
-            "scraping_status": "failed"
+            "home_win": round(rng.uniform(1.5, 4.0), 2),
+            "draw": round(rng.uniform(2.8, 4.5), 2),
+            "away_win": round(rng.uniform(1.8, 5.0), 2),
+            "over_2_5": round(rng.uniform(1.6, 2.8), 2),
+            "under_2_5": round(rng.uniform(1.4, 2.5), 2),
+            "btts_yes": round(rng.uniform(1.5, 2.2), 2),
+            "btts_no": round(rng.uniform(1.6, 2.5), 2)
         }
     
-    async def _make_request(self, url: str, retries: int = 0) -> Optional[str]:
+    def _rng(self, *key: str):
+        """
+        Randomness source for simulated data.
+        
+        In upstream replay mode every simulation is seeded by the replay seed
+        and what it simulates, so offline runs produce identical data.
+        """
+        if upstream_mode() != MODE_REPLAY:
+            return random
+        return seeded_random(replay_seed(), *key)
+    
+    def _simulated_delay(self, rng, min_delay: float, max_delay: float) -> float:
+        """Simulated source latency; replay mode uses the configured replay latency."""
+        if upstream_mode() == MODE_REPLAY:
+            return replay_latency().sample(rng)
+        return rng.uniform(min_delay, max_delay)
+    
+    def _get_fallback_data(self) -> ScrapedMatchData:
+        """
+        Return minimal fallback data when scraping fails.
+        """
+        return ScrapedMatchData(scraping_status="failed")
+    
+    async def fetch_pages(
+        self,
+        match: Match,
+        urls: List[str],
+        staleness: Optional[float] = None
+    ) -> Dict[str, Optional[str]]:
         """
-        Make HTTP request with error handling and rate limiting.
+        Fetch pages for a match through the crawl frontier.
+        
+        Args:
+            match: Match the pages belong to; its kickoff sets the crawl priority
+            urls: Pages to fetch
+            staleness: Seconds since this data was last fetched, None if never
+            
+        Returns:
+            Mapping of URL to page text (None for failed fetches)
+        """
+        if self.frontier is None:
+            pages = await asyncio.gather(*(self._make_request(url) for url in urls))
+            return dict(zip(urls, pages))
+        
+        kickoff = datetime.fromisoformat(match.startTime.replace('Z', '+00:00'))
+        return await self.frontier.crawl(urls, kickoff, staleness)
+    
+    async def scrape_page(self, url: str) -> Optional[Extraction]:
+        """
+        Stream a page and extract only the configured sections from it.
+        
+        The body is parsed chunk by chunk as it arrives instead of being
+        decoded whole and built into a DOM. A page whose URL and validators
+        (ETag, Last-Modified) were seen before is answered from the parse
+        cache without reading its body.
         
         Args:
             url: URL to scrape
-            retries: Current retry attempt
             
         Returns:
-            Response text or None if failed
+            Mapping of section name (form, injuries, odds) to rows of cell
+            texts, or None if the request failed
         """
+        await self.politeness.wait(url_domain(url))
+        timeout = remaining_timeout(self.request_timeout)
+        if timeout <= 0:
+            logger.warning(f"No time left to scrape {url}")
+            return None
         try:
-            await asyncio.sleep(self.rate_limit_delay)
-            
-            async with httpx.AsyncClient(timeout=self.request_timeout) as client:
-                response = await client.get(url, headers=self.headers)
-                response.raise_for_status()
-                return response.text
-                
-        except httpx.TimeoutException:
-            if retries < self.max_retries:
-                logger.warning(f"Timeout scraping {url}, retrying ({retries + 1}/{self.max_retries})")
-                backoff_base = SCRAPER_CONFIG["EXPONENTIAL_BACKOFF_BASE"]
-                await asyncio.sleep(backoff_base ** retries)  # Exponential backoff
-                return await self._make_request(url, retries + 1)
-            else:
-                logger.error(f"Max retries exceeded for {url}")
-                return None
-                
+            async with httpx.AsyncClient(timeout=timeout, transport=get_upstream_transport()) as client:
+                with UpstreamCall(url) as call:
+                    async with client.stream("GET", url, headers=self.headers) as response:
+                        call.status = response.status_code
+                        response.raise_for_status()
+                        return await self.extractor.extract_stream(
+                            response.aiter_bytes(),
+                            response.encoding or "utf-8",
+                            page_key=self.extractor.page_key(url, response.headers)
+                        )
         except httpx.HTTPStatusError as e:
-            if e.response.status_code == 429:  # Rate limited
-                backoff_base = SCRAPER_CONFIG["EXPONENTIAL_BACKOFF_BASE"]
-                wait_multiplier = SCRAPER_CONFIG["RATE_LIMIT_WAIT_MULTIPLIER"]
-                wait_time = backoff_base ** retries * wait_multiplier  # Longer wait for rate limits
-                logger.warning(f"Rate limited on {url}, waiting {wait_time}s")
-                await asyncio.sleep(wait_time)
-                
-                if retries < self.max_retries:
-                    return await self._make_request(url, retries + 1)
-            
             logger.error(f"HTTP error {e.response.status_code} for {url}")
             return None
-            
         except Exception as e:
             logger.error(f"Unexpected error scraping {url}: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    async def _make_request(self, url: str) -> Optional[str]:
+        """
+        Make HTTP request with per-domain politeness, error handling and retries.
+        
+        Args:
+            url: URL to scrape
+            
+        Returns:
+            Response text or None if failed
+        """
+        await self.politeness.wait(url_domain(url))
+        return await self._fetch_hedged(url)
+    
+    async def _fetch_hedged(self, url: str) -> Optional[str]:
+        """
+        Fetch a page, sending a hedged duplicate to a mirror if it is slow.
+        
+        Politeness for the primary URL is left to the caller, like
+        _fetch_page; the hedge waits for its own domain's slot.
+        
+        Args:
+            url: URL to scrape
+            
+        Returns:
+            Response text of whichever request answered first, or None if both failed
+        """
+        if self.hedger is None:
+            return await self._fetch_page(url)
+        return await self.hedger.run(url, self._fetch_page, hedge_fetch=self._fetch_hedge)
+    
+    async def _fetch_hedge(self, url: str) -> Optional[str]:
+        await self.politeness.wait(url_domain(url))
+        return await self._fetch_page(url)
+    
+    async def _fetch_page(self, url: str) -> Optional[str]:
+        """
+        Fetch a page, retrying timeouts and rate limits with jittered backoff.
+        
+        Politeness is left to the caller (_make_request or the crawl frontier).
+        Each attempt is bounded by the current request deadline, and no retry
+        is started whose backoff would outlast it.
+        
+        Args:
+            url: URL to scrape
+            
+        Returns:
+            Response text or None if failed
+        """
+        for attempt in range(self.max_retries + 1):
+            timeout = remaining_timeout(self.request_timeout)
+            if timeout <= 0:
+                logger.warning(f"No time left to fetch {url}")
+                return None
+            try:
+                async with httpx.AsyncClient(timeout=timeout, transport=get_upstream_transport()) as client:
+                    with UpstreamCall(url) as call:
+                        response = await client.get(url, headers=self.headers)
+                        call.status = response.status_code
+                    response.raise_for_status()
+                    return response.text
+                    
+            except httpx.TimeoutException:
+                if attempt >= self.max_retries:
+                    logger.error(f"Max retries exceeded for {url}")
+                    return None
+                wait_time = self._backoff_delay(attempt)
+                logger.warning(f"Timeout scraping {url}, retrying ({attempt + 1}/{self.max_retries})")
+                
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 429 or attempt >= self.max_retries:
+                    logger.error(f"HTTP error {e.response.status_code} for {url}")
+                    return None
+                # Longer wait for rate limits
+                wait_time = self._backoff_delay(attempt) * SCRAPER_CONFIG["RATE_LIMIT_WAIT_MULTIPLIER"]
+                logger.warning(f"Rate limited on {url}, waiting {wait_time:.1f}s")
+                
+            except Exception as e:
+                logger.error(f"Unexpected error scraping {url}: {e}")
+                return None
+            
+            deadline = current_deadline()
+            if deadline is not None and wait_time >= deadline.remaining():
+                logger.warning(f"Giving up on {url}: retry backoff exceeds the request deadline")
+                return None
+            await asyncio.sleep(wait_time)
+        
+        return None
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Exponential backoff with equal jitter, so retries from many requests don't align.
+        """
+        ceiling = SCRAPER_CONFIG["EXPONENTIAL_BACKOFF_BASE"] ** attempt
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+_domain_politeness: Optional[DomainPoliteness] = None
+_crawl_frontier: Optional[CrawlFrontier] = None
+
+
+def get_domain_politeness() -> DomainPoliteness:
+    """Return the process-wide per-domain politeness tracker."""
+    global _domain_politeness
+    if _domain_politeness is None:
+        _domain_politeness = DomainPoliteness(default_delay=SCRAPER_CONFIG["RATE_LIMIT_DELAY"])
+    return _domain_politeness
+
+
+def get_crawl_frontier() -> CrawlFrontier:
+    """Return the process-wide crawl frontier, sharing the politeness tracker."""
+    global _crawl_frontier
+    if _crawl_frontier is None:
+        _crawl_frontier = CrawlFrontier(
+            fetch=WebScraperService(hedger=get_request_hedger())._fetch_hedged,
+            politeness=get_domain_politeness()
+        )
+    return _crawl_frontier
@@ -0,0 +1,123 @@
+"""
+Benchmark selective streaming HTML extraction against a full-DOM parse.
+
+Run from apps/backend:
+
+    python -m benchmarks.bench_html_extraction --rows 2000 --repeat 5
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from html.parser import HTMLParser
+
+from app.services.html_extractor import HtmlExtractor
+
+
+def build_page(rows: int) -> bytes:
+    """Synthetic match page: large navigation/article noise around the tables we want."""
+    noise = "".join(
+        f'<div class="article"><h2>Story {i}</h2><p>{"Lorem ipsum dolor sit amet. " * 20}</p>'
+        f'<a href="/news/{i}"><img src="/img/{i}.png"/></a></div>'
+        for i in range(rows)
+    )
+    form = "".join(
+        f"<tr><td>Team {i}</td><td>{'WDL'[i % 3]}</td><td>{i % 4}-{i % 3}</td></tr>" for i in range(20)
+    )
+    injuries = "".join(f"<li>Player {i} - hamstring - doubtful</li>" for i in range(10))
+    odds = "".join(
+        f'<tr class="odds-row"><td>Bookmaker {i}</td><td>2.10</td><td>3.40</td><td>3.60</td></tr>'
+        for i in range(30)
+    )
+    html = (
+        "<html><head><title>Match</title></head><body>"
+        f"<nav>{noise}</nav>"
+        f'<table class="form-table">{form}</table>'
+        f'<ul class="injury-list">{injuries}</ul>'
+        f"<table>{odds}</table>"
+        f"<footer>{noise}</footer>"
+        "</body></html>"
+    )
+    return html.encode("utf-8")
+
+
+class _TreeBuilder(HTMLParser):
+    """Baseline: materialise the whole document as a nested tree, like a DOM parser would."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = {"tag": "#root", "attrs": {}, "children": []}
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = {"tag": tag, "attrs": dict(attrs), "children": []}
+        self.stack[-1]["children"].append(node)
+        if tag not in {"img", "br", "meta", "link", "input", "hr"}:
+            self.stack.append(node)
+
+    def handle_endtag(self, tag):
+        for index in range(len(self.stack) - 1, 0, -1):
+            if self.stack[index]["tag"] == tag:
+                del self.stack[index:]
+                break
+
+    def handle_data(self, data):
+        self.stack[-1]["children"].append(data)
+
+
+def full_dom_parse(content: bytes):
+    builder = _TreeBuilder()
+    builder.feed(content.decode("utf-8"))
+    builder.close()
+    return builder.root
+
+
+async def _chunks(content: bytes, size: int = 16 * 1024):
+    for start in range(0, len(content), size):
+        yield content[start:start + size]
+
+
+def measure(label: str, func, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"case": label, "median_ms": statistics.median(timings) * 1000, "peak_kib": peak / 1024}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000, help="noise blocks around the extracted tables")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    page = build_page(args.rows)
+
+    def streaming():
+        asyncio.run(HtmlExtractor().extract_stream(_chunks(page)))
+
+    warm = HtmlExtractor()
+    warm.extract(page)
+
+    results = [
+        measure("full DOM parse", lambda: full_dom_parse(page), args.repeat),
+        measure("selective streaming", streaming, args.repeat),
+        measure("content-hash cache hit", lambda: warm.extract(page), args.repeat),
+    ]
+
+    print(f"page size: {len(page) / 1024:.0f} KiB")
+    print(f"{'case':<26}{'median ms':>12}{'peak KiB':>12}")
+    for result in results:
+        print(f"{result['case']:<26}{result['median_ms']:>12.2f}{result['peak_kib']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Measure memory per cached match: plain nested dicts versus typed slotted records.
+
+Run from apps/backend:
+
+    python -m benchmarks.bench_scraped_data_memory --matches 2000
+"""
+import argparse
+import asyncio
+import gc
+import tracemalloc
+from unittest.mock import patch
+
+from app.models.match import Match
+from app.services.web_scraper import WebScraperService
+
+TEAMS = [
+    "Arsenal", "Aston Villa", "Bournemouth", "Brentford", "Brighton & Hove Albion", "Burnley",
+    "Chelsea", "Crystal Palace", "Everton", "Fulham", "Liverpool", "Luton Town",
+    "Manchester City", "Manchester United", "Newcastle United", "Nottingham Forest",
+    "Sheffield United", "Tottenham Hotspur", "West Ham United", "Wolverhampton Wanderers"
+]
+
+
+def build_matches(count: int):
+    # Team names arrive as fresh strings from each API response, as in production
+    return [
+        Match(
+            id=str(2_000_000 + index),
+            homeTeam=TEAMS[index % len(TEAMS)].encode().decode(),
+            awayTeam=TEAMS[(index * 7 + 3) % len(TEAMS)].encode().decode(),
+            startTime="2025-08-19T18:45:00Z"
+        )
+        for index in range(count)
+    ]
+
+
+async def simulate(matches):
+    scraper = WebScraperService()
+    with patch("asyncio.sleep"):
+        return [await scraper._simulate_scraped_data(match) for match in matches]
+
+
+def measure(label: str, build) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    data = build()
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"case": label, "bytes": after - before, "items": len(data)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--matches", type=int, default=2000)
+    args = parser.parse_args()
+
+    matches = build_matches(args.matches)
+    typed_sections = asyncio.run(simulate(matches))
+
+    def typed():
+        return asyncio.run(simulate(matches))
+
+    def plain():
+        # Same content in the nested-dict shape the scraper produced before
+        return [
+            {
+                section: [item.to_dict() for item in value] if isinstance(value, tuple) else value.to_dict()
+                for section, value in sections.items()
+            }
+            for sections in typed_sections
+        ]
+
+    results = [measure("nested dicts", plain), measure("typed records", typed)]
+
+    print(f"matches: {args.matches}")
+    print(f"{'case':<16}{'total KiB':>12}{'bytes/match':>14}")
+    for result in results:
+        print(f"{result['case']:<16}{result['bytes'] / 1024:>12.0f}{result['bytes'] / result['items']:>14.0f}")
+    print(f"reduction: {1 - results[1]['bytes'] / results[0]['bytes']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""
+Load test the prediction API under uvicorn against replayed upstreams.
+
+Starts the app with UPSTREAM_MODE=replay and synthetic upstream cassettes,
+drives /prediction/matches and /prediction/predict, and reports RPS and
+p50/p95/p99 latency per endpoint. Results are saved as JSON; passing a
+previous result as --baseline fails the run (exit code 1) when latency or
+throughput regressed beyond the tolerances.
+
+Run from apps/backend:
+
+    # closed loop: 32 clients back to back for 30s
+    python -m benchmarks.load_test --concurrency 32 --duration 30 --output results.json
+
+    # open loop: Poisson arrivals at 200 req/s, gated against a stored baseline
+    python -m benchmarks.load_test --rate 200 --duration 30 --baseline baseline.json
+
+    # against a server that is already running
+    python -m benchmarks.load_test --url http://localhost:8000 --concurrency 16
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.services.match_service import MatchService
+from app.services.upstream_replay import CassetteStore
+
+TEAMS = [
+    "Arsenal", "Aston Villa", "Bournemouth", "Brentford", "Brighton & Hove Albion", "Burnley",
+    "Chelsea", "Crystal Palace", "Everton", "Fulham", "Liverpool", "Luton Town",
+    "Manchester City", "Manchester United", "Newcastle United", "Nottingham Forest",
+    "Sheffield United", "Tottenham Hotspur", "West Ham United", "Wolverhampton Wanderers"
+]
+RISK_LEVELS = ("Low", "Medium", "High")
+PERCENTILES = (50, 95, 99)
+# Runs are only comparable when they applied the same load
+COMPARABLE_SETTINGS = ("mode", "rate", "concurrency", "predict_ratio", "matches", "upstream_latency", "upstream_error_rate")
+
+
+def synthetic_events(count: int) -> List[Dict[str, Any]]:
+    """Upcoming fixtures shaped like TheSportsDB eventsnextleague events."""
+    kickoff = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+    return [
+        {
+            "idEvent": str(3_000_000 + index),
+            "strHomeTeam": TEAMS[index % len(TEAMS)],
+            "strAwayTeam": TEAMS[(index * 7 + 3) % len(TEAMS)],
+            "dateEvent": (kickoff + timedelta(hours=index)).strftime("%Y-%m-%d"),
+            "strTime": (kickoff + timedelta(hours=index)).strftime("%H:%M:%S")
+        }
+        for index in range(count)
+    ]
+
+
+def write_upstream_cassettes(directory: str, events: List[Dict[str, Any]]) -> None:
+    """Record the sports API response the app will replay."""
+    service = MatchService()
+    url = f"{service.base_url}/eventsnextleague.php?id={service.premier_league_id}"
+    body = json.dumps({"events": events}).encode()
+    request = httpx.Request("GET", url)
+    response = httpx.Response(200, headers={"content-type": "application/json"}, content=body, request=request)
+    CassetteStore(directory).save(request, response, body)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workdir: str, args: argparse.Namespace) -> subprocess.Popen:
+    """Start uvicorn on replayed upstreams and wait until it has warmed up (/ready)."""
+    cassette_dir = os.path.join(workdir, "cassettes")
+    write_upstream_cassettes(cassette_dir, synthetic_events(args.matches))
+    env = {
+        **os.environ,
+        "UPSTREAM_MODE": "replay",
+        "UPSTREAM_CASSETTE_DIR": cassette_dir,
+        "UPSTREAM_REPLAY_LATENCY": args.upstream_latency,
+        "UPSTREAM_REPLAY_ERROR_RATE": str(args.upstream_error_rate),
+        "SCRAPE_CACHE_PATH": os.path.join(workdir, "scrape_cache.json"),
+        "SHARED_CACHE_PATH": os.path.join(workdir, "shared_cache.sqlite3"),
+        "PROFILE_DIR": os.path.join(workdir, "profiles")
+    }
+    command = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log"
+    ]
+    server = subprocess.Popen(command, env=env, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/ready", timeout=1.0).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 30s")
+
+
+class LoadRecorder:
+    """Latency and outcome of every request, per endpoint."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, Dict[str, int]] = {}
+
+    def record(self, endpoint: str, latency: float, outcome: str) -> None:
+        if outcome == "200":
+            self.latencies.setdefault(endpoint, []).append(latency)
+        else:
+            errors = self.errors.setdefault(endpoint, {})
+            errors[outcome] = errors.get(outcome, 0) + 1
+
+    def summary(self, duration: float) -> Dict[str, Dict[str, Any]]:
+        endpoints = {}
+        for endpoint in sorted(set(self.latencies) | set(self.errors)):
+            latencies = sorted(self.latencies.get(endpoint, []))
+            errors = self.errors.get(endpoint, {})
+            report = {
+                "requests": len(latencies) + sum(errors.values()),
+                "ok": len(latencies),
+                "errors": errors,
+                "rps": round(len(latencies) / duration, 2)
+            }
+            if latencies:
+                report["latency_ms"] = {
+                    **{f"p{p}": round(percentile(latencies, p) * 1000, 2) for p in PERCENTILES},
+                    "mean": round(sum(latencies) / len(latencies) * 1000, 2),
+                    "max": round(latencies[-1] * 1000, 2)
+                }
+            endpoints[endpoint] = report
+        return endpoints
+
+
+def percentile(ordered: List[float], p: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    index = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def fetch_match_ids(client: httpx.AsyncClient) -> List[str]:
+    response = await client.get("/prediction/matches")
+    response.raise_for_status()
+    match_ids = [match["id"] for match in response.json()]
+    if not match_ids:
+        raise RuntimeError("/prediction/matches returned no matches to predict")
+    return match_ids
+
+
+async def send_request(
+    client: httpx.AsyncClient,
+    recorder: LoadRecorder,
+    rng: random.Random,
+    match_ids: List[str],
+    predict_ratio: float,
+    started: float
+) -> None:
+    """One request of the mix; latency counts from `started`, its scheduled time."""
+    if rng.random() < predict_ratio:
+        endpoint = "predict"
+        request = client.post(
+            "/prediction/predict",
+            json={"matchId": rng.choice(match_ids), "riskLevel": rng.choice(RISK_LEVELS)}
+        )
+    else:
+        endpoint = "matches"
+        request = client.get("/prediction/matches")
+    try:
+        response = await request
+        outcome = str(response.status_code)
+    except httpx.TimeoutException:
+        outcome = "timeout"
+    except httpx.HTTPError as e:
+        outcome = type(e).__name__
+    recorder.record(endpoint, time.perf_counter() - started, outcome)
+
+
+async def closed_loop(client, recorder, rng, match_ids, args) -> None:
+    """`concurrency` clients each sending their next request as soon as the last one returns."""
+    stop_at = time.perf_counter() + args.duration
+
+    async def client_loop():
+        while time.perf_counter() < stop_at:
+            await send_request(client, recorder, rng, match_ids, args.predict_ratio, time.perf_counter())
+
+    await asyncio.gather(*(client_loop() for _ in range(args.concurrency)))
+
+
+async def open_loop(client, recorder, rng, match_ids, args) -> None:
+    """
+    Poisson arrivals at `rate` per second, at most `concurrency` in flight.
+
+    Latency is measured from each request's scheduled arrival, so time spent
+    queued behind a slow server is counted instead of hidden.
+    """
+    slots = asyncio.Semaphore(args.concurrency)
+    start = time.perf_counter()
+    arrival = start
+    tasks = []
+
+    async def scheduled(at: float):
+        async with slots:
+            await send_request(client, recorder, rng, match_ids, args.predict_ratio, at)
+
+    while arrival < start + args.duration:
+        delay = arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(scheduled(arrival)))
+        arrival += rng.expovariate(args.rate)
+    await asyncio.gather(*tasks)
+
+
+async def run_load(base_url: str, args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        match_ids = await fetch_match_ids(client)
+
+        if args.warmup > 0:
+            warmup = argparse.Namespace(**{**vars(args), "duration": args.warmup})
+            await closed_loop(client, LoadRecorder(), rng, match_ids, warmup)
+
+        recorder = LoadRecorder()
+        started = time.perf_counter()
+        if args.rate:
+            await open_loop(client, recorder, rng, match_ids, args)
+        else:
+            await closed_loop(client, recorder, rng, match_ids, args)
+        elapsed = time.perf_counter() - started
+
+    return {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "mode": "open" if args.rate else "closed",
+            "rate": args.rate,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "predict_ratio": args.predict_ratio,
+            "matches": args.matches,
+            "upstream_latency": args.upstream_latency,
+            "upstream_error_rate": args.upstream_error_rate,
+            "python": platform.python_version()
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        "endpoints": recorder.summary(elapsed)
+    }
+
+
+def compare_to_baseline(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    latency_tolerance: float,
+    throughput_tolerance: float
+) -> List[str]:
+    """
+    Regressions of the results against a baseline run.
+
+    Args:
+        latency_tolerance: Allowed relative increase of p50/p95/p99, e.g. 0.2 for +20%
+        throughput_tolerance: Allowed relative drop of RPS, e.g. 0.1 for -10%
+
+    Returns:
+        One message per regressed endpoint metric; empty when within tolerance
+    """
+    regressions = [
+        f"load setting {key} differs from baseline: {results['config'].get(key)} != {baseline['config'].get(key)}"
+        for key in COMPARABLE_SETTINGS
+        if results["config"].get(key) != baseline["config"].get(key)
+    ]
+    if regressions:
+        return regressions
+    for endpoint, before in baseline["endpoints"].items():
+        after = results["endpoints"].get(endpoint)
+        if after is None:
+            regressions.append(f"{endpoint}: no successful requests")
+            continue
+        if after["rps"] < before["rps"] * (1 - throughput_tolerance):
+            regressions.append(f"{endpoint}: throughput {after['rps']} rps < baseline {before['rps']} rps")
+        for name, value in before.get("latency_ms", {}).items():
+            if name not in {f"p{p}" for p in PERCENTILES}:
+                continue
+            current = after.get("latency_ms", {}).get(name)
+            if current is not None and current > value * (1 + latency_tolerance):
+                regressions.append(f"{endpoint}: {name} {current}ms > baseline {value}ms")
+    return regressions
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    config = results["config"]
+    load = f"{config['rate']} req/s" if config["mode"] == "open" else f"{config['concurrency']} clients"
+    print(f"{config['mode']} loop, {load}, {results['elapsed_seconds']}s")
+    print(f"{'endpoint':<10}{'ok':>8}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for endpoint, report in results["endpoints"].items():
+        latency = report.get("latency_ms", {})
+        print(
+            f"{endpoint:<10}{report['ok']:>8}{sum(report['errors'].values()):>8}{report['rps']:>10}"
+            f"{latency.get('p50', '-'):>10}{latency.get('p95', '-'):>10}{latency.get('p99', '-'):>10}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Target a running server instead of starting uvicorn")
+    parser.add_argument("--concurrency", type=int, default=16, help="Clients (closed loop) or max in flight (open loop)")
+    parser.add_argument("--rate", type=float, help="Open-loop arrival rate in requests per second")
+    parser.add_argument("--duration", type=float, default=20.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds before the run")
+    parser.add_argument("--predict-ratio", type=float, default=0.8, help="Share of requests hitting /predict")
+    parser.add_argument("--matches", type=int, default=380, help="Upcoming matches served by the stub upstream")
+    parser.add_argument("--upstream-latency", default="lognormal:40:0.5", help="Replay latency spec in ms")
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", help="Results JSON to gate against")
+    parser.add_argument("--latency-tolerance", type=float, default=0.2, help="Allowed relative p50/p95/p99 increase")
+    parser.add_argument("--throughput-tolerance", type=float, default=0.1, help="Allowed relative RPS drop")
+    args = parser.parse_args()
+
+    server: Optional[subprocess.Popen] = None
+    with tempfile.TemporaryDirectory(prefix="load-test-") as workdir:
+        base_url = args.url
+        if base_url is None:
+            port = free_port()
+            server = start_server(port, workdir, args)
+            base_url = f"http://127.0.0.1:{port}"
+        try:
+            results = asyncio.run(run_load(base_url, args))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=10)
+
+    print_report(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.latency_tolerance, args.throughput_tolerance)
+        if regressions:
+            print("REGRESSION against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("within baseline tolerances")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""
+Microbenchmarks for the backend's hot-path functions, timed in isolation.
+
+Each benchmark processes a batch of synthetic, production-shaped inputs
+(by default 1k, 10k and 100k events) and reports the best batch time and
+the cost per item. Save results with --output and pass them back as
+--baseline to see the change per function.
+
+Run from apps/backend:
+
+    python -m benchmarks.microbench
+    python -m benchmarks.microbench --sizes 1000,10000 --only format_match,parse_event_datetime
+    python -m benchmarks.microbench --output before.json
+    python -m benchmarks.microbench --baseline before.json
+"""
+import argparse
+import asyncio
+import gc
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+import httpx
+from pydantic import TypeAdapter
+
+from app.main import app
+from app.api.prediction_router import (
+    get_match_service, get_prediction_cache, get_prediction_service, get_web_scraper_service
+)
+from app.models.match import Match, PredictionResult
+from app.models.scraped_data import ScrapedMatchData
+from app.services.match_service import MatchService
+from app.services.odds_store import ODDS_MARKETS, OddsStore
+from app.services.prediction_cache import PredictionCache
+from app.services.prediction_service import PredictionService
+
+TEAMS = [
+    "Arsenal", "Aston Villa", "Bournemouth", "Brentford", "Brighton & Hove Albion", "Burnley",
+    "Chelsea", "Crystal Palace", "Everton", "Fulham", "Liverpool", "Luton Town",
+    "Manchester City", "Manchester United", "Newcastle United", "Nottingham Forest",
+    "Sheffield United", "Tottenham Hotspur", "West Ham United", "Wolverhampton Wanderers"
+]
+RISK_LEVELS = ("Low", "Medium", "High")
+
+# Shape of a full scrape, as the scraper caches it
+SCRAPED_TEMPLATE = {
+    "match_statistics": {
+        "home_team_form": ["W", "W", "D", "L", "W"],
+        "away_team_form": ["L", "D", "W", "W", "L"],
+        "home_goals_scored_last_5": 9,
+        "away_goals_scored_last_5": 6,
+        "home_goals_conceded_last_5": 4,
+        "away_goals_conceded_last_5": 7
+    },
+    "team_news": {
+        "home_injuries": [{"player": "Player 7", "status": "Doubtful", "injury": "Hamstring"}],
+        "away_injuries": [],
+        "home_suspensions": [],
+        "away_suspensions": []
+    },
+    "betting_odds": {"home_win": 2.1, "draw": 3.4, "away_win": 3.6, "over_2_5": 1.9, "under_2_5": 1.95},
+    "weather_conditions": {"temperature": 14, "conditions": "Cloudy", "wind_speed": 12, "humidity": 70},
+    "expert_predictions": [
+        {"source": "Expert A", "prediction": "Home Win", "confidence": 70},
+        {"source": "Expert B", "prediction": "Draw", "confidence": 55}
+    ]
+}
+
+Batch = Callable[[], Any]
+Setup = Callable[[int, random.Random], Tuple[Batch, bool]]
+
+
+def synthetic_events(count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """TheSportsDB events; a few lack a kickoff time, as in real responses."""
+    start = datetime(2025, 8, 16, 12, 30, tzinfo=timezone.utc)
+    events = []
+    for index in range(count):
+        kickoff = start + timedelta(hours=rng.randrange(0, 24 * 280))
+        events.append({
+            "idEvent": str(2_000_000 + index),
+            "strHomeTeam": f" {TEAMS[index % len(TEAMS)]} ",
+            "strAwayTeam": TEAMS[(index * 7 + 3) % len(TEAMS)],
+            "dateEvent": kickoff.strftime("%Y-%m-%d"),
+            "strTime": kickoff.strftime("%H:%M:%S") if index % 10 else None,
+            "strLeague": "English Premier League",
+            "strVenue": "Stadium"
+        })
+    return events
+
+
+def synthetic_matches(count: int, rng: random.Random) -> List[Match]:
+    service = MatchService()
+    return [service._format_match(event) for event in synthetic_events(count, rng)]
+
+
+def bench_format_match(size: int, rng: random.Random) -> Tuple[Batch, bool]:
+    service = MatchService()
+    events = synthetic_events(size, rng)
+    return (lambda: [service._format_match(event) for event in events]), False
+
+
+def bench_parse_event_datetime(size: int, rng: random.Random) -> Tuple[Batch, bool]:
+    service = MatchService()
+    pairs = [(event["dateEvent"], event["strTime"]) for event in synthetic_events(size, rng)]
+    return (lambda: [service._parse_event_datetime(date, time_) for date, time_ in pairs]), False
+
+
+def bench_analyze_match_data(size: int, rng: random.Random) -> Tuple[Batch, bool]:
+    service = PredictionService()
+    matches = synthetic_matches(size, rng)
+    scraped = ScrapedMatchData.from_dict(SCRAPED_TEMPLATE)
+
+    async def batch():
+        for match in matches:
+            await service._analyze_match_data(match, scraped)
+    return batch, True
+
+
+def _analyses(service: PredictionService, matches: List[Match]) -> List[Dict[str, Any]]:
+    scraped = ScrapedMatchData.from_dict(SCRAPED_TEMPLATE)
+    loop = asyncio.new_event_loop()
+    try:
+        return [loop.run_until_complete(service._analyze_match_data(match, scraped)) for match in matches]
+    finally:
+        loop.close()
+
+
+def bench_generate_bet_suggestion(size: int, rng: random.Random) -> Tuple[Batch, bool]:
+    service = PredictionService()
+    matches = synthetic_matches(size, rng)
+    cases = list(zip(matches, _analyses(service, matches), (RISK_LEVELS[i % 3] for i in range(size))))
+    return (lambda: [service._generate_bet_suggestion(match, risk, analysis) for match, analysis, risk in cases]), False
+
+
+def bench_apply_analysis_to_selection(size: int, rng: random.Random) -> Tuple[Batch, bool]:
+    service = PredictionService()
+    matches = synthetic_matches(size, rng)
+    risk_config = service.risk_level_mappings["Medium"]
+    cases = [
+        (
+            [f"{match.homeTeam} to win", f"{match.awayTeam} to win", "Over 2.5 goals",
+             "Both teams to score - Yes", f"{match.homeTeam} to win and Over 1.5 goals"],
+            analysis
+        )
+        for match, analysis in zip(matches, _analyses(service, matches))
+    ]
+    return (lambda: [service._apply_analysis_to_selection(options, analysis, risk_config) for options, analysis in cases]), False
+
+
+def bench_match_serialize(size: int, rng: random.Random) -> Tuple[Batch, bool]:
+    matches = synthetic_matches(size, rng)
+    return (lambda: [match.model_dump_json() for match in matches]), False
+
+
+def bench_match_validate(size: int, rng: random.Random) -> Tuple[Batch, bool]:
+    payloads = [match.model_dump() for match in synthetic_matches(size, rng)]
+    return (lambda: [Match.model_validate(payload) for payload in payloads]), False
+
+
+def bench_match_list_response(size: int, rng: random.Random) -> Tuple[Batch, bool]:
+    """The List[Match] body of GET /prediction/matches, serialized in one go."""
+    adapter = TypeAdapter(List[Match])
+    matches = synthetic_matches(size, rng)
+    return (lambda: adapter.dump_json(matches)), False
+
+
+def bench_prediction_result_serialize(size: int, rng: random.Random) -> Tuple[Batch, bool]:
+    results = [
+        PredictionResult(
+            betSuggestion=f"{TEAMS[i % len(TEAMS)]} to win",
+            rationale="Home side unbeaten in five with the stronger attack; odds still offer value.",
+            riskLevel=RISK_LEVELS[i % 3],
+            degraded=i % 20 == 0,
+            degradedReasons=["betting_odds:stale"] if i % 20 == 0 else []
+        )
+        for i in range(size)
+    ]
+    return (lambda: [result.model_dump_json() for result in results]), False
+
+
+class _StubMatchService:
+    def __init__(self, matches: List[Match]):
+        self.matches = matches
+
+    async def get_upcoming_matches(self) -> List[Match]:
+        return self.matches
+
+
+class _StubScraper:
+    def __init__(self):
+        self.scraped = ScrapedMatchData.from_dict(SCRAPED_TEMPLATE)
+
+    async def scrape_match_data(self, match: Match) -> ScrapedMatchData:
+        return self.scraped
+
+
+def bench_predict_request(size: int, rng: random.Random) -> Tuple[Batch, bool]:
+    """
+    POST /prediction/predict through the full ASGI stack in process.
+
+    Upstream services are stubbed and the prediction cache bypassed, so
+    this times routing, middleware, admission, validation, the prediction
+    itself and response serialization.
+    """
+    matches = synthetic_matches(380, rng)
+    requests = [
+        {"matchId": rng.choice(matches).id, "riskLevel": RISK_LEVELS[i % 3]}
+        for i in range(size)
+    ]
+    match_service = _StubMatchService(matches)
+    scraper = _StubScraper()
+    prediction_service = PredictionService()
+
+    async def batch():
+        app.dependency_overrides[get_match_service] = lambda: match_service
+        app.dependency_overrides[get_web_scraper_service] = lambda: scraper
+        app.dependency_overrides[get_prediction_service] = lambda: prediction_service
+        # Every request does the full prediction rather than hitting the cache
+        app.dependency_overrides[get_prediction_cache] = lambda: PredictionCache(ttl=0)
+        try:
+            async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+                for body in requests:
+                    response = await client.post("/prediction/predict", json=body)
+                    assert response.status_code == 200, response.text
+        finally:
+            app.dependency_overrides.clear()
+    return batch, True
+
+
+def bench_value_bets_request(size: int, rng: random.Random) -> Tuple[Batch, bool]:
+    """
+    GET /prediction/value-bets over a slate of `size` matches in process.
+
+    Every match has bookmaker odds recorded in the odds store, the normal
+    state once the scraper has run, so this times pricing from stored
+    odds and ranking the whole slate.
+    """
+    matches = synthetic_matches(size, rng)
+    odds_store = OddsStore()
+    for match in matches:
+        for bookmaker in ("book_a", "book_b", "book_c"):
+            odds_store.record(match.id, bookmaker, {market: round(rng.uniform(1.5, 4.5), 2) for market in ODDS_MARKETS})
+    match_service = _StubMatchService(matches)
+    prediction_service = PredictionService()
+
+    async def batch():
+        app.dependency_overrides[get_match_service] = lambda: match_service
+        app.dependency_overrides[get_prediction_service] = lambda: prediction_service
+        try:
+            with patch("app.api.prediction_router.get_odds_store", return_value=odds_store):
+                async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+                    response = await client.get("/prediction/value-bets?limit=20")
+                    assert response.status_code == 200, response.text
+        finally:
+            app.dependency_overrides.clear()
+    return batch, True
+
+
+BENCHMARKS: Dict[str, Setup] = {
+    "format_match": bench_format_match,
+    "parse_event_datetime": bench_parse_event_datetime,
+    "analyze_match_data": bench_analyze_match_data,
+    "generate_bet_suggestion": bench_generate_bet_suggestion,
+    "apply_analysis_to_selection": bench_apply_analysis_to_selection,
+    "match_serialize": bench_match_serialize,
+    "match_validate": bench_match_validate,
+    "match_list_response": bench_match_list_response,
+    "prediction_result_serialize": bench_prediction_result_serialize,
+    "predict_request": bench_predict_request,
+    "value_bets_request": bench_value_bets_request
+}
+
+# Requests are ~1000x dearer than a function call; their batches are capped
+MAX_REQUESTS = 2000
+
+
+def run_benchmark(name: str, size: int, repeat: int, seed: int) -> Dict[str, Any]:
+    """Time the best of `repeat` batches, with gc disabled while timing."""
+    if name == "predict_request":
+        size = min(size, MAX_REQUESTS)
+    batch, is_async = BENCHMARKS[name](size, random.Random(seed))
+    loop = asyncio.new_event_loop() if is_async else None
+    timings = []
+    try:
+        for _ in range(repeat):
+            gc.collect()
+            gc.disable()
+            try:
+                started = time.perf_counter()
+                if loop is not None:
+                    loop.run_until_complete(batch())
+                else:
+                    batch()
+                timings.append(time.perf_counter() - started)
+            finally:
+                gc.enable()
+    finally:
+        if loop is not None:
+            loop.close()
+
+    best = min(timings)
+    return {
+        "name": name,
+        "size": size,
+        "best_ms": round(best * 1000, 3),
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "per_item_us": round(best / size * 1e6, 3),
+        "items_per_second": round(size / best)
+    }
+
+
+def print_results(results: List[Dict[str, Any]], baseline: Optional[Dict[str, Dict[str, Any]]]) -> None:
+    header = f"{'benchmark':<30}{'size':>8}{'best ms':>12}{'median ms':>12}{'us/item':>10}{'items/s':>12}"
+    print(header + ("  vs baseline" if baseline else ""))
+    for result in results:
+        line = (
+            f"{result['name']:<30}{result['size']:>8}{result['best_ms']:>12}{result['median_ms']:>12}"
+            f"{result['per_item_us']:>10}{result['items_per_second']:>12}"
+        )
+        before = (baseline or {}).get(f"{result['name']}@{result['size']}")
+        if before:
+            change = result["per_item_us"] / before["per_item_us"] - 1
+            line += f"  {change:+.1%}"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated batch sizes")
+    parser.add_argument("--only", help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {f"{result['name']}@{result['size']}": result for result in json.load(f)["results"]}
+
+    results = []
+    seen = set()
+    for name in names:
+        for size in sizes:
+            result = run_benchmark(name, size, args.repeat, args.seed)
+            key = (name, result["size"])
+            if key not in seen:
+                seen.add(key)
+                results.append(result)
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"sizes": sizes, "repeat": args.repeat, "results": results}, f, indent=2)
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
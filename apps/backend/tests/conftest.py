@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+# Tests must not share cached matches and predictions through the on-disk cache
+os.environ.setdefault("SHARED_CACHE_PATH", "")
+# Nor fetch live match data in the background whenever a TestClient starts the app
+os.environ.setdefault("WARMUP", "0")
+# Admin endpoints and profiling triggers are closed without a token; tests that need them are local admins
+os.environ.setdefault("ADMIN_ALLOW_UNAUTHENTICATED", "1")
+
+from app.services import admission, prediction_cache, prediction_jobs
+from app.services.loop_watchdog import LoopWatchdog
+
+# Loop stall that fails an async test; generous so slow CI machines don't flake
+TEST_STALL_THRESHOLD = 0.5
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "allow_loop_stalls: the test blocks the event loop on purpose")
+
+
+@pytest.fixture(autouse=True)
+def loop_stall_guard(request):
+    """
+    Fail async tests whose code blocks the event loop.
+
+    The watchdog runs on the test's event loop; any stall longer than
+    TEST_STALL_THRESHOLD fails the test with the stack that held the loop.
+    """
+    if request.node.get_closest_marker("asyncio") is None or request.node.get_closest_marker("allow_loop_stalls"):
+        yield
+        return
+
+    watchdog = LoopWatchdog(threshold=TEST_STALL_THRESHOLD)
+    watchdog.start(request.getfixturevalue("event_loop"))
+    yield
+    watchdog.stop()
+    if watchdog.stalls:
+        stall = watchdog.stalls[0]
+        # Innermost frames are the ones that blocked
+        stack = "\n  ".join((stall["stack"] or "stack not captured").split(";")[-12:])
+        pytest.fail(f"Event loop blocked for {stall['lag_seconds']:.3f}s:\n  {stack}", pytrace=False)
+
+
+@pytest.fixture(autouse=True)
+def reset_prediction_state():
+    """Give each test an empty prediction cache, job queue and idle admission controller."""
+    prediction_cache._prediction_cache = None
+    prediction_jobs._prediction_job_queue = None
+    admission._admission_controller = None
+    yield
+    prediction_cache._prediction_cache = None
+    prediction_jobs._prediction_job_queue = None
+    admission._admission_controller = None
@@ -0,0 +1,161 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.api.prediction_router import get_match_service, get_prediction_service, get_web_scraper_service
+from app.models.match import Match, PredictionResult
+from app.services.admission import AdmissionController, AdmissionRejected, ADMISSION_SHED, get_admission_controller
+from app.services.match_service import MatchService
+from app.services.prediction_service import PredictionService
+from app.services.web_scraper import WebScraperService
+
+
+@pytest.fixture
+def prediction_overrides():
+    match = Match(id="2274671", homeTeam="Huddersfield Town", awayTeam="Doncaster Rovers", startTime="2025-08-19T18:45:00Z")
+    mock_ms = AsyncMock(spec=MatchService)
+    mock_ms.get_upcoming_matches.return_value = [match]
+    mock_ps = AsyncMock(spec=PredictionService)
+    mock_ps.generate_prediction.return_value = PredictionResult(
+        betSuggestion="Huddersfield Town to win", rationale="Strong home form.", riskLevel="Medium"
+    )
+    mock_ws = AsyncMock(spec=WebScraperService)
+    mock_ws.scrape_match_data.return_value = {}
+
+    app.dependency_overrides[get_match_service] = lambda: mock_ms
+    app.dependency_overrides[get_prediction_service] = lambda: mock_ps
+    app.dependency_overrides[get_web_scraper_service] = lambda: mock_ws
+    yield mock_ps
+    app.dependency_overrides.clear()
+
+
+class TestAdmissionController:
+    @pytest.mark.asyncio
+    async def test_admits_up_to_limit_then_queues_in_order(self):
+        """Test holders beyond the limit wait and are admitted first in, first out"""
+        controller = AdmissionController(max_concurrent=1, max_queue=5, queue_timeout=1.0)
+        admitted = []
+        release = asyncio.Event()
+
+        async def hold(name):
+            async with controller.admit():
+                admitted.append(name)
+                await release.wait()
+
+        tasks = [asyncio.create_task(hold(name)) for name in ("a", "b", "c")]
+        await asyncio.sleep(0.01)
+
+        assert admitted == ["a"]
+        assert controller.active == 1
+        assert controller.queued == 2
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert admitted == ["a", "b", "c"]
+        assert controller.active == 0
+        assert controller.admitted == 3
+
+
+    @pytest.mark.asyncio
+    async def test_full_queue_sheds_immediately(self):
+        """Test a request arriving to a full queue is rejected without waiting"""
+        controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=5.0)
+        before = ADMISSION_SHED.value(reason="queue_full")
+        await controller.acquire()
+        waiter = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await controller.acquire()
+
+        assert exc_info.value.reason == "queue_full"
+        assert exc_info.value.retry_after >= 1
+        assert controller.shed["queue_full"] == 1
+        assert ADMISSION_SHED.value(reason="queue_full") == before + 1
+
+        controller.release()
+        await waiter
+        controller.release()
+        assert controller.active == 0
+
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout_sheds_and_frees_queue_position(self):
+        """Test a waiter that outlasts its timeout is shed and leaves the queue"""
+        controller = AdmissionController(max_concurrent=1, max_queue=5, queue_timeout=1.0)
+        await controller.acquire()
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await controller.acquire(timeout=0.02)
+
+        assert exc_info.value.reason == "queue_timeout"
+        assert controller.queued == 0
+        controller.release()
+        assert controller.active == 0
+
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        """Test cancelling a queued request neither consumes nor loses a slot"""
+        controller = AdmissionController(max_concurrent=1, max_queue=5, queue_timeout=1.0)
+        await controller.acquire()
+        waiter = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        controller.release()
+
+        assert controller.active == 0
+        assert controller.queued == 0
+
+
+    @pytest.mark.asyncio
+    async def test_retry_after_tracks_queue_drain_time(self):
+        """Test Retry-After grows with queue depth and observed service time"""
+        controller = AdmissionController(max_concurrent=2, max_queue=10)
+        controller.active = 3
+        controller.release(held_for=3.0)
+        loop = asyncio.get_running_loop()
+        controller._waiters.extend(loop.create_future() for _ in range(3))
+
+        # Four requests ahead of the next arrival, two slots, three seconds each
+        assert controller.retry_after() == 6
+
+
+    def test_saturated_predict_returns_503_with_retry_after(self, prediction_overrides):
+        """Test /predict sheds with 503 and Retry-After when no slot or queue space is left"""
+        controller = get_admission_controller()
+        controller.max_concurrent = 0
+        controller.max_queue = 0
+
+        response = TestClient(app).post("/prediction/predict", json={"matchId": "2274671", "riskLevel": "Medium"})
+
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) >= 1
+        prediction_overrides.generate_prediction.assert_not_called()
+        assert controller.stats()["shed"]["queue_full"] == 1
+
+
+    def test_cached_prediction_bypasses_admission(self, prediction_overrides):
+        """Test a cached prediction is served even when the service is saturated"""
+        client = TestClient(app)
+        request = {"matchId": "2274671", "riskLevel": "Medium"}
+        first = client.post("/prediction/predict", json=request)
+
+        controller = get_admission_controller()
+        controller.max_concurrent = 0
+        controller.max_queue = 0
+        second = client.post("/prediction/predict", json=request)
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert prediction_overrides.generate_prediction.await_count == 1
+        assert controller.stats()["exempt"] == 1
+        assert client.get("/admin/admission").json()["exempt"] == 1
@@ -0,0 +1,130 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from app.services.crawl_frontier import CrawlFrontier, DomainPoliteness, url_domain
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestDomainPoliteness:
+    def test_reserve_spaces_requests_per_domain(self):
+        """Test consecutive reservations for a domain are spaced by its delay"""
+        clock = FakeClock()
+        politeness = DomainPoliteness(default_delay=1.0, domain_delays={"slow.test": 3.0}, clock=clock)
+        
+        assert politeness.reserve("a.test") == 0
+        assert politeness.reserve("a.test") == 1.0
+        assert politeness.reserve("a.test") == 2.0
+        assert politeness.reserve("slow.test") == 0
+        assert politeness.ready_in("slow.test") == 3.0
+        
+        clock.now += 5
+        assert politeness.ready_in("a.test") == 0
+
+
+class TestCrawlFrontier:
+    def test_url_domain(self):
+        """Test domain extraction is host based and case insensitive"""
+        assert url_domain("https://WWW.Example.com:8080/path?q=1") == "www.example.com"
+
+
+    def test_priority_orders_by_kickoff_and_staleness(self):
+        """Test sooner kickoffs and staler data are fetched first"""
+        frontier = CrawlFrontier(fetch=None, politeness=DomainPoliteness(default_delay=0.0), clock=FakeClock(0.0))
+        kickoff = datetime(2025, 8, 19, 18, 45, tzinfo=timezone.utc)
+        
+        soon = frontier.priority(kickoff, staleness=60)
+        later = frontier.priority(kickoff + timedelta(hours=2), staleness=60)
+        stale = frontier.priority(kickoff + timedelta(hours=2), staleness=4 * 60 * 60)
+        
+        assert soon < later
+        assert stale < later
+        assert stale < soon
+
+
+    @pytest.mark.asyncio
+    async def test_crawl_fetches_in_priority_order_and_dedupes(self):
+        """Test URLs are drained in priority order and duplicates share one fetch"""
+        fetched = []
+        
+        async def fetch(url):
+            fetched.append(url)
+            return url.upper()
+        
+        frontier = CrawlFrontier(fetch=fetch, politeness=DomainPoliteness(default_delay=0.0), workers=1)
+        kickoff = datetime(2025, 8, 19, 18, 45, tzinfo=timezone.utc)
+        
+        late = frontier.submit("http://a.test/late", kickoff + timedelta(days=1), staleness=0)
+        soon = frontier.submit("http://a.test/soon", kickoff, staleness=0)
+        duplicate = frontier.submit("http://a.test/soon", kickoff, staleness=0)
+        
+        assert duplicate is soon
+        assert await soon == "HTTP://A.TEST/SOON"
+        assert await late == "HTTP://A.TEST/LATE"
+        assert fetched == ["http://a.test/soon", "http://a.test/late"]
+        assert frontier.stats()["deduplicated"] == 1
+        await frontier.stop()
+
+
+    @pytest.mark.asyncio
+    async def test_crawl_respects_domain_concurrency(self):
+        """Test no domain exceeds its concurrency limit while others proceed"""
+        active = {}
+        peak = {}
+        
+        async def fetch(url):
+            domain = url_domain(url)
+            active[domain] = active.get(domain, 0) + 1
+            peak[domain] = max(peak.get(domain, 0), active[domain])
+            await asyncio.sleep(0.01)
+            active[domain] -= 1
+            return "ok"
+        
+        frontier = CrawlFrontier(
+            fetch=fetch, politeness=DomainPoliteness(default_delay=0.0), workers=6, domain_concurrency=2
+        )
+        urls = [f"http://a.test/{i}" for i in range(6)] + [f"http://b.test/{i}" for i in range(6)]
+        
+        pages = await frontier.crawl(urls)
+        
+        assert all(page == "ok" for page in pages.values())
+        assert peak == {"a.test": 2, "b.test": 2}
+        await frontier.stop()
+
+
+    @pytest.mark.asyncio
+    async def test_crawl_applies_politeness_delay(self):
+        """Test request starts to one domain are spaced by the politeness delay"""
+        starts = []
+        
+        async def fetch(url):
+            starts.append(asyncio.get_running_loop().time())
+            return "ok"
+        
+        frontier = CrawlFrontier(fetch=fetch, politeness=DomainPoliteness(default_delay=0.05), workers=3)
+        
+        await frontier.crawl(["http://a.test/1", "http://a.test/2", "http://a.test/3"])
+        
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        assert all(gap >= 0.04 for gap in gaps)
+        await frontier.stop()
+
+
+    @pytest.mark.asyncio
+    async def test_crawl_failed_fetch_resolves_none(self):
+        """Test fetch errors resolve to None and are counted"""
+        async def fetch(url):
+            raise RuntimeError("boom")
+        
+        frontier = CrawlFrontier(fetch=fetch, politeness=DomainPoliteness(default_delay=0.0))
+        
+        assert await frontier.crawl(["http://a.test/1"]) == {"http://a.test/1": None}
+        assert frontier.stats()["failed"] == 1
+        await frontier.stop()
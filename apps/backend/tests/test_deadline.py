@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from app.services.deadline import (
+    DEADLINE_CONFIG,
+    Deadline,
+    current_deadline,
+    deadline_scope,
+    note_degraded,
+    remaining_timeout
+)
+
+
+class FakeClock:
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestDeadline:
+    def test_remaining_and_timeout(self):
+        """Test stage timeouts are capped by the remaining budget and the reserve"""
+        clock = FakeClock()
+        deadline = Deadline(2.0, clock=clock)
+        
+        assert deadline.timeout(30.0) == pytest.approx(2.0)
+        assert deadline.timeout(1.0) == pytest.approx(1.0)
+        assert deadline.timeout(30.0, reserve=0.5) == pytest.approx(1.5)
+        
+        clock.now += 3.0
+        assert deadline.expired()
+        assert deadline.remaining() == 0.0
+        assert deadline.timeout(30.0) == 0.0
+
+
+    def test_from_header_clamps_budget(self):
+        """Test header budgets are converted from ms and clamped to the allowed range"""
+        assert Deadline.from_header(None).budget == DEADLINE_CONFIG["DEFAULT_BUDGET"]
+        assert Deadline.from_header(1500).budget == pytest.approx(1.5)
+        assert Deadline.from_header(1).budget == DEADLINE_CONFIG["MIN_BUDGET"]
+        assert Deadline.from_header(10_000_000).budget == DEADLINE_CONFIG["MAX_BUDGET"]
+
+
+    @pytest.mark.asyncio
+    async def test_scope_propagates_to_tasks(self):
+        """Test the current deadline is visible in tasks and reset after the scope"""
+        assert current_deadline() is None
+        assert remaining_timeout(10.0) == 10.0
+        
+        async def stage():
+            note_degraded("betting_odds:late")
+            return remaining_timeout(10.0)
+        
+        with deadline_scope(Deadline(1.0)) as deadline:
+            timeout = await asyncio.create_task(stage())
+            note_degraded("betting_odds:late")
+        
+        assert timeout <= 1.0
+        assert deadline.degraded_reasons == ["betting_odds:late"]
+        assert current_deadline() is None
+        note_degraded("ignored outside a scope")
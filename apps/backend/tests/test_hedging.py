@@ -0,0 +1,168 @@
+import asyncio
+
+import pytest
+
+from app.services.hedging import HEDGE_CONFIG, HedgeBudget, LatencyTracker, RequestHedger
+
+
+def slow_primary(calls, delay=1.0, result="primary"):
+    async def fetch(url):
+        calls.append(url)
+        await asyncio.sleep(delay)
+        return result
+    return fetch
+
+
+def fast_hedge(calls, result="hedge"):
+    async def fetch(url):
+        calls.append(url)
+        return result
+    return fetch
+
+
+@pytest.fixture
+def hedge_delay(monkeypatch):
+    monkeypatch.setitem(HEDGE_CONFIG, "DEFAULT_HEDGE_DELAY", 0.01)
+
+
+class TestRequestHedger:
+    def test_latency_percentile(self):
+        """Test the tracker reports a nearest-rank percentile per source"""
+        tracker = LatencyTracker(window=100)
+        for i in range(1, 101):
+            tracker.record("a.com", i / 100)
+
+        assert tracker.percentile("a.com", 0.95) == pytest.approx(0.95)
+        assert tracker.percentile("b.com", 0.95) is None
+
+
+    def test_hedge_delay_uses_p95_after_enough_samples(self):
+        """Test the hedge delay follows the source's observed p95"""
+        hedger = RequestHedger()
+        assert hedger.hedge_delay("a.com") == HEDGE_CONFIG["DEFAULT_HEDGE_DELAY"]
+
+        for i in range(HEDGE_CONFIG["MIN_SAMPLES"]):
+            hedger.tracker.record("a.com", 0.2 if i else 0.3)
+        assert hedger.hedge_delay("a.com") == pytest.approx(0.2)
+
+
+    def test_alternate_url_rotates_mirrors(self):
+        """Test hedges go to the source's mirrors in turn, keeping the path"""
+        hedger = RequestHedger(mirrors={"www.a.com": ["m1.a.com", "m2.a.com"]})
+
+        assert hedger.alternate_url("https://www.a.com/odds?x=1") == "https://m1.a.com/odds?x=1"
+        assert hedger.alternate_url("https://www.a.com/odds?x=1") == "https://m2.a.com/odds?x=1"
+        assert hedger.alternate_url("https://b.com/odds") == "https://b.com/odds"
+
+
+    def test_budget_caps_extra_load(self):
+        """Test hedges are limited to the configured fraction of requests"""
+        budget = HedgeBudget(ratio=0.1, burst=1)
+        hedges = 0
+        for _ in range(100):
+            budget.on_request()
+            hedges += budget.try_acquire()
+
+        assert hedges <= 11
+
+
+    @pytest.mark.asyncio
+    async def test_fast_request_is_not_hedged(self, hedge_delay):
+        """Test a request answering before the hedge delay sends no duplicate"""
+        hedger = RequestHedger()
+        primary_calls, hedge_calls = [], []
+
+        result = await hedger.run("https://a.com/x", fast_hedge(primary_calls, "primary"), fast_hedge(hedge_calls))
+
+        assert result == "primary"
+        assert hedge_calls == []
+        assert hedger.hedged == 0
+        assert hedger.tracker.count("a.com") == 1
+
+
+    @pytest.mark.asyncio
+    async def test_slow_request_is_hedged_and_cancelled(self, hedge_delay):
+        """Test the first response wins and the slow request is cancelled"""
+        hedger = RequestHedger(mirrors={"a.com": ["mirror.a.com"]})
+        cancelled = asyncio.Event()
+        hedge_calls = []
+
+        async def stuck(url):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        result = await hedger.run("https://a.com/x", stuck, fast_hedge(hedge_calls))
+
+        assert result == "hedge"
+        assert hedge_calls == ["https://mirror.a.com/x"]
+        assert cancelled.is_set()
+        assert hedger.hedge_wins == 1
+
+
+    @pytest.mark.asyncio
+    async def test_failed_hedge_waits_for_primary(self, hedge_delay):
+        """Test a failed hedge does not win over a slower successful primary"""
+        hedger = RequestHedger(mirrors={"a.com": ["mirror.a.com"]})
+        primary_calls = []
+
+        result = await hedger.run("https://a.com/x", slow_primary(primary_calls, delay=0.05), fast_hedge([], None))
+
+        assert result == "primary"
+        assert hedger.hedged == 1
+        assert hedger.hedge_wins == 0
+
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_skips_hedge(self, hedge_delay):
+        """Test no duplicate is sent once the hedge budget is spent"""
+        hedger = RequestHedger(mirrors={"a.com": ["mirror.a.com"]}, budget=HedgeBudget(ratio=0.0, burst=0))
+        hedge_calls = []
+
+        result = await hedger.run("https://a.com/x", slow_primary([], delay=0.05), fast_hedge(hedge_calls))
+
+        assert result == "primary"
+        assert hedge_calls == []
+        assert hedger.budget_denied == 1
+
+
+    @pytest.mark.asyncio
+    async def test_source_without_mirror_is_not_hedged(self, hedge_delay):
+        """Test a slow request to a source without a mirror gets no duplicate"""
+        hedger = RequestHedger(mirrors={})
+        hedge_calls = []
+
+        result = await hedger.run("https://a.com/x", slow_primary([], delay=0.05), fast_hedge(hedge_calls))
+
+        assert result == "primary"
+        assert hedge_calls == []
+        assert hedger.hedged == 0
+
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mirrors", [{}, {"a.com": ["mirror.a.com"]}])
+    async def test_cancelled_caller_cancels_requests(self, mirrors, monkeypatch):
+        """Test cancelling the caller cancels the primary, and the hedge if one was sent"""
+        monkeypatch.setitem(HEDGE_CONFIG, "DEFAULT_HEDGE_DELAY", 0.05)
+        hedger = RequestHedger(mirrors=mirrors)
+        cancelled = []
+
+        async def stuck(url):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(url)
+                raise
+
+        for wait in (0.01, 0.1):
+            cancelled.clear()
+            caller = asyncio.create_task(hedger.run("https://a.com/x", stuck))
+            await asyncio.sleep(wait)
+            caller.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await caller
+
+            hedged = wait > 0.05 and mirrors
+            assert sorted(cancelled) == (["https://a.com/x", "https://mirror.a.com/x"] if hedged else ["https://a.com/x"])
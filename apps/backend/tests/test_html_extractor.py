@@ -0,0 +1,139 @@
+import pytest
+
+from app.services.html_extractor import HtmlExtractor, Selector
+
+
+SAMPLE_PAGE = b"""
+<html><body>
+  <nav><p>Navigation <b>noise</b></p></nav>
+  <table class="stats form-table" id="form">
+    <tr><th>Opponent</th><th>Result</th><th>Score</th></tr>
+    <tr><td>Team A</td><td>W</td><td>2-1</td></tr>
+    <tr><td>Team B &amp; Co</td><td>D</td><td>1-1
+  </table>
+  <ul class="injury-list">
+    <li>Key Striker - hamstring<br>doubtful
+    <li>Main Defender - knee - out</li>
+  </ul>
+  <table>
+    <tr class="odds-row"><td>Book A</td><td>2.10</td><td>3.40</td></tr>
+    <tr class="odds-row"><td>Book B</td><td>2.05</td><td>3.50</td></tr>
+    <tr><td>Ignored</td></tr>
+  </table>
+</body></html>
+"""
+
+
+async def chunked(content, size):
+    for start in range(0, len(content), size):
+        yield content[start:start + size]
+
+
+@pytest.fixture
+def extractor():
+    return HtmlExtractor()
+
+
+class TestHtmlExtractor:
+    def test_selector_matching(self):
+        """Test tag, class and id selector components"""
+        selector = Selector("table.form-table#form")
+        
+        assert selector.matches("table", [("class", "stats form-table"), ("id", "form")])
+        assert not selector.matches("table", [("class", "stats"), ("id", "form")])
+        assert not selector.matches("div", [("class", "form-table"), ("id", "form")])
+        assert Selector(".odds-row").matches("tr", [("class", "odds-row")])
+        with pytest.raises(ValueError):
+            Selector("table > tr")
+
+
+    def test_extract_selected_sections_only(self, extractor):
+        """Test only configured sections are extracted, with optional end tags handled"""
+        result = extractor.extract(SAMPLE_PAGE)
+        
+        assert result["form"] == [
+            ["Opponent", "Result", "Score"],
+            ["Team A", "W", "2-1"],
+            ["Team B & Co", "D", "1-1"]
+        ]
+        assert result["injuries"] == [
+            ["Key Striker - hamstring", "doubtful"],
+            ["Main Defender - knee - out"]
+        ]
+        assert result["odds"] == [["Book A", "2.10", "3.40"], ["Book B", "2.05", "3.50"]]
+
+
+    @pytest.mark.asyncio
+    async def test_extract_stream_matches_whole_page_parse(self, extractor):
+        """Test parsing in small chunks gives the same result as a whole-page parse"""
+        streamed = await HtmlExtractor().extract_stream(chunked(SAMPLE_PAGE, 7))
+        
+        assert streamed == extractor.extract(SAMPLE_PAGE)
+
+
+    @pytest.mark.asyncio
+    async def test_extract_stream_handles_split_multibyte_characters(self, extractor):
+        """Test UTF-8 sequences split across chunks are decoded correctly"""
+        page = '<ul class="injury-list"><li>Müller – knee</li></ul>'.encode("utf-8")
+        
+        result = await extractor.extract_stream(chunked(page, 3))
+        
+        assert result["injuries"] == [["Müller – knee"]]
+
+
+    def test_content_hash_cache(self, extractor):
+        """Test identical pages are parsed once and served from the cache"""
+        first = extractor.extract(SAMPLE_PAGE)
+        second = extractor.extract(SAMPLE_PAGE)
+        
+        assert second is first
+        assert extractor.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+    @pytest.mark.asyncio
+    async def test_streamed_page_populates_cache(self, extractor):
+        """Test a streamed page is reused by later extract calls"""
+        streamed = await extractor.extract_stream(chunked(SAMPLE_PAGE, 64))
+        
+        assert extractor.extract(SAMPLE_PAGE) is streamed
+
+
+    def test_cache_is_bounded(self):
+        """Test the parse cache evicts least recently used pages"""
+        extractor = HtmlExtractor(cache_size=2)
+        for i in range(3):
+            extractor.extract(f"<ul class='injury-list'><li>{i}</li></ul>".encode())
+        
+        assert extractor.stats()["entries"] == 2
+
+
+    @pytest.mark.asyncio
+    async def test_page_key_hit_skips_reading_the_body(self, extractor):
+        """Test a page seen with the same URL and validators is not read or parsed again"""
+        headers = {"etag": '"v1"', "content-length": str(len(SAMPLE_PAGE))}
+        page_key = extractor.page_key("http://pages.test/match", headers)
+        first = await extractor.extract_stream(chunked(SAMPLE_PAGE, 64), page_key=page_key)
+        
+        async def unread_body():
+            raise AssertionError("body read on a page key hit")
+            yield b""
+        
+        second = await extractor.extract_stream(unread_body(), page_key=page_key)
+        
+        assert second is first
+        assert extractor.page_key("http://pages.test/match", {"content-length": "10"}) is None
+        assert extractor.page_key("http://pages.test/match", {**headers, "etag": '"v2"'}) != page_key
+
+
+    def test_long_text_is_capped_while_accumulating(self, extractor):
+        """Test an oversized text node never buffers more than the cell limit"""
+        parser = extractor._new_parser()
+        parser.feed('<table class="form-table"><tr><td>   ')
+        for _ in range(1000):
+            parser.feed("x" * 1000)
+            assert parser._text_chars <= parser.max_cell_chars
+        parser.feed("<b>bold</b>more</td></tr></table>")
+        
+        result = parser.close_all()
+        
+        assert result["form"] == [["x" * parser.max_cell_chars]]
@@ -0,0 +1,68 @@
+import pytest
+
+from benchmarks.load_test import compare_to_baseline
+
+
+def load_run(rps=100.0, p95=40.0, **config):
+    """A saved load test result with one endpoint."""
+    return {
+        "config": {
+            "mode": "closed",
+            "rate": None,
+            "concurrency": 16,
+            "duration": 20.0,
+            "predict_ratio": 0.8,
+            "matches": 380,
+            "upstream_latency": "lognormal:40:0.5",
+            "upstream_error_rate": 0.0,
+            "python": "3.11.7",
+            **config
+        },
+        "endpoints": {
+            "predict": {"rps": rps, "latency_ms": {"p50": 20.0, "p95": p95, "p99": 80.0, "mean": 25.0}}
+        }
+    }
+
+
+@pytest.fixture
+def baseline():
+    return load_run()
+
+
+class TestCompareToBaseline:
+    def test_within_tolerance_passes(self, baseline):
+        """Test small latency and throughput changes are not reported"""
+        results = load_run(rps=95.0, p95=46.0, duration=30.0, python="3.12.1")
+
+        assert compare_to_baseline(results, baseline, latency_tolerance=0.2, throughput_tolerance=0.1) == []
+
+
+    def test_regressions_are_reported(self, baseline):
+        """Test latency above and throughput below tolerance are reported per metric"""
+        results = load_run(rps=80.0, p95=60.0)
+        # Only the gated percentiles count
+        results["endpoints"]["predict"]["latency_ms"]["mean"] = 500.0
+
+        regressions = compare_to_baseline(results, baseline, latency_tolerance=0.2, throughput_tolerance=0.1)
+
+        assert regressions == [
+            "predict: throughput 80.0 rps < baseline 100.0 rps",
+            "predict: p95 60.0ms > baseline 40.0ms"
+        ]
+
+
+    def test_missing_endpoint_is_a_regression(self, baseline):
+        """Test an endpoint without successful requests is reported"""
+        results = load_run()
+        results["endpoints"] = {}
+
+        assert compare_to_baseline(results, baseline, 0.2, 0.1) == ["predict: no successful requests"]
+
+
+    def test_settings_mismatch_is_not_compared(self, baseline):
+        """Test runs under different load are refused instead of compared"""
+        results = load_run(rps=10.0, p95=400.0, concurrency=32)
+
+        regressions = compare_to_baseline(results, baseline, latency_tolerance=0.2, throughput_tolerance=0.1)
+
+        assert regressions == ["load setting concurrency differs from baseline: 32 != 16"]
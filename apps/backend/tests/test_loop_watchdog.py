@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.loop_watchdog import LoopWatchdog
+from app.services.metrics import LOOP_STALLS
+
+
+def block_loop(seconds):
+    time.sleep(seconds)
+
+
+@pytest.fixture
+def watchdog():
+    watchdog = LoopWatchdog(threshold=0.05, interval=0.01)
+    yield watchdog
+    watchdog.stop()
+
+
+class TestLoopWatchdog:
+    @pytest.mark.asyncio
+    async def test_idle_loop_has_no_stalls(self, watchdog):
+        """Test an idle loop shows small lag and no stalls"""
+        watchdog.start()
+        await asyncio.sleep(0.2)
+
+        assert watchdog.stall_count == 0
+        assert watchdog.lag_percentiles()["p50"] < 0.05
+
+
+    @pytest.mark.asyncio
+    @pytest.mark.allow_loop_stalls
+    async def test_blocking_call_is_recorded_with_stack(self, watchdog):
+        """Test a blocking call inside a coroutine is caught with its stack"""
+        before = LOOP_STALLS.value()
+        watchdog.start()
+        await asyncio.sleep(0.05)
+
+        block_loop(0.3)
+        await asyncio.sleep(0.05)
+
+        assert watchdog.stall_count == 1
+        stall = watchdog.stalls[0]
+        assert stall["lag_seconds"] >= 0.2
+        assert "block_loop (test_loop_watchdog.py" in stall["stack"]
+        assert LOOP_STALLS.value() == before + 1
+        assert watchdog.lag_percentiles()["max"] >= 0.2
+
+
+    @pytest.mark.asyncio
+    async def test_stopped_watchdog_stops_ticking(self, watchdog):
+        """Test stopping cancels the heartbeat"""
+        watchdog.start()
+        await asyncio.sleep(0.05)
+        watchdog.stop()
+        samples = len(watchdog.lags)
+        await asyncio.sleep(0.05)
+
+        assert not watchdog.running
+        assert len(watchdog.lags) == samples
+
+
+    def test_app_starts_watchdog_and_reports_lag(self):
+        """Test the app watches its loop and exposes lag on /metrics and /admin/loop"""
+        with TestClient(app) as client:
+            time.sleep(0.2)
+            report = client.get("/admin/loop").json()
+            metrics = client.get("/metrics").text
+
+        assert report["running"] is True
+        assert "p95" in report["lag_seconds"]
+        assert 'event_loop_lag_quantile_seconds{quantile="0.95"}' in metrics
+        assert "event_loop_lag_seconds_count" in metrics
@@ -1,7 +1,13 @@
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 import httpx
-from app.services.match_service import MatchService
+from app.models.match import Match
+from app.services.deadline import Deadline, deadline_scope
+from app.services.match_service import MatchService, MatchStore
+
+# 2025-08-01, before the fixture matches kick off
+PRESEASON = 1754006400.0
 
 
 @pytest.fixture
@@ -201,4 +207,148 @@ class TestMatchService:
         # Should return all 50 matches, not limited to 10
         assert len(matches) == 50
         assert matches[0].id == "123450"
-        assert matches[49].id == "1234549"
\ No newline at end of file
+        assert matches[49].id == "1234549"
+
+    @pytest.mark.asyncio
+    @patch('app.services.match_service.httpx.AsyncClient')
+    async def test_get_upcoming_matches_falls_back_to_last_known_good(self, mock_client, sample_api_response):
+        """Test a failed fetch serves the stored list and marks the request degraded"""
+        mock_response = MagicMock()
+        mock_response.json.return_value = sample_api_response
+        mock_response.raise_for_status.return_value = None
+        mock_context = AsyncMock()
+        mock_context.get.return_value = mock_response
+        mock_client.return_value.__aenter__.return_value = mock_context
+        
+        match_service = MatchService(store=MatchStore(clock=lambda: PRESEASON))
+        fresh = await match_service.get_upcoming_matches()
+        
+        mock_context.get.side_effect = httpx.TimeoutException("Timeout")
+        with deadline_scope(Deadline(5.0)) as deadline:
+            stale = await match_service.get_upcoming_matches()
+        
+        assert [match.id for match in stale] == [match.id for match in fresh]
+        assert deadline.degraded_reasons == ["matches:stale"]
+
+    @pytest.mark.asyncio
+    @patch('app.services.match_service.httpx.AsyncClient')
+    async def test_get_upcoming_matches_skips_fetch_without_time(self, mock_client):
+        """Test an exhausted deadline serves the stored list without calling the API"""
+        store = MatchStore(clock=lambda: PRESEASON)
+        store.update([Match(id="1", homeTeam="Arsenal", awayTeam="Chelsea", startTime="2025-08-20T15:00:00+00:00")])
+        match_service = MatchService(store=store)
+        
+        with deadline_scope(Deadline(0.0)) as deadline:
+            matches = await match_service.get_upcoming_matches()
+        
+        mock_client.assert_not_called()
+        assert matches[0].id == "1"
+        assert deadline.degraded_reasons == ["matches:stale"]
+
+    @pytest.mark.asyncio
+    @patch('app.services.match_service.httpx.AsyncClient')
+    async def test_get_upcoming_matches_timeout_follows_deadline(self, mock_client, sample_api_response):
+        """Test the API call only gets the remaining request budget"""
+        mock_response = MagicMock()
+        mock_response.json.return_value = sample_api_response
+        mock_response.raise_for_status.return_value = None
+        mock_context = AsyncMock()
+        mock_context.get.return_value = mock_response
+        mock_client.return_value.__aenter__.return_value = mock_context
+        
+        with deadline_scope(Deadline(2.0)):
+            await MatchService().get_upcoming_matches()
+        
+        assert mock_client.call_args.kwargs["timeout"] <= 2.0
+
+
+class TestMatchStore:
+    @staticmethod
+    def fixture(match_id, kickoff="2025-08-20T15:00:00+00:00"):
+        return Match(id=match_id, homeTeam=f"Home {match_id}", awayTeam=f"Away {match_id}", startTime=kickoff)
+
+    def test_refresh_gets_new_version_only_when_list_changes(self):
+        """Test versions increase on change and stay put on identical refreshes"""
+        store = MatchStore(clock=lambda: PRESEASON)
+        store.update([self.fixture("1")])
+        first = store.version
+        
+        store.update([self.fixture("1")])
+        assert store.version == first
+        
+        store.update([self.fixture("1"), self.fixture("2")])
+        assert store.version > first
+
+
+    def test_changes_since_merges_log_entries(self):
+        """Test changes across several refreshes are reported once per match"""
+        store = MatchStore(clock=lambda: PRESEASON)
+        store.update([self.fixture("1"), self.fixture("2"), self.fixture("3")], version=10)
+        store.update([self.fixture("1", "2025-08-21T15:00:00+00:00"), self.fixture("2"), self.fixture("4")], version=20)
+        store.update([self.fixture("1", "2025-08-21T15:00:00+00:00"), self.fixture("4"), self.fixture("5")], version=30)
+        
+        changes = store.changes_since(10)
+        
+        assert changes["version"] == 30
+        assert sorted(match.id for match in changes["added"]) == ["4", "5"]
+        assert [match.id for match in changes["changed"]] == ["1"]
+        assert sorted(changes["removed"]) == ["2", "3"]
+        assert store.changes_since(30) == {"version": 30, "added": [], "changed": [], "removed": []}
+        # A match added and removed between the two versions never reaches the client
+        assert store.changes_since(20)["removed"] == ["2"]
+
+
+    def test_changes_since_unknown_or_trimmed_version_needs_resync(self):
+        """Test versions not in the bounded change log ask for a resync"""
+        store = MatchStore(clock=lambda: PRESEASON, log_size=2)
+        for version in (10, 20, 30, 40):
+            store.update([self.fixture(str(version))], version=version)
+        
+        assert store.changes_since(10) is None
+        assert store.changes_since(15) is None
+        assert store.changes_since(20)["version"] == 40
+        # Older shared versions are ignored
+        store.update([self.fixture("old")], version=35)
+        assert store.version == 40
+
+
+    @pytest.mark.asyncio
+    async def test_matches_expire_at_kickoff(self):
+        """Test matches leave the list when they start, with one timer and a change log entry"""
+        clock = [PRESEASON]
+        store = MatchStore(clock=lambda: clock[0])
+        expired = []
+        store.on_expire(lambda match_ids, previous: expired.append((match_ids, previous)))
+        store.update([
+            self.fixture("1", "2025-08-01T00:00:00+00:00"),
+            self.fixture("2", "2025-08-01T00:00:00.050000+00:00"),
+            self.fixture("3", "2025-08-02T15:00:00+00:00")
+        ], version=10)
+        # Kicked off already, so never upcoming
+        assert [match.id for match in store.get()] == ["2", "3"]
+        
+        store.start_expiry()
+        assert store._timer is not None
+        clock[0] += 0.05
+        await asyncio.sleep(0.1)
+        
+        assert expired == [(["2"], 10)]
+        assert len(store) == 1
+        assert store.changes_since(10)["removed"] == ["2"]
+        # The timer is re-armed for the next kickoff only
+        assert store._timer.when() - asyncio.get_running_loop().time() > 3600
+        store.stop_expiry()
+
+
+    def test_rescheduled_match_expires_at_new_kickoff(self):
+        """Test a moved kickoff replaces the old one instead of expiring the match early"""
+        clock = [PRESEASON]
+        store = MatchStore(clock=lambda: clock[0])
+        store.update([self.fixture("1", "2025-08-01T12:00:00+00:00")], version=10)
+        store.update([self.fixture("1", "2025-08-01T18:00:00+00:00")], version=20)
+        
+        clock[0] += 13 * 3600
+        assert [match.id for match in store.get()] == ["1"]
+        clock[0] += 6 * 3600
+        assert store.get() == []
+        assert store.expired == 1
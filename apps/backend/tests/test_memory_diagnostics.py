@@ -0,0 +1,139 @@
+import asyncio
+import sys
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import admin_router
+from app.main import app
+from app.models.match import Match
+from app.services import memory_diagnostics
+from app.services.match_service import MatchStore
+from app.services.memory_diagnostics import MemoryProfiler, cache_sizes, deep_sizeof, object_census
+
+# 2025-08-01, before the fixture matches kick off
+PRESEASON = 1754006400.0
+
+
+class Leaky:
+    def __init__(self):
+        self.items = []
+
+
+class Slotted:
+    __slots__ = ("payload",)
+
+    def __init__(self, payload):
+        self.payload = payload
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def profiler():
+    profiler = MemoryProfiler(max_snapshots=2)
+    yield profiler
+    profiler.stop()
+
+
+class TestMemoryDiagnostics:
+    def test_deep_sizeof_counts_shared_objects_once(self):
+        """Test retained size follows dicts, lists, slots and counts shared objects once"""
+        payload = "x" * 10_000
+        single = deep_sizeof([payload])
+        shared = deep_sizeof([payload, payload, Slotted(payload)])
+
+        assert single["bytes"] >= sys.getsizeof(payload)
+        assert shared["bytes"] < 2 * sys.getsizeof(payload)
+        assert shared["objects"] == single["objects"] + 1
+
+
+    def test_deep_sizeof_skips_code_and_stops_at_limit(self):
+        """Test functions and classes are not counted and huge graphs are truncated"""
+        assert deep_sizeof({"fn": deep_sizeof, "cls": Leaky})["objects"] == 3
+        assert deep_sizeof(list(range(1000)), limit=10)["truncated"] == 1
+
+
+    def test_object_census_reports_types(self):
+        """Test the census counts live instances by type"""
+        keep = [Leaky() for _ in range(500)]
+
+        census = {entry["type"]: entry for entry in object_census(limit=10_000)}
+
+        assert census[f"{__name__}.Leaky"]["count"] >= len(keep)
+
+
+    def test_object_census_stops_at_limit(self):
+        """Test the census counts no more objects than its cap"""
+        census = object_census(limit=10_000, max_objects=100)
+
+        assert sum(entry["count"] for entry in census) == 100
+
+
+    def test_snapshot_diff_finds_growth(self, profiler):
+        """Test diffing two snapshots points at the allocation that grew"""
+        leaky = Leaky()
+        profiler.start()
+        first = profiler.take_snapshot()
+        leaky.items.extend(bytearray(1024) for _ in range(200))
+        second = profiler.take_snapshot()
+
+        diff = profiler.diff(first["id"], second["id"])
+
+        assert diff["size_diff_bytes"] >= 200 * 1024
+        assert "test_memory_diagnostics.py" in diff["top"][0]["location"]
+
+
+    def test_snapshot_requires_tracing_and_drops_oldest(self, profiler):
+        """Test snapshots need tracing on and only the newest are kept"""
+        with pytest.raises(RuntimeError):
+            profiler.take_snapshot()
+
+        profiler.start()
+        ids = [profiler.take_snapshot(limit=1)["id"] for _ in range(3)]
+
+        assert [entry["id"] for entry in profiler.status()["snapshots"]] == ids[1:]
+        with pytest.raises(KeyError):
+            profiler.diff(ids[0], ids[2])
+
+
+    def test_cache_sizes(self, monkeypatch):
+        """Test registered caches report entries and retained size"""
+        store = MatchStore(clock=lambda: PRESEASON)
+        store.update([
+            Match(id=str(i), homeTeam="Arsenal", awayTeam="Chelsea", startTime="2025-08-19T18:45:00Z")
+            for i in range(3)
+        ])
+        monkeypatch.setattr(memory_diagnostics, "_cache_sources", {"match_list": lambda: store})
+
+        sizes = cache_sizes()
+
+        assert sizes["match_list"]["entries"] == 3
+        assert sizes["match_list"]["bytes"] > 0
+
+
+    def test_admin_memory_endpoints(self, client, monkeypatch):
+        """Test the admin endpoints drive tracemalloc and report caches and objects"""
+        monkeypatch.setattr(memory_diagnostics, "_cache_sources", {"match_list": MatchStore})
+        try:
+            assert client.post("/admin/memory/snapshots").status_code == 409
+            assert client.post("/admin/memory/tracemalloc/start").json()["tracing"] is True
+            first = client.post("/admin/memory/snapshots?limit=5").json()
+            second = client.post("/admin/memory/snapshots?limit=5").json()
+
+            diff = client.get(f"/admin/memory/snapshots/{first['id']}/diff/{second['id']}")
+            assert diff.status_code == 200
+            assert client.get("/admin/memory/snapshots/0/diff/999").status_code == 404
+        finally:
+            assert client.post("/admin/memory/tracemalloc/stop").json()["tracing"] is False
+
+        assert client.get("/admin/memory/caches").json()["match_list"]["entries"] == 0
+        assert len(client.get("/admin/memory/objects?limit=3").json()) == 3
+        assert not tracemalloc.is_tracing()
+        # Heap walks are plain functions, run in the threadpool instead of on the event loop
+        assert not asyncio.iscoroutinefunction(admin_router.get_object_census)
+        assert not asyncio.iscoroutinefunction(admin_router.get_cache_sizes)
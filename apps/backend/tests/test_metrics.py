@@ -0,0 +1,153 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import metrics_router
+from app.main import app
+from app.services.metrics import (
+    HTTP_REQUESTS,
+    UPSTREAM_IN_FLIGHT,
+    UPSTREAM_RESPONSES,
+    MetricsRegistry,
+    ServerTiming,
+    STAGE_LATENCY,
+    UpstreamCall
+)
+from app.services.prediction_cache import PredictionCache
+from app.services.shared_cache import SharedCache
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+class TestMetrics:
+    def test_counter_and_gauge_render(self, registry):
+        """Test counters and gauges render one sample per label set"""
+        requests = registry.counter("requests_total", "Requests", ("status",))
+        in_flight = registry.gauge("in_flight", "In flight")
+        requests.inc(status=200)
+        requests.inc(2, status=200)
+        requests.inc(status=503)
+        in_flight.inc()
+        in_flight.inc()
+        in_flight.dec()
+
+        text = registry.render()
+
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{status="200"} 3' in text
+        assert 'requests_total{status="503"} 1' in text
+        assert "in_flight 1" in text
+
+
+    def test_histogram_buckets_are_cumulative(self, registry):
+        """Test histogram samples use cumulative le buckets, sum and count"""
+        latency = registry.histogram("latency_seconds", "Latency", ("stage",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value, stage="scrape")
+
+        text = registry.render()
+
+        assert 'latency_seconds_bucket{stage="scrape",le="0.1"} 2' in text
+        assert 'latency_seconds_bucket{stage="scrape",le="1"} 3' in text
+        assert 'latency_seconds_bucket{stage="scrape",le="+Inf"} 4' in text
+        assert 'latency_seconds_sum{stage="scrape"} 3.65' in text
+        assert 'latency_seconds_count{stage="scrape"} 4' in text
+
+
+    def test_callback_metric_and_label_escaping(self, registry):
+        """Test callback metrics are read at render time and label values are escaped"""
+        state = {'a "quoted" cache': 0.5}
+        registry.callback("hit_ratio", "Hit ratio", lambda: state, ("cache",))
+        state['a "quoted" cache'] = 0.75
+
+        assert 'hit_ratio{cache="a \\"quoted\\" cache"} 0.75' in registry.render()
+
+
+    def test_missing_label_is_rejected(self, registry):
+        """Test recording without a declared label fails loudly"""
+        requests = registry.counter("requests_total", "Requests", ("status",))
+        with pytest.raises(KeyError):
+            requests.inc()
+
+
+    def test_upstream_call_records_status_and_failures(self):
+        """Test upstream calls record status codes, timeouts and release the connection"""
+        url = "https://metrics-upstream.test/page"
+        with UpstreamCall(url) as call:
+            assert UPSTREAM_IN_FLIGHT.value(host="metrics-upstream.test") == 1
+            call.status = 429
+        with pytest.raises(httpx.ReadTimeout):
+            with UpstreamCall(url):
+                raise httpx.ReadTimeout("slow")
+        with pytest.raises(asyncio.CancelledError):
+            with UpstreamCall(url):
+                raise asyncio.CancelledError()
+
+        assert UPSTREAM_IN_FLIGHT.value(host="metrics-upstream.test") == 0
+        assert UPSTREAM_RESPONSES.value(host="metrics-upstream.test", status="429") == 1
+        assert UPSTREAM_RESPONSES.value(host="metrics-upstream.test", status="timeout") == 1
+        assert UPSTREAM_RESPONSES.value(host="metrics-upstream.test", status="cancelled") == 1
+
+
+    def test_server_timing_header(self):
+        """Test stages are reported in order with a total and observed in the histogram"""
+        before = STAGE_LATENCY.count(stage="metrics_test")
+        timing = ServerTiming()
+        with timing.stage("metrics_test"):
+            pass
+
+        header = timing.header()
+
+        assert header.startswith("metrics_test;dur=")
+        assert ", total;dur=" in header
+        assert STAGE_LATENCY.count(stage="metrics_test") == before + 1
+
+
+    def test_metrics_endpoint(self, client):
+        """Test /metrics serves the Prometheus text format including request counts"""
+        client.get("/health")
+        before = HTTP_REQUESTS.value(method="GET", handler="health_check", status=200)
+        client.get("/health")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert HTTP_REQUESTS.value(method="GET", handler="health_check", status=200) == before + 1
+        assert "# TYPE http_request_duration_seconds histogram" in response.text
+        assert 'cache_hit_ratio{cache="team_stats"}' in response.text
+        assert 'crawl_frontier_pool{state="workers"}' in response.text
+
+
+    def test_shared_cache_counts_run_once_off_the_loop(self, client, tmp_path, monkeypatch):
+        """Test /metrics counts shared entries once per scrape, on the database thread"""
+        shared = SharedCache(str(tmp_path / "shared.db"))
+        shared.put("prediction:m1:medium", {}, 60)
+        counted = []
+
+        def count_prefix(prefix):
+            counted.append(threading.current_thread().name)
+            return SharedCache.count_prefix(shared, prefix)
+
+        monkeypatch.setattr(shared, "count_prefix", count_prefix)
+        monkeypatch.setattr(metrics_router, "get_shared_cache", lambda: shared)
+        monkeypatch.setattr(metrics_router, "get_prediction_cache", lambda: PredictionCache(shared=shared))
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert 'cache_entries{cache="predictions"} 1' in response.text
+        assert 'cache_entries{cache="shared"} 1' in response.text
+        assert len(counted) == 1
+        assert counted[0].startswith("shared-cache")
@@ -0,0 +1,97 @@
+import pytest
+
+from app.services.odds_store import OddsStore, ODDS_STORE_CONFIG
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def odds_store(clock):
+    return OddsStore(clock=clock)
+
+
+class TestOddsStore:
+    def test_best_price_and_consensus(self, odds_store):
+        """Test best price picks the highest current price and consensus averages implied probability"""
+        odds_store.record("1", "book_a", {"home_win": 2.0, "draw": 3.5})
+        odds_store.record("1", "book_b", {"home_win": 2.5, "draw": 3.2})
+        
+        best = odds_store.best_price("1")
+        consensus = odds_store.consensus("1")
+        
+        assert best["home_win"] == {"odds": 2.5, "bookmaker": "book_b"}
+        assert best["draw"] == {"odds": 3.5, "bookmaker": "book_a"}
+        # Mean implied probability (0.5 + 0.4) / 2 = 0.45
+        assert consensus["home_win"] == pytest.approx(1 / 0.45, abs=1e-3)
+        assert "over_2_5" not in consensus
+
+
+    def test_latest_snapshot_per_bookmaker_wins(self, odds_store, clock):
+        """Test only each bookmaker's newest price counts as current"""
+        odds_store.record("1", "book_a", {"home_win": 3.0})
+        clock.now += 60
+        odds_store.record("1", "book_a", {"home_win": 2.2})
+        
+        assert odds_store.best_price("1")["home_win"]["odds"] == pytest.approx(2.2)
+
+
+    def test_stale_prices_are_ignored(self, odds_store, clock):
+        """Test prices older than the max age drop out of best/consensus"""
+        odds_store.record("1", "book_a", {"home_win": 3.0})
+        clock.now += ODDS_STORE_CONFIG["LATEST_PRICE_MAX_AGE"] + 1
+        odds_store.record("1", "book_b", {"home_win": 2.0})
+        
+        assert odds_store.best_price("1")["home_win"] == {"odds": 2.0, "bookmaker": "book_b"}
+
+
+    def test_line_movement(self, odds_store, clock):
+        """Test line movement reports opening, current and change of the consensus"""
+        for price in (2.4, 2.3, 2.1):
+            odds_store.record("1", "book_a", {"home_win": price})
+            odds_store.record("1", "book_b", {"home_win": price})
+            clock.now += 60
+        
+        movement = odds_store.line_movement("1", "home_win")
+        
+        assert movement["opening"] == pytest.approx(2.4)
+        assert movement["current"] == pytest.approx(2.1)
+        assert movement["change"] == pytest.approx(-0.3)
+        assert len(movement["points"]) == 3
+
+
+    def test_memory_stays_bounded_with_downsampling(self, odds_store, clock):
+        """Test thousands of snapshots stay in kilobytes and history stays queryable"""
+        odds = {
+            "home_win": 2.0, "draw": 3.4, "away_win": 3.6,
+            "over_2_5": 1.9, "under_2_5": 1.95, "btts_yes": 1.8, "btts_no": 2.0
+        }
+        for _ in range(2500):
+            for bookmaker in ("book_a", "book_b", "book_c", "book_d"):
+                odds_store.record("1", bookmaker, odds)
+            clock.now += 60
+        
+        assert odds_store.snapshot_count("1") == 10000
+        assert odds_store.memory_bytes("1") < 32 * 1024
+        movement = odds_store.line_movement("1", "home_win")
+        assert movement["opening"] == pytest.approx(2.0, abs=1e-3)
+        assert movement["points"][0]["timestamp"] <= movement["points"][-1]["timestamp"]
+        assert odds_store.consensus("1")["draw"] == pytest.approx(3.4, abs=1e-3)
+
+
+    def test_unknown_match(self, odds_store):
+        """Test queries for unknown matches return empty results"""
+        assert odds_store.best_price("missing") == {}
+        assert odds_store.consensus("missing") == {}
+        assert odds_store.line_movement("missing", "home_win")["points"] == []
+        assert odds_store.snapshot_count("missing") == 0
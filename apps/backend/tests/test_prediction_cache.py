@@ -0,0 +1,59 @@
+import pytest
+
+from app.models.match import PredictionResult
+from app.services.prediction_cache import PredictionCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_result(degraded=False):
+    return PredictionResult(
+        betSuggestion="Arsenal to win",
+        rationale="Home form.",
+        riskLevel="Low",
+        degraded=degraded,
+        degradedReasons=["betting_odds:late"] if degraded else []
+    )
+
+
+class TestPredictionCache:
+    @pytest.mark.asyncio
+    async def test_hit_within_ttl_and_miss_after(self):
+        """Test predictions are served until their TTL runs out"""
+        clock = FakeClock()
+        cache = PredictionCache(ttl=60, clock=clock)
+        await cache.put("1", "Low", make_result())
+
+        assert await cache.get("1", "Low") is not None
+        assert await cache.get("1", "High") is None
+        clock.now += 61
+        assert await cache.get("1", "Low") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 2
+
+
+    @pytest.mark.asyncio
+    async def test_degraded_predictions_are_not_cached(self):
+        """Test a prediction built from partial data is never reused"""
+        cache = PredictionCache()
+        await cache.put("1", "Low", make_result(degraded=True))
+
+        assert len(cache) == 0
+
+
+    @pytest.mark.asyncio
+    async def test_oldest_entry_dropped_at_capacity(self):
+        """Test the cache stays within max_entries by dropping the oldest prediction"""
+        cache = PredictionCache(max_entries=2)
+        for match_id in ("1", "2", "3"):
+            await cache.put(match_id, "Low", make_result())
+
+        assert len(cache) == 2
+        assert await cache.get("1", "Low") is None
+        assert await cache.evict_match("3") == 1
@@ -0,0 +1,188 @@
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.api.prediction_router import get_match_service, get_prediction_service, get_web_scraper_service
+from app.models.match import Match, PredictionResult
+from app.services.match_service import MatchService
+from app.services.prediction_jobs import JobQueueFull, PredictionJobQueue
+from app.services.prediction_service import PredictionService
+from app.services.shared_cache import SharedCache
+from app.services.web_scraper import WebScraperService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_result(suggestion="Arsenal to win"):
+    return PredictionResult(betSuggestion=suggestion, rationale="Home form.", riskLevel="Low")
+
+
+@pytest.fixture
+def prediction_overrides():
+    match = Match(id="2274671", homeTeam="Huddersfield Town", awayTeam="Doncaster Rovers", startTime="2025-08-19T18:45:00Z")
+    mock_ms = AsyncMock(spec=MatchService)
+    mock_ms.get_upcoming_matches.return_value = [match]
+    mock_ps = AsyncMock(spec=PredictionService)
+    mock_ps.generate_prediction.return_value = make_result("Huddersfield Town to win")
+    mock_ws = AsyncMock(spec=WebScraperService)
+    mock_ws.scrape_match_data.return_value = {}
+
+    app.dependency_overrides[get_match_service] = lambda: mock_ms
+    app.dependency_overrides[get_prediction_service] = lambda: mock_ps
+    app.dependency_overrides[get_web_scraper_service] = lambda: mock_ws
+    yield mock_ps
+    app.dependency_overrides.clear()
+
+
+def poll(client, location, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(location).json()
+        if job["status"] in ("succeeded", "failed") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.01)
+
+
+class TestPredictionJobQueue:
+    @pytest.mark.asyncio
+    async def test_job_runs_and_keeps_result(self):
+        """Test a submitted job is processed by a worker and its result retained"""
+        queue = PredictionJobQueue(workers=1)
+        job = queue.submit("1", "Low", AsyncMock(return_value=make_result()))
+
+        assert job.status == "queued"
+        await asyncio.sleep(0.01)
+
+        assert queue.get(job.id).status == "succeeded"
+        assert queue.get(job.id).view().result.betSuggestion == "Arsenal to win"
+        await queue.stop()
+
+
+    @pytest.mark.asyncio
+    async def test_duplicate_inflight_jobs_are_merged(self):
+        """Test the same match and risk level in flight share one job and one run"""
+        queue = PredictionJobQueue(workers=2)
+        release = asyncio.Event()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await release.wait()
+            return make_result()
+
+        first = queue.submit("1", "Low", work)
+        second = queue.submit("1", "Low", work)
+        other = queue.submit("1", "High", work)
+        await asyncio.sleep(0.01)
+        release.set()
+        await asyncio.sleep(0.01)
+
+        assert second is first
+        assert other is not first
+        assert len(calls) == 2
+        assert queue.stats()["merged"] == 1
+        # Once finished, a new submission runs again
+        assert queue.submit("1", "Low", work) is not first
+        await queue.stop()
+
+
+    @pytest.mark.asyncio
+    async def test_failed_job_reports_error(self):
+        """Test an exception from the work marks the job failed with its message"""
+        queue = PredictionJobQueue(workers=1)
+        job = queue.submit("1", "Low", AsyncMock(side_effect=RuntimeError("Match with ID 1 not found")))
+        await asyncio.sleep(0.01)
+
+        assert job.status == "failed"
+        assert job.error == "Match with ID 1 not found"
+        await queue.stop()
+
+
+    @pytest.mark.asyncio
+    async def test_finished_jobs_expire_and_pending_is_bounded(self):
+        """Test results are forgotten after the TTL and submissions beyond max_pending are refused"""
+        clock = FakeClock()
+        queue = PredictionJobQueue(workers=1, max_pending=1, result_ttl=60, clock=clock)
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return make_result()
+
+        job = queue.submit("1", "Low", work)
+        with pytest.raises(JobQueueFull):
+            queue.submit("2", "Low", work)
+
+        release.set()
+        await asyncio.sleep(0.01)
+        clock.now += 59
+        assert queue.get(job.id) is not None
+        clock.now += 1
+        assert queue.get(job.id) is None
+        await queue.stop()
+
+
+    @pytest.mark.asyncio
+    async def test_job_can_be_polled_on_another_worker(self, tmp_path):
+        """Test a job's status and result are visible to a second queue through the shared cache"""
+        path = str(tmp_path / "shared.sqlite3")
+        accepting = PredictionJobQueue(workers=1, shared=SharedCache(path))
+        polled = PredictionJobQueue(workers=1, shared=SharedCache(path))
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return make_result()
+
+        job = accepting.submit("1", "Low", work)
+        await asyncio.sleep(0.05)
+        running = await polled.lookup(job.id)
+        release.set()
+        await asyncio.sleep(0.05)
+        finished = await polled.lookup(job.id)
+        await accepting.stop()
+
+        assert running.status == "running"
+        assert finished.status == "succeeded"
+        assert finished.result.betSuggestion == "Arsenal to win"
+        assert await polled.lookup("unknown") is None
+
+
+    def test_job_endpoints_submit_and_poll(self, prediction_overrides):
+        """Test POST /prediction/jobs returns 202 with a Location that yields the result"""
+        with TestClient(app) as client:
+            response = client.post("/prediction/jobs", json={"matchId": "2274671", "riskLevel": "Medium"})
+
+            assert response.status_code == 202
+            location = response.headers["Location"]
+            assert location == f"/prediction/jobs/{response.json()['jobId']}"
+
+            job = poll(client, location)
+            assert job["status"] == "succeeded"
+            assert job["result"]["betSuggestion"] == "Huddersfield Town to win"
+
+            # The finished prediction is cached, so a repeat completes immediately
+            repeat = client.post("/prediction/jobs", json={"matchId": "2274671", "riskLevel": "Medium"})
+            assert repeat.json()["status"] == "succeeded"
+            assert prediction_overrides.generate_prediction.await_count == 1
+
+
+    def test_job_for_unknown_match_fails_and_unknown_job_is_404(self, prediction_overrides):
+        """Test an invalid match fails the job, and unknown job ids return 404"""
+        with TestClient(app) as client:
+            response = client.post("/prediction/jobs", json={"matchId": "missing", "riskLevel": "Low"})
+            job = poll(client, response.headers["Location"])
+
+            assert job["status"] == "failed"
+            assert job["error"] == "Match with ID missing not found"
+            assert client.get("/prediction/jobs/unknown").status_code == 404
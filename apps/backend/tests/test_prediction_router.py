@@ -1,3 +1,5 @@
+import time
+
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from fastapi.testclient import TestClient
@@ -5,10 +7,13 @@ from fastapi import HTTPException
 
 from app.main import app
 from app.models.match import Match, PredictionRequest, PredictionResult
-from app.services.match_service import MatchService
+from app.services.match_service import MatchService, MatchStore
 from app.services.prediction_service import PredictionService
 from app.services.web_scraper import WebScraperService
 
+# 2025-08-01, before the fixture matches kick off
+PRESEASON = 1754006400.0
+
 
 @pytest.fixture
 def client():
@@ -128,6 +133,9 @@ class TestPredictionRouter:
             assert data["rationale"] == "Home team has strong recent form and advantage."
             assert data["riskLevel"] == "Medium"
             
+            stages = [entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")]
+            assert stages == ["queue", "match_fetch", "scrape", "analysis", "total"]
+            
             # Verify service calls
             mock_ps.generate_prediction.assert_called_once()
             mock_ws.scrape_match_data.assert_called_once()
@@ -284,4 +292,167 @@ class TestPredictionRouter:
                 assert response.status_code == 200
                 data = response.json()
                 assert data["riskLevel"] == risk_level
-                assert len(data["betSuggestion"]) > 0
\ No newline at end of file
+                assert len(data["betSuggestion"]) > 0
+
+    def test_predict_match_endpoint_reports_degradation(self, client, sample_matches, sample_prediction_result):
+        """Test the deadline header is applied and degraded stages are reported in the response"""
+        from app.api.prediction_router import get_match_service, get_prediction_service, get_web_scraper_service
+        from app.services.deadline import current_deadline, note_degraded
+        
+        budgets = []
+        
+        async def scrape(match):
+            budgets.append(current_deadline().budget)
+            note_degraded("betting_odds:late")
+            return {}
+        
+        mock_ms = AsyncMock(spec=MatchService)
+        mock_ms.get_upcoming_matches.return_value = sample_matches
+        mock_ps = AsyncMock(spec=PredictionService)
+        mock_ps.generate_prediction.return_value = sample_prediction_result
+        mock_ws = AsyncMock(spec=WebScraperService)
+        mock_ws.scrape_match_data.side_effect = scrape
+        
+        app.dependency_overrides[get_match_service] = lambda: mock_ms
+        app.dependency_overrides[get_prediction_service] = lambda: mock_ps
+        app.dependency_overrides[get_web_scraper_service] = lambda: mock_ws
+        
+        try:
+            response = client.post(
+                "/prediction/predict",
+                json={"matchId": "2274671", "riskLevel": "Medium"},
+                headers={"X-Request-Timeout-Ms": "1500"}
+            )
+            
+            assert response.status_code == 200
+            data = response.json()
+            assert data["degraded"] is True
+            assert data["degradedReasons"] == ["betting_odds:late"]
+            assert budgets == [pytest.approx(1.5)]
+            # The shared result object is not modified
+            assert sample_prediction_result.degraded is False
+        finally:
+            app.dependency_overrides.clear()
+
+
+    def test_get_value_bets_endpoint(self, client, sample_matches):
+        """Test GET /prediction/value-bets ranks markets by expected value"""
+        from app.api.prediction_router import get_match_service, get_prediction_service, get_web_scraper_service
+        
+        mock_ms = AsyncMock(spec=MatchService)
+        mock_ms.get_upcoming_matches.return_value = sample_matches
+        
+        mock_ps = AsyncMock(spec=PredictionService)
+        mock_ps.estimate_market_probabilities.return_value = {"home_win": 0.6, "draw": 0.2, "away_win": 0.2}
+        
+        mock_ws = AsyncMock(spec=WebScraperService)
+        mock_ws.scrape_betting_odds.return_value = {"home_win": 2.0, "draw": 4.0, "away_win": 5.0}
+        
+        app.dependency_overrides[get_match_service] = lambda: mock_ms
+        app.dependency_overrides[get_prediction_service] = lambda: mock_ps
+        app.dependency_overrides[get_web_scraper_service] = lambda: mock_ws
+        
+        try:
+            response = client.get("/prediction/value-bets?limit=1")
+            
+            assert response.status_code == 200
+            data = response.json()
+            assert len(data) == 1
+            assert data[0]["market"] == "home_win"
+            assert data[0]["expectedValue"] == pytest.approx(0.2)
+            assert mock_ws.scrape_betting_odds.call_count == 2
+        finally:
+            app.dependency_overrides.clear()
+
+
+    def test_get_value_bets_endpoint_prices_from_recorded_odds(self, client):
+        """Test a full slate with recorded odds is ranked without scraping, within the latency budget"""
+        from app.api.prediction_router import get_match_service, get_web_scraper_service
+        from app.services.odds_store import get_odds_store
+        
+        matches = [
+            Match(id=f"slate-{i}", homeTeam=f"Home {i}", awayTeam=f"Away {i}", startTime="2025-08-19T18:45:00Z")
+            for i in range(400)
+        ]
+        odds_store = get_odds_store()
+        for match in matches:
+            odds_store.record(match.id, "book_a", {
+                "home_win": 2.1, "draw": 3.4, "away_win": 3.6, "over_2_5": 1.9,
+                "under_2_5": 1.95, "btts_yes": 1.8, "btts_no": 2.0
+            })
+        
+        mock_ms = AsyncMock(spec=MatchService)
+        mock_ms.get_upcoming_matches.return_value = matches
+        mock_ws = AsyncMock(spec=WebScraperService)
+        app.dependency_overrides[get_match_service] = lambda: mock_ms
+        app.dependency_overrides[get_web_scraper_service] = lambda: mock_ws
+        
+        try:
+            client.get("/prediction/value-bets")
+            started = time.perf_counter()
+            response = client.get("/prediction/value-bets?limit=20")
+            elapsed = time.perf_counter() - started
+            
+            assert response.status_code == 200
+            assert len(response.json()) == 20
+            mock_ws.scrape_betting_odds.assert_not_called()
+            assert elapsed < 0.1
+        finally:
+            app.dependency_overrides.clear()
+            for match in matches:
+                odds_store.evict_match(match.id)
+
+
+    def test_get_match_changes_endpoint(self, client, sample_matches):
+        """Test GET /prediction/matches/changes returns deltas, and a full list to new or stale clients"""
+        store = MatchStore(clock=lambda: PRESEASON)
+        with patch('app.api.prediction_router.get_match_store', return_value=store), \
+             patch('app.api.prediction_router.MatchService') as MockMatchService:
+            mock_instance = AsyncMock()
+            mock_instance.get_upcoming_matches.side_effect = lambda: store.get()
+            MockMatchService.return_value = mock_instance
+            store.update(sample_matches[:1], version=100)
+            
+            bootstrap = client.get("/prediction/matches/changes")
+            version = int(client.get("/prediction/matches").headers["X-Matches-Version"])
+            store.update(sample_matches, version=200)
+            delta = client.get(f"/prediction/matches/changes?since={version}")
+            stale = client.get("/prediction/matches/changes?since=50")
+        
+        assert bootstrap.json()["resync"] is True
+        assert bootstrap.json()["version"] == version == 100
+        assert [match["id"] for match in bootstrap.json()["matches"]] == ["2274671"]
+        assert delta.json()["resync"] is False
+        assert delta.json()["version"] == 200
+        assert [match["id"] for match in delta.json()["added"]] == [sample_matches[1].id]
+        assert delta.json()["changed"] == [] and delta.json()["removed"] == []
+        assert stale.json()["resync"] is True
+        assert len(stale.json()["matches"]) == 2
+
+
+    def test_get_match_odds_endpoint(self, client):
+        """Test GET /prediction/matches/{id}/odds returns aggregated odds"""
+        from app.services.odds_store import get_odds_store
+        
+        odds_store = get_odds_store()
+        odds_store.record("odds-test", "book_a", {"home_win": 2.0, "draw": 3.0})
+        odds_store.record("odds-test", "book_b", {"home_win": 2.2, "draw": 3.1})
+        
+        try:
+            response = client.get("/prediction/matches/odds-test/odds")
+            
+            assert response.status_code == 200
+            data = response.json()
+            assert data["snapshots"] == 2
+            assert data["bestPrice"]["home_win"]["bookmaker"] == "book_b"
+            assert "home_win" in data["consensus"]
+            assert len(data["lineMovement"]["draw"]["points"]) == 1
+        finally:
+            odds_store.evict_match("odds-test")
+
+
+    def test_get_match_odds_endpoint_unknown_match(self, client):
+        """Test GET /prediction/matches/{id}/odds returns 404 without recorded odds"""
+        response = client.get("/prediction/matches/no-odds/odds")
+        
+        assert response.status_code == 404
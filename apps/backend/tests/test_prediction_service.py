@@ -4,6 +4,7 @@ import random
 
 from app.services.prediction_service import PredictionService
 from app.models.match import Match, PredictionResult
+from app.services.team_stats_cache import TeamStatsCache
 
 
 @pytest.fixture
@@ -311,4 +312,43 @@ class TestPredictionService:
             assert "multiplier" in config
             assert "variance" in config
             assert isinstance(config["multiplier"], (int, float))
-            assert isinstance(config["variance"], (int, float))
\ No newline at end of file
+            assert isinstance(config["variance"], (int, float))
+
+    @pytest.mark.asyncio
+    async def test_estimate_market_probabilities(self, prediction_service, sample_match):
+        """Test estimate_market_probabilities returns coherent market probabilities"""
+        probabilities = await prediction_service.estimate_market_probabilities(sample_match)
+        
+        for market in ["home_win", "draw", "away_win", "over_2_5", "under_2_5", "btts_yes", "btts_no"]:
+            assert 0.0 < probabilities[market] < 1.0
+        
+        assert probabilities["home_win"] + probabilities["draw"] + probabilities["away_win"] == pytest.approx(1.0)
+        assert probabilities["over_2_5"] + probabilities["under_2_5"] == pytest.approx(1.0)
+        assert probabilities["btts_yes"] + probabilities["btts_no"] == pytest.approx(1.0)
+
+
+    def test_process_scraped_insights_uses_betting_odds(self, prediction_service, sample_scraped_data):
+        """Test _process_scraped_insights carries scraped odds and injuries through"""
+        insights = prediction_service._process_scraped_insights(sample_scraped_data)
+        
+        assert insights["betting_odds"].to_dict() == sample_scraped_data["betting_odds"]
+        assert len(insights["injury_reports"]) == 1
+        assert insights["injury_reports"][0].player == "Key Striker"
+
+
+    @pytest.mark.asyncio
+    async def test_analyze_match_data_reads_cached_team_statistics(self, sample_match):
+        """Test cached season statistics feed into expected goals"""
+        team_stats = TeamStatsCache()
+        team_stats.put(sample_match.homeTeam, {"goals_for": 60, "games_played": 20})
+        team_stats.put(sample_match.awayTeam, {"goals_for": 20, "games_played": 20})
+        prediction_service = PredictionService(team_stats=team_stats)
+        
+        analysis = await prediction_service._analyze_match_data(sample_match)
+        
+        assert analysis["team_statistics"]["home"]["goals_for"] == 60
+        analysis.update(home_advantage=0.0, team_strength_differential=0.0)
+        analysis["recent_form"].update(home_goals_per_game=1.0, away_goals_per_game=1.0)
+        home_xg, away_xg = prediction_service._expected_goals(analysis)
+        assert home_xg == pytest.approx(2.0)
+        assert away_xg == pytest.approx(1.0)
@@ -0,0 +1,148 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import profiler
+from app.services.profiler import ProfileStore, ProfilingMiddleware, StackSampler, collapse_stack
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ProfileStore(str(tmp_path / "profiles"))
+    monkeypatch.setattr(profiler, "_profile_store", store)
+    return store
+
+
+@pytest.fixture
+def client(store):
+    return TestClient(app)
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestProfiler:
+    def test_collapse_stack_is_root_first(self):
+        """Test collapsed stacks end with the innermost frame"""
+        stack = collapse_stack(sys._getframe())
+
+        assert stack.split(";")[-1].startswith("test_collapse_stack_is_root_first (test_profiler.py:")
+
+
+    def test_sampler_counts_busy_thread_stacks(self):
+        """Test the sampler attributes samples to the function burning CPU"""
+        ready = threading.Event()
+        ident = {}
+
+        def worker():
+            ident["thread"] = threading.get_ident()
+            ready.set()
+            busy(0.1)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        ready.wait()
+        sampler = StackSampler(ident["thread"], interval=0.002).start()
+        thread.join()
+        stacks = sampler.stop()
+
+        assert sampler.samples > 0
+        assert any("busy (test_profiler.py" in stack for stack in stacks)
+
+
+    def test_header_triggers_profile_and_admin_lists_it(self, client, store):
+        """Test X-Profile stores a profile that the admin endpoints serve"""
+        response = client.get("/health", headers={"X-Profile": "1"})
+        profile_id = response.headers["X-Profile-Id"]
+
+        profiles = client.get("/admin/profiles").json()
+        assert [meta["id"] for meta in profiles] == [profile_id]
+        assert profiles[0]["path"] == "/health"
+        assert profiles[0]["trigger"] == "requested"
+
+        collapsed = client.get(f"/admin/profiles/{profile_id}")
+        assert collapsed.status_code == 200
+        assert client.get("/admin/profiles/missing").status_code == 404
+
+
+    def test_unflagged_requests_are_not_profiled(self, client, store):
+        """Test requests without a trigger store nothing"""
+        response = client.get("/health")
+        client.get("/health?profile=0")
+
+        assert "X-Profile-Id" not in response.headers
+        assert store.list() == []
+
+
+    def test_sampling_mode_profiles_one_in_n(self, store):
+        """Test sampling mode profiles every Nth request"""
+        inner = FastAPI()
+
+        @inner.get("/work")
+        async def work():
+            busy(0.01)
+            return {}
+
+        client = TestClient(ProfilingMiddleware(inner, store=store, sample_every=2))
+        for _ in range(4):
+            client.get("/work")
+
+        profiles = store.list()
+        assert len(profiles) == 2
+        assert {meta["trigger"] for meta in profiles} == {"sampled"}
+
+
+    def test_store_keeps_newest_profiles(self, tmp_path):
+        """Test old profiles are pruned beyond the limit"""
+        store = ProfileStore(str(tmp_path), max_profiles=2)
+        for i in range(3):
+            store.save({"id": f"p{i}", "started_at": i}, {"main;work": 1})
+
+        assert [meta["id"] for meta in store.list()] == ["p2", "p1"]
+        assert store.load("p0") is None
+        assert store.load("p2") == "main;work 1\n"
+        assert store.load("../p2") is None
+
+
+    def test_prune_goes_by_file_time(self, tmp_path):
+        """Test pruning removes the least recently written profiles"""
+        store = ProfileStore(str(tmp_path), max_profiles=2)
+        for i, profile_id in enumerate(["c", "a"]):
+            store.save({"id": profile_id, "started_at": i}, {"main;work": 1})
+            os.utime(tmp_path / f"{profile_id}.json", (i, i))
+        store.save({"id": "b", "started_at": 2}, {"main;work": 1})
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["a.collapsed", "a.json", "b.collapsed", "b.json"]
+
+
+    def test_admin_closed_without_token(self, client, store, monkeypatch):
+        """Test admin endpoints and profile triggers are refused when no token is configured"""
+        monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+        monkeypatch.delenv("ADMIN_ALLOW_UNAUTHENTICATED", raising=False)
+
+        assert client.get("/admin/profiles").status_code == 403
+        assert client.post("/admin/memory/tracemalloc/start").status_code == 403
+        assert "X-Profile-Id" not in client.get("/health", headers={"X-Profile": "1"}).headers
+        assert "X-Profile-Id" not in client.get("/health?profile=1").headers
+        assert store.list() == []
+
+
+    def test_admin_token_required_when_configured(self, client, store, monkeypatch):
+        """Test admin endpoints and profile triggers require the configured token"""
+        monkeypatch.setenv("ADMIN_TOKEN", "secret")
+
+        assert client.get("/admin/profiles").status_code == 403
+        assert "X-Profile-Id" not in client.get("/health", headers={"X-Profile": "1"}).headers
+
+        response = client.get("/health", headers={"X-Profile": "1", "X-Admin-Token": "secret"})
+        assert "X-Profile-Id" in response.headers
+        assert client.get("/admin/profiles", headers={"X-Admin-Token": "secret"}).status_code == 200
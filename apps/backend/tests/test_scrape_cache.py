@@ -0,0 +1,189 @@
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app.models.scraped_data import ExpertPrediction, HeadToHead, Meeting, section_from_dict
+from app.services.scrape_cache import ScrapeCache
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return ScrapeCache(section_ttls={"betting_odds": 60, "head_to_head": 3600}, clock=clock)
+
+
+class TestScrapeCache:
+    def test_get_fresh_sections_respects_ttl(self, cache, clock):
+        """Test each section expires on its own TTL"""
+        cache.put_sections("1", {"betting_odds": {"home_win": 2.0}, "head_to_head": {"draws": 1}})
+        
+        clock.now += 120
+        fresh = cache.get_fresh_sections("1", ["betting_odds", "head_to_head"])
+        
+        assert fresh == {"head_to_head": {"draws": 1}}
+
+
+    def test_get_fresh_sections_is_keyed_by_match(self, cache):
+        """Test sections of different matches do not collide"""
+        cache.put_sections("1", {"head_to_head": {"draws": 1}})
+        
+        assert cache.get_fresh_sections("2", ["head_to_head"]) == {}
+
+
+    def test_stats_reports_hit_rate_and_age(self, cache, clock):
+        """Test stats reports per-section hit rate and data age"""
+        cache.put_sections("1", {"head_to_head": {"draws": 1}})
+        clock.now += 30
+        cache.get_fresh_sections("1", ["head_to_head", "betting_odds"])
+        cache.get_fresh_sections("1", ["head_to_head"])
+        
+        stats = cache.stats()
+        
+        assert stats["head_to_head"]["hits"] == 2
+        assert stats["head_to_head"]["hit_rate"] == 1.0
+        assert stats["head_to_head"]["max_age_seconds"] == 30.0
+        assert stats["betting_odds"]["hit_rate"] == 0.0
+        assert stats["betting_odds"]["entries"] == 0
+
+
+    def test_persists_across_restarts(self, tmp_path, clock):
+        """Test fresh entries survive a reload from disk and expired ones are dropped"""
+        path = str(tmp_path / "scrape_cache.json")
+        ttls = {"betting_odds": 60, "head_to_head": 3600}
+        
+        cache = ScrapeCache(section_ttls=ttls, path=path, clock=clock)
+        cache.put_sections("1", {"betting_odds": {"home_win": 2.0}, "head_to_head": {"draws": 1}})
+        cache.flush(force=True)
+        
+        clock.now += 120
+        reloaded = ScrapeCache(section_ttls=ttls, path=path, clock=clock)
+        
+        assert len(reloaded) == 1
+        assert reloaded.get_fresh_sections("1", ["head_to_head"]) == {"head_to_head": {"draws": 1}}
+
+
+    def test_persists_typed_records(self, tmp_path, clock):
+        """Test typed section records are written as dicts and rebuilt on load"""
+        path = str(tmp_path / "scrape_cache.json")
+        ttls = {"head_to_head": 3600, "expert_predictions": 3600}
+        h2h = HeadToHead([Meeting("2024-03-15", "Arsenal", "Chelsea", 2, 1)], home_wins=3, away_wins=1, draws=0)
+        tips = (ExpertPrediction("Sports Analyst A", "Arsenal to win", 80),)
+        
+        cache = ScrapeCache(section_ttls=ttls, path=path, clock=clock)
+        cache.put_sections("1", {"head_to_head": h2h, "expert_predictions": tips})
+        cache.flush(force=True)
+        
+        reloaded = ScrapeCache(section_ttls=ttls, path=path, clock=clock, decode=section_from_dict)
+        fresh = reloaded.get_fresh_sections("1", ["head_to_head", "expert_predictions"])
+        assert fresh == {"head_to_head": h2h, "expert_predictions": tips}
+
+
+    def test_load_skips_unreadable_entries(self, tmp_path, clock):
+        """Test malformed and old-format entries are dropped without losing the rest"""
+        path = tmp_path / "scrape_cache.json"
+        path.write_text(json.dumps([
+            ["1", "head_to_head", clock.now, {"last_5_h2h": [], "draws": 1}],
+            ["2", "head_to_head", clock.now],
+            ["3", "head_to_head", "yesterday", {}],
+            ["4", "head_to_head", clock.now, ["old", "record", "layout"]],
+            "garbage"
+        ]))
+        
+        reloaded = ScrapeCache(section_ttls={"head_to_head": 3600}, path=str(path), clock=clock, decode=section_from_dict)
+        
+        assert len(reloaded) == 1
+        assert reloaded.get_fresh_sections("1", ["head_to_head"])["head_to_head"].draws == 1
+        
+        path.write_text(json.dumps({"1": "not a list of entries"}))
+        assert len(ScrapeCache(section_ttls={"head_to_head": 3600}, path=str(path), clock=clock)) == 0
+
+
+    def test_flush_is_rate_limited(self, tmp_path, cache):
+        """Test non-forced flushes are throttled by the flush interval"""
+        cache.path = str(tmp_path / "scrape_cache.json")
+        cache.put_sections("1", {"head_to_head": {"draws": 1}})
+        cache.flush()
+        cache.put_sections("2", {"head_to_head": {"draws": 2}})
+        cache.flush()
+        
+        reloaded = ScrapeCache(section_ttls=cache.section_ttls, path=cache.path, clock=cache._clock)
+        assert len(reloaded) == 1
+
+
+    def test_workers_merge_into_one_file(self, tmp_path, clock):
+        """Test a flush keeps entries another worker wrote and drops ones it evicted"""
+        path = str(tmp_path / "scrape_cache.json")
+        ttls = {"head_to_head": 3600}
+        first = ScrapeCache(section_ttls=ttls, path=path, clock=clock)
+        second = ScrapeCache(section_ttls=ttls, path=path, clock=clock)
+        
+        first.put_sections("1", {"head_to_head": {"draws": 1}})
+        first.put_sections("3", {"head_to_head": {"draws": 3}})
+        first.flush(force=True)
+        second.put_sections("2", {"head_to_head": {"draws": 2}})
+        second.flush(force=True)
+        first.evict_match("3")
+        first.flush(force=True)
+        
+        reloaded = ScrapeCache(section_ttls=ttls, path=path, clock=clock)
+        assert reloaded.get_fresh_sections("1", ["head_to_head"]) == {"head_to_head": {"draws": 1}}
+        assert reloaded.get_fresh_sections("2", ["head_to_head"]) == {"head_to_head": {"draws": 2}}
+        assert len(reloaded) == 2
+
+
+    def test_failed_flush_removes_temp_file_and_stays_dirty(self, tmp_path, cache):
+        """Test a write that fails midway leaves no temp file and is retried later"""
+        cache.path = str(tmp_path / "scrape_cache.json")
+        cache.put_sections("1", {"head_to_head": object()})
+        
+        cache.flush(force=True)
+        
+        assert [p.name for p in tmp_path.iterdir() if p.name.startswith(".scrape_cache.")] == []
+        assert cache._dirty
+
+
+    @pytest.mark.asyncio
+    async def test_aflush_writes_off_the_event_loop(self, tmp_path, cache):
+        """Test aflush serializes in a worker thread and is rate limited like flush"""
+        cache.path = str(tmp_path / "scrape_cache.json")
+        cache.put_sections("1", {"head_to_head": {"draws": 1}})
+        threads = []
+        real_dump = json.dump
+        
+        def dump(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return real_dump(*args, **kwargs)
+        
+        with patch("app.services.scrape_cache.json.dump", side_effect=dump):
+            await cache.aflush()
+            cache.put_sections("2", {"head_to_head": {"draws": 2}})
+            await cache.aflush()
+        
+        assert threads and threads[0] is not threading.main_thread()
+        assert len(threads) == 1
+        assert len(ScrapeCache(section_ttls=cache.section_ttls, path=cache.path, clock=cache._clock)) == 1
+
+
+    def test_evict_match_and_purge_expired(self, cache, clock):
+        """Test eviction by match and purge of expired entries"""
+        cache.put_sections("1", {"betting_odds": {}, "head_to_head": {}})
+        cache.put_sections("2", {"betting_odds": {}})
+        
+        assert cache.evict_match("1") == 2
+        clock.now += 120
+        assert cache.purge_expired() == 1
+        assert len(cache) == 0
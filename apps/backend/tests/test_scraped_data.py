@@ -0,0 +1,114 @@
+import sys
+
+import pytest
+
+from app.models.scraped_data import (
+    BettingOdds,
+    FormResult,
+    MatchStatistics,
+    ScrapedMatchData,
+    TeamNews,
+    section_from_dict
+)
+
+
+@pytest.fixture
+def plain_scraped_data():
+    return {
+        "match_statistics": {
+            "home_recent_form": [
+                {"opponent": "Team A", "result": "W", "score": "2-1"},
+                {"opponent": "Team B", "result": "D", "score": "1-1"}
+            ],
+            "away_recent_form": [{"opponent": "Team C", "result": "L", "score": "0-3"}],
+            "home_goals_scored_last_5": 8,
+            "home_goals_conceded_last_5": 4,
+            "away_goals_scored_last_5": 6,
+            "away_goals_conceded_last_5": 7
+        },
+        "team_news": {
+            "home_injuries": [],
+            "away_injuries": [{"player": "Key Striker", "status": "out", "injury": "hamstring"}],
+            "home_suspensions": [],
+            "away_suspensions": []
+        },
+        "head_to_head": {
+            "last_5_h2h": [{"date": "2024-03-15", "home": "Arsenal", "away": "Chelsea", "score": "2-1"}],
+            "home_wins": 3,
+            "away_wins": 1,
+            "draws": 1
+        },
+        "betting_odds": {"home_win": 2.1, "draw": 3.2, "away_win": 3.8},
+        "weather_conditions": {"temperature": 12, "condition": "rainy", "precipitation_chance": 70, "wind_speed": 20},
+        "expert_predictions": [{"source": "Sports Analyst A", "prediction": "Arsenal to win", "confidence": 75}],
+        "stadium_info": {
+            "name": "Arsenal Stadium",
+            "capacity": 60000,
+            "surface": "Grass",
+            "home_record_this_season": {"wins": 8, "draws": 2, "losses": 1}
+        },
+        "team_statistics": {"home": {"goals_for": 40}, "away": {"goals_for": 30}},
+        "scraping_status": "complete",
+        "source_status": {"match_intel": "ok"},
+        "cached_sections": [],
+        "stale_sections": []
+    }
+
+
+class TestScrapedData:
+    def test_round_trip_preserves_plain_shape(self, plain_scraped_data):
+        """Test dict -> typed -> dict keeps the original structure and values"""
+        scraped = ScrapedMatchData.from_dict(plain_scraped_data)
+        
+        assert scraped.to_dict() == plain_scraped_data
+
+
+    def test_form_results_are_small_ints(self, plain_scraped_data):
+        """Test form results store result codes and goals instead of strings"""
+        stats = MatchStatistics.from_dict(plain_scraped_data["match_statistics"])
+        
+        first = stats.home_recent_form[0]
+        assert (first.result, first.goals_for, first.goals_against) == (0, 2, 1)
+        assert first.result_label == "W"
+        assert stats.away_recent_form[0].to_dict() == {"opponent": "Team C", "result": "L", "score": "0-3"}
+
+
+    def test_records_are_slotted(self):
+        """Test records carry no per-instance __dict__"""
+        form = FormResult("Team A", 0, 1, 0)
+        
+        assert not hasattr(form, "__dict__")
+        with pytest.raises(AttributeError):
+            form.extra = 1
+
+
+    def test_names_are_interned(self):
+        """Test repeated names share one string object"""
+        opponent = "".join(["Manchester", " ", "City"])
+        
+        first = FormResult(opponent, 0, 1, 0)
+        second = FormResult("Manchester City", 2, 0, 1)
+        assert first.opponent is second.opponent
+        assert first.opponent is sys.intern("Manchester City")
+
+
+    def test_betting_odds_aliases(self):
+        """Test long scraped market names map onto canonical odds fields"""
+        odds = BettingOdds.from_dict({"home_win": 2.0, "over_2_5_goals": 1.9, "both_teams_score_no": 2.1, "corners": 9.0})
+        
+        assert odds.over_2_5 == 1.9
+        assert odds.btts_no == 2.1
+        assert odds.to_dict() == {"home_win": 2.0, "over_2_5": 1.9, "btts_no": 2.1}
+        with pytest.raises(TypeError):
+            BettingOdds(corners=9.0)
+
+
+    def test_section_from_dict(self, plain_scraped_data):
+        """Test sections are decoded by name and typed values pass through"""
+        team_news = section_from_dict("team_news", plain_scraped_data["team_news"])
+        
+        assert isinstance(team_news, TeamNews)
+        assert section_from_dict("team_news", team_news) is team_news
+        assert section_from_dict("team_statistics", {"home": {}}) == {"home": {}}
+        assert len(section_from_dict("expert_predictions", plain_scraped_data["expert_predictions"])) == 1
+        assert [injury.player for injury in team_news.injury_reports()] == ["Key Striker"]
@@ -0,0 +1,68 @@
+import os
+import signal
+import socket
+import time
+from unittest.mock import patch
+
+from app import serve
+
+
+class TestServe:
+    def test_prefers_uvloop_and_httptools_when_installed(self):
+        """Test the fast loop and parser are picked when importable, with fallbacks otherwise"""
+        with patch.object(serve.importlib.util, "find_spec", return_value=object()):
+            assert serve.select_loop() == "uvloop"
+            assert serve.select_http() == "httptools"
+        with patch.object(serve.importlib.util, "find_spec", return_value=None):
+            assert serve.select_loop() == "asyncio"
+            assert serve.select_http() == "h11"
+
+
+    def test_bound_socket_is_listening_and_inheritable(self):
+        """Test the parent's socket can be passed to forked workers"""
+        sock = serve.bind_socket("127.0.0.1", 0, backlog=16)
+        try:
+            assert sock.get_inheritable()
+            client = socket.create_connection(sock.getsockname(), timeout=1)
+            client.close()
+        finally:
+            sock.close()
+
+
+    def test_worker_restores_default_signal_handlers(self):
+        """Test a forked worker does not keep the supervisor's handlers, so SIGTERM reaches uvicorn"""
+        supervisor = serve.Supervisor(app=None, sock=None, workers=1, options={})
+
+        def check_handlers():
+            for sig in serve.SUPERVISOR_SIGNALS:
+                if signal.getsignal(sig) != signal.SIG_DFL:
+                    os._exit(1)
+
+        previous = {sig: signal.signal(sig, supervisor._on_signal) for sig in serve.SUPERVISOR_SIGNALS}
+        try:
+            with patch.object(supervisor, "_serve", check_handlers), patch.object(serve.logger, "exception"):
+                pid = supervisor.spawn()
+            _, status = os.waitpid(pid, 0)
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+        assert os.waitstatus_to_exitcode(status) == 0
+
+
+    def test_crash_backoff_does_not_block_the_supervisor(self):
+        """Test a crashed worker is replaced after a delay without sleeping in reap"""
+        supervisor = serve.Supervisor(app=None, sock=None, workers=1, options={})
+        supervisor._crashes = 10
+        pid = os.fork()
+        if pid == 0:
+            os._exit(1)
+        supervisor.children[pid] = time.monotonic()
+
+        started = time.monotonic()
+        while supervisor.children:
+            supervisor.reap()
+        elapsed = time.monotonic() - started
+
+        assert elapsed < 1.0
+        assert supervisor._respawn_after >= started + serve.SERVE_CONFIG["RESPAWN_BACKOFF_MAX"]
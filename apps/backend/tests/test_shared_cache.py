@@ -0,0 +1,201 @@
+import asyncio
+import gc
+import multiprocessing
+import sqlite3
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.models.match import Match, PredictionResult
+from app.services.match_service import MatchService
+from app.services.prediction_cache import PredictionCache
+from app.services.shared_cache import SharedCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def as_worker(cache, name):
+    """Give a cache instance its own lease identity, as a separate worker process would have."""
+    cache._connection()
+    cache.holder = name
+    return cache
+
+
+def refresh_in_worker(path, log_path, results):
+    async def fetch():
+        with open(log_path, "a") as log:
+            log.write("fetch\n")
+        await asyncio.sleep(0.2)
+        return {"matches": 380}
+
+    results.put(asyncio.run(SharedCache(path).get_or_refresh("matches", 60, fetch)))
+
+
+class TestSharedCache:
+    def test_values_expire_but_stay_readable(self, tmp_path):
+        """Test expired entries are not fresh but remain available as stale data"""
+        clock = FakeClock()
+        cache = SharedCache(str(tmp_path / "shared.sqlite3"), clock=clock)
+        cache.put("matches", [{"id": "1"}], ttl=60)
+
+        assert cache.get_fresh("matches") == [{"id": "1"}]
+        clock.now += 60
+        assert cache.get_fresh("matches") is None
+        assert cache.get("matches").value == [{"id": "1"}]
+        assert cache.purge_expired() == 1
+
+
+    def test_only_one_worker_holds_a_lease(self, tmp_path):
+        """Test a lease is exclusive until released or expired"""
+        clock = FakeClock()
+        path = str(tmp_path / "shared.sqlite3")
+        first = as_worker(SharedCache(path, clock=clock), "worker-1")
+        second = as_worker(SharedCache(path, clock=clock), "worker-2")
+
+        assert first.acquire_lease("refresh:matches", ttl=30)
+        assert not second.acquire_lease("refresh:matches", ttl=30)
+        first.release_lease("refresh:matches")
+        assert second.acquire_lease("refresh:matches", ttl=30)
+        # A dead leader's lease runs out
+        clock.now += 30
+        assert first.acquire_lease("refresh:matches", ttl=30)
+
+
+    @pytest.mark.asyncio
+    async def test_followers_serve_stale_value_while_leader_refreshes(self, tmp_path):
+        """Test other workers keep reading the stale value instead of calling upstream"""
+        clock = FakeClock()
+        path = str(tmp_path / "shared.sqlite3")
+        leader = as_worker(SharedCache(path, clock=clock), "worker-1")
+        follower = as_worker(SharedCache(path, clock=clock), "worker-2")
+        leader.put("matches", "old", ttl=60)
+        clock.now += 61
+
+        release = asyncio.Event()
+
+        async def slow_fetch():
+            await release.wait()
+            return "new"
+
+        refresh = asyncio.create_task(leader.get_or_refresh("matches", 60, slow_fetch))
+        await asyncio.sleep(0.01)
+        upstream = AsyncMock(return_value="unexpected")
+
+        assert await follower.get_or_refresh("matches", 60, upstream) == "old"
+        upstream.assert_not_called()
+
+        release.set()
+        assert await refresh == "new"
+        assert await follower.get_or_refresh("matches", 60, upstream) == "new"
+        assert follower.stats()["stale_served"] == 1
+
+
+    def test_concurrent_workers_fetch_once(self, tmp_path):
+        """Test worker processes starting cold together make a single upstream call"""
+        path = str(tmp_path / "shared.sqlite3")
+        log_path = tmp_path / "fetches.log"
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        workers = [
+            context.Process(target=refresh_in_worker, args=(path, str(log_path), results))
+            for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=10)
+
+        assert [worker.exitcode for worker in workers] == [0, 0, 0, 0]
+        assert [results.get(timeout=1) for _ in workers] == [{"matches": 380}] * 4
+        assert log_path.read_text().count("fetch") == 1
+
+
+    @pytest.mark.asyncio
+    async def test_match_services_share_one_fetch(self, tmp_path):
+        """Test match lists fetched by one worker are read by the others"""
+        path = str(tmp_path / "shared.sqlite3")
+        matches = [Match(id="1", homeTeam="Arsenal", awayTeam="Chelsea", startTime="2025-08-19T18:45:00Z")]
+        first = MatchService(shared=as_worker(SharedCache(path), "worker-1"))
+        second = MatchService(shared=as_worker(SharedCache(path), "worker-2"))
+        first._fetch_upcoming_matches = AsyncMock(return_value=matches)
+        second._fetch_upcoming_matches = AsyncMock(return_value=[])
+
+        assert await first.get_upcoming_matches() == matches
+        assert await second.get_upcoming_matches() == matches
+        second._fetch_upcoming_matches.assert_not_called()
+
+
+    @pytest.mark.asyncio
+    async def test_prediction_cache_shared_between_workers(self, tmp_path):
+        """Test a prediction stored by one worker is served by another"""
+        path = str(tmp_path / "shared.sqlite3")
+        first = PredictionCache(shared=SharedCache(path))
+        second = PredictionCache(shared=SharedCache(path))
+        result = PredictionResult(betSuggestion="Arsenal to win", rationale="Home form.", riskLevel="Low")
+
+        await first.put("1", "Low", result)
+
+        assert await second.get("1", "Low") == result
+        assert len(second) == 1
+        assert await second.evict_match("1") == 1
+        assert await first.get("1", "Low") is None
+
+
+    @pytest.mark.asyncio
+    async def test_lock_contention_does_not_block_event_loop(self, tmp_path):
+        """Test a write waiting on another worker's lock leaves the event loop free"""
+        path = str(tmp_path / "shared.sqlite3")
+        cache = SharedCache(path)
+        cache.put("matches", "old", ttl=60)
+        other_worker = sqlite3.connect(path, isolation_level=None)
+        other_worker.execute("BEGIN IMMEDIATE")
+        # Connections left by earlier tests checkpoint when collected; keep that out of the measurement
+        gc.collect()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        write = asyncio.create_task(cache.run(cache.put, "matches", "new", 60))
+        await asyncio.sleep(0.3)
+        assert not write.done()
+        other_worker.execute("COMMIT")
+        await write
+        ticking.cancel()
+        other_worker.close()
+
+        assert ticks >= 20
+        assert cache.get("matches").value == "new"
+
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_refresh(self, tmp_path):
+        """Test other callers still get the refreshed value when the first caller is cancelled"""
+        cache = SharedCache(str(tmp_path / "shared.sqlite3"))
+        release = asyncio.Event()
+
+        async def slow_fetch():
+            await release.wait()
+            return "new"
+
+        first = asyncio.create_task(cache.get_or_refresh("matches", 60, slow_fetch))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(cache.get_or_refresh("matches", 60, slow_fetch))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == "new"
+        assert first.cancelled()
+        assert cache.get("matches").value == "new"
@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+
+from app.services.team_stats_cache import TeamStatsCache, normalize_team_name
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return TeamStatsCache(ttl=60, clock=clock)
+
+
+class TestTeamStatsCache:
+    def test_normalize_team_name(self):
+        """Test spelling variants of a team share one key"""
+        assert normalize_team_name("Brighton & Hove Albion FC") == "brighton hove albion"
+        assert normalize_team_name("  brighton and hove  albion ") == "brighton hove albion"
+        assert normalize_team_name("Atlético Madrid") == "atletico madrid"
+
+
+    def test_get_respects_ttl(self, cache, clock):
+        """Test entries expire after the TTL"""
+        cache.put("Liverpool FC", {"points": 50})
+        
+        assert cache.get("liverpool") == {"points": 50}
+        clock.now += 61
+        assert cache.get("Liverpool") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+
+    @pytest.mark.asyncio
+    async def test_get_or_fetch_deduplicates_concurrent_misses(self, cache):
+        """Test concurrent misses for one team share a single fetch"""
+        calls = []
+        
+        async def fetch(team_name):
+            calls.append(team_name)
+            await asyncio.sleep(0.01)
+            return {"points": 42}
+        
+        results = await asyncio.gather(*(cache.get_or_fetch("Arsenal", fetch) for _ in range(5)))
+        
+        assert calls == ["Arsenal"]
+        assert all(result == {"points": 42} for result in results)
+
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_fetch(self, cache):
+        """Test other callers still get statistics when the first caller is cancelled"""
+        release = asyncio.Event()
+        
+        async def fetch(team_name):
+            await release.wait()
+            return {"points": 42}
+        
+        first = asyncio.create_task(cache.get_or_fetch("Arsenal", fetch))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get_or_fetch("Arsenal", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        
+        assert await second == {"points": 42}
+        assert first.cancelled()
+        assert cache.get("Arsenal") == {"points": 42}
+
+
+    @pytest.mark.asyncio
+    async def test_get_or_fetch_does_not_cache_empty_results(self, cache):
+        """Test failed (empty) scrapes are retried on the next lookup"""
+        async def fetch(team_name):
+            return {}
+        
+        assert await cache.get_or_fetch("Arsenal", fetch) == {}
+        assert len(cache) == 0
+
+
+    @pytest.mark.asyncio
+    async def test_prefetch_fetches_each_distinct_team_once(self, cache):
+        """Test prefetch dedupes a slate and honours the concurrency limit"""
+        calls = []
+        active = 0
+        peak = 0
+        
+        async def fetch(team_name):
+            nonlocal active, peak
+            calls.append(team_name)
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"points": len(team_name)}
+        
+        cache.put("Chelsea", {"points": 1})
+        teams = ["Arsenal", "Chelsea", "arsenal fc", "Everton", "Fulham", "Everton", "Leeds", "Wolves"]
+        
+        fetched = await cache.prefetch(teams, fetch, concurrency=2)
+        
+        assert fetched == 5
+        assert sorted(calls) == ["Arsenal", "Everton", "Fulham", "Leeds", "Wolves"]
+        assert peak <= 2
+        assert await cache.prefetch(teams, fetch) == 0
@@ -0,0 +1,180 @@
+import asyncio
+import json
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+
+from app import main
+from app.main import app
+from app.models.match import Match
+from app.services import update_hub as update_hub_module
+from app.services.match_service import MatchService, MatchStore
+from app.services.shared_cache import SharedCache
+from app.services.update_hub import UPDATE_HUB_CONFIG, UpdateHub, get_update_hub, league_topic, match_topic
+from app.services.web_scraper import WebScraperService
+
+# 2025-08-01, before the fixture matches kick off
+PRESEASON = 1754006400.0
+
+
+@pytest.fixture
+def fresh_update_hub():
+    update_hub_module._update_hub = None
+    yield get_update_hub()
+    update_hub_module._update_hub = None
+
+
+def fixture(match_id, kickoff="2025-08-20T15:00:00+00:00"):
+    return Match(id=match_id, homeTeam=f"Home {match_id}", awayTeam=f"Away {match_id}", startTime=kickoff)
+
+
+class TestUpdateHub:
+    @pytest.mark.asyncio
+    async def test_update_serialized_once_for_all_subscribers(self):
+        """Test one update reaches every follower of its topics as the same string"""
+        hub = UpdateHub()
+        league_followers = [hub.connect() for _ in range(3)]
+        match_follower = hub.connect()
+        idle = hub.connect()
+        for subscriber in league_followers:
+            hub.subscribe(subscriber, [league_topic("4328")])
+        hub.subscribe(match_follower, [match_topic("1")])
+
+        with patch("app.services.update_hub.json.dumps", wraps=json.dumps) as dumps:
+            delivered = hub.publish((league_topic("4328"), match_topic("1")), {"type": "match", "event": "added"})
+            hub.publish((match_topic("2"),), {"type": "odds"})
+
+        assert delivered == 4
+        assert dumps.call_count == 1
+        messages = [(await subscriber.drain())[0] for subscriber in league_followers + [match_follower]]
+        assert all(message is messages[0] for message in messages)
+        assert not idle.ready.is_set()
+
+        hub.disconnect(match_follower)
+        assert hub.stats()["topics"] == 1
+
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_drops_oldest_and_is_told(self):
+        """Test a full outbox keeps the newest messages and reports how many were lost"""
+        hub = UpdateHub(queue_size=2)
+        subscriber = hub.connect()
+        hub.subscribe(subscriber, [match_topic("1")])
+
+        for odds in (1.5, 1.6, 1.7, 1.8):
+            hub.publish((match_topic("1"),), {"type": "odds", "odds": {"home_win": odds}})
+        messages = [json.loads(message) for message in await subscriber.drain()]
+
+        assert messages[0] == {"type": "dropped", "count": 2}
+        assert [message["odds"]["home_win"] for message in messages[1:]] == [1.7, 1.8]
+        assert hub.stats()["dropped"] == 2
+
+
+    def test_subscriptions_are_capped_per_connection(self):
+        """Test a connection cannot follow more topics than the limit"""
+        hub = UpdateHub(max_subscriptions=2)
+        subscriber = hub.connect()
+
+        added = hub.subscribe(subscriber, [match_topic(str(match_id)) for match_id in range(5)])
+
+        assert added == [match_topic("0"), match_topic("1")]
+        assert hub.stats()["subscriptions"] == 2
+
+
+    @pytest.mark.asyncio
+    async def test_match_refresh_and_odds_scrape_are_pushed(self):
+        """Test the match refresher pushes list changes and the scraper pushes odds"""
+        hub = UpdateHub()
+        subscriber = hub.connect()
+        hub.subscribe(subscriber, [league_topic("4328"), match_topic("2")])
+        match_service = MatchService(store=MatchStore(clock=lambda: PRESEASON), updates=hub)
+        match_service._fetch_upcoming_matches = AsyncMock(return_value=[fixture("1")])
+        await match_service.get_upcoming_matches()
+        assert not subscriber.ready.is_set()
+
+        match_service._fetch_upcoming_matches.return_value = [fixture("2")]
+        await match_service.get_upcoming_matches()
+        scraper = WebScraperService(updates=hub)
+        scraper._scrape_bookmaker_odds = AsyncMock(return_value={"home_win": 2.0, "draw": 3.2})
+        await scraper.scrape_betting_odds(fixture("2"))
+
+        messages = [json.loads(message) for message in await subscriber.drain()]
+        assert [(message["type"], message.get("event")) for message in messages] == [
+            ("match", "added"), ("match", "removed"), ("odds", None)
+        ]
+        assert messages[0]["match"]["id"] == "2"
+        assert messages[1]["matchId"] == "1"
+        assert messages[2]["odds"] == {"home_win": 2.0, "draw": 3.2}
+
+
+    @pytest.mark.asyncio
+    async def test_updates_reach_subscribers_on_other_workers_once(self, tmp_path, monkeypatch):
+        """Test a change seen by two workers reaches a subscriber of a third through the shared log once"""
+        monkeypatch.setitem(UPDATE_HUB_CONFIG, "RELAY_INTERVAL", 0.01)
+        path = str(tmp_path / "shared.sqlite3")
+        listening = UpdateHub(shared=SharedCache(path))
+        subscriber = listening.connect()
+        listening.subscribe(subscriber, [league_topic("4328")])
+        listening.start_relay()
+        await asyncio.sleep(0.05)
+        
+        for worker in range(2):
+            hub = UpdateHub(shared=SharedCache(path))
+            store = MatchStore(clock=lambda: PRESEASON)
+            store.update([fixture("1")], version=1)
+            match_service = MatchService(store=store, updates=hub)
+            match_service._load_upcoming_matches = AsyncMock(return_value=([fixture("1"), fixture("2")], 2))
+            await match_service.get_upcoming_matches()
+            await hub.stop_relay()
+        
+        messages = [json.loads(message) for message in await asyncio.wait_for(subscriber.drain(), 1.0)]
+        await asyncio.sleep(0.05)
+        await listening.stop_relay()
+        
+        assert [(message["event"], message["match"]["id"]) for message in messages] == [("added", "2")]
+        assert not subscriber.ready.is_set()
+
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_publishes_changes(self, monkeypatch):
+        """Test the lifespan refresher pushes list changes without any request"""
+        hub = UpdateHub()
+        subscriber = hub.connect()
+        hub.subscribe(subscriber, [league_topic("4328")])
+        match_service = MatchService(store=MatchStore(clock=lambda: PRESEASON), updates=hub)
+        match_service._fetch_upcoming_matches = AsyncMock(return_value=[fixture("1")])
+        await match_service.get_upcoming_matches()
+        match_service._fetch_upcoming_matches.return_value = [fixture("1"), fixture("2")]
+        monkeypatch.setattr(main, "get_match_service", lambda: match_service)
+        
+        refresher = asyncio.create_task(main.refresh_match_data(interval=0.01))
+        messages = await asyncio.wait_for(subscriber.drain(), 1.0)
+        refresher.cancel()
+        
+        assert json.loads(messages[0])["match"]["id"] == "2"
+
+
+    def test_websocket_subscribe_and_receive(self, fresh_update_hub):
+        """Test /ws/updates acknowledges subscriptions and pushes published updates"""
+        with TestClient(app) as client:
+            with client.websocket_connect("/ws/updates") as websocket:
+                websocket.send_json({"action": "subscribe", "leagues": ["4328"], "matches": ["1"]})
+                subscribed = websocket.receive_json()
+                websocket.send_text("not json")
+                error = websocket.receive_json()
+                websocket.send_text("[1]")
+                not_an_object = websocket.receive_json()
+
+                client.portal.call(fresh_update_hub.publish, (match_topic("1"),), {"type": "odds", "matchId": "1"})
+                update = websocket.receive_json()
+
+                websocket.send_json({"action": "unsubscribe", "matches": ["1"]})
+                unsubscribed = websocket.receive_json()
+
+        assert subscribed == {"type": "subscriptions", "topics": ["league:4328", "match:1"]}
+        assert error["type"] == "error"
+        assert not_an_object == {"type": "error", "detail": "Invalid command: command must be a JSON object"}
+        assert update == {"type": "odds", "matchId": "1"}
+        assert unsubscribed["topics"] == ["league:4328"]
+        assert len(fresh_update_hub) == 0
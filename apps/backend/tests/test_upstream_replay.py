@@ -0,0 +1,142 @@
+import random
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from app.models.match import Match
+from app.services import upstream_replay
+from app.services.upstream_replay import (
+    CassetteStore,
+    LatencyDistribution,
+    RecordingTransport,
+    ReplayTransport,
+    get_upstream_transport
+)
+from app.services.web_scraper import WebScraperService
+
+
+FIXTURE_URL = "https://www.thesportsdb.com/api/v1/json/3/eventsnextleague.php?id=4328"
+
+
+def upstream_handler(request):
+    return httpx.Response(200, json={"events": [{"idEvent": "1", "path": request.url.path}]})
+
+
+@pytest.fixture
+def cassettes(tmp_path):
+    return CassetteStore(str(tmp_path / "cassettes"))
+
+
+@pytest.fixture
+def replay_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("UPSTREAM_MODE", "replay")
+    monkeypatch.setenv("UPSTREAM_CASSETTE_DIR", str(tmp_path / "cassettes"))
+    monkeypatch.setattr(upstream_replay, "_transports", {})
+
+
+@pytest.fixture
+def sample_match():
+    return Match(
+        id="replay_match",
+        homeTeam="Arsenal",
+        awayTeam="Chelsea",
+        league="Premier League",
+        startTime="2024-12-01T15:00:00Z"
+    )
+
+
+class TestUpstreamReplay:
+    @pytest.mark.asyncio
+    async def test_record_then_replay(self, cassettes):
+        """Test recorded responses are served back offline"""
+        recorder = RecordingTransport(cassettes, transport=httpx.MockTransport(upstream_handler))
+        async with httpx.AsyncClient(transport=recorder) as client:
+            recorded = await client.get(FIXTURE_URL)
+
+        async with httpx.AsyncClient(transport=ReplayTransport(cassettes)) as client:
+            replayed = await client.get(FIXTURE_URL)
+
+        assert replayed.status_code == 200
+        assert replayed.json() == recorded.json()
+        assert replayed.json()["events"][0]["path"] == "/api/v1/json/3/eventsnextleague.php"
+
+
+    @pytest.mark.asyncio
+    async def test_missing_cassette_returns_404(self, cassettes):
+        """Test unrecorded requests are reported instead of reaching the network"""
+        transport = ReplayTransport(cassettes)
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get("https://example.com/not-recorded")
+
+        assert response.status_code == 404
+        assert transport.missing == 1
+
+
+    @pytest.mark.asyncio
+    async def test_error_injection(self, cassettes):
+        """Test configured error status and timeouts are injected"""
+        always_fail = ReplayTransport(cassettes, error_rate=1.0, error_status="503")
+        async with httpx.AsyncClient(transport=always_fail) as client:
+            response = await client.get(FIXTURE_URL)
+        assert response.status_code == 503
+        assert always_fail.injected_errors == 1
+
+        always_timeout = ReplayTransport(cassettes, error_rate=1.0, error_status="timeout")
+        async with httpx.AsyncClient(transport=always_timeout) as client:
+            with pytest.raises(httpx.ReadTimeout):
+                await client.get(FIXTURE_URL)
+
+
+    @pytest.mark.asyncio
+    async def test_injected_faults_are_deterministic(self, cassettes):
+        """Test the same seed injects errors on the same requests every run"""
+        async def run(seed):
+            transport = ReplayTransport(cassettes, error_rate=0.5, seed=seed)
+            async with httpx.AsyncClient(transport=transport) as client:
+                return [(await client.get(f"https://example.com/{i % 3}")).status_code for i in range(12)]
+
+        first = await run(7)
+        assert first == await run(7)
+        assert 503 in first and 404 in first
+
+
+    def test_latency_specs(self):
+        """Test latency spec parsing and sampling in seconds"""
+        rng = random.Random(1)
+        assert LatencyDistribution("fixed:20").sample(rng) == pytest.approx(0.02)
+        assert 0.01 <= LatencyDistribution("uniform:10:50").sample(rng) <= 0.05
+        assert LatencyDistribution("lognormal:20:0.5").sample(rng) > 0
+
+        for spec in ("fixed", "uniform:10", "gaussian:1:2", "fixed:abc"):
+            with pytest.raises(ValueError):
+                LatencyDistribution(spec)
+
+
+    def test_live_mode_uses_default_transport(self, monkeypatch):
+        """Test live mode leaves clients on their real transport"""
+        monkeypatch.delenv("UPSTREAM_MODE", raising=False)
+        assert get_upstream_transport() is None
+
+
+    def test_replay_mode_transport_is_shared(self, replay_env):
+        """Test replay mode returns one shared replay transport"""
+        transport = get_upstream_transport()
+        assert isinstance(transport, ReplayTransport)
+        assert get_upstream_transport() is transport
+
+
+    @pytest.mark.asyncio
+    async def test_replay_mode_simulation_is_deterministic(self, replay_env, sample_match):
+        """Test simulated scrapes repeat exactly in replay mode"""
+        scraper = WebScraperService()
+        with patch('asyncio.sleep'):
+            first = await scraper._simulate_scraped_data(sample_match)
+            second = await scraper._simulate_scraped_data(sample_match)
+            first_odds = await scraper._scrape_bookmaker_odds(sample_match, "bookmaker_a")
+            second_odds = await scraper._scrape_bookmaker_odds(sample_match, "bookmaker_a")
+            other_odds = await scraper._scrape_bookmaker_odds(sample_match, "bookmaker_b")
+
+        assert first == second
+        assert first_odds == second_odds
+        assert first_odds != other_odds
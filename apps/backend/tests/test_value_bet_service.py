@@ -0,0 +1,132 @@
+import pytest
+import time
+
+from app.services.value_bet_service import ValueBetService
+from app.models.match import Match, ValueBet
+
+
+@pytest.fixture
+def value_bet_service():
+    return ValueBetService()
+
+
+@pytest.fixture
+def sample_matches():
+    return [
+        Match(id="1", homeTeam="Liverpool", awayTeam="Manchester City", startTime="2025-08-19T18:45:00Z"),
+        Match(id="2", homeTeam="Arsenal", awayTeam="Chelsea", startTime="2025-08-20T15:00:00Z")
+    ]
+
+
+@pytest.fixture
+def fair_probabilities():
+    return {
+        "home_win": 0.5, "draw": 0.25, "away_win": 0.25,
+        "over_2_5": 0.5, "under_2_5": 0.5,
+        "btts_yes": 0.5, "btts_no": 0.5
+    }
+
+
+class TestValueBetService:
+    def test_rank_value_bets_removes_overround(self, value_bet_service, sample_matches, fair_probabilities):
+        """Test implied probabilities are normalised within each market group"""
+        odds = {"home_win": 1.9, "draw": 3.8, "away_win": 3.8}
+        
+        bets = value_bet_service.rank_value_bets(
+            sample_matches[:1], [odds], [fair_probabilities], limit=10
+        )
+        
+        # No market beats the fair price once the bookmaker margin is priced in
+        assert bets == []
+        
+        value_bet_service.min_expected_value = -1.0
+        bets = value_bet_service.rank_value_bets(
+            sample_matches[:1], [odds], [fair_probabilities], limit=10
+        )
+        assert all(isinstance(bet, ValueBet) for bet in bets)
+        # Bookmaker margin: 1/1.9 + 2/3.8 = 1.0526 -> implied home = 0.5
+        home = next(bet for bet in bets if bet.market == "home_win")
+        assert home.impliedProbability == pytest.approx(0.5, abs=1e-4)
+        assert sum(bet.impliedProbability for bet in bets) == pytest.approx(1.0, abs=1e-3)
+
+
+    def test_rank_value_bets_expected_value_and_kelly(self, value_bet_service, sample_matches, fair_probabilities):
+        """Test EV and fractional Kelly stake for a mispriced market"""
+        odds = {"home_win": 2.5, "draw": 3.0, "away_win": 3.0}
+        
+        bets = value_bet_service.rank_value_bets(
+            sample_matches[:1], [odds], [fair_probabilities], limit=10
+        )
+        
+        assert len(bets) == 1
+        bet = bets[0]
+        assert bet.market == "home_win"
+        assert bet.expectedValue == pytest.approx(0.25)
+        # Full Kelly = 0.25 / 1.5, scaled by the configured fraction
+        assert bet.kellyStake == pytest.approx(0.25 / 1.5 * value_bet_service.kelly_fraction, abs=1e-4)
+
+
+    def test_rank_value_bets_orders_and_limits(self, value_bet_service, sample_matches, fair_probabilities):
+        """Test bets are ordered by EV and truncated to the limit"""
+        odds = [
+            {"home_win": 2.2, "draw": 4.5, "away_win": 4.5, "over_2_5": 2.1, "under_2_5": 1.8},
+            {"home_win": 2.6, "draw": 4.2, "away_win": 4.0, "btts_yes": 2.3, "btts_no": 1.6}
+        ]
+        
+        bets = value_bet_service.rank_value_bets(
+            sample_matches, odds, [fair_probabilities, fair_probabilities], limit=3
+        )
+        
+        assert len(bets) == 3
+        evs = [bet.expectedValue for bet in bets]
+        assert evs == sorted(evs, reverse=True)
+        assert bets[0].matchId == "2"
+        assert bets[0].market == "home_win"
+
+
+    def test_rank_value_bets_skips_incomplete_groups(self, value_bet_service, sample_matches, fair_probabilities):
+        """Test groups without a full set of prices are ignored"""
+        odds = {"home_win": 3.0, "draw": 3.0, "over_2_5": 5.0}
+        
+        bets = value_bet_service.rank_value_bets(
+            sample_matches[:1], [odds], [fair_probabilities], limit=10
+        )
+        
+        assert bets == []
+
+
+    def test_rank_value_bets_accepts_scraper_aliases(self, value_bet_service, sample_matches, fair_probabilities):
+        """Test alternative odds keys from scrape_match_data are recognised"""
+        odds = {"over_2_5_goals": 2.4, "under_2_5_goals": 1.7}
+        
+        bets = value_bet_service.rank_value_bets(
+            sample_matches[:1], [odds], [fair_probabilities], limit=10
+        )
+        
+        assert [bet.market for bet in bets] == ["over_2_5"]
+
+
+    def test_rank_value_bets_misaligned_inputs(self, value_bet_service, sample_matches):
+        """Test misaligned inputs raise ValueError"""
+        with pytest.raises(ValueError):
+            value_bet_service.rank_value_bets(sample_matches, [{}], [{}])
+
+
+    def test_rank_value_bets_full_slate_performance(self, value_bet_service, fair_probabilities):
+        """Test a multi-league slate is ranked within tens of milliseconds"""
+        matches = [
+            Match(id=str(i), homeTeam=f"Home {i}", awayTeam=f"Away {i}", startTime="2025-08-19T18:45:00Z")
+            for i in range(500)
+        ]
+        odds = {
+            "home_win": 2.2, "draw": 3.4, "away_win": 3.6,
+            "over_2_5": 1.9, "under_2_5": 1.95, "btts_yes": 1.8, "btts_no": 2.0
+        }
+        start = time.perf_counter()
+        bets = value_bet_service.rank_value_bets(
+            matches, [odds] * len(matches), [fair_probabilities] * len(matches), limit=20
+        )
+        elapsed = time.perf_counter() - start
+        
+        assert len(bets) == 20
+        assert elapsed < 0.05
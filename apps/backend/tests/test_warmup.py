@@ -0,0 +1,113 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app import main, serve
+from app.services import warmup as warmup_module
+from app.services.warmup import WARMUP_CONFIG, WarmupState
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def fresh_warmup_state():
+    warmup_module._warmup_state = None
+    yield
+    warmup_module._warmup_state = None
+
+
+class TestWarmup:
+    @pytest.mark.asyncio
+    async def test_phases_are_timed_and_failures_do_not_block_readiness(self):
+        """Test each phase gets a timing and status, and the worker is ready after all ran"""
+        state = WarmupState()
+
+        async def ok():
+            await asyncio.sleep(0.01)
+
+        async def broken():
+            raise RuntimeError("sports API unavailable")
+
+        async def stuck():
+            await asyncio.sleep(1)
+
+        await state.run([("caches", ok), ("match_data", broken), ("schemas", stuck)], timeout=0.05)
+        report = state.report()
+
+        assert report["status"] == "ready"
+        assert report["phases"]["caches"]["status"] == "ok"
+        assert report["phases"]["caches"]["seconds"] >= 0.01
+        assert report["phases"]["match_data"] == {
+            "status": "failed", "seconds": pytest.approx(0, abs=0.05), "error": "sports API unavailable"
+        }
+        assert report["phases"]["schemas"]["status"] == "timeout"
+
+
+    def test_ready_is_503_until_warmup_completes(self, fresh_warmup_state):
+        """Test /ready stays not-ready while a phase runs, and /health is live throughout"""
+        release = asyncio.Event()
+
+        async def slow_phase():
+            await release.wait()
+
+        with patch.dict(os.environ, {"WARMUP": "1"}), \
+             patch.object(main, "WARMUP_PHASES", [("match_data", slow_phase)]):
+            with TestClient(main.app) as client:
+                assert client.get("/health").status_code == 200
+                warming = client.get("/ready")
+                client.portal.call(release.set)
+                for _ in range(100):
+                    ready = client.get("/ready")
+                    if ready.status_code == 200:
+                        break
+
+        assert warming.status_code == 503
+        assert warming.json()["status"] == "warming"
+        assert ready.status_code == 200
+        assert ready.json()["phases"]["match_data"]["status"] == "ok"
+        assert ready.json()["import_seconds"] is None
+
+
+    def test_import_stays_within_budget_and_defers_modules(self):
+        """Test importing the app is fast and leaves on-demand modules unimported"""
+        script = (
+            "import json, sys, time\n"
+            "started = time.perf_counter()\n"
+            "import app.main\n"
+            "elapsed = time.perf_counter() - started\n"
+            f"deferred = [m for m in {list(WARMUP_CONFIG['DEFERRED_MODULES'])!r} if m in sys.modules]\n"
+            "print(json.dumps({'seconds': elapsed, 'loaded': deferred,"
+            " 'recorded': app.main.get_warmup_state().import_seconds}))\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+
+        assert result["loaded"] == []
+        assert result["seconds"] < WARMUP_CONFIG["IMPORT_BUDGET"]
+        assert 0 < result["recorded"] <= result["seconds"]
+
+
+    def test_preloaded_warmup_is_not_repeated_by_workers(self, fresh_warmup_state):
+        """Test the parent's warm-up runs once before forking and workers start ready"""
+        calls = []
+
+        async def phase():
+            calls.append(os.getpid())
+
+        with patch.dict(os.environ, {"WARMUP": "1"}), \
+             patch.object(main, "WARMUP_PHASES", [("match_data", phase)]):
+            serve.preload_app()
+            with TestClient(main.app) as client:
+                ready = client.get("/ready")
+
+        assert calls == [os.getpid()]
+        assert ready.status_code == 200
+        assert ready.json()["phases"]["match_data"]["status"] == "ok"
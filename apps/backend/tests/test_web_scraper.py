@@ -1,9 +1,20 @@
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
+import asyncio
+import time
 import httpx
 
-from app.services.web_scraper import WebScraperService
+from app.services.web_scraper import WebScraperService, SCRAPED_SECTIONS, SCRAPER_CONFIG
+from app.services.scrape_cache import ScrapeCache
+from app.services.team_stats_cache import TeamStatsCache
+from app.services.crawl_frontier import CrawlFrontier, DomainPoliteness
+from app.services.odds_store import OddsStore
+from app.services.deadline import Deadline, deadline_scope
+from app.services.hedging import HEDGE_CONFIG, RequestHedger
 from app.models.match import Match
+from app.models.scraped_data import (
+    BettingOdds, FormResult, HeadToHead, Injury, MatchStatistics, ScrapedMatchData, TeamNews
+)
 
 
 @pytest.fixture
@@ -27,26 +38,21 @@ class TestWebScraperService:
         """Test scrape_match_data returns simulated data successfully"""
         result = await web_scraper.scrape_match_data(sample_match)
         
-        assert isinstance(result, dict)
-        assert "match_statistics" in result
-        assert "team_news" in result
-        assert "head_to_head" in result
-        assert "betting_odds" in result
-        assert "weather_conditions" in result
-        assert "expert_predictions" in result
-        assert "stadium_info" in result
+        assert isinstance(result, ScrapedMatchData)
+        assert isinstance(result.match_statistics, MatchStatistics)
+        assert isinstance(result.team_news, TeamNews)
+        assert isinstance(result.head_to_head, HeadToHead)
+        assert isinstance(result.betting_odds, BettingOdds)
+        assert result.weather_conditions is not None
+        assert len(result.expert_predictions) == 3
+        assert result.stadium_info is not None
         
         # Check match statistics structure
-        match_stats = result["match_statistics"]
-        assert "home_recent_form" in match_stats
-        assert "away_recent_form" in match_stats
-        assert "home_goals_scored_last_5" in match_stats
-        assert "away_goals_scored_last_5" in match_stats
-        
-        assert isinstance(match_stats["home_recent_form"], list)
-        assert isinstance(match_stats["away_recent_form"], list)
-        assert isinstance(match_stats["home_goals_scored_last_5"], int)
-        assert isinstance(match_stats["away_goals_scored_last_5"], int)
+        match_stats = result.match_statistics
+        assert isinstance(match_stats.home_recent_form, tuple)
+        assert isinstance(match_stats.away_recent_form, tuple)
+        assert isinstance(match_stats.home_goals_scored_last_5, int)
+        assert isinstance(match_stats.away_goals_scored_last_5, int)
 
 
     @pytest.mark.asyncio
@@ -55,42 +61,179 @@ class TestWebScraperService:
         result = await web_scraper.scrape_match_data(sample_match)
         
         # Test team news structure
-        team_news = result["team_news"]
-        assert "home_injuries" in team_news
-        assert "away_injuries" in team_news
-        assert "home_suspensions" in team_news
-        assert "away_suspensions" in team_news
-        assert isinstance(team_news["home_injuries"], list)
-        assert isinstance(team_news["away_injuries"], list)
+        team_news = result.team_news
+        assert isinstance(team_news.home_injuries, tuple)
+        assert isinstance(team_news.away_injuries, tuple)
+        assert team_news.home_suspensions == ()
+        assert team_news.away_suspensions == ()
         
         # Test head to head structure
-        h2h = result["head_to_head"]
-        assert "last_5_h2h" in h2h
-        assert "home_wins" in h2h
-        assert "away_wins" in h2h
-        assert "draws" in h2h
-        assert isinstance(h2h["last_5_h2h"], list)
-        assert isinstance(h2h["home_wins"], int)
+        h2h = result.head_to_head
+        assert len(h2h.last_5_h2h) == 5
+        assert isinstance(h2h.home_wins, int)
+        assert isinstance(h2h.away_wins, int)
+        assert isinstance(h2h.draws, int)
         
         # Test betting odds structure
-        odds = result["betting_odds"]
-        assert "home_win" in odds
-        assert "draw" in odds
-        assert "away_win" in odds
-        assert isinstance(odds["home_win"], float)
-        assert isinstance(odds["draw"], float)
+        odds = result.betting_odds
+        assert isinstance(odds.home_win, float)
+        assert isinstance(odds.draw, float)
+        assert isinstance(odds.away_win, float)
+        
+        # Plain dicts keep the original shape at the API boundary
+        plain = result.to_dict()
+        assert set(plain["team_news"]) == {"home_injuries", "away_injuries", "home_suspensions", "away_suspensions"}
+        assert set(plain["head_to_head"]) == {"last_5_h2h", "home_wins", "away_wins", "draws"}
+        assert plain["head_to_head"]["last_5_h2h"][0]["score"] == "2-1"
 
 
     @pytest.mark.asyncio
     async def test_scrape_match_data_error_handling(self, web_scraper, sample_match):
-        """Test scrape_match_data handles errors gracefully"""
+        """Test scrape_match_data keeps other sources when one source fails"""
         # Mock _simulate_scraped_data to raise an exception
         with patch.object(web_scraper, '_simulate_scraped_data', side_effect=Exception("Scraping failed")):
             result = await web_scraper.scrape_match_data(sample_match)
             
-            # Should return fallback data
-            assert isinstance(result, dict)
-            assert result == web_scraper._get_fallback_data()
+            # Failed source falls back, the rest are merged
+            assert isinstance(result, ScrapedMatchData)
+            assert result.scraping_status == "partial"
+            assert result.source_status["match_intel"] == "failed"
+            assert result.source_status["betting_odds"] == "ok"
+            assert result.match_statistics is None
+            assert result.betting_odds.home_win is not None
+            assert result.team_statistics["home"]
+
+
+    @pytest.mark.asyncio
+    async def test_scrape_match_data_all_sources_fail(self, web_scraper, sample_match):
+        """Test scrape_match_data reports failure when no source succeeds"""
+        with patch.object(web_scraper, '_simulate_scraped_data', side_effect=Exception("Scraping failed")), \
+             patch.object(web_scraper, 'scrape_team_statistics', AsyncMock(return_value={})), \
+             patch.object(web_scraper, 'scrape_betting_odds', AsyncMock(return_value={})):
+            result = await web_scraper.scrape_match_data(sample_match)
+            
+            assert result.scraping_status == "failed"
+            assert set(result.source_status.values()) == {"failed"}
+            assert result.betting_odds is None
+
+
+    @pytest.mark.asyncio
+    async def test_scrape_match_data_flags_late_sources(self, web_scraper, sample_match):
+        """Test slow sources are cut off at their deadline and flagged late"""
+        async def slow_odds(match):
+            await asyncio.sleep(5)
+            return {"home_win": 2.0}
+        
+        web_scraper.source_timeouts["betting_odds"] = 0.05
+        with patch.object(web_scraper, 'scrape_betting_odds', side_effect=slow_odds):
+            start = time.perf_counter()
+            result = await web_scraper.scrape_match_data(sample_match)
+            elapsed = time.perf_counter() - start
+        
+        assert result.source_status["betting_odds"] == "late"
+        assert result.source_status["match_intel"] == "ok"
+        assert result.scraping_status == "partial"
+        # Simulated odds from the match intel source are kept
+        assert result.betting_odds.home_win is not None
+        assert elapsed < web_scraper.scrape_budget + 0.5
+
+
+    @pytest.mark.asyncio
+    async def test_scrape_match_data_respects_budget(self, web_scraper, sample_match):
+        """Test the critical path is capped by the scrape budget"""
+        async def hang(*args):
+            await asyncio.sleep(5)
+        
+        web_scraper.scrape_budget = 0.1
+        with patch.object(web_scraper, '_simulate_scraped_data', side_effect=hang), \
+             patch.object(web_scraper, 'scrape_team_statistics', side_effect=hang), \
+             patch.object(web_scraper, 'scrape_betting_odds', side_effect=hang):
+            start = time.perf_counter()
+            result = await web_scraper.scrape_match_data(sample_match)
+            elapsed = time.perf_counter() - start
+        
+        assert elapsed < 1.0
+        assert set(result.source_status.values()) == {"late"}
+        assert result.scraping_status == "failed"
+
+
+    @pytest.mark.asyncio
+    async def test_scrape_match_data_only_refetches_expired_sections(self, sample_match):
+        """Test cached sections are served and only expired sections are scraped"""
+        cache = ScrapeCache()
+        web_scraper = WebScraperService(cache=cache)
+        
+        first = await web_scraper.scrape_match_data(sample_match)
+        assert first.cached_sections == []
+        
+        # Expire only the odds section
+        cache.section_ttls["betting_odds"] = 0
+        with patch.object(web_scraper, '_simulate_scraped_data', wraps=web_scraper._simulate_scraped_data) as intel, \
+             patch.object(web_scraper, 'scrape_team_statistics', AsyncMock(return_value={})) as team_stats:
+            second = await web_scraper.scrape_match_data(sample_match)
+        
+        intel.assert_called_once_with(sample_match, ["betting_odds"])
+        team_stats.assert_not_called()
+        assert set(second.source_status) == {"match_intel", "betting_odds"}
+        assert second.head_to_head == first.head_to_head
+        assert second.team_statistics == first.team_statistics
+        assert set(second.cached_sections) == set(SCRAPED_SECTIONS) - {"betting_odds"}
+        assert second.scraping_status == "complete"
+
+
+    @pytest.mark.asyncio
+    async def test_scrape_match_data_without_time_serves_stale_sections(self, sample_match):
+        """Test an exhausted deadline skips every source and falls back to expired cache entries"""
+        cache = ScrapeCache()
+        web_scraper = WebScraperService(cache=cache)
+        first = await web_scraper.scrape_match_data(sample_match)
+        
+        # Everything has expired and no time is left to scrape again
+        cache.section_ttls = {section: 0 for section in cache.section_ttls}
+        with deadline_scope(Deadline(0.1)) as deadline, \
+             patch.object(web_scraper, '_simulate_scraped_data', wraps=web_scraper._simulate_scraped_data) as intel:
+            start = time.perf_counter()
+            result = await web_scraper.scrape_match_data(sample_match)
+            elapsed = time.perf_counter() - start
+        
+        intel.assert_called_once()
+        assert elapsed < 0.1
+        assert set(result.source_status.values()) == {"skipped"}
+        assert result.scraping_status == "partial"
+        assert set(result.stale_sections) == set(SCRAPED_SECTIONS)
+        assert result.head_to_head == first.head_to_head
+        assert "betting_odds:skipped" in deadline.degraded_reasons
+        assert "head_to_head:stale" in deadline.degraded_reasons
+
+
+    @pytest.mark.asyncio
+    async def test_scrape_budget_shrinks_to_deadline(self, web_scraper, sample_match):
+        """Test the scrape budget is cut to the remaining deadline minus the prediction reserve"""
+        with deadline_scope(Deadline(1.0)), \
+             patch.object(web_scraper, '_gather_sources', AsyncMock(return_value=({}, {}))) as gather:
+            await web_scraper.scrape_match_data(sample_match)
+        
+        sources, budget = gather.call_args.args
+        for coro in sources.values():
+            coro.close()
+        assert budget <= 1.0 - 0.25
+        assert budget < web_scraper.scrape_budget
+
+
+    @pytest.mark.asyncio
+    async def test_fetch_page_stops_retrying_at_deadline(self, web_scraper):
+        """Test no retry is started when its backoff would outlast the deadline"""
+        mock_context = AsyncMock()
+        mock_context.get.side_effect = httpx.TimeoutException("Timeout")
+        
+        with patch('httpx.AsyncClient') as mock_client, patch('asyncio.sleep') as mock_sleep:
+            mock_client.return_value.__aenter__.return_value = mock_context
+            with deadline_scope(Deadline(0.3)):
+                result = await web_scraper._fetch_page("http://example.com")
+        
+        assert result is None
+        assert mock_context.get.call_count == 1
+        mock_sleep.assert_not_called()
 
 
     @pytest.mark.asyncio
@@ -99,22 +242,21 @@ class TestWebScraperService:
         result = await web_scraper._simulate_scraped_data(sample_match)
         
         # Test that form data contains expected structure
-        home_form = result["match_statistics"]["home_recent_form"]
+        home_form = result["match_statistics"].home_recent_form
         assert len(home_form) == 5
         for game in home_form:
-            assert "opponent" in game
-            assert "result" in game
-            assert "score" in game
-            assert game["result"] in ["W", "D", "L"]
+            assert isinstance(game, FormResult)
+            assert game.opponent
+            assert game.result_label in ["W", "D", "L"]
+            assert 0 <= game.goals_for <= 10 and 0 <= game.goals_against <= 10
         
         # Test injury data structure
-        home_injuries = result["team_news"]["home_injuries"]
-        assert isinstance(home_injuries, list)
+        home_injuries = result["team_news"].home_injuries
+        assert isinstance(home_injuries, tuple)
         for injury in home_injuries:
-            if injury:  # May be empty list
-                assert "player" in injury
-                assert "status" in injury
-                assert "injury" in injury
+            assert isinstance(injury, Injury)
+            assert injury.player
+            assert injury.injury
 
 
     def test_generate_injury_list(self, web_scraper):
@@ -125,10 +267,10 @@ class TestWebScraperService:
         assert len(injuries) <= 2  # Should return 0-2 injuries
         
         for injury in injuries:
-            assert "player" in injury
-            assert "status" in injury
-            assert "injury" in injury
-            assert injury["status"] in ["doubtful", "out", "fit"]
+            assert isinstance(injury, Injury)
+            assert injury.player
+            assert injury.injury
+            assert injury.status in ["doubtful", "out", "fit"]
 
 
     @pytest.mark.asyncio
@@ -165,6 +307,22 @@ class TestWebScraperService:
             assert result == {}  # Should return empty dict on error
 
 
+    @pytest.mark.asyncio
+    async def test_prefetch_teams_serves_match_scrapes_from_cache(self, sample_match):
+        """Test team statistics prefetched for a slate are not scraped again per match"""
+        web_scraper = WebScraperService(team_stats_cache=TeamStatsCache())
+        
+        fetched = await web_scraper.prefetch_teams([sample_match.homeTeam, sample_match.awayTeam, "Liverpool FC"])
+        assert fetched == 2
+        
+        with patch.object(web_scraper, 'scrape_team_statistics', AsyncMock(return_value={})) as team_stats:
+            result = await web_scraper.scrape_match_data(sample_match)
+        
+        team_stats.assert_not_called()
+        assert result.source_status["home_team_statistics"] == "ok"
+        assert result.team_statistics["away"] == web_scraper.team_stats_cache.get(sample_match.awayTeam)
+
+
     @pytest.mark.asyncio
     async def test_scrape_betting_odds(self, web_scraper, sample_match):
         """Test scrape_betting_odds returns valid odds data"""
@@ -179,6 +337,23 @@ class TestWebScraperService:
             assert 1.0 <= result[odd_type] <= 10.0  # Reasonable odds range
 
 
+    @pytest.mark.asyncio
+    async def test_scrape_betting_odds_records_every_bookmaker(self, sample_match):
+        """Test bookmakers are scraped concurrently and each snapshot is recorded"""
+        odds_store = OddsStore()
+        web_scraper = WebScraperService(odds_store=odds_store)
+        bookmakers = len(SCRAPER_CONFIG["BOOKMAKERS"])
+        
+        start = time.perf_counter()
+        result = await web_scraper.scrape_betting_odds(sample_match)
+        elapsed = time.perf_counter() - start
+        
+        assert odds_store.snapshot_count(sample_match.id) == bookmakers
+        assert set(odds_store.best_price(sample_match.id)) == set(result)
+        # Concurrent: bounded by the slowest bookmaker, not the sum
+        assert elapsed < SCRAPER_CONFIG["BETTING_ODDS_DELAY_RANGE"][1] + 0.5
+
+
     @pytest.mark.asyncio
     async def test_scrape_betting_odds_error_handling(self, web_scraper, sample_match):
         """Test scrape_betting_odds handles errors gracefully"""
@@ -192,16 +367,17 @@ class TestWebScraperService:
         """Test _get_fallback_data returns proper structure"""
         fallback = web_scraper._get_fallback_data()
         
-        assert isinstance(fallback, dict)
+        assert isinstance(fallback, ScrapedMatchData)
         required_keys = [
             "match_statistics", "team_news", "head_to_head", "betting_odds",
             "weather_conditions", "expert_predictions", "stadium_info", "scraping_status"
         ]
         
+        plain = fallback.to_dict()
         for key in required_keys:
-            assert key in fallback
+            assert key in plain
         
-        assert fallback["scraping_status"] == "failed"
+        assert fallback.scraping_status == "failed"
 
 
     @pytest.mark.asyncio
@@ -291,8 +467,11 @@ class TestWebScraperService:
 
 
     @pytest.mark.asyncio
-    async def test_rate_limiting_between_requests(self, web_scraper):
-        """Test that rate limiting delay is applied between requests"""
+    async def test_rate_limiting_between_requests(self):
+        """Test that the per-domain politeness delay is applied between requests"""
+        politeness = DomainPoliteness(default_delay=1.0, clock=lambda: 100.0)
+        web_scraper = WebScraperService(politeness=politeness)
+        
         with patch('asyncio.sleep') as mock_sleep, \
              patch('httpx.AsyncClient') as mock_client:
             
@@ -301,7 +480,81 @@ class TestWebScraperService:
             mock_response.raise_for_status.return_value = None
             mock_client.return_value.__aenter__.return_value.get.return_value = mock_response
             
-            await web_scraper._make_request("http://test.com")
+            await web_scraper._make_request("http://test.com/a")
+            mock_sleep.assert_not_called()
+            
+            await web_scraper._make_request("http://test.com/b")
+            await web_scraper._make_request("http://other.com/a")
+            
+            # Only the second request to the same domain waits, for the politeness delay
+            mock_sleep.assert_called_once_with(web_scraper.rate_limit_delay)
+
+
+    @pytest.mark.asyncio
+    async def test_make_request_retry_backoff_is_jittered(self, web_scraper):
+        """Test retries are iterative with jittered exponential backoff"""
+        with patch('httpx.AsyncClient') as mock_client, \
+             patch('asyncio.sleep') as mock_sleep:
+            
+            mock_client.return_value.__aenter__.return_value.get.side_effect = httpx.TimeoutException("Timeout")
+            
+            await web_scraper._make_request("http://jitter.test")
             
-            # Should have called sleep with rate_limit_delay
-            mock_sleep.assert_called_with(web_scraper.rate_limit_delay)
\ No newline at end of file
+            backoffs = [call.args[0] for call in mock_sleep.call_args_list][-web_scraper.max_retries:]
+            for attempt, delay in enumerate(backoffs):
+                ceiling = 2 ** attempt
+                assert ceiling / 2 <= delay <= ceiling
+
+
+    @pytest.mark.asyncio
+    async def test_make_request_hedges_slow_source_to_mirror(self, monkeypatch):
+        """Test a slow request is hedged to the source's mirror and the mirror's response wins"""
+        monkeypatch.setitem(HEDGE_CONFIG, "DEFAULT_HEDGE_DELAY", 0.01)
+        hedger = RequestHedger(mirrors={"slow.test": ["mirror.test"]})
+        politeness = DomainPoliteness(default_delay=0.0)
+        web_scraper = WebScraperService(politeness=politeness, hedger=hedger)
+        
+        async def get(url, headers=None):
+            if "slow.test" in url:
+                await asyncio.sleep(10)
+            response = MagicMock()
+            response.text = f"from {url}"
+            return response
+        
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_client.return_value.__aenter__.return_value.get.side_effect = get
+            
+            result = await web_scraper._make_request("http://slow.test/odds")
+        
+        assert result == "from http://mirror.test/odds"
+        assert hedger.hedged == 1
+        assert hedger.hedge_wins == 1
+
+
+    @pytest.mark.asyncio
+    async def test_scrape_page_streams_and_extracts(self):
+        """Test scrape_page streams the body into the selective extractor"""
+        page = b'<html><ul class="injury-list"><li>Key Striker - out</li></ul></html>'
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=page))
+        web_scraper = WebScraperService(politeness=DomainPoliteness(default_delay=0.0))
+        
+        real_client = httpx.AsyncClient
+        with patch('httpx.AsyncClient', side_effect=lambda **kwargs: real_client(**{**kwargs, 'transport': transport})):
+            result = await web_scraper.scrape_page("http://pages.test/match")
+        
+        assert result["injuries"] == [["Key Striker - out"]]
+
+
+    @pytest.mark.asyncio
+    async def test_fetch_pages_through_frontier(self, sample_match):
+        """Test fetch_pages routes URLs through the crawl frontier"""
+        async def fetch(url):
+            return f"<html>{url}</html>"
+        
+        frontier = CrawlFrontier(fetch=fetch, politeness=DomainPoliteness(default_delay=0.0))
+        web_scraper = WebScraperService(frontier=frontier)
+        
+        pages = await web_scraper.fetch_pages(sample_match, ["http://a.test/1", "http://b.test/1"])
+        
+        assert pages == {"http://a.test/1": "<html>http://a.test/1</html>", "http://b.test/1": "<html>http://b.test/1</html>"}
+        await frontier.stop()
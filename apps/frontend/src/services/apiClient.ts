@@ -14,6 +14,8 @@ export interface PredictionResult {
   betSuggestion: string;
   rationale: string;
   riskLevel: 'Low' | 'Medium' | 'High';
+  degraded?: boolean;
+  degradedReasons?: string[];
 }
 
 export interface ApiError {